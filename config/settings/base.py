@@ -146,11 +146,114 @@ STATIC_URL = '/staticfiles/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = '/mediafiles/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'mediafiles')
+# Internal nginx location that serves MEDIA_ROOT. When set, downloads are authorized by Django and
+# then sent by nginx through an X-Accel-Redirect header. When None, Django sends them itself.
+FILE_DELIVERY_ACCEL_REDIRECT = None
 
 # If we don't do this, NGINX will not be able to serve large files that are uploaded to the server
 # since the default permissions set for large files deny it access.
 FILE_UPLOAD_PERMISSIONS = 0o644
 
+# Where the state of download/upload/transfer jobs is kept. 'sqlite' stores it in the database
+# below and writes it out to the job's process_info.json whenever anything but the progress
+# counters change, so the file and byte counters of a running job are only in the database.
+# 'json' stores everything only in each job's process_info.json file.
+JOB_STATE_BACKEND = 'sqlite'
+JOB_STATE_DATABASE = os.path.join(BASE_DIR, 'jobstate', 'jobs.sqlite3')
+# Milliseconds between writes of a running job's file and byte counters to the job store.
+JOB_PROGRESS_FLUSH_INTERVAL = 500
+# Seconds a job may run for before the job supervisor terminates it, by action.
+JOB_TIMEOUTS = {
+    'resource_download': 3600,
+    'resource_upload': 3600,
+    'resource_transfer_in': 3600,
+    'default': 3600
+}
+# Jobs wait in a queue until they can run without going over these limits. JOB_QUEUE_MAX_RUNNING
+# is the size of the pool of running jobs. POSTs are refused with a 503 once JOB_QUEUE_MAX_WAITING
+# jobs are waiting. Waiting jobs with a higher priority are started first.
+JOB_QUEUE_MAX_RUNNING = 8
+JOB_QUEUE_MAX_WAITING = 100
+JOB_QUEUE_MAX_RUNNING_PER_TARGET = {
+    'osf': 4,
+    'github': 2,
+    'default': 4
+}
+JOB_QUEUE_MAX_RUNNING_PER_USER = 2
+JOB_QUEUE_PRIORITIES = {
+    'resource_download': 0,
+    'resource_upload': 0,
+    'resource_transfer_in': 0
+}
+# Seconds between checks for free places in the queue while jobs are waiting.
+JOB_QUEUE_POLL_INTERVAL = 1
+# Whoever runs a job renews a lease on it every JOB_QUEUE_HEARTBEAT_INTERVAL seconds. Jobs whose
+# lease runs out are queued again for another worker, up to JOB_QUEUE_MAX_ATTEMPTS times by
+# action. Uploads aren't run again, their zip file is removed once it has been extracted.
+JOB_QUEUE_HEARTBEAT_INTERVAL = 10
+JOB_QUEUE_LEASE_SECONDS = 30
+JOB_QUEUE_MAX_ATTEMPTS = {
+    'resource_upload': 1,
+    'default': 3
+}
+# Dotted path of the job queue class. Backends that don't use the job state database can be
+# given their own options with JOB_QUEUE_OPTIONS.
+JOB_QUEUE_BACKEND = 'presqt.utilities.job_store.sqlite_job_queue.SQLiteJobQueue'
+# 'local' runs jobs on the server's host, supervised by the one server process that holds the
+# lock on JOB_SUPERVISOR_LOCK_FILE. 'worker' queues them for `python manage.py run_job_worker`
+# processes instead, which need the same mediafiles directory and job state database as the server.
+JOB_EXECUTION = os.environ.get('JOB_EXECUTION', 'local')
+JOB_SUPERVISOR_LOCK_FILE = os.path.join(BASE_DIR, 'jobstate', 'job_supervisor.lock')
+# Runs the tests with the job state database and job supervisor lock in a temporary directory.
+TEST_RUNNER = 'config.test_runner.PresQTTestRunner'
+JOB_WORKER_CONCURRENCY = 4
+# Key the user tokens in queued job payloads are encrypted with, made by Fernet.generate_key().
+# When it isn't set a key is derived from SECRET_KEY.
+JOB_PAYLOAD_KEY = os.environ.get('JOB_PAYLOAD_KEY')
+# Transfers into a new project on a target with an upload stream upload each file as soon as it's
+# downloaded. Up to TRANSFER_STREAM_QUEUE_SIZE downloaded files wait for the upload before the
+# download is held back. Asynchronous downloads aren't held back, their files wait on disk instead.
+TRANSFER_STREAMING = True
+TRANSFER_STREAM_QUEUE_SIZE = 32
+# How the zip files PresQT makes are compressed, by what they are made for. 'store' doesn't
+# compress, 'deflate' compresses every file and 'auto' compresses every file that isn't already
+# in a compressed format. Up to ZIP_COMPRESSION_WORKERS files of a finite depth upload's zip file
+# are compressed at the same time.
+ZIP_COMPRESSION = {
+    'resource_download': 'auto',
+    'bag_and_zip': 'auto',
+    'finite_depth_upload': 'auto',
+    'default': 'store'
+}
+ZIP_COMPRESSION_LEVEL = 6
+ZIP_COMPRESSION_WORKERS = 4
+# Files with these extensions, or MIME types starting with these, are already compressed.
+ZIP_STORED_EXTENSIONS = [
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar', '.zst', '.lz4', '.jar', '.whl',
+    '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.odp', '.epub', '.jpg', '.jpeg', '.png', '.gif',
+    '.webp', '.heic', '.mp3', '.mp4', '.m4a', '.mov', '.mkv', '.avi', '.webm', '.ogg', '.flac'
+]
+ZIP_STORED_MIME_TYPES = [
+    'video/', 'audio/mpeg', 'audio/ogg', 'audio/aac', 'audio/flac', 'image/jpeg', 'image/png',
+    'image/gif', 'image/webp', 'application/zip', 'application/gzip', 'application/x-bzip2',
+    'application/x-xz', 'application/x-7z-compressed', 'application/x-rar-compressed',
+    'application/java-archive', 'application/vnd.openxmlformats-officedocument.',
+    'application/vnd.oasis.opendocument.'
+]
+# Limits on the zip file of an upload, checked by the upload job before it's extracted. Zip files
+# that would extract to more than UPLOAD_MAX_COMPRESSION_RATIO times their own size are refused as
+# zip bombs. The checksums of up to UPLOAD_VALIDATION_WORKERS files of the bag are validated at
+# the same time.
+UPLOAD_MAX_BYTES = 50 * 1024 ** 3
+UPLOAD_MAX_FILES = 100000
+UPLOAD_MAX_COMPRESSION_RATIO = 200
+UPLOAD_VALIDATION_WORKERS = 4
+# Resumable upload sessions. A session that hasn't received a chunk in
+# UPLOAD_SESSION_EXPIRATION_HOURS is deleted with its partial zip file, and each PATCH may send at
+# most UPLOAD_SESSION_MAX_CHUNK_SIZE bytes.
+UPLOAD_SESSION_EXPIRATION_HOURS = 24
+UPLOAD_SESSION_MAX_CHUNK_SIZE = 100 * 1024 ** 2
+
 # Test user tokens. Used for unit tests.
 # DON'T EVER USE THESE TOKENS TO STORE NON-PUBLIC DATA AS THEY ARE NOT SECURE
 OSF_TEST_USER_TOKEN = os.environ['OSF_TEST_USER_TOKEN']
@@ -6,6 +6,9 @@ EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST_USER = os.environ['EMAIL_HOST_USER']
 EMAIL_DEFAULT_FROM_EMAIL = 'noreply@presqt.crc.nd.edu'
 
+# Downloads are sent by nginx from its internal /protected_mediafiles/ location
+FILE_DELIVERY_ACCEL_REDIRECT = '/protected_mediafiles/'
+
 CORS_ORIGIN_ALLOW_ALL = False
 
 CORS_ORIGIN_WHITELIST = (
@@ -0,0 +1,24 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class PresQTTestRunner(DiscoverRunner):
+    """
+    Test runner that keeps the job state database and the job supervisor lock of the tests in a
+    temporary directory instead of the server's jobstate directory.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.job_state_directory = tempfile.mkdtemp()
+        settings.JOB_STATE_DATABASE = os.path.join(self.job_state_directory, 'jobs.sqlite3')
+        settings.JOB_SUPERVISOR_LOCK_FILE = os.path.join(self.job_state_directory,
+                                                         'job_supervisor.lock')
+
+    def teardown_test_environment(self, **kwargs):
+        shutil.rmtree(self.job_state_directory, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+import zipfile
+
+import bagit
+from django.test import SimpleTestCase
+
+from presqt.api_v1.utilities.fixity.bag_manifests import make_bag_tag_files
+from presqt.api_v1.utilities.validation.bagit_validation import validate_bag
+from presqt.utilities import PresQTValidationError, ZipStream, file_multi_hash_generator
+
+
+class TestBagManifests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_make_bag_tag_files(self):
+        """
+        A bag written straight into a zip file should be valid once it's extracted.
+        """
+        files = {'/project/a.txt': b'a' * 100, '/project/folder/b b.txt': b'b' * 50}
+        zip_path = os.path.join(self.directory, 'bag.zip')
+        zip_stream = ZipStream(zip_path)
+        file_digests = {}
+        for path, contents in files.items():
+            file_path = os.path.join(self.directory, 'spool')
+            with open(file_path, 'wb') as file:
+                file.write(contents)
+            file_digests[path] = file_multi_hash_generator(file_path)
+            zip_stream.write_file(file_path, 'bag/data{}'.format(path))
+        for tag_file_path, contents in make_bag_tag_files(file_digests, 150):
+            zip_stream.write_bytes(contents, 'bag/{}'.format(tag_file_path))
+        zip_stream.close()
+
+        with zipfile.ZipFile(zip_path) as zip_file:
+            zip_file.extractall(self.directory)
+        bag = bagit.Bag(os.path.join(self.directory, 'bag'))
+        bag.validate()
+        self.assertEqual(bag.info['Payload-Oxum'], '150.2')
+
+    def test_validate_bag(self):
+        """
+        Checksums should be validated by several threads, and a changed file should fail them.
+        """
+        bag_path = os.path.join(self.directory, 'bag')
+        os.makedirs(bag_path)
+        for index in range(10):
+            with open(os.path.join(bag_path, 'file_{}.txt'.format(index)), 'w') as file:
+                file.write('contents {}'.format(index))
+        bag = bagit.make_bag(bag_path, checksums=['md5', 'sha256'])
+        validate_bag(bag, workers=4)
+
+        with open(os.path.join(bag_path, 'data', 'file_3.txt'), 'w') as file:
+            file.write('contents 4')
+        with self.assertRaises(PresQTValidationError) as e:
+            validate_bag(bagit.Bag(bag_path), workers=4)
+        self.assertEqual(e.exception.data, 'Checksums failed to validate.')
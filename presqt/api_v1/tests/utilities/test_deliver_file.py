@@ -0,0 +1,64 @@
+import os
+import shutil
+
+from django.test import SimpleTestCase, RequestFactory, override_settings
+
+from presqt.api_v1.utilities import deliver_file
+
+
+class TestDeliverFile(SimpleTestCase):
+    def setUp(self):
+        self.directory = os.path.join('mediafiles', 'test_deliver_file')
+        os.makedirs(self.directory, exist_ok=True)
+        self.file_path = os.path.join(self.directory, 'bag.zip')
+        with open(self.file_path, 'wb') as file:
+            file.write(bytes(range(100)))
+        self.factory = RequestFactory()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_ranges(self):
+        """
+        Django should send the whole file, or the byte range requested if the file hasn't changed.
+        """
+        response = deliver_file(self.factory.get('/'), self.file_path, 'bag.zip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(100)))
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename=bag.zip')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+        for range_header, start, end in [('bytes=10-19', 10, 19), ('bytes=90-', 90, 99),
+                                         ('bytes=-5', 95, 99), ('bytes=95-500', 95, 99)]:
+            response = deliver_file(self.factory.get('/', HTTP_RANGE=range_header,
+                                                     HTTP_IF_RANGE=response['ETag']),
+                                    self.file_path, 'bag.zip')
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(b''.join(response.streaming_content), bytes(range(start, end + 1)))
+            self.assertEqual(response['Content-Range'], 'bytes {}-{}/100'.format(start, end))
+
+        # The file changed since the first part was sent
+        response = deliver_file(self.factory.get('/', HTTP_RANGE='bytes=10-19',
+                                                 HTTP_IF_RANGE='"old"'),
+                                self.file_path, 'bag.zip')
+        self.assertEqual(response.status_code, 200)
+
+        response = deliver_file(self.factory.get('/', HTTP_RANGE='bytes=100-'),
+                                self.file_path, 'bag.zip')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */100')
+
+    def test_accel_redirect(self):
+        """
+        The file should be handed to nginx when FILE_DELIVERY_ACCEL_REDIRECT is set.
+        """
+        with override_settings(FILE_DELIVERY_ACCEL_REDIRECT='/protected_mediafiles/',
+                               MEDIA_ROOT=os.path.abspath('mediafiles')):
+            response = deliver_file(self.factory.get('/'), self.file_path, 'bag.zip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['X-Accel-Redirect'],
+                         '/protected_mediafiles/test_deliver_file/bag.zip')
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename=bag.zip')
@@ -0,0 +1,242 @@
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from presqt.api_v1.utilities.multiprocess import job_supervisor
+from presqt.api_v1.utilities.multiprocess.job_payload import (JobRequest, build_job_payload,
+                                                             run_job_payload)
+from presqt.api_v1.utilities.multiprocess.job_supervisor import JobSupervisor
+from presqt.utilities.job_store.sqlite_job_queue import SQLiteJobQueue
+from presqt.utilities.job_store.sqlite_job_store import SQLiteJobStore
+
+
+class PayloadJob(object):
+    """
+    Stands in for a resource view whose job is run by a job worker.
+    """
+
+    def finish(self):
+        SQLiteJobStore(self.database_path).update_action(
+            self.ticket_number, self.action,
+            {'status': 'finished', 'function_process_id': self.function_process.pid})
+
+    def record_tokens(self):
+        self.received_tokens = (self.source_token, self.destination_token)
+
+
+class ElectedSupervisor(object):
+    """
+    Stands in for the JobSupervisor a server process starts once it's elected.
+    """
+
+    def __init__(self, max_jobs=0):
+        self.pid = os.getpid()
+        self.worker_id = 'elected:{}'.format(self.pid)
+
+
+def run_candidate(elected):
+    """
+    Stands in for a server process that has queued a job.
+    """
+    job_supervisor.elect_job_supervisor()
+    while job_supervisor.get_job_supervisor() is None:
+        time.sleep(0.05)
+    elected.set()
+    time.sleep(60)
+
+
+def run_dying_supervisor(job_pids):
+    """
+    Stands in for a supervisor that starts a job and then dies.
+    """
+    process = multiprocessing.Process(target=job_supervisor.run_supervised_job,
+                                      args=({}, os.getpid()))
+    process.start()
+    job_pids.put(process.pid)
+    time.sleep(60)
+
+
+def process_gone(pid):
+    """
+    Check whether a process has exited. An exited process that hasn't been reaped yet counts.
+    """
+    try:
+        with open('/proc/{}/stat'.format(pid)) as stat_file:
+            return stat_file.read().rpartition(')')[2].split()[0] == 'Z'
+    except FileNotFoundError:
+        return True
+
+
+def wait_for_status(job_store, ticket_number, action, status, seconds=10):
+    for _ in range(seconds * 10):
+        process_obj = job_store.get_job(ticket_number)[action]
+        if process_obj['status'] == status:
+            return process_obj
+        time.sleep(0.1)
+    return job_store.get_job(ticket_number)[action]
+
+
+class TestJobSupervisor(SimpleTestCase):
+    def setUp(self):
+        self.ticket_number = 'test_job_supervisor'
+        self.action = 'resource_download'
+        self.database_directory = tempfile.mkdtemp()
+        self.job_store = SQLiteJobStore(os.path.join(self.database_directory, 'jobs.sqlite3'))
+        self.job_store.set_action(self.ticket_number, self.action,
+                                  {'status': 'in_progress', 'message': 'Job is starting...',
+                                   'status_code': None})
+
+        self.store_patch = patch(
+            'presqt.api_v1.utilities.multiprocess.job_supervisor.get_job_store',
+            return_value=self.job_store)
+        self.job_queue = SQLiteJobQueue(os.path.join(self.database_directory, 'jobs.sqlite3'),
+                                  max_running=1)
+        self.queue_patch = patch(
+            'presqt.api_v1.utilities.multiprocess.job_supervisor.get_job_queue',
+            return_value=self.job_queue)
+        self.store_patch.start()
+        self.queue_patch.start()
+        self.supervisor = JobSupervisor()
+
+    def tearDown(self):
+        self.store_patch.stop()
+        self.queue_patch.stop()
+        shutil.rmtree(self.database_directory)
+        shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number), ignore_errors=True)
+
+    def test_job_timeout(self):
+        """
+        A job that runs past its timeout should be terminated and marked as failed.
+        """
+        process = multiprocessing.Process(target=time.sleep, args=(30,))
+        process.start()
+        self.supervisor.supervise(process, self.ticket_number, self.action, timeout=0.5)
+
+        process_obj = wait_for_status(self.job_store, self.ticket_number, self.action, 'failed')
+        self.assertEqual(process_obj['status_code'], 504)
+        self.assertEqual(process_obj['message'], 'The process took too long on the server.')
+        process.join(5)
+        self.assertFalse(process.is_alive())
+
+    def test_job_crash(self):
+        """
+        A job whose process exits while the job is in progress should be marked as failed.
+        """
+        process = multiprocessing.Process(target=sys.exit, args=(1,))
+        process.start()
+        self.supervisor.supervise(process, self.ticket_number, self.action)
+
+        process_obj = wait_for_status(self.job_store, self.ticket_number, self.action, 'failed')
+        self.assertEqual(process_obj['status_code'], 500)
+        self.assertEqual(process_obj['message'], 'The process ended unexpectedly on the server.')
+
+    def test_finished_job_untouched(self):
+        """
+        A job that finished before its process exited should keep its status.
+        """
+        self.job_store.update_action(self.ticket_number, self.action,
+                                     {'status': 'finished', 'status_code': '200'})
+        process = multiprocessing.Process(target=sys.exit, args=(0,))
+        process.start()
+        self.supervisor.supervise(process, self.ticket_number, self.action)
+        process.join()
+        time.sleep(0.5)
+
+        process_obj = self.job_store.get_job(self.ticket_number)[self.action]
+        self.assertEqual(process_obj['status'], 'finished')
+
+    def test_payload_job(self):
+        """
+        A supervisor with room for payload jobs should rebuild and run jobs queued with a payload.
+        """
+        job = PayloadJob()
+        job.request = JobRequest('http://testserver/')
+        job.database_path = os.path.join(self.database_directory, 'jobs.sqlite3')
+        job.ticket_number = self.ticket_number
+        job.action = self.action
+        self.job_queue.enqueue(self.ticket_number, self.action, ['osf'], ['a'],
+                               build_job_payload(job, job.finish))
+
+        worker = JobSupervisor(max_jobs=1)
+        process_obj = wait_for_status(self.job_store, self.ticket_number, self.action, 'finished')
+        self.assertEqual(process_obj['status'], 'finished')
+        self.assertIsNotNone(process_obj['function_process_id'])
+        worker.stop()
+        worker.join()
+
+    def test_payload_tokens_encrypted(self):
+        """
+        The user's tokens should not be stored in the job queue, but should reach the job.
+        """
+        job = PayloadJob()
+        job.request = JobRequest('http://testserver/')
+        job.ticket_number = self.ticket_number
+        job.action = self.action
+        job.source_token = 'source-eggs-token'
+        job.destination_token = 'destination-ham-token'
+        self.job_queue.enqueue(self.ticket_number, self.action, ['osf'], ['a'],
+                               build_job_payload(job, job.record_tokens))
+
+        stored_payload = self.job_queue._database.connection().execute(
+            'SELECT payload FROM job_queue').fetchone()[0]
+        self.assertNotIn('source-eggs-token', stored_payload)
+        self.assertNotIn('destination-ham-token', stored_payload)
+
+        claimed = self.job_queue.claim('worker', 1)[0]
+        with patch.object(PayloadJob, 'record_tokens', autospec=True) as mock_record_tokens:
+            run_job_payload(claimed[0][1])
+        rebuilt_job = mock_record_tokens.call_args[0][0]
+        self.assertEqual(rebuilt_job.source_token, 'source-eggs-token')
+        self.assertEqual(rebuilt_job.destination_token, 'destination-ham-token')
+
+    def test_supervisor_election(self):
+        """
+        Only one server process of a host should run the job supervisor, and another should take
+        over once it exits.
+        """
+        lock_path = os.path.join(self.database_directory, 'job_supervisor.lock')
+        with override_settings(JOB_SUPERVISOR_LOCK_FILE=lock_path), \
+                patch.object(job_supervisor, 'JobSupervisor', ElectedSupervisor):
+            first_elected = multiprocessing.Event()
+            second_elected = multiprocessing.Event()
+            first = multiprocessing.Process(target=run_candidate, args=(first_elected,))
+            first.start()
+            self.assertTrue(first_elected.wait(5))
+
+            second = multiprocessing.Process(target=run_candidate, args=(second_elected,))
+            second.start()
+            self.assertFalse(second_elected.wait(1))
+
+            first.kill()
+            first.join()
+            self.assertTrue(second_elected.wait(5))
+            second.kill()
+            second.join()
+
+    def test_job_dies_with_supervisor(self):
+        """
+        A job should be killed when the supervisor that started it dies, rather than keep running
+        after its lease runs out and it's queued again.
+        """
+        job_pids = multiprocessing.Queue()
+        with patch.object(job_supervisor, 'run_job_payload', lambda payload: time.sleep(60)), \
+                patch.object(job_supervisor, 'SUPERVISOR_CHECK_INTERVAL', 0.1):
+            supervisor = multiprocessing.Process(target=run_dying_supervisor, args=(job_pids,))
+            supervisor.start()
+            job_pid = job_pids.get(timeout=5)
+
+        time.sleep(0.5)
+        self.assertFalse(process_gone(job_pid))
+        supervisor.kill()
+        supervisor.join()
+        for _ in range(50):
+            if process_gone(job_pid):
+                break
+            time.sleep(0.1)
+        self.assertTrue(process_gone(job_pid))
@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from presqt.api_v1.utilities.utils.transfer_pipeline import TransferPipeline
+from presqt.utilities import PresQTResponseException
+
+
+class FakeUploadStream(object):
+    """
+    Stands in for a target's upload stream. Uploads wait until they are released.
+    """
+    max_workers = 2
+
+    def __init__(self, fail_on=None):
+        self.action_metadata = {'destinationUsername': 'presqt'}
+        self.project_id = None
+        self.project_link = None
+        self.projects = []
+        self.folders = []
+        self.uploaded = []
+        self.fail_on = fail_on
+        self.release = threading.Event()
+
+    def create_project(self, title):
+        self.projects.append(title)
+        self.project_id = '1234'
+        self.project_link = 'https://example.com/1234'
+
+    def create_folder(self, path_in_project):
+        self.folders.append(path_in_project)
+        return False
+
+    def upload_file(self, file_path, path_in_project):
+        self.release.wait(10)
+        if path_in_project == self.fail_on:
+            raise PresQTResponseException('Upload failed', 400)
+        self.uploaded.append(path_in_project)
+        return {'actionRootPath': file_path,
+                'destinationPath': '/{}'.format(path_in_project),
+                'title': path_in_project.rpartition('/')[2],
+                'destinationHash': {'md5': 'hash_{}'.format(path_in_project), 'sha256': 'x'}}
+
+
+class TestTransferPipeline(SimpleTestCase):
+    def test_bounded_queue(self):
+        """
+        Downloaded files should be uploaded into one new project, and the download should be held
+        back once the queue is full until the upload catches up.
+        """
+        upload_stream = FakeUploadStream()
+        pipeline = TransferPipeline(upload_stream, 1)
+        paths = ['a.txt', 'folder/b.txt', 'folder/c.txt', 'd.txt']
+
+        def download():
+            for path in paths:
+                pipeline.put('/disk/{}'.format(path), '/Project/{}'.format(path))
+            pipeline.add_empty_container('/Project/empty/')
+
+        downloader = threading.Thread(target=download)
+        downloader.start()
+        time.sleep(0.2)
+        # Two files are being uploaded and one waits on the queue
+        self.assertTrue(downloader.is_alive())
+
+        upload_stream.release.set()
+        downloader.join(10)
+        func_dict = pipeline.finish('md5')
+
+        self.assertEqual(upload_stream.projects, ['Project'])
+        self.assertEqual(upload_stream.folders, ['empty'])
+        self.assertEqual(sorted(upload_stream.uploaded), sorted(paths))
+        self.assertEqual(func_dict['project_id'], '1234')
+        self.assertEqual(func_dict['resources_ignored'], [])
+        self.assertEqual(
+            sorted(metadata['destinationHash'] for metadata in func_dict['file_metadata_list']),
+            sorted('hash_{}'.format(path) for path in paths))
+
+    def test_put_from_event_loop(self):
+        """
+        Files put from a coroutine should be handed over without blocking the event loop while
+        the queue is full, and still be uploaded in full.
+        """
+        upload_stream = FakeUploadStream()
+        pipeline = TransferPipeline(upload_stream, 1)
+        paths = ['a.txt', 'b.txt', 'c.txt', 'd.txt', 'e.txt']
+
+        async def download():
+            for path in paths:
+                pipeline.put('/disk/{}'.format(path), '/Project/{}'.format(path))
+
+        loop = asyncio.new_event_loop()
+        started = time.monotonic()
+        loop.run_until_complete(download())
+        loop.close()
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(upload_stream.uploaded, [])
+
+        upload_stream.release.set()
+        pipeline.finish('md5')
+        self.assertEqual(sorted(upload_stream.uploaded), paths)
+
+    def test_errors(self):
+        """
+        Errors should be raised by finish() without holding back the download.
+        """
+        upload_stream = FakeUploadStream(fail_on='a.txt')
+        upload_stream.release.set()
+        pipeline = TransferPipeline(upload_stream, 1)
+        for path in ['a.txt', 'b.txt', 'c.txt']:
+            pipeline.put('/disk/{}'.format(path), '/Project/{}'.format(path))
+        with self.assertRaises(PresQTResponseException) as e:
+            pipeline.finish('md5')
+        self.assertEqual(e.exception.data, 'Upload failed')
+
+        pipeline = TransferPipeline(FakeUploadStream(), 1)
+        pipeline.put('/disk/file.txt', '/file.txt')
+        with self.assertRaises(PresQTResponseException) as e:
+            pipeline.finish('md5')
+        self.assertEqual(e.exception.status_code, 400)
@@ -20,9 +20,33 @@ class TestBagAndZipGET(SimpleTestCase):
         response = self.client.post(self.url, {'presqt-file': open(file, 'rb')})
         self.assertEquals(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         self.assertEqual(len(zip_file.namelist()), 11)
 
+    def test_range(self):
+        """
+        A Range of the zip file can be requested, since it's written to disk before it's sent.
+        """
+        file = 'presqt/api_v1/tests/resources/upload/bagless_zip.zip'
+        response = self.client.post(self.url, {'presqt-file': open(file, 'rb')},
+                                    HTTP_RANGE='bytes=0-3')
+        self.assertEquals(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'PK\x03\x04')
+
+    def test_stream(self):
+        """
+        A streamed zip file is sent whole, as Range requests aren't supported for it.
+        """
+        file = 'presqt/api_v1/tests/resources/upload/bagless_zip.zip'
+        response = self.client.post('{}?stream=true'.format(self.url),
+                                    {'presqt-file': open(file, 'rb')}, HTTP_RANGE='bytes=0-3')
+        self.assertEquals(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'none')
+
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(len(zip_file.namelist()), 11)
+        self.assertIsNone(zip_file.testzip())
+
     def test_not_a_zip(self):
         file = 'presqt/api_v1/tests/resources/upload/screenshot.png'
         response = self.client.post(self.url, {'presqt-file': open(file, 'rb')})
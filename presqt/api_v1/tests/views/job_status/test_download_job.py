@@ -9,9 +9,9 @@ from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
 from config.settings.base import OSF_TEST_USER_TOKEN
-from presqt.api_v1.utilities import hash_tokens
+from presqt.api_v1.utilities import hash_tokens, update_or_create_process_info
 from presqt.api_v1.utilities.fixity.download_fixity_checker import download_fixity_checker
-from presqt.utilities import write_file, read_file
+from presqt.utilities import read_file
 from presqt.targets.utilities import shared_call_get_resource_zip
 
 
@@ -45,7 +45,7 @@ class TestDownloadJobGET(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -110,7 +110,8 @@ class TestDownloadJobGET(SimpleTestCase):
         shared_call_get_resource_zip(self, self.resource_id)
 
         # Update the fixity_info.json to say the resource hasn't finished processing
-        write_file(self.process_info_path, self.initial_process_info, True)
+        update_or_create_process_info(self.initial_process_info['resource_download'], 'resource_download',
+                                      self.ticket_number)
 
         url = reverse('job_status', kwargs={'action': 'download'})
         response = self.client.get(url, **self.header)
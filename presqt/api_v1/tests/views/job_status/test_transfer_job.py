@@ -774,7 +774,7 @@ class TestTransferJobGET(SimpleTestCase):
                 self.status_code = status_code
         mock_req = MockResponse({'error': 'The server is down.'}, 500)
 
-        with patch('requests.put') as mock_request:
+        with patch('requests.Session.put') as mock_request:
             mock_request.return_value = mock_req
 
             github_id = "209373160:__pycache__"
@@ -804,7 +804,7 @@ class TestTransferJobGET(SimpleTestCase):
             # DELETE TICKET FOLDER
             shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number))
 
-        with patch('requests.patch') as mock_request:
+        with patch('requests.Session.patch') as mock_request:
             mock_request.return_value = mock_req
 
             github_id = "209373160:__pycache__"
@@ -9,8 +9,8 @@ from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
 from config.settings.base import OSF_UPLOAD_TEST_USER_TOKEN
-from presqt.api_v1.utilities import hash_tokens
-from presqt.utilities import read_file, write_file
+from presqt.api_v1.utilities import hash_tokens, update_or_create_process_info
+from presqt.utilities import read_file
 from presqt.targets.osf.utilities import delete_users_projects
 
 
@@ -160,7 +160,8 @@ class TestUploadJobGET(SimpleTestCase):
         self.call_upload_resources()
 
         # Update the fixity_info.json to say the resource hasn't finished processing
-        write_file(self.process_info_path, self.initial_process_info, True)
+        update_or_create_process_info(self.initial_process_info['resource_upload'], 'resource_upload',
+                                      self.ticket_number)
 
         url = reverse('job_status', kwargs={'action': 'upload'})
         response = self.client.get(url, **self.headers)
@@ -169,6 +169,20 @@ class TestResourcePOSTWithFile(SimpleTestCase):
         """
         delete_users_projects(self.token)
 
+    def assert_upload_job_failed(self, message):
+        """
+        Wait for the upload job to finish and check it failed with a 400 and the message given.
+        """
+        ticket_path = 'mediafiles/jobs/{}'.format(hash_tokens(self.token))
+        process_info = read_file('{}/process_info.json'.format(ticket_path), True)
+        process_wait(process_info, ticket_path)
+
+        process_info = read_file('{}/process_info.json'.format(ticket_path), True)
+        self.assertEqual(process_info['resource_upload']['status'], 'failed')
+        self.assertEqual(process_info['resource_upload']['status_code'], 400)
+        self.assertEqual(process_info['resource_upload']['message'], message)
+        shutil.rmtree(ticket_path)
+
     def test_success_202_upload_fixity_failed(self):
         """
         Get a 202 if POST succeeds but with fixity errors.
@@ -316,41 +330,45 @@ class TestResourcePOSTWithFile(SimpleTestCase):
 
     def test_error_400_bagit_manifest_error(self):
         """
-        Return a 400 if the POST fails because the BagIt manifest doesn't match the bag provided because the manifest hashes don't match the current files' hashes.
+        The upload job fails with a 400 because the BagIt manifest doesn't match the bag provided because the manifest hashes don't match the current files' hashes.
         """
         url = reverse('resource', kwargs={'target_name': 'osf',
                                           'resource_id': '5cd9895b840cae001a708c31'})
         response = self.client.post(
             url, {'presqt-file': open('presqt/api_v1/tests/resources/upload/BadBagItManifest.zip', 'rb')}, **self.headers)
-        # Verify the error status code and message
-        self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.data, {'error': "PresQT Error: Checksums failed to validate."})
+        self.assertEqual(response.status_code, 202)
+
+        # The bag is validated by the upload job. Verify the error status code and message.
+        self.assert_upload_job_failed(
+            "PresQT Error: Checksums failed to validate.")
 
     def test_error_400_bagit_missing_file(self):
         """
-        Return a 400 if the POST fails because the BagIt manifest doesn't match the bag provided because a file is missing in the data.
+        The upload job fails with a 400 because the BagIt manifest doesn't match the bag provided because a file is missing in the data.
         """
         url = reverse('resource', kwargs={'target_name': 'osf',
                                           'resource_id': '5cd9895b840cae001a708c31'})
         response = self.client.post(
             url, {'presqt-file': open('presqt/api_v1/tests/resources/upload/BadBagItMissingFile.zip', 'rb')}, **self.headers)
-        # Verify the error status code and message
-        self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.data, {
-                         'error': "PresQT Error: Payload-Oxum validation failed. Expected 2 files and 283274 bytes but found 1 files and 87111 bytes"})
+        self.assertEqual(response.status_code, 202)
+
+        # The bag is validated by the upload job. Verify the error status code and message.
+        self.assert_upload_job_failed(
+            "PresQT Error: Payload-Oxum validation failed. Expected 2 files and 283274 bytes but found 1 files and 87111 bytes")
 
     def test_error_400_bagit_unknown_file(self):
         """
-        Return a 400 if the POST fails because the BagIt manifest doesn't match the bag provided because there's an unexpected file in the data.
+        The upload job fails with a 400 because the BagIt manifest doesn't match the bag provided because there's an unexpected file in the data.
         """
         url = reverse('resource', kwargs={'target_name': 'osf',
                                           'resource_id': '5cd9895b840cae001a708c31'})
         response = self.client.post(
             url, {'presqt-file': open('presqt/api_v1/tests/resources/upload/BadBagItUnknownFile.zip', 'rb')}, **self.headers)
-        # Verify the error status code and message
-        self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.data, {
-                         'error': "PresQT Error: data/fixity_info.json exists in manifest but was not found on filesystem"})
+        self.assertEqual(response.status_code, 202)
+
+        # The bag is validated by the upload job. Verify the error status code and message.
+        self.assert_upload_job_failed(
+            "PresQT Error: data/fixity_info.json exists in manifest but was not found on filesystem")
 
 
 class TestResourcePOSTWithBody(SimpleTestCase):
@@ -0,0 +1,163 @@
+import base64
+import hashlib
+import os
+import shutil
+
+from django.test import SimpleTestCase
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from config.settings.base import OSF_UPLOAD_TEST_USER_TOKEN
+from presqt.api_v1.utilities import hash_tokens
+from presqt.targets.utilities import process_wait
+from presqt.utilities import chunk_lock, get_job_store, read_file
+
+
+class TestUploadSession(SimpleTestCase):
+    """
+    Test the `api_v1/targets/{target_name}/upload_sessions/` and
+    `api_v1/upload_sessions/{session_id}/` endpoints.
+
+    Testing only PresQT Core code.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.token = OSF_UPLOAD_TEST_USER_TOKEN
+        self.headers = {'HTTP_PRESQT_DESTINATION_TOKEN': self.token,
+                        'HTTP_PRESQT_FILE_DUPLICATE_ACTION': 'ignore',
+                        'HTTP_PRESQT_EMAIL_OPT_IN': ''}
+        self.ticket_path = 'mediafiles/jobs/{}'.format(hash_tokens(self.token))
+        with open('presqt/api_v1/tests/resources/upload/BadBagItManifest.zip', 'rb') as file:
+            self.contents = file.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.ticket_path, ignore_errors=True)
+
+    def create_session(self, upload_length):
+        response = self.client.post(
+            reverse('upload_session_collection', kwargs={'target_name': 'osf'}),
+            HTTP_UPLOAD_LENGTH=str(upload_length), **self.headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Upload-Offset'], '0')
+        return reverse('upload_session', kwargs={'session_id': response.data['session_id']})
+
+    def patch_chunk(self, url, offset, chunk, digest=None):
+        if digest is None:
+            digest = base64.b64encode(hashlib.sha256(chunk).digest()).decode()
+        return self.client.generic(
+            'PATCH', url, chunk, 'application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset), HTTP_UPLOAD_CHECKSUM='sha256 {}'.format(digest),
+            **self.headers)
+
+    def test_upload_in_chunks(self):
+        """
+        Chunks sent in order should be written to the upload's zip file, and finishing the
+        session should start the upload job, which validates the bag.
+        """
+        url = self.create_session(len(self.contents))
+        middle = len(self.contents) // 2
+
+        # The upload can't start until the whole file has been received
+        response = self.patch_chunk(url, 0, self.contents[:middle])
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response['Upload-Offset'], str(middle))
+        self.assertEqual(self.client.post(url, **self.headers).status_code, 409)
+
+        response = self.client.head(url, **self.headers)
+        self.assertEqual(response['Upload-Offset'], str(middle))
+        self.assertEqual(response['Upload-Length'], str(len(self.contents)))
+
+        response = self.patch_chunk(url, middle, self.contents[middle:])
+        self.assertEqual(response.status_code, 204)
+        with open('{}/upload/upload.zip'.format(self.ticket_path), 'rb') as file:
+            self.assertEqual(file.read(), self.contents)
+
+        response = self.client.post(url, **self.headers)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self.client.head(url, **self.headers).status_code, 404)
+
+        process_info = read_file('{}/process_info.json'.format(self.ticket_path), True)
+        process_wait(process_info, self.ticket_path)
+        process_info = read_file('{}/process_info.json'.format(self.ticket_path), True)
+        self.assertEqual(process_info['resource_upload']['status'], 'failed')
+        self.assertEqual(process_info['resource_upload']['message'],
+                         'PresQT Error: Checksums failed to validate.')
+
+    def test_bad_chunks(self):
+        """
+        Chunks at the wrong offset or that don't match their checksum should be refused without
+        moving the session's offset.
+        """
+        url = self.create_session(len(self.contents))
+
+        response = self.patch_chunk(url, 100, self.contents[100:200])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['error'],
+                         "PresQT Error: 'Upload-Offset' is 100 but the session is at 0.")
+
+        digest = base64.b64encode(hashlib.sha256(b'other').digest()).decode()
+        response = self.patch_chunk(url, 0, self.contents[:100], digest)
+        self.assertEqual(response.status_code, 460)
+        self.assertEqual(self.client.head(url, **self.headers)['Upload-Offset'], '0')
+
+        response = self.patch_chunk(url, 0, self.contents + b'extra')
+        self.assertEqual(response.status_code, 413)
+
+        response = self.client.delete(url, **self.headers)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.patch_chunk(url, 0, self.contents).status_code, 404)
+
+    def test_409_upload_in_progress(self):
+        """
+        A session shouldn't be opened, or started, while the user's upload job is running, as
+        opening one empties the upload directory the job is reading.
+        """
+        url = self.create_session(len(self.contents))
+        self.assertEqual(self.patch_chunk(url, 0, self.contents).status_code, 204)
+        ticket_number = hash_tokens(self.token)
+        get_job_store().set_action(ticket_number, 'resource_upload', {'status': 'in_progress'})
+
+        response = self.client.post(
+            reverse('upload_session_collection', kwargs={'target_name': 'osf'}),
+            HTTP_UPLOAD_LENGTH='100', **self.headers)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['error'],
+                         "PresQT Error: An upload is already in progress. Wait for it to finish "
+                         "or cancel it before starting another.")
+        self.assertEqual(self.client.post(url, **self.headers).status_code, 409)
+        with open('{}/upload/upload.zip'.format(self.ticket_path), 'rb') as file:
+            self.assertEqual(file.read(), self.contents)
+
+        get_job_store().delete_job(ticket_number)
+
+    def test_409_chunk_being_written(self):
+        """
+        A session shouldn't be opened, or deleted, while a chunk of the open session is being
+        written, as doing so removes the file the chunk is written to.
+        """
+        url = self.create_session(len(self.contents))
+        upload_zip_path = '{}/upload/upload.zip'.format(self.ticket_path)
+
+        with chunk_lock(upload_zip_path):
+            response = self.client.post(
+                reverse('upload_session_collection', kwargs={'target_name': 'osf'}),
+                HTTP_UPLOAD_LENGTH='100', **self.headers)
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.data['error'],
+                             "PresQT Error: Another chunk of the file is being written.")
+            self.assertEqual(self.client.delete(url, **self.headers).status_code, 409)
+            self.assertTrue(os.path.isfile(upload_zip_path))
+
+        self.assertEqual(self.client.head(url, **self.headers).status_code, 200)
+        self.assertEqual(self.client.delete(url, **self.headers).status_code, 204)
+
+    def test_400_missing_upload_length(self):
+        """
+        Return a 400 if a session is opened without an Upload-Length header.
+        """
+        response = self.client.post(
+            reverse('upload_session_collection', kwargs={'target_name': 'osf'}), **self.headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'],
+                         "PresQT Error: 'Upload-Length' missing in the request headers.")
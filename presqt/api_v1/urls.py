@@ -14,6 +14,8 @@ from presqt.api_v1.views.service.eaasi.proposal import Proposals, Proposal
 from presqt.api_v1.views.target.target import TargetCollection, Target
 from presqt.api_v1.views.service.service import ServiceCollection, Service
 from presqt.api_v1.views.service.eaasi.download import EaasiDownload
+from presqt.api_v1.views.upload_session.upload_session import (UploadSessionCollection,
+                                                              UploadSession)
 
 api_v1_endpoints = [
     path('', api_root, name='api_root'),
@@ -35,6 +37,13 @@ api_v1_endpoints = [
     path('targets/<str:target_name>/resources/<str:resource_id>/keywords/',
          ResourceKeywords.as_view(), name="keywords"),
 
+    # Resumable Upload Sessions
+    path('targets/<str:target_name>/upload_sessions/',
+         UploadSessionCollection.as_view(), name="upload_session_collection"),
+    path('targets/<str:target_name>/resources/<str:resource_id>/upload_sessions/',
+         UploadSessionCollection.as_view(), name="upload_session_collection"),
+    path('upload_sessions/<str:session_id>/', UploadSession.as_view(), name="upload_session"),
+
     # Services
     path('services/', ServiceCollection.as_view(), name='service_collection'),
     path('services/<str:service_name>/', Service.as_view(), name='service'),
@@ -20,6 +20,9 @@ from presqt.api_v1.utilities.validation.get_process_info_data import get_process
 from presqt.api_v1.utilities.validation.token_validation import (get_source_token,
                                                                  get_destination_token)
 from presqt.api_v1.utilities.validation.email_validation import get_user_email_opt
+from presqt.api_v1.utilities.validation.upload_session_validation import (
+    get_upload_length, get_upload_offset, get_upload_checksum, get_upload_session,
+    upload_job_validation)
 from presqt.api_v1.utilities.validation.transfer_post_body_validation import \
     transfer_post_body_validation
 from presqt.api_v1.utilities.utils.hash_tokens import hash_tokens
@@ -35,6 +38,7 @@ from presqt.api_v1.utilities.validation.get_keyword_support import get_keyword_s
 from presqt.api_v1.utilities.utils.page_links import page_links
 from presqt.api_v1.utilities.utils.update_or_create_process_info import update_or_create_process_info
 from presqt.api_v1.utilities.utils.calculate_job_percentage import calculate_job_percentage
+from presqt.api_v1.utilities.utils.deliver_file import deliver_file
 from presqt.api_v1.utilities.validation.get_process_info_action import get_process_info_action
 from presqt.api_v1.utilities.validation.keyword_post_validation import keyword_post_validation
 from presqt.api_v1.utilities.keyword_enhancement.fetch_ontologies import fetch_ontologies
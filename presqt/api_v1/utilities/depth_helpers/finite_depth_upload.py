@@ -4,8 +4,10 @@ from uuid import uuid4
 
 from django.utils import timezone
 
-from presqt.api_v1.utilities import create_fts_metadata, get_target_data, hash_generator
-from presqt.utilities import zip_directory, write_file, read_file
+from presqt.api_v1.utilities import create_fts_metadata, get_target_data
+from presqt.api_v1.utilities.fixity.bag_manifests import update_bag_manifests
+from presqt.api_v1.utilities.fixity.hash_generator import file_hash_generator
+from presqt.utilities import zip_directory, write_file, CompressionPolicy
 
 
 def finite_depth_upload_helper(instance):
@@ -45,7 +47,8 @@ def finite_depth_upload_helper(instance):
     # Zip the file and store it in the created `zip_format/<title>` directory
     zip_directory(instance.resource_main_dir,
                   '{}/{}'.format(project_zip_path, zip_title),
-                  instance.resource_main_dir)
+                  instance.resource_main_dir,
+                  CompressionPolicy.for_endpoint('finite_depth_upload'))
 
     # Since the metadata belonging with the files gets written inside of the zip,
     # Reset the metadata to associate with the zip file actually being uploaded
@@ -59,8 +62,8 @@ def finite_depth_upload_helper(instance):
     else:  # pragma: no cover
         instance.hash_algorithm = 'md5'
 
-    zip_file = read_file('{}/{}'.format(project_zip_path, zip_title))
-    zip_hash = hash_generator(zip_file, instance.hash_algorithm)
+    zip_hash = file_hash_generator('{}/{}'.format(project_zip_path, zip_title),
+                                   instance.hash_algorithm)
     instance.file_hashes = {'{}/{}'.format(project_zip_path, zip_title): zip_hash}
 
     instance.source_fts_metadata_actions = []
@@ -116,8 +119,8 @@ def update_bagit_with_metadata(instance, zip_title):
                                                   instance.action_metadata,
                                                   instance.source_fts_metadata_actions,
                                                   instance.extra_metadata)
-    write_file(os.path.join(instance.data_directory, 'PRESQT_FTS_METADATA.json'),
-               final_fts_metadata_data, True)
+    metadata_path = os.path.join(instance.data_directory, 'PRESQT_FTS_METADATA.json')
+    write_file(metadata_path, final_fts_metadata_data, True)
 
-    # Update the bag
-    instance.bag.save(manifests=True)
\ No newline at end of file
+    # Update the bag. Only the metadata file needs to be hashed for the new manifests.
+    instance.bag = update_bag_manifests(instance.bag, [metadata_path])
\ No newline at end of file
@@ -0,0 +1,214 @@
+import os
+import re
+from datetime import date
+
+import bagit
+
+from presqt.utilities import BAG_CHECKSUMS, file_multi_hash_generator, multi_hash_generator
+
+
+def make_bag_from_digests(bag_dir, file_digests, checksums=BAG_CHECKSUMS, move_payload=True):
+    """
+    Convert a directory into a BagIt 'bag' using digests that have already been calculated for its
+    files instead of reading every file again for each checksum. Any payload file without cached
+    digests is read once to calculate all of them.
+
+    Parameters
+    ----------
+    bag_dir: str
+        Path to the directory to bag
+    file_digests: dict
+        Dictionary of file paths relative to bag_dir (key) and their digests (value)
+    checksums: list
+        Hash algorithms to write manifests for
+    move_payload: bool
+        Whether the payload has to be moved into the data directory. Pass False if the files were
+        already written to bag_dir/data.
+
+    Returns
+    -------
+    The bagit.Bag that was created.
+    """
+    data_directory = os.path.join(bag_dir, 'data')
+    if move_payload:
+        # Move the payload into the data directory the same way bagit.make_bag does
+        payload = os.listdir(bag_dir)
+        os.mkdir(data_directory)
+        for payload_item in payload:
+            os.rename(os.path.join(bag_dir, payload_item),
+                      os.path.join(data_directory, payload_item))
+    else:
+        os.makedirs(data_directory, exist_ok=True)
+
+    cached_digests = {
+        'data/{}'.format(path.lstrip('/')): digests for path, digests in file_digests.items()}
+    total_bytes, total_files = _write_manifests(bag_dir, checksums, cached_digests)
+
+    with open(os.path.join(bag_dir, 'bagit.txt'), 'w', encoding='utf-8') as bagit_file:
+        bagit_file.write('BagIt-Version: 0.97\nTag-File-Character-Encoding: UTF-8\n')
+
+    _write_tag_file(os.path.join(bag_dir, 'bag-info.txt'), {
+        'Bagging-Date': date.strftime(date.today(), '%Y-%m-%d'),
+        'Bag-Software-Agent': 'bagit.py v{} <{}>'.format(bagit.VERSION, bagit.PROJECT_URL),
+        'Payload-Oxum': '{}.{}'.format(total_bytes, total_files)
+    })
+    _write_tagmanifests(bag_dir, checksums)
+
+    return bagit.Bag(bag_dir)
+
+
+def make_bag_tag_files(file_digests, total_bytes, checksums=BAG_CHECKSUMS):
+    """
+    Build the tag files of a BagIt 'bag' from the digests of its payload files, for bags that are
+    written straight into a zip file rather than to a directory on disk.
+
+    Parameters
+    ----------
+    file_digests: dict
+        Dictionary of payload file paths relative to the data directory (key) and their digests
+        (value)
+    total_bytes: int
+        Total size of the payload files
+    checksums: list
+        Hash algorithms to write manifests for
+
+    Returns
+    -------
+    List of tuples of each tag file's path relative to the bag and its contents.
+    """
+    tag_files = []
+    for checksum in checksums:
+        manifest_lines = ['{}  {}\n'.format(digests[checksum],
+                                            _encode_filename('data/{}'.format(path.lstrip('/'))))
+                          for path, digests in sorted(file_digests.items())]
+        tag_files.append(('manifest-{}.txt'.format(checksum), ''.join(manifest_lines)))
+    tag_files.append(('bagit.txt', 'BagIt-Version: 0.97\nTag-File-Character-Encoding: UTF-8\n'))
+    tag_files.append(('bag-info.txt', _tag_file_contents({
+        'Bagging-Date': date.strftime(date.today(), '%Y-%m-%d'),
+        'Bag-Software-Agent': 'bagit.py v{} <{}>'.format(bagit.VERSION, bagit.PROJECT_URL),
+        'Payload-Oxum': '{}.{}'.format(total_bytes, len(file_digests))
+    })))
+    tag_files = [(path, contents.encode('utf-8')) for path, contents in tag_files]
+
+    tag_file_digests = [(path, multi_hash_generator(contents, checksums))
+                        for path, contents in tag_files]
+    for checksum in checksums:
+        tag_files.append(('tagmanifest-{}.txt'.format(checksum), ''.join(
+            '{} {}\n'.format(digests[checksum], path)
+            for path, digests in tag_file_digests).encode('utf-8')))
+
+    return tag_files
+
+
+def update_bag_manifests(bag, changed_paths=()):
+    """
+    Rewrite the manifests of a bag after files have been added, renamed, removed or changed.
+    Unlike bag.save(manifests=True), only the files that aren't already in the manifests or are
+    listed in changed_paths are read.
+
+    Parameters
+    ----------
+    bag: bagit.Bag
+        The bag whose payload was modified. Its manifests must match the files left untouched.
+    changed_paths: list
+        Paths of payload files whose contents changed in place
+
+    Returns
+    -------
+    The reloaded bagit.Bag.
+    """
+    changed_paths = [os.path.relpath(path, bag.path) for path in changed_paths]
+    cached_digests = {path: digests for path, digests in bag.entries.items()
+                      if path.startswith('data/') and path not in changed_paths}
+
+    total_bytes, total_files = _write_manifests(bag.path, bag.algorithms, cached_digests)
+
+    bag.info['Payload-Oxum'] = '{}.{}'.format(total_bytes, total_files)
+    _write_tag_file(os.path.join(bag.path, bag.tag_file_name), bag.info)
+    _write_tagmanifests(bag.path, bag.algorithms)
+
+    return bagit.Bag(bag.path)
+
+
+def _write_manifests(bag_dir, checksums, cached_digests):
+    """
+    Write a manifest for each checksum covering every file in the bag's data directory.
+    Returns the total bytes and number of files in the payload.
+    """
+    manifest_lines = {checksum: [] for checksum in checksums}
+    total_bytes = 0
+    total_files = 0
+
+    for root, folders, files in os.walk(os.path.join(bag_dir, 'data')):
+        folders.sort()
+        for file in sorted(files):
+            file_path = os.path.join(root, file)
+            relative_path = os.path.relpath(file_path, bag_dir)
+
+            digests = cached_digests.get(relative_path, {})
+            if not all(checksum in digests for checksum in checksums):
+                digests = file_multi_hash_generator(file_path, checksums)
+
+            for checksum in checksums:
+                manifest_lines[checksum].append('{}  {}\n'.format(
+                    digests[checksum], _encode_filename(relative_path)))
+            total_bytes += os.path.getsize(file_path)
+            total_files += 1
+
+    for checksum, lines in manifest_lines.items():
+        manifest_path = os.path.join(bag_dir, 'manifest-{}.txt'.format(checksum))
+        with open(manifest_path, 'w', encoding='utf-8') as manifest:
+            manifest.writelines(lines)
+
+    return total_bytes, total_files
+
+
+def _write_tagmanifests(bag_dir, checksums):
+    """
+    Write a tag manifest for each checksum, reading each tag file only once.
+    """
+    tag_file_digests = []
+    for root, folders, files in os.walk(bag_dir):
+        if root == bag_dir and 'data' in folders:
+            folders.remove('data')
+        for file in files:
+            relative_path = os.path.relpath(os.path.join(root, file), bag_dir)
+            if re.match(r'^tagmanifest-.+\.txt$', relative_path):
+                continue
+            tag_file_digests.append((
+                relative_path, file_multi_hash_generator(os.path.join(root, file), checksums)))
+
+    for checksum in checksums:
+        tagmanifest_path = os.path.join(bag_dir, 'tagmanifest-{}.txt'.format(checksum))
+        with open(tagmanifest_path, 'w', encoding='utf-8') as tagmanifest:
+            for relative_path, digests in tag_file_digests:
+                tagmanifest.write('{} {}\n'.format(digests[checksum], relative_path))
+
+
+def _write_tag_file(tag_file_path, tags):
+    """
+    Write a bag-info style tag file with one line per tag value.
+    """
+    with open(tag_file_path, 'w', encoding='utf-8') as tag_file:
+        tag_file.write(_tag_file_contents(tags))
+
+
+def _tag_file_contents(tags):
+    """
+    Format tags the way they are written to a bag-info style tag file.
+    """
+    lines = []
+    for tag in sorted(tags.keys()):
+        values = tags[tag]
+        if not isinstance(values, list):
+            values = [values]
+        for value in values:
+            lines.append('{}: {}\n'.format(tag, re.sub(r'\n|\r', '', str(value))))
+    return ''.join(lines)
+
+
+def _encode_filename(filename):
+    """
+    Percent encode line breaks in a filename so it fits on a single manifest line.
+    """
+    return filename.replace('\r', '%0D').replace('\n', '%0A')
@@ -1,16 +1,21 @@
 import hashlib
 
-from presqt.api_v1.utilities.fixity.hash_generator import hash_generator
+from presqt.api_v1.utilities.fixity.hash_generator import hash_generator, file_hash_generator
 
-def download_fixity_checker(resource_dict):
+
+def download_fixity_checker(resource_dict, file_digests=None):
     """
-    Take a file in binary format and a dictionary of hashes and run a fixity check against the first
-    one found that's supported by hashlib.
+    Take a file, either in binary format or as the path to a spooled file, and a dictionary of
+    hashes and run a fixity check against the first one found that's supported by hashlib or
+    that was calculated while the file was downloaded.
 
     Parameters
     ----------
     resource_dict: dict
-        Dictionary that contains binary_file, hashes, title, and path
+        Dictionary that contains file, hashes, title, and path
+    file_digests: dict
+        Digests already calculated for the file, keyed by hash algorithm. The file is only read
+        if the digest needed for the check isn't in here.
 
     Returns
     -------
@@ -28,11 +33,13 @@ def download_fixity_checker(resource_dict):
     fixity_match = True
 
     for hash_algorithm, hash_value in resource_dict['hashes'].items():
-        # If the current hash_value is not None and the hash algorithm is supported by hashlib
-        # then this is the hash we will run our fixity checker against.
-        if hash_value and hash_algorithm in hashlib.algorithms_available:
+        # If the current hash_value is not None and the hash algorithm is supported by hashlib,
+        # or the file's digest with it is already known, then this is the hash we will run our
+        # fixity checker against.
+        if hash_value and (hash_algorithm in hashlib.algorithms_available
+                           or (file_digests and hash_algorithm in file_digests)):
             # Run the file through the hash algorithm
-            hash_hex = hash_generator(resource_dict['file'], hash_algorithm)
+            hash_hex = _generate_hash(resource_dict['file'], hash_algorithm, file_digests)
 
             fixity_obj['hash_algorithm'] = hash_algorithm
             fixity_obj['presqt_hash'] = hash_hex
@@ -52,8 +59,7 @@ def download_fixity_checker(resource_dict):
         # If either there is no matching algorithms in hashlib or the provided hashes
         # don't have values then we assume fixity has remained and we calculate a new hash
         # using md5 to give to the user.
-        h = hashlib.md5(resource_dict['file'])
-        hash_hex = h.hexdigest()
+        hash_hex = _generate_hash(resource_dict['file'], 'md5', file_digests)
         fixity_obj['hash_algorithm'] = 'md5'
         fixity_obj['presqt_hash'] = hash_hex
         fixity_obj['fixity_details'] = (
@@ -61,3 +67,15 @@ def download_fixity_checker(resource_dict):
         fixity_match = False
 
     return fixity_obj, fixity_match
+
+
+def _generate_hash(file, hash_algorithm, file_digests):
+    """
+    Hash the file whether it's been given to us as bytes or as the path to a spooled file, unless
+    the digest has already been calculated.
+    """
+    if file_digests and hash_algorithm in file_digests:
+        return file_digests[hash_algorithm]
+    if isinstance(file, bytes):
+        return hash_generator(file, hash_algorithm)
+    return file_hash_generator(file, hash_algorithm)
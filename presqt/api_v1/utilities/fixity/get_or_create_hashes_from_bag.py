@@ -1,6 +1,5 @@
-from presqt.api_v1.utilities.fixity.hash_generator import hash_generator
+from presqt.api_v1.utilities.fixity.hash_generator import file_hash_generator
 from presqt.api_v1.utilities.utils.get_target_data import get_target_data
-from presqt.utilities import read_file
 
 
 def get_or_create_hashes_from_bag(self):
@@ -44,7 +43,6 @@ def get_or_create_hashes_from_bag(self):
             hash_algorithm = 'md5'
         for key, value in self.bag.payload_entries().items():
             file_path = '{}/{}'.format(self.resource_main_dir, key)
-            binary_file = read_file(file_path)
-            file_hashes[file_path] = hash_generator(binary_file, hash_algorithm)
+            file_hashes[file_path] = file_hash_generator(file_path, hash_algorithm)
 
     return file_hashes, hash_algorithm
@@ -18,4 +18,29 @@ def hash_generator(file, hash_algorithm):
     """
     h = hashlib.new(hash_algorithm)
     h.update(file)
-    return h.hexdigest()
\ No newline at end of file
+    return h.hexdigest()
+
+
+def file_hash_generator(file_path, hash_algorithm, chunk_size=1024 * 1024):
+    """
+    Generate a hash for a file on disk based on a given hash algorithm. The file is read in chunks
+    so it never has to be held in memory all at once.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file to be ran through the hash algorithm
+    hash_algorithm : str
+        Hash algorithm to use
+    chunk_size : int
+        Number of bytes to read from the file at a time
+
+    Returns
+    -------
+    String of the file hash generated by the given hash algorithm.
+    """
+    h = hashlib.new(hash_algorithm)
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
@@ -1,6 +1,7 @@
 import json
 
 from presqt.json_schemas.schema_handlers import schema_validator
+from presqt.utilities import read_file
 
 
 def create_download_metadata(instance, resource, fixity_obj):
@@ -49,7 +50,23 @@ def create_download_metadata(instance, resource, fixity_obj):
 
 
 def validate_metadata(instance, resource):
-    source_fts_metadata_content = json.loads(resource['file'].decode())
+    """
+    Validate a PRESQT_FTS_METADATA.json file found in the resource being downloaded. If it's valid
+    then gather its actions and keywords.
+
+    Parameters
+    ----------
+    instance: BaseResource Class Instance
+        Class instance we save metadata to.
+    resource: Dict
+        Resource dictionary of the metadata file. 'file' is the path to the spooled file.
+
+    Returns
+    -------
+    True if the resource is a valid FTS metadata file.
+    False if the resource is not a valid FTS metadata file.
+    """
+    source_fts_metadata_content = json.loads(read_file(resource['file']).decode())
     # If the metadata is valid then grab it's contents and don't save it
     if schema_validator('presqt/json_schemas/metadata_schema.json', source_fts_metadata_content) is True:
         instance.source_fts_metadata_actions = instance.source_fts_metadata_actions + \
@@ -3,6 +3,7 @@ from json.decoder import JSONDecodeError
 
 from rest_framework import status
 
+from presqt.api_v1.utilities.fixity.bag_manifests import update_bag_manifests
 from presqt.json_schemas.schema_handlers import schema_validator
 from presqt.utilities import get_dictionary_from_list, PresQTError, read_file, PresQTValidationError
 
@@ -41,13 +42,13 @@ def get_upload_source_metadata(instance, bag):
                 if 'extra_metadata' in source_metadata_content.keys():
                     instance.extra_metadata = source_metadata_content['extra_metadata']
                 os.remove(os.path.join(instance.resource_main_dir, bag_file))
-                bag.save(manifests=True)
+                instance.bag = update_bag_manifests(instance.bag)
             # If the FTS metadata is invalid then rename the file in the bag.
             else:
                 invalid_metadata_path = os.path.join(os.path.split(metadata_path)[0],
                                                      'INVALID_PRESQT_FTS_METADATA.json')
                 os.rename(metadata_path, invalid_metadata_path)
-                bag.save(manifests=True)
+                instance.bag = update_bag_manifests(instance.bag)
 
 
 def create_upload_metadata(instance, file_metadata_list, action_metadata, project_id,
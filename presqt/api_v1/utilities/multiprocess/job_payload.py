@@ -0,0 +1,125 @@
+import base64
+import hashlib
+import json
+import multiprocessing
+from urllib.parse import urljoin
+
+import bagit
+from cryptography.fernet import Fernet
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Attributes of a resource view that only make sense in the request that created the job
+JOB_PAYLOAD_EXCLUDED = ['request', 'args', 'kwargs', 'headers', 'format_kwarg', 'response',
+                        'function_process', 'bag', 'transfer_checkpoint',
+                        'transfer_pipeline', 'download_zip']
+# Attributes of a resource view holding the user's target tokens. The job queue keeps payloads
+# on disk so these are encrypted rather than stored with the rest of the attributes.
+JOB_PAYLOAD_SECRETS = ['source_token', 'destination_token']
+
+
+class JobRequest(object):
+    """
+    Stands in for the request that created a job when the job runs somewhere else. Job methods
+    only use the request to build absolute links back to the server.
+    """
+
+    def __init__(self, root_uri):
+        self.root_uri = root_uri
+
+    def build_absolute_uri(self, location='/'):
+        return urljoin(self.root_uri, location)
+
+
+def get_payload_cipher():
+    """
+    Get the cipher the secrets of job payloads are encrypted with. Its key is JOB_PAYLOAD_KEY,
+    or one derived from SECRET_KEY if that isn't set, so job workers need the same settings as
+    the server that queued the jobs.
+
+    Returns
+    -------
+    A Fernet instance.
+    """
+    key = getattr(settings, 'JOB_PAYLOAD_KEY', None)
+    if not key:
+        key = base64.urlsafe_b64encode(hashlib.sha256(
+            'presqt.job_payload:{}'.format(settings.SECRET_KEY).encode()).digest())
+    return Fernet(key)
+
+
+def get_job_attributes(instance, excluded=()):
+    """
+    Get the attributes of a resource view that a job needs to run away from the request that
+    created it.
+
+    Parameters
+    ----------
+    instance: BaseResource
+        The view the job was created by
+    excluded: list
+        Names of further attributes to leave out
+
+    Returns
+    -------
+    A dictionary of the view's attributes by name.
+    """
+    # Private attributes, like the content negotiator, are left by Django REST Framework
+    return {name: value for name, value in vars(instance).items()
+            if name not in JOB_PAYLOAD_EXCLUDED and name not in excluded
+            and not name.startswith('_')}
+
+
+def build_job_payload(instance, method_to_call):
+    """
+    Serialize a resource view and the job method to call on it so any job worker can run the
+    job without inheriting the view from the request process.
+
+    Parameters
+    ----------
+    instance: BaseResource
+        The view the job was created by
+    method_to_call: class method
+        The job method of the view to run
+
+    Returns
+    -------
+    A JSON serializable dictionary of the view's class, the method's name, the view's
+    attributes and its encrypted secrets. Raises TypeError if an attribute can't be serialized.
+    """
+    secrets = {name: value for name, value in vars(instance).items()
+               if name in JOB_PAYLOAD_SECRETS}
+    payload = {
+        'class': '{}.{}'.format(type(instance).__module__, type(instance).__qualname__),
+        'method': method_to_call.__name__,
+        'attributes': get_job_attributes(instance, JOB_PAYLOAD_SECRETS),
+        'secrets': get_payload_cipher().encrypt(json.dumps(secrets).encode()).decode(),
+        'root_uri': instance.request.build_absolute_uri('/'),
+        'bag_path': instance.bag.path if getattr(instance, 'bag', None) else None
+    }
+    # Fail now rather than when a worker picks the job up
+    json.dumps(payload)
+    return payload
+
+
+def run_job_payload(payload):
+    """
+    Rebuild the view of a job from its payload and run the job method on it. This is the target
+    of the processes job workers start.
+
+    Parameters
+    ----------
+    payload: dict
+        Payload built by build_job_payload
+    """
+    instance = import_string(payload['class'])()
+    instance.__dict__.update(payload['attributes'])
+    instance.__dict__.update(
+        json.loads(get_payload_cipher().decrypt(payload['secrets'].encode()).decode()))
+    instance.request = JobRequest(payload['root_uri'])
+    if payload['bag_path']:
+        instance.bag = bagit.Bag(payload['bag_path'])
+    # Job methods record the id of the process they run in
+    instance.function_process = multiprocessing.current_process()
+
+    getattr(instance, payload['method'])()
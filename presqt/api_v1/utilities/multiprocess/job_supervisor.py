@@ -0,0 +1,359 @@
+import fcntl
+import heapq
+import itertools
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from multiprocessing import Pipe
+from multiprocessing.connection import wait
+
+from django.conf import settings
+
+from presqt.api_v1.utilities.multiprocess.job_payload import run_job_payload
+from presqt.utilities import get_job_queue, get_job_store
+
+logger = logging.getLogger(__name__)
+
+# Seconds between a job process's checks that the supervisor that started it is still alive.
+# This has to be well under JOB_QUEUE_LEASE_SECONDS, so the job is gone before it's queued again.
+SUPERVISOR_CHECK_INTERVAL = 1
+
+_supervisor = None
+# The process that's a candidate to supervise the host's jobs, and the lock file it holds once
+# it has been elected
+_candidate_pid = None
+_supervisor_lock_file = None
+_supervisor_lock = threading.Lock()
+
+
+def elect_job_supervisor():
+    """
+    Make this server process a candidate to run the job supervisor of its host.
+
+    The server processes of a host queue their jobs with a payload, and the one holding the lock
+    on JOB_SUPERVISOR_LOCK_FILE runs the JobSupervisor that starts and supervises them. The other
+    candidates wait for the lock in a thread, so one of them takes over if the supervising
+    process exits. Forked processes don't inherit the lock and become candidates of their own.
+    """
+    global _candidate_pid
+    with _supervisor_lock:
+        if _candidate_pid == os.getpid():
+            return
+        _candidate_pid = os.getpid()
+        threading.Thread(target=_run_election, name='presqt-job-supervisor-election',
+                         daemon=True).start()
+
+
+def get_job_supervisor():
+    """
+    Get the job supervisor of the host if this process has been elected to run it.
+
+    Returns
+    -------
+    The host's JobSupervisor, or None if another process runs it.
+    """
+    with _supervisor_lock:
+        if _supervisor is not None and _supervisor.pid == os.getpid():
+            return _supervisor
+        return None
+
+
+def _run_election():
+    """
+    Wait for the host's supervisor lock and start the JobSupervisor once it's taken.
+    """
+    global _supervisor, _supervisor_lock_file
+    lock_path = settings.JOB_SUPERVISOR_LOCK_FILE
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    lock_file = open(lock_path, 'a')
+    # A POSIX lock belongs to the process that took it. Unlike a flock() lock it isn't shared
+    # with the job processes forked from it, so it's released as soon as this process exits.
+    fcntl.lockf(lock_file, fcntl.LOCK_EX)
+
+    supervisor = JobSupervisor(max_jobs=getattr(settings, 'JOB_QUEUE_MAX_RUNNING', 8))
+    with _supervisor_lock:
+        _supervisor = supervisor
+        _supervisor_lock_file = lock_file
+    logger.info('Job supervisor %s elected', supervisor.worker_id)
+
+
+def run_supervised_job(payload, supervisor_pid):
+    """
+    Run a queued job in a process group of its own, which is killed if the supervisor that
+    started the job dies. Nothing renews the job's lease after that, so the job would otherwise
+    still be running when it's queued again and run a second time.
+
+    Parameters
+    ----------
+    payload: dict
+        Payload of the job
+    supervisor_pid: int
+        Id of the process running the supervisor that started the job
+    """
+    os.setpgrp()
+    threading.Thread(target=_watch_supervisor, args=(supervisor_pid,),
+                     name='presqt-job-supervisor-watch', daemon=True).start()
+    run_job_payload(payload)
+
+
+def _watch_supervisor(supervisor_pid):
+    """
+    Kill the job's process group, along with any processes the job started, once the supervisor
+    that started it has died. The job process is then handed to another parent.
+    """
+    while os.getppid() == supervisor_pid:
+        time.sleep(SUPERVISOR_CHECK_INTERVAL)
+    logger.error('The supervisor of job process %s died, stopping the job', os.getpid())
+    os.killpg(0, signal.SIGKILL)
+
+
+def get_job_timeout(action):
+    """
+    Get the number of seconds a job running the given action is allowed to take.
+
+    Parameters
+    ----------
+    action: str
+        The action the job is running
+
+    Returns
+    -------
+    The timeout in seconds from JOB_TIMEOUTS, or its 'default' if the action isn't listed.
+    """
+    job_timeouts = getattr(settings, 'JOB_TIMEOUTS', {})
+    return job_timeouts.get(action, job_timeouts.get('default', 3600))
+
+
+class JobSupervisor(object):
+    """
+    Supervises the job processes of a host from a single thread. The thread
+    sleeps in multiprocessing.connection.wait() on the sentinels of the running jobs until one
+    of them exits or the earliest deadline passes.
+
+    Jobs are queued with a payload in the shared job queue, and any supervisor can run them.
+    The supervisor elected by a host's server processes, or the one running in a job worker,
+    claims up to max_jobs of them once the queue lets them start. The thread also wakes every
+    JOB_QUEUE_POLL_INTERVAL seconds to check the queue for jobs and places freed by other
+    processes.
+
+    The leases on the supervisor's jobs are renewed every JOB_QUEUE_HEARTBEAT_INTERVAL seconds.
+    Jobs whose cancellation was requested through the queue are killed on the next heartbeat.
+    Jobs kill themselves if the supervisor dies, before their leases run out and they're queued
+    again.
+
+    A job that runs past its deadline is terminated and marked as failed with a 504. A job whose
+    process exits while the job is still 'in_progress' has crashed and is marked as failed with
+    a 500.
+    """
+
+    def __init__(self, max_jobs=0):
+        """
+        Parameters
+        ----------
+        max_jobs: int
+            Maximum number of queued jobs to run at once
+        """
+        self.pid = os.getpid()
+        self.worker_id = '{}:{}'.format(socket.gethostname(), self.pid)
+        self.max_jobs = max_jobs
+        self.job_queue = get_job_queue()
+        self._last_heartbeat = time.monotonic()
+        self._stopping = False
+        # Running jobs by the sentinel of their process
+        self._jobs = {}
+        # Heap of (deadline, sequence number, job) entries
+        self._deadlines = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        # Written to whenever a job is added so the thread starts waiting on it
+        self._wake_reader, self._wake_writer = Pipe(duplex=False)
+
+        self._thread = threading.Thread(target=self._run, name='presqt-job-supervisor',
+                                        daemon=True)
+        self._thread.start()
+
+    def supervise(self, process, ticket_number, action, timeout=None, job_id=None):
+        """
+        Start supervising a started job process.
+
+        Parameters
+        ----------
+        process: multiprocessing.Process
+            The started process running the job
+        ticket_number: str
+            Ticket number of the job
+        action: str
+            The action the job is running
+        timeout: int
+            Seconds the job may run for. Defaults to the action's JOB_TIMEOUTS value.
+        job_id: int
+            Queue id of the job, if it was started from the job queue
+        """
+        if timeout is None:
+            timeout = get_job_timeout(action)
+        job = (process, str(ticket_number), action, job_id)
+
+        with self._lock:
+            self._jobs[process.sentinel] = job
+            heapq.heappush(self._deadlines,
+                           (time.monotonic() + timeout, next(self._sequence), job))
+            self._wake_writer.send_bytes(b'')
+
+    def wake(self):
+        """
+        Check the job queue now rather than at the next poll, e.g. once a job has been queued.
+        """
+        with self._lock:
+            self._wake_writer.send_bytes(b'')
+
+    def stop(self):
+        """
+        Stop claiming jobs and let the supervisor's thread end once its running jobs have exited.
+        """
+        with self._lock:
+            self._stopping = True
+            self._wake_writer.send_bytes(b'')
+
+    def join(self):
+        """
+        Wait for the supervisor's thread to end.
+        """
+        self._thread.join()
+
+    def _run(self):
+        heartbeat_interval = getattr(settings, 'JOB_QUEUE_HEARTBEAT_INTERVAL', 10)
+        poll_interval = getattr(settings, 'JOB_QUEUE_POLL_INTERVAL', 1)
+        while True:
+            with self._lock:
+                if self._stopping and not self._jobs:
+                    return
+                sentinels = list(self._jobs)
+                timeouts = []
+                if self._deadlines:
+                    timeouts.append(max(self._deadlines[0][0] - time.monotonic(), 0))
+                if self._jobs:
+                    timeouts.append(heartbeat_interval)
+                if self.max_jobs and not self._stopping:
+                    timeouts.append(poll_interval)
+
+            for ready in wait(sentinels + [self._wake_reader], min(timeouts, default=None)):
+                if ready is self._wake_reader:
+                    self._wake_reader.recv_bytes()
+                else:
+                    self._job_exited(ready)
+            self._expire_jobs()
+            if time.monotonic() - self._last_heartbeat >= heartbeat_interval:
+                self._heartbeat()
+            if not self._stopping:
+                self._dispatch_jobs()
+
+    def _heartbeat(self):
+        """
+        Renew the leases on this supervisor's jobs and kill the ones that have been cancelled.
+        """
+        self._last_heartbeat = time.monotonic()
+        with self._lock:
+            job_ids = [job[3] for job in self._jobs.values() if job[3] is not None]
+            running = {job[3]: job[0] for job in self._jobs.values()}
+        try:
+            cancelled = self.job_queue.heartbeat(self.worker_id, job_ids)
+        except Exception:
+            logger.exception('Could not renew job leases')
+            return
+
+        for job_id in cancelled:
+            if job_id in running:
+                running[job_id].kill()
+
+    def _dispatch_jobs(self):
+        """
+        Start the queued jobs the job queue has places for.
+        """
+        with self._lock:
+            queued_jobs = len([job for job in self._jobs.values() if job[3] is not None])
+            free_slots = max(self.max_jobs - queued_jobs, 0)
+        # Claiming also releases the jobs that lost their runner, even when there's no room
+        try:
+            claimed, abandoned = self.job_queue.claim(self.worker_id, free_slots)
+        except Exception:
+            logger.exception('Could not check the job queue')
+            return
+
+        # Jobs whose runner has died and that won't be run again
+        for ticket_number, action in abandoned:
+            get_job_store().update_in_progress_action(ticket_number, action, {
+                'status': 'failed',
+                'message': 'The server running the job stopped before the job could finish.',
+                'status_code': 500
+            })
+
+        for job_id, payload in claimed:
+            process = multiprocessing.Process(target=run_supervised_job,
+                                              args=(payload, self.pid))
+            ticket_number = payload['attributes']['ticket_number']
+            action = payload['attributes']['action']
+            try:
+                process.start()
+            except Exception:
+                logger.exception('Could not start job %s', ticket_number)
+                self.job_queue.finish(job_id)
+                get_job_store().update_in_progress_action(ticket_number, action, {
+                    'status': 'failed',
+                    'message': 'The job could not be started on the server.',
+                    'status_code': 500
+                })
+                continue
+            self.job_queue.started(job_id, process.pid)
+            self.supervise(process, ticket_number, action, job_id=job_id)
+
+    def _job_exited(self, sentinel):
+        """
+        Forget a job whose process has exited and fail it if it never reported finishing.
+        """
+        with self._lock:
+            process, ticket_number, action, job_id = self._jobs.pop(sentinel)
+        process.join()
+        if job_id is not None:
+            self.job_queue.finish(job_id)
+
+        try:
+            failed = get_job_store().update_in_progress_action(ticket_number, action, {
+                'status': 'failed',
+                'message': 'The process ended unexpectedly on the server.',
+                'status_code': 500
+            })
+        except Exception:
+            logger.exception('Could not fail crashed job %s', ticket_number)
+        else:
+            if failed:
+                logger.error('Job %s exited with code %s while in progress',
+                             ticket_number, process.exitcode)
+
+    def _expire_jobs(self):
+        """
+        Terminate and fail every job whose deadline has passed. Terminated jobs stay in the wait
+        list until their process exits.
+        """
+        while True:
+            with self._lock:
+                if not self._deadlines or self._deadlines[0][0] > time.monotonic():
+                    return
+                deadline, sequence, job = heapq.heappop(self._deadlines)
+                process, ticket_number, action, job_id = job
+                # Skip jobs that have already exited
+                if self._jobs.get(process.sentinel) is not job:
+                    continue
+
+            process.terminate()
+            try:
+                get_job_store().update_in_progress_action(ticket_number, action, {
+                    'status': 'failed',
+                    'message': 'The process took too long on the server.',
+                    'status_code': 504
+                })
+            except Exception:
+                logger.exception('Could not fail timed out job %s', ticket_number)
@@ -1,12 +1,22 @@
-import multiprocessing
+from django.conf import settings
 
-from presqt.api_v1.utilities.multiprocess.watchdog import process_watchdog
+from presqt.api_v1.utilities.multiprocess.job_payload import build_job_payload
+from presqt.api_v1.utilities.multiprocess.job_supervisor import (elect_job_supervisor,
+                                                                 get_job_supervisor)
+from presqt.api_v1.utilities.utils.hash_tokens import hash_tokens
+from presqt.utilities import PresQTValidationError, get_job_queue, get_job_store
 
 
 def spawn_action_process(self, method_to_call, action):
     """
     Spawn a separate process on the Python kernel to run independently of the
-    main request thread. This also starts a watch dog to supervise the spawned process.
+    main request thread. The job is serialized into the job queue, and the job supervisor that
+    claims it starts it once the queue has room and fails the job if it runs past the action's
+    timeout or exits without finishing.
+
+    If JOB_EXECUTION is 'local' the job is run on this host by the supervisor its server
+    processes elect. If it's 'worker' it's run by the job workers started with the run_job_worker
+    command instead, which may run on other hosts.
 
     Parameters
     ----------
@@ -14,15 +24,37 @@ def spawn_action_process(self, method_to_call, action):
         Class the spawned off method is attached to
     method_to_call: class method
         Method to spawn
+    action: str
+        The action the spawned method performs
+
+    Raises
+    ------
+    PresQTValidationError with a 503 if the job queue is full. The job is marked as failed.
     """
-    # Spawn job separate from request memory thread
-    function_process = multiprocessing.Process(target=method_to_call)
-    # Add the process obj to the base class so we can write the process id in the target function
-    self.function_process = function_process
-    function_process.start()
-
-    # Start the watchdog process that will monitor the spawned off process
-    watch_dog = multiprocessing.Process(target=process_watchdog,
-                                        args=(function_process, self.process_info_path, 3600, action))
-    self.watch_dog = watch_dog
-    watch_dog.start()
+    # The targets and users the job counts against in the job queue
+    targets = []
+    users = []
+    if action in ['resource_download', 'resource_transfer_in']:
+        targets.append(self.source_target_name)
+        users.append(hash_tokens(self.source_token))
+    if action in ['resource_upload', 'resource_transfer_in']:
+        targets.append(self.destination_target_name)
+        users.append(hash_tokens(self.destination_token))
+
+    try:
+        priority = getattr(settings, 'JOB_QUEUE_PRIORITIES', {}).get(action, 0)
+        get_job_queue().enqueue(self.ticket_number, action, targets, users,
+                                build_job_payload(self, method_to_call), priority)
+    except PresQTValidationError as e:
+        get_job_store().update_action(self.ticket_number, action, {
+            'status': 'failed',
+            'message': e.data,
+            'status_code': e.status_code
+        })
+        raise
+
+    if getattr(settings, 'JOB_EXECUTION', 'local') == 'local':
+        elect_job_supervisor()
+        supervisor = get_job_supervisor()
+        if supervisor:
+            supervisor.wake()
@@ -1,4 +1,4 @@
-def calculate_job_percentage(total_files, files_finished):
+def calculate_job_percentage(total_files, files_finished, total_bytes=0, bytes_finished=0):
     """
     Do some maths to calculate the job percentage :)
 
@@ -8,16 +8,23 @@ def calculate_job_percentage(total_files, files_finished):
         Total number of files for a job
     files_finished: int
         Files finished for a job
+    total_bytes: int
+        Total number of bytes for a job, if known
+    bytes_finished: int
+        Bytes finished for a job
 
     Returns
     -------
     An int representation of the job percentage
     """
     job_percentage = 0
-    if total_files != 0 and files_finished != 0:
+    # Bytes give a smoother percentage than files when file sizes vary, so use them when we can
+    if total_bytes and bytes_finished:
+        job_percentage = round(bytes_finished / total_bytes * 100)
+    elif total_files != 0 and files_finished != 0:
         job_percentage = round(files_finished / total_files * 100)
-        # Little bit of a hack here, the front end doesn't build resources as fast as they are
-        # returned so to get around the FE hanging on 100% for a few seconds, we'll display 99.
-        if job_percentage == 100:
-            job_percentage = 99
-    return job_percentage
\ No newline at end of file
+    # Little bit of a hack here, the front end doesn't build resources as fast as they are
+    # returned so to get around the FE hanging on 100% for a few seconds, we'll display 99.
+    if job_percentage >= 100:
+        job_percentage = 99
+    return job_percentage
@@ -0,0 +1,123 @@
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.http import http_date
+from rest_framework import status
+
+# A single byte range, e.g. 'bytes=0-499', 'bytes=500-' or 'bytes=-500'
+BYTE_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# Bytes read from disk at a time when Django sends the file itself
+DELIVERY_BLOCK_SIZE = 64 * 1024
+
+
+def deliver_file(request, file_path, file_name, content_type='application/zip'):
+    """
+    Build the response that sends a file on disk to the user once the request has been
+    authorized.
+
+    If the FILE_DELIVERY_ACCEL_REDIRECT setting is set the file is handed to nginx with an
+    X-Accel-Redirect header, so nginx sends it (and answers Range requests) without tying up a
+    Django worker. Otherwise Django streams the file itself, honouring single byte Range and
+    If-Range headers so interrupted downloads can be resumed.
+
+    Parameters
+    ----------
+    request: HttpRequest
+        The request for the file
+    file_path: str
+        Path to the file. Only files in MEDIA_ROOT can be handed to nginx.
+    file_name: str
+        Name the file is saved as by the user
+    content_type: str
+        Content type of the file
+
+    Returns
+    -------
+    HttpResponse or FileResponse
+    """
+    file_stat = os.stat(file_path)
+    file_size = file_stat.st_size
+    etag = '"{:x}-{:x}"'.format(int(file_stat.st_mtime), file_size)
+    last_modified = http_date(file_stat.st_mtime)
+
+    accel_redirect = getattr(settings, 'FILE_DELIVERY_ACCEL_REDIRECT', None)
+    media_path = os.path.relpath(os.path.abspath(file_path), settings.MEDIA_ROOT)
+    if accel_redirect and not media_path.startswith(os.pardir):
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = quote('{}/{}'.format(accel_redirect.rstrip('/'),
+                                                            media_path))
+    else:
+        byte_range = _get_byte_range(request, file_size, etag, last_modified)
+        if byte_range:
+            start, end = byte_range
+            if start > end:
+                response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+                response['Content-Range'] = 'bytes */{}'.format(file_size)
+                return response
+            response_status = status.HTTP_206_PARTIAL_CONTENT
+        else:
+            start, end = 0, file_size - 1
+            response_status = status.HTTP_200_OK
+
+        response = FileResponse(_read_file_range(file_path, start, end - start + 1),
+                                status=response_status, content_type=content_type)
+        response['Content-Length'] = end - start + 1
+        if response_status == status.HTTP_206_PARTIAL_CONTENT:
+            response['Content-Range'] = 'bytes {}-{}/{}'.format(start, end, file_size)
+
+    response['Content-Disposition'] = 'attachment; filename={}'.format(file_name)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    return response
+
+
+def _get_byte_range(request, file_size, etag, last_modified):
+    """
+    Returns the first and last byte of the range requested, or None if the whole file should be
+    sent. The first byte is after the last if the range can't be satisfied.
+    """
+    range_header = request.META.get('HTTP_RANGE')
+    if not range_header:
+        return None
+    # Send the whole file if it changed since the client got the first part of it
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range not in [etag, last_modified]:
+        return None
+    # Multiple ranges and other units aren't supported, so the whole file is sent
+    match = BYTE_RANGE_RE.match(range_header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+
+    first_byte, last_byte = match.groups()
+    if first_byte:
+        start = int(first_byte)
+        end = file_size - 1
+        if last_byte:
+            if int(last_byte) < start:
+                return None
+            end = min(int(last_byte), end)
+    else:
+        # A suffix range asks for the last bytes of the file
+        start = max(file_size - int(last_byte), 0)
+        end = file_size - 1
+        if not int(last_byte):
+            start = file_size
+    return start, end
+
+
+def _read_file_range(file_path, start, length):
+    """
+    Yield length bytes of the file starting at start.
+    """
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(DELIVERY_BLOCK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
@@ -12,6 +12,7 @@ from presqt.targets.curate_nd.functions.keywords import curate_nd_fetch_keywords
 from presqt.targets.osf.functions.fetch import osf_fetch_resources, osf_fetch_resource
 from presqt.targets.osf.functions.download import osf_download_resource
 from presqt.targets.osf.functions.upload import osf_upload_resource
+from presqt.targets.osf.functions.upload_stream import OSFUploadStream
 from presqt.targets.osf.functions.upload_metadata import osf_upload_metadata
 from presqt.targets.osf.functions.keywords import osf_fetch_keywords, osf_upload_keywords
 
@@ -53,6 +54,9 @@ class FunctionRouter(object):
     Target Resource Upload:
         {target_name}_resource_upload
 
+    Target Resource Upload Stream (optional, used by streaming transfers):
+        {target_name}_resource_upload_stream
+
     Target Resource FTS Metadata Upload:
         {target_name}_metadata_upload
 
@@ -69,6 +73,7 @@ class FunctionRouter(object):
     osf_resource_detail = osf_fetch_resource
     osf_resource_download = osf_download_resource
     osf_resource_upload = osf_upload_resource
+    osf_resource_upload_stream = OSFUploadStream
     osf_metadata_upload = osf_upload_metadata
     osf_keywords = osf_fetch_keywords
     osf_keywords_upload = osf_upload_keywords
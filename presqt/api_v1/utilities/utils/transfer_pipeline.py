@@ -0,0 +1,197 @@
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from rest_framework import status
+
+from presqt.utilities import PresQTResponseException
+
+
+class TransferPipeline(object):
+    """
+    Uploads the files of a transfer while the rest of the resource is still being downloaded.
+
+    Each downloaded file is put on a bounded queue that the upload stream's workers take files
+    from, so the transfer takes about as long as the slower of the download and the upload rather
+    than both added together. When the queue is full the download waits for the upload to catch up.
+    Files put from a coroutine are handed over by a separate thread instead, so the event loop
+    running the download isn't blocked and its other downloads carry on. Those files wait on disk.
+
+    An upload stream is provided by the destination target as {target_name}_resource_upload_stream
+    in the FunctionRouter. It creates the new project on the destination and uploads one file at a
+    time. It must have the following attributes and methods:
+        max_workers: Number of files that can be uploaded at the same time
+        action_metadata: Dictionary containing FTS action metadata
+        project_id: ID of the created project
+        project_link: Link to the created project
+        create_project(title): Create the project named after the top level directory
+        create_folder(path_in_project): Create a folder, returns False if the target can't
+        upload_file(file_path, path_in_project): Upload a file, returns its FTS file metadata
+    """
+
+    def __init__(self, upload_stream, queue_size):
+        """
+        Parameters
+        ----------
+        upload_stream: object
+            The destination target's upload stream
+        queue_size: int
+            Number of downloaded files that can wait to be uploaded
+        """
+        self.upload_stream = upload_stream
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.project_title = None
+        self.file_metadata_list = []
+        # The first error raised by the upload. Files put on the queue after it are skipped.
+        self.error = None
+        self._stopped = False
+        self._lock = threading.Lock()
+        # Hands over the files put from an event loop, in the order they were put
+        self._hand_off = ThreadPoolExecutor(max_workers=1)
+        self._workers = [threading.Thread(target=self._work, daemon=True)
+                         for _ in range(upload_stream.max_workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def put(self, file_path, resource_path):
+        """
+        Queue a downloaded file to be uploaded. The project is created when the first file
+        arrives. Errors are raised by finish() so the download isn't interrupted.
+
+        Parameters
+        ----------
+        file_path: str
+            Path to the file on disk
+        resource_path: str
+            Path of the file in the resource, starting with the top level directory
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._put(file_path, resource_path)
+        else:
+            self._hand_off.submit(self._put, file_path, resource_path)
+
+    def add_empty_container(self, container_path):
+        """
+        Queue an empty folder of the resource to be created.
+
+        Parameters
+        ----------
+        container_path: str
+            Path of the folder in the resource, starting with the top level directory
+        """
+        path_in_project = self._path_in_project(container_path.rstrip('/'), False)
+        if path_in_project:
+            self.queue.put((None, path_in_project))
+
+    def finish(self, hash_algorithm):
+        """
+        Wait for every queued file to be uploaded.
+
+        Parameters
+        ----------
+        hash_algorithm: str
+            Hash algorithm used to check the fixity of the uploaded files
+
+        Returns
+        -------
+        Dictionary in the format upload functions return.
+        """
+        self._stop()
+        if self.error:
+            raise self.error
+        if self.project_title is None:
+            raise PresQTResponseException(
+                "PresQT Error: There are no files to transfer.", status.HTTP_400_BAD_REQUEST)
+
+        for file_metadata in self.file_metadata_list:
+            # Only send forward the hash we need based on the hash_algorithm provided
+            if isinstance(file_metadata['destinationHash'], dict):
+                file_metadata['destinationHash'] = file_metadata['destinationHash'].get(
+                    hash_algorithm)
+
+        return {
+            'resources_ignored': [],
+            'resources_updated': [],
+            'action_metadata': self.upload_stream.action_metadata,
+            'file_metadata_list': self.file_metadata_list,
+            'project_id': self.upload_stream.project_id,
+            'project_link': self.upload_stream.project_link
+        }
+
+    def abort(self):
+        """
+        Stop uploading without waiting for the queued files.
+        """
+        self._stopped = True
+        self._stop()
+
+    def _put(self, file_path, resource_path):
+        path_in_project = self._path_in_project(resource_path, True)
+        if path_in_project:
+            self.queue.put((file_path, path_in_project))
+
+    def _path_in_project(self, resource_path, is_file):
+        """
+        Check the structure of the resource and create the project the first time it's called.
+        Returns the path inside of the project, or None if nothing should be queued.
+        """
+        if self.error:
+            return None
+        title, _, path_in_project = resource_path.lstrip('/').partition('/')
+
+        if is_file and not path_in_project:
+            self._fail(PresQTResponseException(
+                "PresQT Error: You need to select a resource to transfer into, as a single file "
+                "can not be uploaded as a new project.", status.HTTP_400_BAD_REQUEST))
+            return None
+        if self.project_title is None:
+            try:
+                self.upload_stream.create_project(title)
+            except Exception as e:
+                self._fail(e)
+                return None
+            self.project_title = title
+        elif title != self.project_title:
+            self._fail(PresQTResponseException(
+                "PresQT Error: Repository is not formatted correctly. Multiple directories exist "
+                "at the top level.", status.HTTP_400_BAD_REQUEST))
+            return None
+        return path_in_project
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            if self.error or self._stopped:
+                continue
+
+            file_path, path_in_project = item
+            try:
+                if file_path is None:
+                    self.upload_stream.create_folder(path_in_project)
+                else:
+                    file_metadata = self.upload_stream.upload_file(file_path, path_in_project)
+                    with self._lock:
+                        self.file_metadata_list.append(file_metadata)
+            except Exception as e:
+                # Keep taking files off the queue so the download never waits on it forever
+                self._fail(e)
+
+    def _fail(self, error):
+        with self._lock:
+            if self.error is None:
+                self.error = error
+
+    def _stop(self):
+        # Files still being handed over are queued before the workers are told to stop
+        self._hand_off.shutdown(wait=True)
+        if not any(worker.is_alive() for worker in self._workers):
+            return
+        for _ in self._workers:
+            self.queue.put(None)
+        for worker in self._workers:
+            worker.join()
@@ -1,11 +1,9 @@
-import os
-
-from presqt.utilities import read_file, write_file
+from presqt.utilities import get_job_store, get_process_info_path
 
 
 def update_or_create_process_info(process_obj, action, ticket_number):
     """
-    Create or update the process_info.json file for a job.
+    Create or update the process info of an action for a job.
 
     Parameters
     ----------
@@ -20,14 +18,5 @@ def update_or_create_process_info(process_obj, action, ticket_number):
     -------
     Returns the path to the process_info.json file
     """
-    process_info_path = os.path.join('mediafiles', 'jobs', str(ticket_number), 'process_info.json')
-    # If there already exists a process_info.json file for this user then add to the process dict
-    if os.path.isfile(process_info_path):
-        file_obj = read_file(process_info_path, True)
-        file_obj[action] = process_obj
-    # If no process_info.json file exists for this user than create a new process dict
-    else:
-        file_obj = {action: process_obj}
-
-    write_file(process_info_path, file_obj, True)
-    return process_info_path
+    get_job_store().set_action(str(ticket_number), action, process_obj)
+    return get_process_info_path(ticket_number)
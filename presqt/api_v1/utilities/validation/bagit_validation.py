@@ -1,10 +1,13 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import bagit
 from rest_framework import status
 
-from presqt.utilities import PresQTValidationError
+from presqt.utilities import PresQTValidationError, file_multi_hash_generator
 
 
-def validate_bag(bag):
+def validate_bag(bag, trusted=False, workers=1):
     """
     Validate that a bag is in the correct format, all checksums match, and that there
     are no unexpected or missing files
@@ -13,16 +16,42 @@ def validate_bag(bag):
     ----------
     bag : bagit.Bag
         The BagIt class we want to validate.
+    trusted : bool
+        True if the server built the bag itself from digests calculated while the files were
+        received. Checksums are then not recalculated; only the structure and Payload-Oxum
+        of the bag are checked.
+    workers : int
+        Number of files whose checksums are calculated at the same time. Threads are used since
+        hashlib releases the GIL while it hashes.
     """
     # Verify that checksums still match and that there are no unexpected or missing files
     try:
-        bag.validate()
+        bag.validate(fast=trusted, completeness_only=not trusted)
     except bagit.BagValidationError as e:
         if e.details:
-            if isinstance(e.details[0], bagit.ChecksumMismatch):
-                raise PresQTValidationError("Checksums failed to validate.",
-                                            status.HTTP_400_BAD_REQUEST)
-            else:
-                raise PresQTValidationError(str(e.details[0]), status.HTTP_400_BAD_REQUEST)
+            raise PresQTValidationError(str(e.details[0]), status.HTTP_400_BAD_REQUEST)
         else:
-            raise PresQTValidationError(str(e), status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            raise PresQTValidationError(str(e), status.HTTP_400_BAD_REQUEST)
+
+    if not trusted and _checksums_mismatch(bag, workers):
+        raise PresQTValidationError("Checksums failed to validate.", status.HTTP_400_BAD_REQUEST)
+
+
+def _checksums_mismatch(bag, workers):
+    """
+    Calculate the checksums of every file in the bag's manifests in a thread pool.
+
+    Returns
+    -------
+    True if any file's checksum doesn't match its manifest.
+    """
+    def file_matches(entry):
+        rel_path, hashes = entry
+        algorithms = [algorithm for algorithm in hashes if algorithm in bag.algorithms]
+        file_path = os.path.join(bag.path, bag.normalized_filesystem_names.get(rel_path, rel_path))
+        file_hashes = file_multi_hash_generator(file_path, algorithms)
+        return all(hashes[algorithm].lower() == file_hashes[algorithm]
+                   for algorithm in algorithms)
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        return not all(executor.map(file_matches, bag.entries.items()))
@@ -1,28 +1,23 @@
-import json
-
 from rest_framework import status
-from presqt.utilities import read_file
-from presqt.utilities import PresQTValidationError
+
+from presqt.utilities import PresQTValidationError, get_job_store
 
 
 def get_process_info_data(ticket_number):
     """
-    Get the JSON from process_info.json in the requested ticket number directory.
+    Get the process info of every action of the job with the requested ticket number.
 
     Parameters
     ----------
     ticket_number : str
-        Requested ticket_number directory the JSON should live in
+        Requested ticket_number of the job
 
     Returns
     -------
     JSON dictionary representing the process_info.json data.
     """
-    while True:
-        try:
-            return read_file('mediafiles/jobs/{}/process_info.json'.format(ticket_number), True)
-        except json.decoder.JSONDecodeError:
-            pass
-        except FileNotFoundError:
-            raise PresQTValidationError("PresQT Error: Invalid ticket number, '{}'.".format(ticket_number),
-                                        status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+    process_info_data = get_job_store().get_job(ticket_number)
+    if process_info_data is None:
+        raise PresQTValidationError("PresQT Error: Invalid ticket number, '{}'.".format(ticket_number),
+                                    status.HTTP_404_NOT_FOUND)
+    return process_info_data
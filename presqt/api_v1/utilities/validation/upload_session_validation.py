@@ -0,0 +1,128 @@
+from rest_framework import status
+
+from presqt.utilities import PresQTValidationError, get_job_store
+
+# Checksum algorithms chunks can be sent with
+UPLOAD_CHECKSUM_ALGORITHMS = ['md5', 'sha1', 'sha256', 'sha512']
+
+
+def get_upload_length(request):
+    """
+    Get the size of the whole file from the Upload-Length header of a new upload session.
+
+    Parameters
+    ----------
+    request : HTTP request object
+
+    Returns
+    -------
+    The size of the file in bytes.
+    """
+    return _get_byte_header(request, 'Upload-Length')
+
+
+def get_upload_offset(request):
+    """
+    Get the byte a chunk starts at from the Upload-Offset header.
+
+    Parameters
+    ----------
+    request : HTTP request object
+
+    Returns
+    -------
+    The offset of the chunk in bytes.
+    """
+    return _get_byte_header(request, 'Upload-Offset')
+
+
+def get_upload_checksum(request):
+    """
+    Get the checksum of a chunk from the Upload-Checksum header. The header holds the algorithm
+    and the base64 encoded digest separated by a space, e.g. 'sha256 47DEQpj8HBSa...'.
+
+    Parameters
+    ----------
+    request : HTTP request object
+
+    Returns
+    -------
+    The algorithm and the base64 encoded digest.
+    """
+    try:
+        algorithm, digest = request.META['HTTP_UPLOAD_CHECKSUM'].split()
+    except KeyError:
+        raise PresQTValidationError(
+            "PresQT Error: 'Upload-Checksum' missing in the request headers.",
+            status.HTTP_400_BAD_REQUEST)
+    except ValueError:
+        raise PresQTValidationError(
+            "PresQT Error: 'Upload-Checksum' must be an algorithm and a base64 digest.",
+            status.HTTP_400_BAD_REQUEST)
+
+    if algorithm not in UPLOAD_CHECKSUM_ALGORITHMS:
+        raise PresQTValidationError(
+            "PresQT Error: '{}' is not a supported checksum algorithm. The options are {}.".format(
+                algorithm, ', '.join(UPLOAD_CHECKSUM_ALGORITHMS)),
+            status.HTTP_400_BAD_REQUEST)
+    return algorithm, digest
+
+
+def get_upload_session(ticket_number, session_id):
+    """
+    Get the state of a user's open upload session.
+
+    Parameters
+    ----------
+    ticket_number : str
+        Ticket number of the user's job
+    session_id : str
+        Requested id of the upload session
+
+    Returns
+    -------
+    Dictionary of the upload session's state.
+    """
+    upload_session = (get_job_store().get_job(ticket_number) or {}).get('upload_session')
+    if (upload_session is None or upload_session['session_id'] != session_id
+            or upload_session['status'] != 'in_progress'):
+        raise PresQTValidationError(
+            "PresQT Error: Invalid upload session, '{}'.".format(session_id),
+            status.HTTP_404_NOT_FOUND)
+    return upload_session
+
+
+def upload_job_validation(ticket_number):
+    """
+    Make sure the user has no upload job running, as the job is still reading the user's upload
+    directory that a session writes to.
+
+    Parameters
+    ----------
+    ticket_number : str
+        Ticket number of the user's job
+    """
+    upload_job = (get_job_store().get_job(ticket_number) or {}).get('resource_upload')
+    if upload_job and upload_job['status'] == 'in_progress':
+        raise PresQTValidationError(
+            "PresQT Error: An upload is already in progress. Wait for it to finish or cancel it "
+            "before starting another.", status.HTTP_409_CONFLICT)
+
+
+def _get_byte_header(request, header):
+    """
+    Get a header holding a number of bytes.
+    """
+    try:
+        value = int(request.META['HTTP_{}'.format(header.upper().replace('-', '_'))])
+    except KeyError:
+        raise PresQTValidationError(
+            "PresQT Error: '{}' missing in the request headers.".format(header),
+            status.HTTP_400_BAD_REQUEST)
+    except ValueError:
+        value = -1
+    if value < 0:
+        raise PresQTValidationError(
+            "PresQT Error: '{}' must be a whole number of bytes.".format(header),
+            status.HTTP_400_BAD_REQUEST)
+    return value
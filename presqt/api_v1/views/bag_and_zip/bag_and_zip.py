@@ -3,13 +3,15 @@ import zipfile
 from uuid import uuid4
 
 import bagit
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from rest_framework import renderers
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from presqt.api_v1.utilities.utils.deliver_file import deliver_file
 from presqt.api_v1.utilities.validation.file_validation import file_validation
-from presqt.utilities import PresQTValidationError, zip_directory
+from presqt.utilities import (PresQTValidationError, CompressionPolicy, iter_zip_directory,
+                              zip_directory)
 
 
 class BagAndZip(APIView):
@@ -26,11 +28,18 @@ class BagAndZip(APIView):
         """
         Take a zipped file, format it using BagIt, and return it to the user.
 
+        The zip file is written to disk and delivered like a download job's zip file, so a single
+        byte Range of it can be requested. With the query parameter 'stream=true' it's instead
+        sent while it's being zipped. A streamed zip file doesn't support Range requests.
+
         Returns
         -------
         200: OK
         Returns a file
 
+        206: Partial Content
+        Returns the requested Range of the file
+
         400: Bad Request
         {
             "error": "PresQT Error: The file, 'presqt-file', is not found in the body of the request."
@@ -62,11 +71,16 @@ class BagAndZip(APIView):
         # Make a BagIt 'bag' of the resources.
         bagit.make_bag(data_path, checksums=['md5', 'sha1', 'sha256', 'sha512'])
 
-        # Zip the BagIt 'bag' to send forward.
-        zip_path = os.path.join(ticket_path, "presqt_bag.zip")
-        zip_directory(data_path, zip_path, ticket_path)
+        policy = CompressionPolicy.for_endpoint('bag_and_zip')
+        if request.query_params.get('stream') == 'true':
+            # Zip the BagIt 'bag' while it's sent, rather than writing the zip file to disk first.
+            response = StreamingHttpResponse(iter_zip_directory(data_path, ticket_path, policy),
+                                             content_type='application/zip')
+            response['Content-Disposition'] = 'attachment; filename=presqt_{}'.format(file_name)
+            response['Accept-Ranges'] = 'none'
+            return response
 
-        response = HttpResponse(open(zip_path, 'rb'), content_type='application/zip')
-        response['Content-Disposition'] = 'attachment; filename=presqt_{}'.format(file_name)
+        zip_path = os.path.join(ticket_path, "presqt_bag.zip")
+        zip_directory(data_path, zip_path, ticket_path, policy)
 
-        return response
+        return deliver_file(request, zip_path, 'presqt_{}'.format(file_name))
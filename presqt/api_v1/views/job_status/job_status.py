@@ -1,19 +1,21 @@
-import json
 import multiprocessing
 import os
+from time import sleep
 
 from dateutil.relativedelta import relativedelta
 from django.utils.datastructures import MultiValueDictKeyError
-from django.http import HttpResponse
 from django.utils import timezone
 from rest_framework import status, renderers
+from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
 from presqt.api_v1.utilities import (get_source_token, get_process_info_data, hash_tokens,
                                      update_or_create_process_info, get_destination_token,
-                                     calculate_job_percentage)
-from presqt.utilities import PresQTValidationError
+                                     calculate_job_percentage, spawn_action_process,
+                                     deliver_file)
+from presqt.api_v1.views.resource.base_resource import BaseResource
+from presqt.utilities import PresQTValidationError, get_job_queue, TransferCheckpoint
 
 
 class JobStatus(APIView):
@@ -21,6 +23,7 @@ class JobStatus(APIView):
     **Supported HTTP Methods**
 
     * Get: Retrieve the status of a job
+    * Post: Resume a job that was stopped
     * Patch: Cancel a job
     """
 
@@ -115,6 +118,8 @@ class JobStatus(APIView):
         total_files = download_process_data['download_total_files']
         files_finished = download_process_data['download_files_finished']
         download_job_percentage = calculate_job_percentage(total_files, files_finished)
+        bytes_transferred = download_process_data.get('download_bytes_transferred', 0)
+        bytes_per_second = download_process_data.get('download_bytes_per_second', 0)
 
         # Return the file to download if it has finished.
         if download_status == 'finished':
@@ -124,30 +129,34 @@ class JobStatus(APIView):
                 zip_file_path = os.path.join('mediafiles', 'jobs', self.ticket_number,
                                              'download', zip_name)
 
-                response = HttpResponse(open(zip_file_path, 'rb'), content_type='application/zip')
-                response['Content-Disposition'] = 'attachment; filename={}'.format(zip_name)
+                response = deliver_file(self.request, zip_file_path, zip_name)
             else:
                 response = Response(data={'status_code': status_code,
                                           'message': message,
                                           'zip_name': download_process_data['zip_name'],
                                           'failed_fixity': download_process_data['failed_fixity'],
                                           'job_percentage': download_job_percentage,
+                                          'bytes_transferred': bytes_transferred,
+                                          'bytes_per_second': bytes_per_second,
                                           'status': download_status
                                           },
                                     status=status.HTTP_200_OK)
             return response
         else:
+            data = {'job_percentage': download_job_percentage,
+                    'bytes_transferred': bytes_transferred,
+                    'bytes_per_second': bytes_per_second,
+                    'status': download_status,
+                    'status_code': status_code,
+                    'message': message
+                    }
             if download_status == 'in_progress':
                 http_status = status.HTTP_202_ACCEPTED
+                data.update(self._queue_position('resource_download'))
             else:
                 http_status = status.HTTP_500_INTERNAL_SERVER_ERROR
 
-            return Response(status=http_status,
-                            data={'job_percentage': download_job_percentage,
-                                  'status': download_status,
-                                  'status_code': status_code,
-                                  'message': message
-                                  })
+            return Response(status=http_status, data=data)
 
     def upload_get(self):
         """
@@ -171,13 +180,18 @@ class JobStatus(APIView):
         upload_status = upload_process_data['status']
         total_files = upload_process_data['upload_total_files']
         files_finished = upload_process_data['upload_files_finished']
+        total_bytes = upload_process_data.get('upload_total_bytes', 0)
+        bytes_transferred = upload_process_data.get('upload_bytes_transferred', 0)
 
-        job_percentage = calculate_job_percentage(total_files, files_finished)
+        job_percentage = calculate_job_percentage(total_files, files_finished,
+                                                  total_bytes, bytes_transferred)
         data = {
             'status_code': upload_process_data['status_code'],
             'status': upload_status,
             'message': upload_process_data['message'],
-            'job_percentage': job_percentage
+            'job_percentage': job_percentage,
+            'bytes_transferred': bytes_transferred,
+            'bytes_per_second': upload_process_data.get('upload_bytes_per_second', 0)
         }
 
         if upload_status == 'finished':
@@ -192,6 +206,7 @@ class JobStatus(APIView):
             if upload_status == 'in_progress':
                 http_status = status.HTTP_202_ACCEPTED
                 data['job_percentage'] = job_percentage
+                data.update(self._queue_position('resource_upload'))
             else:
                 http_status = status.HTTP_500_INTERNAL_SERVER_ERROR
 
@@ -220,13 +235,19 @@ class JobStatus(APIView):
 
         transfer_status = transfer_process_data['status']
         upload_job_percentage = calculate_job_percentage(transfer_process_data['upload_total_files'],
-                                                         transfer_process_data['upload_files_finished'])
+                                                         transfer_process_data['upload_files_finished'],
+                                                         transfer_process_data.get('upload_total_bytes', 0),
+                                                         transfer_process_data.get('upload_bytes_transferred', 0))
         download_job_percentage = calculate_job_percentage(transfer_process_data['download_total_files'],
                                                            transfer_process_data['download_files_finished'])
         data = {'status_code': transfer_process_data['status_code'],
                 'status': transfer_status,
                 'message': transfer_process_data['message'],
                 'job_percentage': round((upload_job_percentage + download_job_percentage) / 2),
+                'download_bytes_transferred': transfer_process_data.get('download_bytes_transferred', 0),
+                'download_bytes_per_second': transfer_process_data.get('download_bytes_per_second', 0),
+                'upload_bytes_transferred': transfer_process_data.get('upload_bytes_transferred', 0),
+                'upload_bytes_per_second': transfer_process_data.get('upload_bytes_per_second', 0)
                 }
 
         if transfer_status == 'finished':
@@ -244,11 +265,139 @@ class JobStatus(APIView):
         else:
             if transfer_status == 'in_progress':
                 http_status = status.HTTP_202_ACCEPTED
+                data.update(self._queue_position('resource_transfer_in'))
             else:
                 http_status = status.HTTP_500_INTERNAL_SERVER_ERROR
 
         return Response(status=http_status, data=data)
 
+    def post(self, request, action, response_format=None):
+        """
+        Resume a job that was stopped before it finished.
+
+        Handler for all action status jobs...will route to the correct action class method
+        depending on the action url parameter, 'action'. Only transfers can be resumed.
+
+        Path Parameters
+        ---------------
+        action: str
+            The action to resume
+        response_format:
+            Optional parameter for specifying the response format for downloads
+
+        Returns
+        -------
+        202: Accepted
+        {
+            "message": "The server is resuming the request.",
+            "transfer_job": "https://localhost/api_v1/job_status/transfer/",
+            "resume_from": "/Project/file.txt"
+        }
+
+        400: Bad Request
+        {
+            "error": "PresQT Error: 'presqt-source-token' missing in the request headers."
+        }
+        or
+        {
+            "error": "PresQT Error: {} is not a valid acton."
+        }
+        or
+        {
+            "error": "PresQT Error: The transfer has no checkpoint to resume from."
+        }
+        404  Not Found
+        {
+            "error": "PresQT Error: Invalid ticket number, '1234'."
+        }
+        406: Not Acceptable
+        {
+            "status_code": "200",
+            "message": "Transfer successful."
+        }
+        """
+        self.response_format = response_format
+
+        try:
+            func = getattr(self, '{}_post'.format(action))
+        except AttributeError:
+            return Response(data={"error": "PresQT Error: {} is not a valid acton.".format(action)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            return func()
+
+    def transfer_post(self):
+        """
+        Resume a transfer that failed, timed out or was stopped by a restart from its
+        checkpoint. Files already downloaded aren't downloaded again and files already uploaded
+        aren't sent again.
+        """
+        # Perform token validation. Read data from the process_info file.
+        try:
+            destination_token = get_destination_token(self.request)
+            source_token = get_source_token(self.request)
+            self.ticket_number = '{}_{}'.format(hash_tokens(source_token),
+                                                hash_tokens(destination_token))
+            process_data = get_process_info_data(self.ticket_number)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        try:
+            transfer_process_data = process_data['resource_transfer_in']
+        except KeyError:
+            return Response(
+                data={'error': 'PresQT Error: "resource_transfer_in" not found in process_info file.'},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        # Only transfers that have stopped without finishing can be resumed
+        if transfer_process_data['status'] != 'failed':
+            return Response(
+                data={'status_code': transfer_process_data['status_code'],
+                      'message': transfer_process_data['message']},
+                status=status.HTTP_406_NOT_ACCEPTABLE)
+
+        ticket_path = os.path.join('mediafiles', 'jobs', self.ticket_number, 'transfer')
+        checkpoint = TransferCheckpoint(ticket_path)
+        if not checkpoint.state:
+            return Response(
+                data={'error': 'PresQT Error: The transfer has no checkpoint to resume from.'},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        # Rebuild the transfer from its checkpoint
+        transfer = BaseResource()
+        transfer.__dict__.update(checkpoint.state)
+        transfer.request = self.request
+        transfer.source_token = source_token
+        transfer.destination_token = destination_token
+
+        transfer_process_data.update({
+            'status': 'in_progress',
+            'expiration': str(timezone.now() + relativedelta(hours=5)),
+            'message': 'Transfer is being resumed on the server',
+            'status_code': None,
+            'function_process_id': None,
+            'upload_files_finished': 0,
+            'upload_bytes_transferred': 0
+        })
+        # The download counts its files again, resumed ones included, unless it had finished
+        if not checkpoint.download_finished:
+            transfer_process_data.update({'download_status': None,
+                                          'download_files_finished': 0,
+                                          'download_bytes_transferred': 0})
+        transfer.process_info_obj = transfer_process_data
+        transfer.process_info_path = update_or_create_process_info(
+            transfer_process_data, 'resource_transfer_in', self.ticket_number)
+
+        try:
+            spawn_action_process(transfer, transfer._transfer_resource, 'resource_transfer_in')
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        reversed_url = reverse('job_status', kwargs={'action': 'transfer'})
+        return Response(status=status.HTTP_202_ACCEPTED,
+                        data={'message': 'The server is resuming the request.',
+                              'transfer_job': self.request.build_absolute_uri(reversed_url),
+                              'resume_from': checkpoint.first_incomplete_file()})
+
     def patch(self, request, action, response_format=None):
         """
         Cancel a job
@@ -315,11 +464,11 @@ class JobStatus(APIView):
 
         # Wait until the spawned off process has started to cancel the download
         while self.process_data['resource_download']['function_process_id'] is None:
-            try:
-                self.process_data = get_process_info_data(self.ticket_number)
-            except json.decoder.JSONDecodeError:
-                # Pass while the process_info file is being written to
-                pass
+            cancelled_response = self._cancel_queued_job('resource_download', 'Download')
+            if cancelled_response:
+                return cancelled_response
+            sleep(0.1)
+            self.process_data = get_process_info_data(self.ticket_number)
 
         download_process_data = self.process_data['resource_download']
 
@@ -336,11 +485,15 @@ class JobStatus(APIView):
                         timezone.now() + relativedelta(hours=1))
                     update_or_create_process_info(
                         download_process_data, 'resource_download', self.ticket_number)
-
-                return Response(
-                    data={
-                        'status_code': download_process_data['status_code'], 'message': download_process_data['message']},
-                    status=status.HTTP_200_OK)
+                    return Response(
+                        data={
+                            'status_code': download_process_data['status_code'], 'message': download_process_data['message']},
+                        status=status.HTTP_200_OK)
+            # The job is running in another server process or on a job worker
+            return self._cancel_queued_job('resource_download', 'Download') or Response(
+                data={
+                    'status_code': download_process_data['status_code'], 'message': download_process_data['message']},
+                status=status.HTTP_200_OK)
         # If download is finished then don't attempt to cancel subprocess
         else:
             return Response(
@@ -362,11 +515,11 @@ class JobStatus(APIView):
 
         # Wait until the spawned off process has started to cancel the upload
         while self.process_data['resource_upload']['function_process_id'] is None:
-            try:
-                self.process_data = get_process_info_data(self.ticket_number)
-            except json.decoder.JSONDecodeError:
-                # Pass while the process_info file is being written to
-                pass
+            cancelled_response = self._cancel_queued_job('resource_upload', 'Upload')
+            if cancelled_response:
+                return cancelled_response
+            sleep(0.1)
+            self.process_data = get_process_info_data(self.ticket_number)
 
         upload_process_data = self.process_data['resource_upload']
 
@@ -386,6 +539,11 @@ class JobStatus(APIView):
                         data={
                             'status_code': upload_process_data['status_code'], 'message': upload_process_data['message']},
                         status=status.HTTP_200_OK)
+            # The job is running in another server process or on a job worker
+            return self._cancel_queued_job('resource_upload', 'Upload') or Response(
+                data={
+                    'status_code': upload_process_data['status_code'], 'message': upload_process_data['message']},
+                status=status.HTTP_200_OK)
         # If upload is finished then don't attempt to cancel subprocess
         else:
             return Response(
@@ -409,11 +567,11 @@ class JobStatus(APIView):
 
         # Wait until the spawned off process has started to cancel the transfer
         while process_data['resource_transfer_in']['function_process_id'] is None:
-            try:
-                process_data = get_process_info_data(self.ticket_number)
-            except json.decoder.JSONDecodeError:
-                # Pass while the process_info file is being written to
-                pass
+            cancelled_response = self._cancel_queued_job('resource_transfer_in', 'Transfer')
+            if cancelled_response:
+                return cancelled_response
+            sleep(0.1)
+            process_data = get_process_info_data(self.ticket_number)
 
         transfer_process_data = process_data['resource_transfer_in']
 
@@ -434,9 +592,49 @@ class JobStatus(APIView):
                         data={
                             'status_code': transfer_process_data['status_code'], 'message': transfer_process_data['message']},
                         status=status.HTTP_200_OK)
+            # The job is running in another server process or on a job worker
+            return self._cancel_queued_job('resource_transfer_in', 'Transfer') or Response(
+                data={
+                    'status_code': transfer_process_data['status_code'], 'message': transfer_process_data['message']},
+                status=status.HTTP_200_OK)
         # If transfer is finished then don't attempt to cancel subprocess
         else:
             return Response(
                 data={
                     'status_code': transfer_process_data['status_code'], 'message': transfer_process_data['message']},
                 status=status.HTTP_406_NOT_ACCEPTABLE)
+
+    def _queue_position(self, action):
+        """
+        Get the place in the job queue of the job's action if it hasn't started yet.
+
+        Returns
+        -------
+        A dictionary with the 'queue_position' and 'estimated_start_time' of a waiting job, or
+        an empty dictionary if the job isn't waiting.
+        """
+        return get_job_queue().get_position(self.ticket_number, action) or {}
+
+    def _cancel_queued_job(self, action, job_name):
+        """
+        Take the job's action out of the job queue if it hasn't started yet, or ask whoever runs
+        it to kill it, and mark it as cancelled.
+
+        Returns
+        -------
+        The response for the cancelled job, or None if the job isn't in the queue.
+        """
+        job_queue = get_job_queue()
+        if not job_queue.cancel(self.ticket_number, action) and \
+                not job_queue.request_cancel(self.ticket_number, action):
+            return None
+
+        process_data = get_process_info_data(self.ticket_number)[action]
+        process_data['status'] = 'failed'
+        process_data['message'] = '{} was cancelled by the user'.format(job_name)
+        process_data['status_code'] = '499'
+        process_data['expiration'] = str(timezone.now() + relativedelta(hours=1))
+        update_or_create_process_info(process_data, action, self.ticket_number)
+        return Response(
+            data={'status_code': process_data['status_code'], 'message': process_data['message']},
+            status=status.HTTP_200_OK)
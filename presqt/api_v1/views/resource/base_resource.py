@@ -1,12 +1,15 @@
+import asyncio
 import os
 import shutil
-import zipfile
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from uuid import uuid4
 
 import bagit
 from dateutil.relativedelta import relativedelta
+from django.conf import settings
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_protect
@@ -27,17 +30,26 @@ from presqt.api_v1.utilities import (target_validation, transfer_target_validati
                                      keyword_action_validation,
                                      automatic_keywords, update_targets_keywords, manual_keywords,
                                      get_target_data, get_keyword_support,
-                                     update_or_create_process_info, get_user_email_opt,
+                                     update_or_create_process_info, get_process_info_data,
+                                     get_user_email_opt,
                                      fairshare_evaluator_validation, fairshare_results)
 from presqt.api_v1.utilities.fixity import download_fixity_checker
+from presqt.api_v1.utilities.fixity.bag_manifests import (make_bag_from_digests,
+                                                           make_bag_tag_files)
+from presqt.api_v1.utilities.multiprocess.job_payload import get_job_attributes
+from presqt.api_v1.utilities.utils.transfer_pipeline import TransferPipeline
 from presqt.api_v1.utilities.metadata.download_metadata import validate_metadata
 from presqt.api_v1.utilities.validation.bagit_validation import validate_bag
 from presqt.api_v1.utilities.validation.file_validation import file_validation
 from presqt.api_v1.utilities.utils.send_email import email_blaster
 from presqt.json_schemas.schema_handlers import schema_validator
-from presqt.utilities import (PresQTValidationError, PresQTResponseException, write_file,
-                              zip_directory, read_file, update_process_info_message,
-                              increment_process_info, PresQTError)
+from presqt.targets.utilities import get_spool_file_digests, respool_file, upload_total_files
+from presqt.utilities import (PresQTValidationError, PresQTResponseException, move_file,
+                              update_process_info_message, update_process_info,
+                              increment_process_info, PresQTError, ProgressReporter,
+                              TransferCheckpoint, ZipStream, CompressionPolicy, extract_zip,
+                              save_uploaded_file, get_job_store)
+from presqt.utilities.job_store.transfer_checkpoint import CHECKPOINT_EXCLUDED
 
 
 class BaseResource(APIView):
@@ -84,14 +96,6 @@ class BaseResource(APIView):
             "error": "PresQT Error: The file provided, 'presqt-file', is not a zip file."
         }
         or
-        {
-            "error": "PresQT Error: The file provided is not in BagIt format."
-        }
-        or
-        {
-            "error": "PresQT Error: Checksums failed to validate."
-        }
-        or
         {
             "error": "PresQT Error: 'presqt-file-duplicate-action' missing in the request headers."
         }
@@ -211,8 +215,6 @@ class BaseResource(APIView):
             return Response(data={'error': e.data}, status=e.status_code)
 
         self.ticket_number = hash_tokens(self.destination_token)
-        ticket_path = os.path.join('mediafiles', 'jobs', str(self.ticket_number))
-
         self.ticket_path = os.path.join('mediafiles', 'jobs', str(self.ticket_number), 'upload')
 
         # Remove any resources that already exist in this user's job directory
@@ -220,6 +222,22 @@ class BaseResource(APIView):
             for folder in next(os.walk(self.ticket_path))[1]:
                 shutil.rmtree(os.path.join(self.ticket_path, folder))
 
+        # Save the zip file for the upload job, which extracts it and validates the bag so the
+        # request doesn't wait on either.
+        self.upload_zip_path = os.path.join(self.ticket_path, 'upload.zip')
+        save_uploaded_file(resource, self.upload_zip_path)
+
+        return self.start_upload_job()
+
+    def start_upload_job(self):
+        """
+        Start the job that extracts the zip file saved at self.upload_zip_path, validates the bag
+        inside of it and uploads the resources to the target.
+
+        Returns
+        -------
+        Response object in JSON format
+        """
         # Write process_info.json file
         self.process_info_obj = {
             'presqt-destination-token': hash_tokens(self.destination_token),
@@ -235,56 +253,11 @@ class BaseResource(APIView):
         self.process_info_path = update_or_create_process_info(
             self.process_info_obj, self.action, self.ticket_number)
 
-        # Save files to disk and check their fixity integrity. If BagIt validation fails, attempt
-        # to save files to disk again. If BagIt validation fails after 3 attempts return an error.
-        for index in range(3):
-            # Extract each file in the zip file to disk
-            with zipfile.ZipFile(resource) as myzip:
-                myzip.extractall(self.ticket_path)
-
-            try:
-                self.base_directory_name = next(os.walk(self.ticket_path))[1][0]
-            except IndexError:
-                self.process_info_obj['status'] = 'failure'
-                self.process_info_obj['expiration'] = str(timezone.now())
-                self.process_info_obj['status_code'] = 400
-                self.process_info_obj['message'] = 'PresQT Error: Bag is not formatted properly.'
-                self.process_info_path = update_or_create_process_info(
-                    self.process_info_obj, self.action, self.ticket_number)
-                return Response(data={'error': 'PresQT Error: Bag is not formatted properly.'}, status=status.HTTP_400_BAD_REQUEST)
-
-            self.resource_main_dir = os.path.join(self.ticket_path, self.base_directory_name)
-
-            # Validate the 'bag' and check for checksum mismatches
-            try:
-                self.bag = bagit.Bag(self.resource_main_dir)
-                validate_bag(self.bag)
-            except PresQTValidationError as e:
-                shutil.rmtree(self.ticket_path)
-                # If we've reached the maximum number of attempts then return an error response
-                if index == 2:
-                    return Response(data={'error': 'PresQT Error: {}'.format(e.data)}, status=e.status_code)
-            except bagit.BagError as e:
-                shutil.rmtree(self.ticket_path)
-                # If we've reached the maximum number of attempts then return an error response
-                if index == 2:
-                    return Response(data={'error': 'PresQT Error: {}'.format(e.args[0])}, status=status.HTTP_400_BAD_REQUEST)
-            else:
-                # Collect and remove any existing source metadata
-                try:
-                    get_upload_source_metadata(self, self.bag)
-                except PresQTValidationError as e:
-                    return Response(data={'error': e.data}, status=e.status_code)
-                # If the bag validated successfully then break from the loop
-                break
-
-        # Create a hash dictionary to compare with the hashes returned from the target after upload
-        # If the destination target supports a hash provided by the bag then use those hashes
-        # otherwise create new hashes with a target supported hash.
-        self.file_hashes, self.hash_algorithm = get_or_create_hashes_from_bag(self)
-
         # Spawn the upload_resource method separate from the request server by using multiprocess.
-        spawn_action_process(self, self._upload_resource, 'resource_upload')
+        try:
+            spawn_action_process(self, self._ingest_and_upload_resource, 'resource_upload')
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
 
         reversed_url = reverse('job_status', kwargs={'action': 'upload'})
         upload_hyperlink = self.request.build_absolute_uri(reversed_url)
@@ -293,10 +266,20 @@ class BaseResource(APIView):
                         data={'message': 'The server is processing the request.',
                               'upload_job': upload_hyperlink})
 
-    def _download_resource(self):
+    def _download_resource(self, resumed_files=None):
         """
         Downloads the resources from the target, performs a fixity check,
         zips them up in BagIt format.
+
+        Downloads write each file into the zip file as soon as it's downloaded and checked, so the
+        resource is never written to disk twice. Transfers record each file in their checkpoint
+        as soon as it's written.
+
+        Parameters
+        ----------
+        resumed_files: dict
+            Spooled copies of the files a stopped transfer had already downloaded, by their path
+            in the resource. The target uses these instead of downloading the files again.
         """
         action = 'resource_download'
 
@@ -307,15 +290,80 @@ class BaseResource(APIView):
         # Fetch the proper function to call
         func = FunctionRouter.get_function(self.source_target_name, action)
 
+        # Targets stream each file they download to this directory instead of holding it in memory
+        self.spool_directory = os.path.join(self.ticket_path, 'spool')
+
+        # The directory all files should be saved in.
+        self.resource_main_dir = os.path.join(self.ticket_path, self.base_directory_name)
+        self.payload_directory = self.resource_main_dir
+
+        # For each resource, perform fixity check, gather metadata, and move it from the spool
+        # directory into the resource directory.
+        self.fixity_info = []
+        self.download_fixity = True
+        self.download_failed_fixity = []
+        self.source_fts_metadata_actions = []
+        self.new_fts_metadata_files = []
+        self.all_keywords = []
+        self.initial_keywords = []
+        self.manual_keywords = []
+        self.enhanced_keywords = []
+        # Digests calculated while the files were spooled, keyed by their path in the resource
+        # directory. These are reused for the fixity checks and the BagIt manifests.
+        self.file_digests = {}
+        # Spooled files that were handled while the download was still running
+        processed_files = set()
+
+        # Downloads are bagged straight into the zip file that is sent to the user
+        self.download_zip = None
+        if self.action == 'resource_download':
+            os.makedirs(self.ticket_path, exist_ok=True)
+            self.download_zip = ZipStream('{}.zip'.format(self.resource_main_dir),
+                                          CompressionPolicy.for_endpoint('resource_download'))
+            self.payload_bytes = 0
+
+        # Downloaded files are processed by a separate thread, one at a time in the order they
+        # were reported. Files reported from a coroutine don't wait for it, so the event loop
+        # running the download isn't blocked by writing them to the zip file and its other
+        # downloads carry on.
+        hand_off = ThreadPoolExecutor(max_workers=1)
+        handed_off = []
+
+        def file_downloaded(resource):
+            processed_files.add(resource['file'])
+            future = hand_off.submit(self._process_downloaded_file, resource, progress_reporter)
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                future.result()
+            else:
+                handed_off.append(future)
+
+        # Progress is reported through a ProgressReporter so it isn't written for every file.
+        progress_reporter = ProgressReporter(
+            self.ticket_number, checkpoint=getattr(self, 'transfer_checkpoint', None),
+            on_file_downloaded=file_downloaded, resumed_files=resumed_files)
+        self.transfer_pipeline = None
+        if self.action == 'resource_transfer_in':
+            self.transfer_pipeline = self._start_transfer_pipeline(progress_reporter)
+
         # Fetch the resources. func_dict is in the format:
         #   {
         #       'resources': files,
         #       'empty_containers': empty_containers,
         #       'action_metadata': action_metadata
         #   }
+        # Each resource's 'file' is the path to its spooled file. Targets that can report each
+        # file as soon as it's spooled let a streaming transfer upload it right away.
         try:
-            func_dict = func(self.source_token, self.source_resource_id,
-                             self.process_info_path, self.action)
+            try:
+                func_dict = func(self.source_token, self.source_resource_id,
+                                 progress_reporter, self.action, self.spool_directory)
+            finally:
+                hand_off.shutdown(wait=True)
+                progress_reporter.flush()
+            for future in handed_off:
+                future.result()
             # If the resource is being transferred, has only one file, and that file is the
             # PresQT metadata then raise an error.
             if self.action == 'resource_transfer_in' and \
@@ -337,51 +385,29 @@ class BaseResource(APIView):
             # it's an incomplete/failed directory.
             self.process_info_obj['expiration'] = str(timezone.now() + relativedelta(hours=1))
             update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+            shutil.rmtree(self.spool_directory, ignore_errors=True)
+            if self.transfer_pipeline:
+                self.transfer_pipeline.abort()
+            if self.download_zip:
+                self.download_zip.close()
+                os.remove('{}.zip'.format(self.resource_main_dir))
 
             return False
 
-        # Get the latest contents of the job's process_info.json file
-        self.process_info_obj = read_file(self.process_info_path, True)[self.action]
+        # Get the latest process info of the job
+        self.process_info_obj = get_process_info_data(self.ticket_number)[self.action]
 
-        # The directory all files should be saved in.
-        self.resource_main_dir = os.path.join(self.ticket_path, self.base_directory_name)
         update_process_info_message(self.process_info_path, self.action,
                                     'Performing fixity checks and gathering metadata...')
 
         self.extra_metadata = func_dict['extra_metadata']
-        # For each resource, perform fixity check, gather metadata, and save it to disk.
-        fixity_info = []
-        self.download_fixity = True
-        self.download_failed_fixity = []
-        self.source_fts_metadata_actions = []
-        self.new_fts_metadata_files = []
-        self.all_keywords = []
-        self.initial_keywords = []
-        self.manual_keywords = []
-        self.enhanced_keywords = []
         for resource in func_dict['resources']:
-            # Perform the fixity check and add extra info to the returned fixity object.
-            # Note: This method of calling the function needs to stay this way for test Mock
-            fixity_obj, self.download_fixity = download_fixity_checker.download_fixity_checker(
-                resource)
-            fixity_info.append(fixity_obj)
-
-            if not fixity_obj['fixity']:
-                self.download_failed_fixity.append(resource['path'])
-
-            # Create metadata for this resource or validate the metadata file
-            if resource['title'] == 'PRESQT_FTS_METADATA.json':
-                is_valid = validate_metadata(self, resource)
-                if not is_valid:
-                    resource['path'] = resource['path'].replace('PRESQT_FTS_METADATA.json',
-                                                                'INVALID_PRESQT_FTS_METADATA.json')
-                    create_download_metadata(self, resource, fixity_obj)
-                    write_file('{}{}'.format(self.resource_main_dir,
-                                             resource['path']), resource['file'])
-            else:
-                create_download_metadata(self, resource, fixity_obj)
-                write_file('{}{}'.format(self.resource_main_dir,
-                                         resource['path']), resource['file'])
+            if resource['file'] not in processed_files:
+                self._process_downloaded_file(resource, progress_reporter)
+        progress_reporter.flush()
+
+        # Anything left in the spool directory (e.g. valid FTS metadata files) isn't written.
+        shutil.rmtree(self.spool_directory, ignore_errors=True)
 
         # Enhance the source keywords
         self.keyword_dict = {}
@@ -432,14 +458,23 @@ class BaseResource(APIView):
                 container_path += '/'
             if container_path[0] != '/':
                 container_path = '/' + container_path
-            os.makedirs(os.path.dirname('{}{}'.format(self.resource_main_dir, container_path)))
+            if self.download_zip:
+                self.download_zip.write_directory('{}/data{}'.format(self.base_directory_name,
+                                                                     container_path))
+                continue
+            os.makedirs(os.path.dirname('{}{}'.format(self.payload_directory, container_path)),
+                        exist_ok=bool(self.transfer_pipeline))
+            if self.transfer_pipeline:
+                self.transfer_pipeline.add_empty_container(container_path)
 
         # If we are transferring the downloaded resource then bag it for the resource_upload method
         if self.action == 'resource_transfer_in':
             self.action_metadata['destinationTargetName'] = self.destination_target_name
 
-            # Make a BagIt 'bag' of the resources.
-            bagit.make_bag(self.resource_main_dir, checksums=['md5', 'sha1', 'sha256', 'sha512'])
+            # Make a BagIt 'bag' of the resources. A streaming transfer wrote them straight into
+            # the bag's data directory.
+            self.bag = make_bag_from_digests(self.resource_main_dir, self.file_digests,
+                                             move_payload=not self.transfer_pipeline)
             self.process_info_obj['download_status'] = get_action_message(self, 'Download',
                                                                           self.download_fixity, True,
                                                                           self.action_metadata)
@@ -457,19 +492,24 @@ class BaseResource(APIView):
             self.process_info_obj['message'] = get_action_message(self, 'Download', self.download_fixity,
                                                                   metadata_validation, self.action_metadata)
 
-            # Make a BagIt 'bag' of the resources.
-            bagit.make_bag(self.resource_main_dir, checksums=['md5', 'sha1', 'sha256', 'sha512'])
+            # Finish the BagIt 'bag' in the zip file. The payload files are already in it.
+            for tag_file_path, contents in make_bag_tag_files(self.file_digests,
+                                                              self.payload_bytes):
+                self.download_zip.write_bytes(
+                    contents, '{}/{}'.format(self.base_directory_name, tag_file_path))
 
             # Write metadata file.
-            write_file(os.path.join(self.resource_main_dir, 'PRESQT_FTS_METADATA.json'),
-                       final_fts_metadata_data, True)
+            self.download_zip.write_bytes(
+                json.dumps(final_fts_metadata_data, indent=4),
+                '{}/PRESQT_FTS_METADATA.json'.format(self.base_directory_name))
 
-            # Add the fixity file to the disk directory
-            write_file(os.path.join(self.resource_main_dir, 'fixity_info.json'), fixity_info, True)
+            # Add the fixity file to the zip file
+            self.download_zip.write_bytes(
+                json.dumps(self.fixity_info, indent=4),
+                '{}/fixity_info.json'.format(self.base_directory_name))
 
-            # Zip the BagIt 'bag' to send forward.
-            zip_directory(self.resource_main_dir, "{}.zip".format(self.resource_main_dir),
-                          self.ticket_path)
+            self.download_zip.write_empty_directories()
+            self.download_zip.close()
 
             # Everything was a success so update the server metadata file.
             self.process_info_obj['status_code'] = '200'
@@ -494,6 +534,151 @@ class BaseResource(APIView):
 
         return True
 
+    def _process_downloaded_file(self, resource, progress_reporter):
+        """
+        Perform the fixity check of a downloaded file, gather its metadata and move it from the
+        spool directory into the resource directory, or into the zip file of a download. A
+        transfer then records it in its checkpoint, and a streaming transfer queues it to be
+        uploaded.
+
+        Parameters
+        ----------
+        resource: dict
+            The file's resource dictionary, in the format download functions return them in
+        progress_reporter: ProgressReporter
+            The job's progress reporter
+        """
+        file_digests = get_spool_file_digests(resource['file'])
+        # Perform the fixity check and add extra info to the returned fixity object.
+        # Note: This method of calling the function needs to stay this way for test Mock
+        fixity_obj, self.download_fixity = download_fixity_checker.download_fixity_checker(
+            resource, file_digests)
+        self.fixity_info.append(fixity_obj)
+
+        if not fixity_obj['fixity']:
+            self.download_failed_fixity.append(resource['path'])
+
+        # Create metadata for this resource or validate the metadata file
+        if resource['title'] == 'PRESQT_FTS_METADATA.json':
+            if validate_metadata(self, resource):
+                return
+            resource['path'] = resource['path'].replace('PRESQT_FTS_METADATA.json',
+                                                        'INVALID_PRESQT_FTS_METADATA.json')
+        create_download_metadata(self, resource, fixity_obj)
+        self.file_digests[resource['path']] = file_digests
+        if self.download_zip:
+            self.payload_bytes += os.path.getsize(resource['file'])
+            self.download_zip.write_file(resource['file'], '{}/data{}'.format(
+                self.base_directory_name, resource['path']))
+            os.remove(resource['file'])
+            return
+
+        file_path = '{}{}'.format(self.payload_directory, resource['path'])
+        move_file(resource['file'], file_path)
+        progress_reporter.record_downloaded(resource['path'], file_path, file_digests)
+
+        if self.transfer_pipeline:
+            self.transfer_pipeline.put(file_path, resource['path'])
+
+    def _start_transfer_pipeline(self, progress_reporter):
+        """
+        Start uploading the files of a transfer while they are downloaded, if the destination
+        target can. Transfers into an existing resource, into targets with a finite depth, and
+        resumed transfers that already uploaded into the destination are uploaded once the
+        download has finished instead.
+
+        Parameters
+        ----------
+        progress_reporter: ProgressReporter
+            The transfer's progress reporter
+
+        Returns
+        -------
+        The TransferPipeline, or None if the transfer doesn't stream.
+        """
+        checkpoint = self.transfer_checkpoint
+        upload_stream = getattr(FunctionRouter, '{}_resource_upload_stream'.format(
+            self.destination_target_name), None)
+        if not settings.TRANSFER_STREAMING or upload_stream is None \
+                or self.destination_resource_id or self.infinite_depth is False \
+                or checkpoint.destination_resource_id or checkpoint.uploaded_files():
+            return None
+
+        try:
+            upload_stream = upload_stream(self.destination_token, progress_reporter, self.action)
+        except PresQTResponseException:
+            # The upload after the download reports the error
+            return None
+
+        # Files are downloaded straight into the bag's data directory
+        self.payload_directory = os.path.join(self.resource_main_dir, 'data')
+        checkpoint.start_upload(self.payload_directory)
+        return TransferPipeline(upload_stream, settings.TRANSFER_STREAM_QUEUE_SIZE)
+
+    def _ingest_and_upload_resource(self):
+        """
+        Extract the zip file of an upload and validate the bag inside of it, then upload the
+        resources to the target.
+        """
+        if self._ingest_upload():
+            self._upload_resource()
+
+    def _ingest_upload(self):
+        """
+        Extract the zip file of an upload and validate the bag inside of it.
+
+        Returns
+        -------
+        True if the bag is valid, False if the upload failed.
+        """
+        # Write the process id to the process_info file
+        self.process_info_obj['function_process_id'] = self.function_process.pid
+        update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+
+        try:
+            # Extract each file in the zip file to disk
+            extract_zip(self.upload_zip_path, self.ticket_path, settings.UPLOAD_MAX_BYTES,
+                        settings.UPLOAD_MAX_FILES, settings.UPLOAD_MAX_COMPRESSION_RATIO)
+            # Upload jobs aren't run again if they lose their runner (JOB_QUEUE_MAX_ATTEMPTS),
+            # so the zip file isn't needed anymore
+            os.remove(self.upload_zip_path)
+
+            try:
+                self.base_directory_name = next(os.walk(self.ticket_path))[1][0]
+            except IndexError:
+                raise PresQTValidationError('PresQT Error: Bag is not formatted properly.',
+                                            status.HTTP_400_BAD_REQUEST)
+            self.resource_main_dir = os.path.join(self.ticket_path, self.base_directory_name)
+
+            # Validate the 'bag' and check for checksum mismatches
+            try:
+                self.bag = bagit.Bag(self.resource_main_dir)
+                validate_bag(self.bag, workers=settings.UPLOAD_VALIDATION_WORKERS)
+            except PresQTValidationError as e:
+                raise PresQTValidationError('PresQT Error: {}'.format(e.data), e.status_code)
+            except bagit.BagError as e:
+                raise PresQTValidationError('PresQT Error: {}'.format(e.args[0]),
+                                            status.HTTP_400_BAD_REQUEST)
+
+            # Collect and remove any existing source metadata
+            get_upload_source_metadata(self, self.bag)
+        except PresQTValidationError as e:
+            self.process_info_obj['status_code'] = e.status_code
+            self.process_info_obj['status'] = 'failed'
+            self.process_info_obj['message'] = e.data
+            # Update the expiration from 5 hours to 1 hour from now. We can delete this faster
+            # because it's an incomplete/failed directory.
+            self.process_info_obj['expiration'] = str(timezone.now() + relativedelta(hours=1))
+            update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+            shutil.rmtree(self.ticket_path, ignore_errors=True)
+            return False
+
+        # Create a hash dictionary to compare with the hashes returned from the target after upload
+        # If the destination target supports a hash provided by the bag then use those hashes
+        # otherwise create new hashes with a target supported hash.
+        self.file_hashes, self.hash_algorithm = get_or_create_hashes_from_bag(self)
+        return True
+
     def _upload_resource(self):
         """
         Upload resources to the target and perform a fixity check on the resulting hashes.
@@ -502,9 +687,11 @@ class BaseResource(APIView):
         # This doesn't happen during an upload, so it won't be an error. If there is an error during
         # transfer this will be overwritten.
         self.keyword_enhancement_successful = True
-        # Write the process id to the process_info file
+        # Write the process id to the process_info file. Only this field is written since a
+        # streaming transfer is still counting uploaded files in the process info.
         self.process_info_obj['function_process_id'] = self.function_process.pid
-        update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+        get_job_store().update_action(str(self.ticket_number), self.action,
+                                      {'function_process_id': self.function_process.pid})
 
         # Data directory in the bag
         self.data_directory = '{}/data'.format(self.resource_main_dir)
@@ -577,26 +764,67 @@ class BaseResource(APIView):
         #        'file_metadata_list': file_metadata_list,
         #        'project_id': title
         #    }
+        upload_directory = self.data_directory
+        destination_resource_id = self.destination_resource_id
+        checkpoint = getattr(self, 'transfer_checkpoint', None)
+        # Files a resumed transfer already uploaded are kept out of the upload directory
+        set_aside_uploaded_files = nullcontext()
+        transfer_pipeline = getattr(self, 'transfer_pipeline', None)
+        if transfer_pipeline:
+            # The files were uploaded as they were downloaded. Only the last ones are left.
+            progress_reporter = transfer_pipeline.upload_stream.progress_reporter
+            update_process_info(progress_reporter, upload_total_files(upload_directory),
+                                self.action, 'upload')
+        elif checkpoint:
+            if checkpoint.stage == 'uploading':
+                # Resume the upload. Files that already reached the destination aren't sent
+                # again, and a resource the last attempt created is uploaded into instead of
+                # creating another. The rest are uploaded with the user's file_duplicate_action.
+                set_aside_uploaded_files = checkpoint.set_aside_uploaded_files()
+                if not destination_resource_id and checkpoint.destination_resource_id:
+                    destination_resource_id = checkpoint.destination_resource_id
+                    folders = next(os.walk(upload_directory))[1]
+                    if folders:
+                        upload_directory = os.path.join(upload_directory, folders[0])
+            else:
+                checkpoint.start_upload('{}/data'.format(self.resource_main_dir))
+
+        if not transfer_pipeline:
+            # Progress is reported through a ProgressReporter so it isn't written for every file.
+            progress_reporter = ProgressReporter(self.ticket_number, checkpoint=checkpoint)
         try:
             structure_validation(self)
-            self.func_dict = func(self.destination_token, self.destination_resource_id,
-                                  self.data_directory, self.hash_algorithm, self.file_duplicate_action,
-                                  self.process_info_path, self.action)
+            with set_aside_uploaded_files:
+                progress_reporter.update(self.action, {'upload_total_bytes': sum(
+                    os.path.getsize(os.path.join(path, name))
+                    for path, folders, files in os.walk(upload_directory) for name in files)})
+                try:
+                    if transfer_pipeline:
+                        self.func_dict = transfer_pipeline.finish(self.hash_algorithm)
+                    else:
+                        self.func_dict = func(self.destination_token, destination_resource_id,
+                                              upload_directory, self.hash_algorithm,
+                                              self.file_duplicate_action, progress_reporter,
+                                              self.action)
+                finally:
+                    progress_reporter.flush()
         except PresQTResponseException as e:
+            if transfer_pipeline:
+                transfer_pipeline.abort()
             # Catch any errors that happen within the target fetch.
-            # Update the server process_info file appropriately.
-            self.process_info_obj['status_code'] = e.status_code
-            self.process_info_obj['status'] = 'failed'
+            # Update the server process_info file appropriately. Only the failure is written so
+            # the upload progress recorded since the process info was read is kept.
+            failure = {'status_code': e.status_code, 'status': 'failed', 'message': e.data,
+                       # Update the expiration from 5 hours to 1 hour from now. We can delete
+                       # this faster because it's an incomplete/failed directory.
+                       'expiration': str(timezone.now() + relativedelta(hours=1))}
             if self.action == 'resource_transfer_in':
-                self.process_info_obj['upload_status'] = 'failed'
-            self.process_info_obj['message'] = e.data
-            # Update the expiration from 5 hours to 1 hour from now. We can delete this faster
-            # because it's an incomplete/failed directory.
-            self.process_info_obj['expiration'] = str(timezone.now() + relativedelta(hours=1))
-            update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
+                failure['upload_status'] = 'failed'
+            get_job_store().update_action(str(self.ticket_number), self.action, failure)
+            self.process_info_obj.update(failure)
             return False
 
-        self.process_info_obj = read_file(self.process_info_path, True)[self.action]
+        self.process_info_obj = get_process_info_data(self.ticket_number)[self.action]
 
         # Check if fixity has failed on any files during a transfer. If so, update the
         # process_info_data file.
@@ -733,8 +961,15 @@ class BaseResource(APIView):
             for folder in next(os.walk(self.ticket_path))[1]:
                 shutil.rmtree(os.path.join(self.ticket_path, folder))
 
+        # Start a new checkpoint so the transfer can be resumed if it's stopped
+        TransferCheckpoint(self.ticket_path).record_request(
+            get_job_attributes(self, CHECKPOINT_EXCLUDED))
+
         # Spawn the transfer_resource method separate from the request server by using multiprocess.
-        spawn_action_process(self, self._transfer_resource, self.action)
+        try:
+            spawn_action_process(self, self._transfer_resource, self.action)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
 
         reversed_url = reverse('job_status', kwargs={'action': 'transfer'})
         transfer_hyperlink = self.request.build_absolute_uri(reversed_url)
@@ -746,30 +981,59 @@ class BaseResource(APIView):
     def _transfer_resource(self):
         """
         Transfer resources from the source target to the destination target.
+
+        Progress is recorded in the transfer's checkpoint. A resumed transfer whose download had
+        finished skips straight to the upload, otherwise only the files the stopped download
+        didn't finish are downloaded.
         """
         # Write the process id to the process_info file
         self.process_info_obj['function_process_id'] = self.function_process.pid
         update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
 
-        ####### DOWNLOAD THE RESOURCES #######
-        download_status = self._download_resource()
+        self.transfer_checkpoint = TransferCheckpoint(self.ticket_path)
+        if self.transfer_checkpoint.download_finished:
+            # The attributes saved after the download were restored when the transfer resumed
+            self.transfer_pipeline = None
+            self.bag = bagit.Bag(self.resource_main_dir)
+            # Finite depth targets zip the bag again for the upload
+            shutil.rmtree(os.path.join(self.ticket_path, 'zip_format'), ignore_errors=True)
+        else:
+            # Keep the files a stopped download had finished so they aren't downloaded again,
+            # and remove anything else it left behind
+            spool_directory = os.path.join(self.ticket_path, 'spool')
+            shutil.rmtree(spool_directory, ignore_errors=True)
+            resumed_files = {
+                path: respool_file(file_path, spool_directory, digests)
+                for path, (file_path, digests) in
+                self.transfer_checkpoint.downloaded_files().items() if os.path.isfile(file_path)}
+            for folder in next(os.walk(self.ticket_path))[1]:
+                if folder != 'spool':
+                    shutil.rmtree(os.path.join(self.ticket_path, folder))
 
-        # If download failed then don't continue
-        if not download_status:
-            return
+            ####### DOWNLOAD THE RESOURCES #######
+            download_status = self._download_resource(resumed_files)
 
-        ####### PREPARE UPLOAD FROM DOWNLOAD BAG #######
-        # Validate the 'bag' and check for checksum mismatches
-        self.bag = bagit.Bag(self.resource_main_dir)
-        try:
-            validate_bag(self.bag)
-        except PresQTValidationError as e:
-            return Response(data={'error': e.data}, status=e.status_code)
+            # If download failed then don't continue
+            if not download_status:
+                return
 
-        # Create a hash dictionary to compare with the hashes returned from the target after upload
-        # If the destination target supports a hash provided by the self. then use those hashes,
-        # otherwise create new hashes with a target supported hash.
-        self.file_hashes, self.hash_algorithm = get_or_create_hashes_from_bag(self)
+            ####### PREPARE UPLOAD FROM DOWNLOAD BAG #######
+            # The bag was built from digests calculated as the files arrived, so only its
+            # structure needs to be validated rather than hashing every file again.
+            try:
+                validate_bag(self.bag, trusted=True)
+            except PresQTValidationError as e:
+                if self.transfer_pipeline:
+                    self.transfer_pipeline.abort()
+                return Response(data={'error': e.data}, status=e.status_code)
+
+            # Create a hash dictionary to compare with the hashes returned from the target after
+            # upload. If the destination target supports a hash provided by the self. then use
+            # those hashes, otherwise create new hashes with a target supported hash.
+            self.file_hashes, self.hash_algorithm = get_or_create_hashes_from_bag(self)
+
+            self.transfer_checkpoint.record_download(
+                get_job_attributes(self, CHECKPOINT_EXCLUDED), self.file_digests)
 
         ####### UPLOAD THE RESOURCES #######
         upload_status = self._upload_resource()
@@ -833,6 +1097,9 @@ class BaseResource(APIView):
         self.process_info_obj['link_to_resource'] = self.func_dict["project_link"]
         update_or_create_process_info(self.process_info_obj, self.action, self.ticket_number)
 
+        # A finished transfer can't be resumed
+        self.transfer_checkpoint.clear()
+
         if self.email:
             context = {
                 "transfer_url": self.func_dict["project_link"],
@@ -234,7 +234,10 @@ class Resource(BaseResource):
                 shutil.rmtree(os.path.join(self.ticket_path, folder))
 
         # Spawn the upload_resource method separate from the request server by using multiprocess.
-        spawn_action_process(self, self._download_resource, 'resource_download')
+        try:
+            spawn_action_process(self, self._download_resource, 'resource_download')
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
 
         # Get the download url for zip format
         reversed_url = reverse('job_status', kwargs={
@@ -1,13 +1,12 @@
 import os
 
-from django.http import HttpResponse
 from django.utils.datastructures import MultiValueDictKeyError
 from rest_framework import status, renderers
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from presqt.api_v1.utilities import (get_process_info_data, process_token_validation,
-                                     get_process_info_action)
+                                     get_process_info_action, deliver_file)
 from presqt.utilities import PresQTValidationError
 
 
@@ -81,8 +80,7 @@ class EaasiDownload(APIView):
             zip_name = download_data['zip_name']
             zip_file_path = os.path.join('mediafiles', 'jobs', ticket_number, 'download', zip_name)
 
-            response = HttpResponse(open(zip_file_path, 'rb'), content_type='application/zip')
-            response['Content-Disposition'] = 'attachment; filename={}'.format(zip_name)
+            response = deliver_file(request, zip_file_path, zip_name)
         else:
             response = Response(data={'message': 'File unavailable.'}, status=status.HTTP_404_NOT_FOUND)
         return response
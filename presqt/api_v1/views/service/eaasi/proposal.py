@@ -9,8 +9,8 @@ from rest_framework.reverse import reverse
 from rest_framework import status, renderers
 
 from presqt.api_v1.utilities import (get_process_info_data, get_source_token, hash_tokens,
-                                     get_process_info_action)
-from presqt.utilities import write_file, PresQTValidationError
+                                     get_process_info_action, update_or_create_process_info)
+from presqt.utilities import PresQTValidationError
 
 
 class Proposals(APIView):
@@ -67,7 +67,7 @@ class Proposals(APIView):
         # Create a one time use token for EaaSI to use.
         eaasi_token = str(uuid4())
         download_data['eaasi_token'] = eaasi_token
-        write_file('mediafiles/jobs/{}/process_info.json'.format(ticket_number), process_info_data, True)
+        update_or_create_process_info(download_data, 'resource_download', ticket_number)
 
         # Build EaaSI download endpoint url
         eaasi_download_reverse = reverse('eaasi_download', kwargs={"ticket_number": ticket_number})
@@ -0,0 +1,396 @@
+import os
+import shutil
+from uuid import uuid4
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status, renderers
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
+
+from presqt.api_v1.utilities import (get_destination_token, file_duplicate_action_validation,
+                                     get_user_email_opt, target_validation, hash_tokens,
+                                     update_or_create_process_info, get_upload_length,
+                                     get_upload_offset, get_upload_checksum, get_upload_session,
+                                     upload_job_validation)
+from presqt.api_v1.views.resource.base_resource import BaseResource
+from presqt.utilities import PresQTValidationError, get_job_store, write_chunk, chunk_lock
+
+
+class UploadSessionCollection(APIView):
+    """
+    **Supported HTTP Methods**
+
+    * POST: Open a session to upload a BagIt zip file in chunks.
+    """
+    renderer_classes = [renderers.JSONRenderer]
+
+    def post(self, request, target_name, resource_id=None):
+        """
+        Open a resumable upload session for a zip file of Upload-Length bytes. The chunks of the
+        file are sent to the session's PATCH method and the upload is started by its POST method.
+        Opening a session replaces any session the user already has open, but not while one of
+        the user's uploads is running or a chunk of the open session is being written.
+
+        Parameters
+        ----------
+        request : HTTP Request Object
+        target_name : str
+            The name of the Target to upload to.
+        resource_id : str
+            The id of the Resource to upload to.
+
+        Returns
+        -------
+        201: Created
+        {
+            "session_id": "9d1b2d2b8b3a4c0f9c1c4bd0a4f1a4b2",
+            "upload_offset": 0,
+            "upload_length": 1048576,
+            "upload_session": "https://localhost/api_v1/upload_sessions/9d1b2d2b8b3a4c0f9c1c4bd0a4f1a4b2/"
+        }
+
+        400: Bad Request
+        {
+            "error": "PresQT Error: 'Upload-Length' missing in the request headers."
+        }
+        or
+        {
+            "error": "PresQT Error: 'Upload-Length' must be a whole number of bytes."
+        }
+        or
+        {
+            "error": "PresQT Error: 'presqt-destination-token' missing in the request headers."
+        }
+        or
+        {
+            "error": "PresQT Error: 'new_target' does not support the action 'resource_upload'."
+        }
+
+        404: Not Found
+        {
+            "error": "PresQT Error: 'bad_name' is not a valid Target name."
+        }
+
+        409: Conflict
+        {
+            "error": "PresQT Error: An upload is already in progress. Wait for it to finish or cancel it before starting another."
+        }
+        or
+        {
+            "error": "PresQT Error: Another chunk of the file is being written."
+        }
+
+        413: Request Entity Too Large
+        {
+            "error": "PresQT Error: The upload is 1099511627776 bytes, more than the 53687091200 allowed."
+        }
+        """
+        try:
+            destination_token = get_destination_token(request)
+            file_duplicate_action = file_duplicate_action_validation(request)
+            email = get_user_email_opt(request)
+            target_validation(target_name, 'resource_upload')
+            upload_length = get_upload_length(request)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        if upload_length > settings.UPLOAD_MAX_BYTES:
+            return Response(
+                data={'error': "PresQT Error: The upload is {} bytes, more than the {} "
+                               "allowed.".format(upload_length, settings.UPLOAD_MAX_BYTES)},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        ticket_number = hash_tokens(destination_token)
+        ticket_path = os.path.join('mediafiles', 'jobs', str(ticket_number), 'upload')
+        try:
+            upload_job_validation(ticket_number)
+            # Remove any resources and partial uploads that already exist in this user's job
+            # directory, unless a chunk of the open session is still being written
+            with chunk_lock(os.path.join(ticket_path, 'upload.zip')):
+                shutil.rmtree(ticket_path, ignore_errors=True)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+        os.makedirs(ticket_path)
+
+        session_id = uuid4().hex
+        update_or_create_process_info({
+            'presqt-destination-token': ticket_number,
+            'session_id': session_id,
+            'status': 'in_progress',
+            'expiration': str(timezone.now() + relativedelta(
+                hours=settings.UPLOAD_SESSION_EXPIRATION_HOURS)),
+            'upload_length': upload_length,
+            'upload_offset': 0,
+            'target_name': target_name,
+            'resource_id': resource_id,
+            'file_duplicate_action': file_duplicate_action,
+            'email': email
+        }, 'upload_session', ticket_number)
+
+        session_hyperlink = request.build_absolute_uri(
+            reverse('upload_session', kwargs={'session_id': session_id}))
+        response = Response(status=status.HTTP_201_CREATED,
+                            data={'session_id': session_id,
+                                  'upload_offset': 0,
+                                  'upload_length': upload_length,
+                                  'upload_session': session_hyperlink})
+        response['Location'] = session_hyperlink
+        response['Upload-Offset'] = '0'
+        return response
+
+
+class UploadSession(BaseResource):
+    """
+    **Supported HTTP Methods**
+
+    * HEAD: Get how much of the file the session has received.
+    * PATCH: Write a chunk of the file.
+    * POST: Start the upload once the whole file has been received.
+    * DELETE: Abort the session and remove the partial file.
+    """
+    renderer_classes = [renderers.JSONRenderer]
+
+    def head(self, request, session_id):
+        """
+        Get how much of the file the upload session has received.
+
+        Parameters
+        ----------
+        request : HTTP Request Object
+        session_id : str
+            The id of the upload session.
+
+        Returns
+        -------
+        200: OK
+        The Upload-Offset and Upload-Length headers.
+
+        400: Bad Request
+        {
+            "error": "PresQT Error: 'presqt-destination-token' missing in the request headers."
+        }
+
+        404: Not Found
+        {
+            "error": "PresQT Error: Invalid upload session, 'bad_session_id'."
+        }
+        """
+        try:
+            upload_session = get_upload_session(
+                hash_tokens(get_destination_token(request)), session_id)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        response = Response(status=status.HTTP_200_OK)
+        response['Upload-Offset'] = str(upload_session['upload_offset'])
+        response['Upload-Length'] = str(upload_session['upload_length'])
+        response['Cache-Control'] = 'no-store'
+        return response
+
+    def patch(self, request, session_id):
+        """
+        Write a chunk of the file at the Upload-Offset header. The body of the request is the
+        chunk and the Upload-Checksum header holds its algorithm and base64 encoded digest. A
+        chunk that fails can be sent again at the same offset.
+
+        Parameters
+        ----------
+        request : HTTP Request Object
+        session_id : str
+            The id of the upload session.
+
+        Returns
+        -------
+        204: No Content
+        The Upload-Offset header holds the offset after the chunk.
+
+        400: Bad Request
+        {
+            "error": "PresQT Error: 'Upload-Checksum' missing in the request headers."
+        }
+        or
+        {
+            "error": "PresQT Error: The chunk ended after 100 of its 200 bytes."
+        }
+
+        404: Not Found
+        {
+            "error": "PresQT Error: Invalid upload session, 'bad_session_id'."
+        }
+
+        409: Conflict
+        {
+            "error": "PresQT Error: 'Upload-Offset' is 100 but the session is at 0."
+        }
+
+        413: Request Entity Too Large
+        {
+            "error": "PresQT Error: The chunk ends past the 100 bytes of the upload."
+        }
+
+        460: Checksum Mismatch
+        {
+            "error": "PresQT Error: The chunk doesn't match its Upload-Checksum."
+        }
+        """
+        try:
+            ticket_number = hash_tokens(get_destination_token(request))
+            upload_session = get_upload_session(ticket_number, session_id)
+            upload_offset = get_upload_offset(request)
+            algorithm, digest = get_upload_checksum(request)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        if upload_offset != upload_session['upload_offset']:
+            return Response(
+                data={'error': "PresQT Error: 'Upload-Offset' is {} but the session is at "
+                               "{}.".format(upload_offset, upload_session['upload_offset'])},
+                status=status.HTTP_409_CONFLICT)
+
+        chunk_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        if chunk_length > settings.UPLOAD_SESSION_MAX_CHUNK_SIZE:
+            return Response(
+                data={'error': "PresQT Error: The chunk is {} bytes, more than the {} "
+                               "allowed.".format(chunk_length,
+                                                 settings.UPLOAD_SESSION_MAX_CHUNK_SIZE)},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        if upload_offset + chunk_length > upload_session['upload_length']:
+            return Response(
+                data={'error': "PresQT Error: The chunk ends past the {} bytes of the "
+                               "upload.".format(upload_session['upload_length'])},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        upload_zip_path = os.path.join(
+            'mediafiles', 'jobs', str(ticket_number), 'upload', 'upload.zip')
+        try:
+            upload_offset = write_chunk(upload_zip_path, upload_offset, request.stream,
+                                        chunk_length, algorithm, digest)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        get_job_store().update_action(ticket_number, 'upload_session', {
+            'upload_offset': upload_offset,
+            'expiration': str(timezone.now() + relativedelta(
+                hours=settings.UPLOAD_SESSION_EXPIRATION_HOURS))
+        })
+
+        response = Response(status=status.HTTP_204_NO_CONTENT)
+        response['Upload-Offset'] = str(upload_offset)
+        return response
+
+    def post(self, request, session_id):
+        """
+        Start the upload once the whole file has been received. The bag is validated and
+        uploaded by the same job as a zip file POSTed to the Resource endpoint.
+
+        Parameters
+        ----------
+        request : HTTP Request Object
+        session_id : str
+            The id of the upload session.
+
+        Returns
+        -------
+        202: Accepted
+        {
+            "message": "The server is processing the request.",
+            "upload_job": "https://localhost/api_v1/job_status/upload/"
+        }
+
+        400: Bad Request
+        {
+            "error": "PresQT Error: 'presqt-destination-token' missing in the request headers."
+        }
+
+        404: Not Found
+        {
+            "error": "PresQT Error: Invalid upload session, 'bad_session_id'."
+        }
+
+        409: Conflict
+        {
+            "error": "PresQT Error: Only 100 of the 200 bytes of the upload have been received."
+        }
+        or
+        {
+            "error": "PresQT Error: An upload is already in progress. Wait for it to finish or cancel it before starting another."
+        }
+        """
+        try:
+            self.destination_token = get_destination_token(request)
+            self.ticket_number = hash_tokens(self.destination_token)
+            upload_session = get_upload_session(self.ticket_number, session_id)
+            upload_job_validation(self.ticket_number)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        if upload_session['upload_offset'] != upload_session['upload_length']:
+            return Response(
+                data={'error': "PresQT Error: Only {} of the {} bytes of the upload have been "
+                               "received.".format(upload_session['upload_offset'],
+                                                  upload_session['upload_length'])},
+                status=status.HTTP_409_CONFLICT)
+
+        self.request = request
+        self.action = 'resource_upload'
+        self.destination_target_name = upload_session['target_name']
+        self.destination_resource_id = upload_session['resource_id']
+        self.file_duplicate_action = upload_session['file_duplicate_action']
+        self.email = upload_session['email']
+        self.infinite_depth = target_validation(self.destination_target_name, self.action)[1]
+        self.ticket_path = os.path.join('mediafiles', 'jobs', str(self.ticket_number), 'upload')
+        self.upload_zip_path = os.path.join(self.ticket_path, 'upload.zip')
+
+        response = self.start_upload_job()
+        # The upload can be started again if the job queue was full
+        if response.status_code == status.HTTP_202_ACCEPTED:
+            get_job_store().update_action(self.ticket_number, 'upload_session',
+                                          {'status': 'finished'})
+        return response
+
+    def delete(self, request, session_id):
+        """
+        Abort the upload session and remove the part of the file it has received.
+
+        Parameters
+        ----------
+        request : HTTP Request Object
+        session_id : str
+            The id of the upload session.
+
+        Returns
+        -------
+        204: No Content
+
+        400: Bad Request
+        {
+            "error": "PresQT Error: 'presqt-destination-token' missing in the request headers."
+        }
+
+        404: Not Found
+        {
+            "error": "PresQT Error: Invalid upload session, 'bad_session_id'."
+        }
+
+        409: Conflict
+        {
+            "error": "PresQT Error: Another chunk of the file is being written."
+        }
+        """
+        try:
+            ticket_number = hash_tokens(get_destination_token(request))
+            get_upload_session(ticket_number, session_id)
+            upload_path = os.path.join('mediafiles', 'jobs', str(ticket_number), 'upload')
+            with chunk_lock(os.path.join(upload_path, 'upload.zip')):
+                get_job_store().update_action(ticket_number, 'upload_session', {
+                    'status': 'cancelled',
+                    'expiration': str(timezone.now() + relativedelta(hours=1))
+                })
+                shutil.rmtree(upload_path, ignore_errors=True)
+        except PresQTValidationError as e:
+            return Response(data={'error': e.data}, status=e.status_code)
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -7,7 +7,7 @@ import shutil
 from django.core.management import BaseCommand
 from django.utils import timezone
 
-from presqt.utilities import read_file
+from presqt.utilities import read_file, get_job_store
 
 
 class Command(BaseCommand):
@@ -29,18 +29,26 @@ class Command(BaseCommand):
             try:
                 data = read_file('{}process_info.json'.format(directory), True)
             except (FileNotFoundError, KeyError):
-                shutil.rmtree(directory)
+                self.delete_directory(directory)
                 print('{} has been deleted. No process_info.json file found'.format(directory))
             else:
                 for key, value in data.items():
                     if 'expiration' in value.keys():
                         if parse(value['expiration']) <= timezone.now() or os.environ['ENVIRONMENT'] == 'development':
-                            shutil.rmtree(directory)
+                            self.delete_directory(directory)
                             print('{} has been deleted.'.format(directory))
                             break
                 else:
                     if os.environ['ENVIRONMENT'] == 'development':
-                        shutil.rmtree(directory)
+                        self.delete_directory(directory)
                         print('{} has been deleted.'.format(directory))
                     else:
                         print('{} has been retained.'.format(directory))
+
+    @staticmethod
+    def delete_directory(directory):
+        """
+        Delete a job directory along with the job's state in the job store.
+        """
+        shutil.rmtree(directory)
+        get_job_store().delete_job(os.path.basename(os.path.normpath(directory)))
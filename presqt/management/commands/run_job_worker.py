@@ -0,0 +1,33 @@
+import signal
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from presqt.api_v1.utilities.multiprocess.job_supervisor import JobSupervisor
+
+
+class Command(BaseCommand):
+    help = 'Run resource jobs queued by the server while JOB_EXECUTION is set to "worker".'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=getattr(settings, 'JOB_WORKER_CONCURRENCY', 4),
+            help='Maximum number of jobs this worker runs at once.')
+
+    def handle(self, *args, **kwargs):
+        """
+        Claim jobs from the job queue and run them until stopped. On SIGTERM or SIGINT the
+        worker stops claiming jobs and exits once its running jobs have finished.
+        """
+        supervisor = JobSupervisor(max_jobs=kwargs['concurrency'])
+
+        def stop(signum, frame):
+            print('Job worker {} is stopping once its jobs finish.'.format(supervisor.worker_id))
+            supervisor.stop()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        print('Job worker {} is running up to {} jobs.'.format(
+            supervisor.worker_id, kwargs['concurrency']))
+        supervisor.join()
@@ -1,6 +1,7 @@
 from rest_framework import status
 
 from presqt.targets.curate_nd.classes.base import CurateNDBase
+from presqt.targets.utilities import spool_response
 
 
 class File(CurateNDBase):
@@ -41,13 +42,18 @@ class File(CurateNDBase):
         except KeyError:  # pragma: no cover
             self.md5 = None
 
-    def download(self):
+    def download(self, spool_directory):
         """
-        Download the file using the download url.
-    ​
+        Download the file using the download url and stream it to the spool directory.
+
+        Parameters
+        ----------
+        spool_directory : str
+            Path to the directory the file will be spooled to.
+
         Returns
         -------
-        The requested file in byte format and the file hash.
+        The path to the spooled file and the file hash.
         """
-        response = self.get(self.download_url)
-        return response.content, self.md5
+        response = self.get(self.download_url, stream=True)
+        return spool_response(response, spool_directory), self.md5
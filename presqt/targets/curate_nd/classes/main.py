@@ -1,11 +1,9 @@
-import requests
-
 from rest_framework import status
 
 from presqt.targets.curate_nd.classes.base import CurateNDBase
 from presqt.targets.curate_nd.classes.file import File
 from presqt.targets.curate_nd.classes.item import Item
-from presqt.targets.utilities import run_urls_async
+from presqt.targets.utilities import run_urls_async, get_http_session
 from presqt.utilities import (PresQTInvalidTokenError, PresQTResponseException, update_process_info,
                               increment_process_info)
 
@@ -32,8 +30,8 @@ class CurateND(CurateNDBase):
         """
         self.session.token_auth({'X-Api-Token': '{}'.format(token)})
         # Verify that the token provided is a valid one.
-        response = requests.get('https://curate.nd.edu/api/items?editor=self',
-                                headers={'X-Api-Token': '{}'.format(token)})
+        response = get_http_session('curate_nd').get('https://curate.nd.edu/api/items?editor=self',
+                                                     headers={'X-Api-Token': '{}'.format(token)})
         try:
             response.json()['error']
         except KeyError:
@@ -1,26 +1,28 @@
 import asyncio
-
-import aiohttp
-import requests
+import os
 
 from rest_framework import status
 
 from presqt.targets.curate_nd.utilities import get_curate_nd_resource, extra_metadata_helper
 from presqt.targets.curate_nd.classes.main import CurateND
+from presqt.targets.utilities import async_spool_response, get_async_session, run_async
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import (PresQTInvalidTokenError, PresQTValidationError,
                               get_dictionary_from_list, update_process_info, increment_process_info,
-                              update_process_info_message)
+                              update_process_info_message, report_downloaded_file,
+                              get_resumed_file)
 
 
-async def async_get(url, session, token, process_info_path, action):
+async def async_get(file, session, token, process_info_path, action, spool_directory):
     """
-    Coroutine that uses aiohttp to make a GET request. This is the method that will be called
-    asynchronously with other GETs.
+    Coroutine that uses aiohttp to make a GET request and stream the file to the job's spool
+    directory. This is the method that will be called asynchronously with other GETs.
 
     Parameters
     ----------
-    url: str
-        URL to call
+    file: dict
+        The file's dictionary. Its 'file' is the URL to call, which is replaced with the path to
+        the spooled file.
     session: ClientSession object
         aiohttp ClientSession Object
     token: str
@@ -29,44 +31,56 @@ async def async_get(url, session, token, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory the downloaded file will be spooled to
 
     Returns
     -------
-    Response JSON
+    The file's dictionary
     """
-    async with session.get(url, headers={'X-Api-Token': token}) as response:
-        assert response.status == 200
-        content = await response.read()
-        # Increment the number of files done in the process info file.
-        increment_process_info(process_info_path, action, 'download')
-        return {'url': url, 'binary_content': content}
+    # A resumed transfer hands back the files the stopped one had already downloaded
+    resumed_file = get_resumed_file(process_info_path, file)
+    if resumed_file:
+        file['file'] = resumed_file
+    else:
+        async with session.get(file['file'], headers={'X-Api-Token': token}) as response:
+            assert response.status == 200
+            file['file'] = await async_spool_response(response, spool_directory)
+    # Increment the number of files done in the process info file.
+    increment_process_info(process_info_path, action, 'download', os.path.getsize(file['file']))
+    # Hand the file over before the rest have been downloaded
+    report_downloaded_file(process_info_path, file)
+    return file
 
 
-async def async_main(url_list, token, process_info_path, action):
+async def async_main(files, token, process_info_path, action, spool_directory):
     """
     Main coroutine method that will gather the url calls to be made and will make them
     asynchronously.
 
     Parameters
     ----------
-    url_list: list
-        List of urls to call
+    files: list
+        List of file dictionaries whose 'file' is the URL to call
     token: str
         User's CurateND token
     process_info_path: str
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory the downloaded files will be spooled to
 
     Returns
     -------
     List of data brought back from each coroutine called.
     """
-    async with aiohttp.ClientSession() as session:
-        return await asyncio.gather(*[async_get(url, session, token, process_info_path, action) for url in url_list])
+    session = get_async_session('curate_nd')
+    return await asyncio.gather(*[async_get(file, session, token, process_info_path, action, spool_directory)
+                                  for file in files])
 
 
-def curate_nd_download_resource(token, resource_id, process_info_path, action):
+def curate_nd_download_resource(token, resource_id, process_info_path, action, spool_directory):
     """
     Fetch the requested resource from CurateND along with its hash information.
 
@@ -80,6 +94,8 @@ def curate_nd_download_resource(token, resource_id, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory in the job's ticket path that files should be streamed to
 
     Returns
     -------
@@ -87,7 +103,7 @@ def curate_nd_download_resource(token, resource_id, process_info_path, action):
         'resources': List of dictionary objects that each hold a file and its information.
                      Dictionary must be in the following format:
                          {
-                            'file': binary_file,
+                            'file': '/path/to/spooled/file',
                             'hashes': {'hash_algorithm': 'the_hash'},
                             'title': 'file.jpg',
                             'path': '/path/to/file',
@@ -120,7 +136,7 @@ def curate_nd_download_resource(token, resource_id, process_info_path, action):
         if type(title_url) is list:
             title_url = resource.extra['isPartOf'][0]
         # Get the title of the Project to add to sourcePath
-        project_title = requests.get(
+        project_title = get_http_session('curate_nd').get(
             title_url, headers={'X-Api-Token': '{}'.format(token)}).json()['title']
 
         # This is so we aren't missing the few extra keys that are pulled out for the PresQT payload
@@ -131,10 +147,10 @@ def curate_nd_download_resource(token, resource_id, process_info_path, action):
         # This is necessary to keep track of the progress of the request.
         update_process_info(process_info_path, 1, action, 'download')
 
-        binary_file, curate_hash = resource.download()
+        file_path, curate_hash = resource.download(spool_directory)
 
         files.append({
-            'file': binary_file,
+            'file': file_path,
             'hashes': {'md5': curate_hash},
             'title': resource.title,
             # If the file is the only resource we are downloading then we don't need it's full path.
@@ -143,7 +159,7 @@ def curate_nd_download_resource(token, resource_id, process_info_path, action):
             'extra_metadata': resource.extra})
 
         # Increment the number of files done in the process info file.
-        increment_process_info(process_info_path, action, 'download')
+        increment_process_info(process_info_path, action, 'download', os.path.getsize(file_path))
 
     else:
         if not resource.extra['containedFiles']:
@@ -154,41 +170,30 @@ def curate_nd_download_resource(token, resource_id, process_info_path, action):
             # This is necessary to keep track of the progress of the request.
             update_process_info(process_info_path, len(resource.extra['containedFiles']), action, 'download')
 
-            title_helper = {}
-            hash_helper = {}
-            file_urls = []
             project_title = resource.title
             file_metadata = []
             extra_metadata = extra_metadata_helper(resource)
 
             for file in resource.extra['containedFiles']:
-                download_url = file['downloadUrl']
                 contained_file = get_curate_nd_resource(file['id'], curate_instance)
                 file_metadata_dict = {
                     "title": contained_file.title,
                     "extra": contained_file.extra}
                 file_metadata.append(file_metadata_dict)
 
-                title_helper[download_url] = contained_file.title
-                hash_helper[download_url] = contained_file.md5
-                title_helper[file['downloadUrl']] = file['label']
-                file_urls.append(file['downloadUrl'])
-
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            download_data = loop.run_until_complete(
-                async_main(file_urls, token, process_info_path, action))
-
-            for file in download_data:
-                title = title_helper[file['url']]
-                hash = hash_helper[file['url']]
+                title = file['label']
                 files.append({
-                    'file': file['binary_content'],
-                    'hashes': {'md5': hash},
+                    'file': file['downloadUrl'],
+                    'hashes': {'md5': contained_file.md5},
                     'title': title,
                     "source_path": '/{}/{}'.format(project_title, title),
-                    'path': '/{}/{}'.format(resource.title, title),
-                    'extra_metadata': get_dictionary_from_list(file_metadata, 'title', title)['extra']})
+                    'path': '/{}/{}'.format(resource.title, title)})
+            for file in files:
+                file['extra_metadata'] = get_dictionary_from_list(
+                    file_metadata, 'title', file['title'])['extra']
+
+            # Each file's url is replaced with the path to its spooled file
+            run_async(async_main(files, token, process_info_path, action, spool_directory))
 
     return {
         'resources': files,
@@ -42,7 +42,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -82,7 +82,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -130,7 +130,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 
 def get_curate_nd_resources_by_id(token, resource_id):
@@ -16,8 +17,9 @@ def get_curate_nd_resources_by_id(token, resource_id):
     -------
     A list containing the item and it's files.
     """
-    response = requests.get('https://curate.nd.edu/api/items/{}'.format(resource_id),
-                            headers={'X-Api-Token': '{}'.format(token)})
+    response = get_http_session('curate_nd').get(
+        'https://curate.nd.edu/api/items/{}'.format(resource_id),
+        headers={'X-Api-Token': '{}'.format(token)})
 
     if response.status_code != 200:
         # We didn't find the resource.
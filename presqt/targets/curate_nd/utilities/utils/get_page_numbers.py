@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 
 def get_page_numbers(url, token):
@@ -18,7 +19,7 @@ def get_page_numbers(url, token):
     """
     headers = {"X-Api-Token": token}
 
-    pagination_info = requests.get(url, headers=headers).json()['pagination']
+    pagination_info = get_http_session('curate_nd').get(url, headers=headers).json()['pagination']
 
     next_page = None
     previous_page = None
@@ -1,26 +1,30 @@
 import asyncio
-import aiohttp
-import requests
+import os
 
 from rest_framework import status
 
 from presqt.targets.figshare.utilities.validation_check import validation_check
-from presqt.targets.figshare.utilities.helpers.download_content import download_project, download_article
+from presqt.targets.figshare.utilities.helpers.download_content import article_files
 from presqt.targets.figshare.utilities.helpers.extra_metadata_helper import extra_metadata_helper
-from presqt.utilities import (PresQTResponseException, get_dictionary_from_list,
-                              update_process_info,
-                              increment_process_info, update_process_info_message)
+from presqt.targets.figshare.utilities.helpers.project_tree import (
+    async_expand_articles, get_figshare_resource)
+from presqt.targets.utilities import (async_spool_response, get_async_session, get_http_session,
+                                     run_async, spool_response)
+from presqt.utilities import (PresQTResponseException, update_process_info,
+                              increment_process_info, update_process_info_message,
+                              report_downloaded_file, get_resumed_file)
 
 
-async def async_get(url, session, header, process_info_path, action):
+async def async_get(file, session, header, process_info_path, action, spool_directory):
     """
-    Coroutine that uses aiohttp to make a GET request. This is the method that will be called
-    asynchronously with other GETs.
+    Coroutine that uses aiohttp to make a GET request and stream the file to the job's spool
+    directory. This is the method that will be called asynchronously with other GETs.
 
     Parameters
     ----------
-    url: str
-        URL to call
+    file: dict
+        The file's dictionary. Its 'file' is the URL to call, which is replaced with the path to
+        the spooled file.
     session: ClientSession object
         aiohttp ClientSession Object
     header: str
@@ -29,44 +33,102 @@ async def async_get(url, session, header, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory the downloaded file will be spooled to
 
     Returns
     -------
-    Response JSON
+    The file's dictionary
     """
-    async with session.get(url, headers=header) as response:
-        assert response.status == 200
-        content = await response.read()
-        # Increment the number of files done in the process info file.
-        increment_process_info(process_info_path, action, 'download')
-        return {'url': url, 'binary_content': content}
-
-
-async def async_main(url_list, header, process_info_path, action):
+    # A resumed transfer hands back the files the stopped one had already downloaded
+    resumed_file = get_resumed_file(process_info_path, file)
+    if resumed_file:
+        file['file'] = resumed_file
+    else:
+        async with session.get(file['file'], headers=header) as response:
+            assert response.status == 200
+            file['file'] = await async_spool_response(response, spool_directory)
+    # Increment the number of files done in the process info file.
+    increment_process_info(process_info_path, action, 'download', os.path.getsize(file['file']))
+    # Hand the file over before the rest have been downloaded
+    report_downloaded_file(process_info_path, file)
+    return file
+
+
+async def async_main(files, header, process_info_path, action, spool_directory):
     """
     Main coroutine method that will gather the url calls to be made and will make them
     asynchronously.
 
     Parameters
     ----------
-    url_list: list
-        List of urls to call
+    files: list
+        List of file dictionaries whose 'file' is the URL to call
     header: str
         Header for request
     process_info_path: str
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory the downloaded files will be spooled to
 
     Returns
     -------
     List of data brought back from each coroutine called.
     """
-    async with aiohttp.ClientSession() as session:
-        return await asyncio.gather(*[async_get(url, session, header, process_info_path, action) for url in url_list])
+    session = get_async_session('figshare')
+    return await asyncio.gather(*[async_get(file, session, header, process_info_path, action, spool_directory)
+                                  for file in files])
+
+
+async def async_download_project(articles_url, header, project_name, process_info_path, action,
+                                 spool_directory):
+    """
+    Coroutine that expands every article of a project at the same time and starts downloading
+    an article's files as soon as its details arrive, all through one session. If a download
+    fails the rest are cancelled.
 
+    Parameters
+    ----------
+    articles_url: str
+        URL of the project's list of articles
+    header: str
+        Header for request
+    project_name : str
+        The name of the project that is being downloaded
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+    spool_directory: str
+        Path to the directory the downloaded files will be spooled to
 
-def figshare_download_resource(token, resource_id, process_info_path, action):
+    Returns
+    -------
+    List of the project's file dictionaries, with their spooled files.
+    """
+    files = []
+    downloads = []
+    session = get_async_session('figshare')
+    try:
+        async for article_data in async_expand_articles(session, header, articles_url):
+            for file in article_files(article_data, project_name, True):
+                files.append(file)
+                downloads.append(asyncio.ensure_future(async_get(
+                    file, session, header, process_info_path, action, spool_directory)))
+            # Keep the total number of files up to date as the articles arrive
+            update_process_info(process_info_path, len(files), action, 'download')
+        await asyncio.gather(*downloads)
+    except BaseException:
+        for download in downloads:
+            download.cancel()
+        await asyncio.gather(*downloads, return_exceptions=True)
+        raise
+    return files
+
+
+def figshare_download_resource(token, resource_id, process_info_path, action, spool_directory):
     """
     Fetch the requested resource from FigShare along with its hash information.
 
@@ -80,6 +142,8 @@ def figshare_download_resource(token, resource_id, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory in the job's ticket path that files should be streamed to
 
     Returns
     -------
@@ -87,7 +151,7 @@ def figshare_download_resource(token, resource_id, process_info_path, action):
         'resources': List of dictionary objects that each hold a file and its information.
                      Dictionary must be in the following format:
                          {
-                            'file': binary_file,
+                            'file': '/path/to/spooled/file',
                             'hashes': {'hash_algorithm': 'the_hash'},
                             'title': 'file.jpg',
                             'path': '/path/to/file',
@@ -108,66 +172,55 @@ def figshare_download_resource(token, resource_id, process_info_path, action):
                                       status.HTTP_401_UNAUTHORIZED)
     split_id = str(resource_id).split(":")
     extra_metadata = {}
+    empty_containers = []
+    action_metadata = {"sourceUsername": username}
 
     # But first we need to see whether it is a public project, or a private project.
-    project_url = "https://api.figshare.com/v2/account/projects/{}".format(split_id[0])
-    response = requests.get(project_url, headers=headers)
-    if response.status_code != 200:
-        # Looking for a private project was unsuccessful, try a public project.
-        project_url = "https://api.figshare.com/v2/projects/{}".format(split_id[0])
-        response = requests.get(project_url, headers=headers)
-        if response.status_code != 200:
-            # Project id is invalid
-            raise PresQTResponseException("The resource could not be found by the requesting user.",
-                                          status.HTTP_404_NOT_FOUND)
-    data = response.json()
+    project_url, data = get_figshare_resource(
+        headers, split_id[0],
+        "https://api.figshare.com/v2/account/projects/{}".format(split_id[0]),
+        "https://api.figshare.com/v2/projects/{}".format(split_id[0]))
     project_name = data['title']
 
-    # Flags to be used for file checks.
-    file_urls = None
-    files = None
-
+    update_process_info_message(process_info_path, action, 'Downloading files from FigShare...')
     if len(split_id) == 1:
-        # Download the contents of the project and build the list of file urls to download.
-        articles_url = project_url + "/articles"
-        files, empty_containers, action_metadata = download_project(
-            username, articles_url, headers, project_name, [])
-        file_urls = [file['file'] for file in files]
+        # Download the contents of the project. The files of each article start downloading
+        # as soon as the article's details arrive.
+        files = run_async(async_download_project(
+            project_url + "/articles", headers, project_name, process_info_path, action,
+            spool_directory))
         extra_metadata = extra_metadata_helper(project_url, headers)
 
-    elif len(split_id) == 2 or len(split_id) == 3:
-        # We have an article or a file so we need to get the article url
-        article_url = "https://api.figshare.com/v2/account/projects/{}/articles/{}".format(
-            split_id[0], split_id[1])
-        response = requests.get(article_url, headers=headers)
+    else:
+        # We have an article or a file. The article is looked for in the same place the
+        # project was found.
+        article_url, data = get_figshare_resource(
+            headers, split_id[0],
+            "https://api.figshare.com/v2/account/projects/{}/articles/{}".format(
+                split_id[0], split_id[1]),
+            "https://api.figshare.com/v2/articles/{}".format(split_id[1]))
 
-        if response.status_code != 200:
-            # Let's see if this is a public article....
-            article_url = "https://api.figshare.com/v2/articles/{}".format(split_id[1])
-            response = requests.get(article_url, headers=headers)
-
-            if response.status_code != 200:
-                # We couldn't find the article.
-                raise PresQTResponseException("The resource could not be found by the requesting user.",
-                                              status.HTTP_404_NOT_FOUND)
         if len(split_id) == 2:
-            # Download the contents of the article and build the list of file urls to download.
-            files, empty_containers, action_metadata = download_article(
-                username, article_url, headers, project_name, [])
-            file_urls = [file['file'] for file in files]
-
-        elif len(split_id) == 3:
-            update_process_info_message(process_info_path, action, 'Downloading files from FigShare...')
-            # Add the total number of articles to the process info file.
+            # Download the contents of the article.
+            files = article_files(data, project_name, False)
+            # Add the total number of files to the process info file.
+            # This is necessary to keep track of the progress of the request.
+            update_process_info(process_info_path, len(files), action, 'download')
+            run_async(async_main(files, headers, process_info_path, action, spool_directory))
+
+        else:
+            # Add the total number of files to the process info file.
             # This is necessary to keep track of the progress of the request.
             update_process_info(process_info_path, 1, action, 'download')
 
             # Single file download.
-            data = response.json()
+            files = None
             for file in data['files']:
                 if str(file['id']) == split_id[2]:
+                    file_path = spool_response(get_http_session('figshare').get(
+                        file['download_url'], headers=headers, stream=True), spool_directory)
                     files = [{
-                        "file": requests.get(file['download_url'], headers=headers).content,
+                        "file": file_path,
                         "hashes": {"md5": file['computed_md5']},
                         "title": file['name'],
                         "path": "/{}".format(file['name']),
@@ -175,30 +228,12 @@ def figshare_download_resource(token, resource_id, process_info_path, action):
                         "extra_metadata": {"size": file['size']}
                     }]
                     # Increment the number of files done in the process info file.
-                    increment_process_info(process_info_path, action, 'download')
-
-                    empty_containers = []
-                    action_metadata = {"sourceUsername": username}
+                    increment_process_info(process_info_path, action, 'download',
+                                           os.path.getsize(file_path))
             if not files:
                 # We could not find the file.
                 raise PresQTResponseException("The resource could not be found by the requesting user.",
                                               status.HTTP_404_NOT_FOUND)
-    if file_urls:
-        update_process_info_message(process_info_path, action, 'Downloading files from FigShare...')
-        # Add the total number of articles to the process info file.
-        # This is necessary to keep track of the progress of the request.
-        update_process_info(process_info_path, len(file_urls), action, 'download')
-
-        # Start the async calls for project or article downloads
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        download_data = loop.run_until_complete(async_main(
-            file_urls, headers, process_info_path, action))
-
-        # Go through the file dictionaries and replace the file path with the binary_content
-        for file in files:
-            file['file'] = get_dictionary_from_list(
-                download_data, 'url', file['file'])['binary_content']
 
     return {
         'resources': files,
@@ -1,10 +1,11 @@
-import requests
 from rest_framework import status
 
 from presqt.targets.figshare.utilities.validation_check import validation_check
 from presqt.targets.figshare.utilities.get_figshare_project_data import (
     get_figshare_project_data, get_search_project_data)
 from presqt.targets.figshare.utilities.helpers.get_figshare_children import get_figshare_children
+from presqt.targets.figshare.utilities.helpers.project_tree import get_figshare_resource
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -60,7 +61,8 @@ def figshare_fetch_resources(token, query_parameter):
 
     if query_parameter and 'page' not in query_parameter:
         if 'id' in query_parameter:
-            response = requests.get("{}projects/{}".format(base_url, query_parameter['id']))
+            response = get_http_session('figshare').get(
+                "{}projects/{}".format(base_url, query_parameter['id']))
             if response.status_code != 200:
                 raise PresQTResponseException("Project with id, {}, can not be found.".format(query_parameter['id']),
                                               status.HTTP_404_NOT_FOUND)
@@ -72,7 +74,7 @@ def figshare_fetch_resources(token, query_parameter):
         else:
             url = "{}account/projects?page=1".format(base_url)
 
-        response_data = requests.get(url, headers=headers).json()
+        response_data = get_http_session('figshare').get(url, headers=headers).json()
 
     return get_figshare_project_data(response_data, headers, []), pages
 
@@ -119,20 +121,13 @@ def figshare_fetch_resource(token, resource_id):
 
     if len(split_id) == 1:
         # This is a top level project
-        project_url = "https://api.figshare.com/v2/account/projects/{}".format(resource_id)
-        response = requests.get(project_url, headers=headers)
-
-        if response.status_code != 200:
-            # Let's see if this is a public project....
-            project_url = "https://api.figshare.com/v2/projects/{}".format(resource_id)
-            response = requests.get(project_url, headers=headers)
-
-            if response.status_code != 200:
-                raise PresQTResponseException("The resource could not be found by the requesting user.",
-                                              status.HTTP_404_NOT_FOUND)
-        data = response.json()
+        project_url, data = get_figshare_resource(
+            headers, resource_id,
+            "https://api.figshare.com/v2/account/projects/{}".format(resource_id),
+            "https://api.figshare.com/v2/projects/{}".format(resource_id))
         # Get article data...
-        article_data = requests.get("{}/articles".format(project_url), headers=headers).json()
+        article_data = get_http_session('figshare').get(
+            "{}/articles".format(project_url), headers=headers).json()
         children = get_figshare_children(article_data, resource_id, 'article')
 
         return {
@@ -154,19 +149,11 @@ def figshare_fetch_resource(token, resource_id):
 
     elif len(split_id) == 2:
         # This is an article
-        article_url = "https://api.figshare.com/v2/account/projects/{}/articles/{}".format(
-            split_id[0], split_id[1])
-        response = requests.get(article_url, headers=headers)
-
-        if response.status_code != 200:
-            # Let's see if this is a public article....
-            article_url = "https://api.figshare.com/v2/articles/{}".format(split_id[1])
-            response = requests.get(article_url, headers=headers)
-
-            if response.status_code != 200:
-                raise PresQTResponseException("The resource could not be found by the requesting user.",
-                                              status.HTTP_404_NOT_FOUND)
-        data = response.json()
+        article_url, data = get_figshare_resource(
+            headers, split_id[0],
+            "https://api.figshare.com/v2/account/projects/{}/articles/{}".format(
+                split_id[0], split_id[1]),
+            "https://api.figshare.com/v2/articles/{}".format(split_id[1]))
         # Get the children
         children = get_figshare_children(data['files'], resource_id, 'file')
 
@@ -190,19 +177,12 @@ def figshare_fetch_resource(token, resource_id):
     elif len(split_id) == 3:
         # This is a file
         # Check the article it belongs to to get the file info....
-        article_url = "https://api.figshare.com/v2/account/projects/{}/articles/{}".format(
-            split_id[0], split_id[1])
-        response = requests.get(article_url, headers=headers)
-
-        if response.status_code != 200:
-            # Let's see if this file belongs to a public article....
-            article_url = "https://api.figshare.com/v2/articles/{}".format(split_id[1])
-            response = requests.get(article_url, headers=headers)
-
-            if response.status_code != 200:
-                raise PresQTResponseException("The resource could not be found by the requesting user.",
-                                              status.HTTP_404_NOT_FOUND)
-        for file in response.json()['files']:
+        article_url, data = get_figshare_resource(
+            headers, split_id[0],
+            "https://api.figshare.com/v2/account/projects/{}/articles/{}".format(
+                split_id[0], split_id[1]),
+            "https://api.figshare.com/v2/articles/{}".format(split_id[1]))
+        for file in data['files']:
             if str(file['id']) == split_id[2]:
                 return {
                     "kind": "item",
@@ -1,10 +1,10 @@
 import base64
 import json
-import requests
 
 from rest_framework import status
 
 from presqt.targets.figshare.utilities.validation_check import validation_check
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -53,7 +53,7 @@ def figshare_fetch_keywords(token, resource_id):
         # FTS metadata file if it exists
 
         # We need to check for a metadata article.
-        article_response = requests.get(
+        article_response = get_http_session('figshare').get(
             "https://api.figshare.com/v2/account/projects/{}/articles".format(split_id[0]),
             headers=headers)
         if article_response.status_code != 200:
@@ -63,12 +63,13 @@ def figshare_fetch_keywords(token, resource_id):
         for article in article_response.json():
             if article['title'] == "PRESQT_FTS_METADATA":
                 # Check for metadata file
-                project_files = requests.get(
+                project_files = get_http_session('figshare').get(
                     "{}/files".format(article['url']), headers=headers).json()
                 for file in project_files:
                     if file['name'] == "PRESQT_FTS_METADATA.json":
                         # Download file, delete old file, mixem up, have a time.
-                        file_contents = requests.get(file['download_url'], headers=headers).json()
+                        file_contents = get_http_session('figshare').get(
+                            file['download_url'], headers=headers).json()
                         keywords = file_contents['allKeywords']
     else:
         # Resource is an article.
@@ -126,7 +127,7 @@ def figshare_upload_keywords(token, resource_id, keywords):
 
     data = {"tags": keywords}
 
-    response = requests.put(put_url, headers=headers, data=json.dumps(data))
+    response = get_http_session('figshare').put(put_url, headers=headers, data=json.dumps(data))
 
     if response.status_code != 205:
         raise PresQTResponseException("FigShare returned a {} error trying to update keywords.".format(
@@ -1,17 +1,13 @@
-import io
-import json
 import os
-import requests
 
 from rest_framework import status
 
-from presqt.api_v1.utilities.fixity.hash_generator import hash_generator
 from presqt.targets.figshare.utilities.validation_check import validation_check
 from presqt.targets.figshare.utilities.helpers.create_project import create_project
 from presqt.targets.figshare.utilities.helpers.create_article import create_article
-from presqt.targets.figshare.utilities.helpers.upload_helpers import figshare_file_upload_process
-from presqt.utilities import PresQTResponseException, update_process_info, increment_process_info, update_process_info_message
-from presqt.targets.utilities import get_duplicate_title, upload_total_files
+from presqt.targets.figshare.utilities.helpers.upload_files import figshare_upload_files
+from presqt.utilities import PresQTResponseException, update_process_info, update_process_info_message, record_upload_destination
+from presqt.targets.utilities import get_duplicate_title, upload_total_files, get_http_session
 
 
 def figshare_upload_resource(token, resource_id, resource_main_dir, hash_algorithm, file_duplicate_action, process_info_path, action):
@@ -67,6 +63,8 @@ def figshare_upload_resource(token, resource_id, resource_main_dir, hash_algorit
         2. Send a GET request to the 'Uploader Service' to determine that the status is "Pending" and how many parts to split the upload into.
         3. Split the file into the correct number of parts and upload each using a PUT request.
         4. Send a POST request to complete the upload.
+    Several files are taken through this process at the same time, and the parts of each file are
+    uploaded at the same time.
     """
     try:
         headers, username = validation_check(token)
@@ -92,14 +90,16 @@ def figshare_upload_resource(token, resource_id, resource_main_dir, hash_algorit
         project_name, project_id = create_project(project_title, headers, token)
         # Create article, for now we'll name it the same as the project
         article_id = create_article(project_title, headers, project_id)
+        record_upload_destination(process_info_path, '{}:{}'.format(project_id, article_id))
     else:
         # Upload to an existing project
         split_id = str(resource_id).split(":")
         project_id = split_id[0]
 
         try:
-            project_title = requests.get("https://api.figshare.com/v2/account/projects/{}".format(
-                project_id), headers=headers).json()['title']
+            project_title = get_http_session('figshare').get(
+                "https://api.figshare.com/v2/account/projects/{}".format(project_id),
+                headers=headers).json()['title']
         except KeyError:
             raise PresQTResponseException(
                 "Project with id, {}, could not be found by the requesting user.".format(
@@ -108,8 +108,8 @@ def figshare_upload_resource(token, resource_id, resource_main_dir, hash_algorit
         if len(split_id) == 1:
             # We only have a project and we need to make a new article id
             # Check to see if an article with this name already exists
-            articles = requests.get("https://api.figshare.com/v2/account/projects/{}/articles".format(project_id),
-                                    headers=headers).json()
+            articles = get_http_session('figshare').get("https://api.figshare.com/v2/account/projects/{}/articles".format(project_id),
+                                                        headers=headers).json()
             article_titles = [article['title'] for article in articles]
             new_title = get_duplicate_title(project_title, article_titles, "(PresQT*)")
             article_id = create_article(new_title, headers, resource_id)
@@ -123,28 +123,24 @@ def figshare_upload_resource(token, resource_id, resource_main_dir, hash_algorit
 
     # Get the article title
     try:
-        article_title = requests.get("https://api.figshare.com/v2/account/articles/{}".format(article_id),
-                                     headers=headers).json()['title']
+        article_title = get_http_session('figshare').get("https://api.figshare.com/v2/account/articles/{}".format(article_id),
+                                                         headers=headers).json()['title']
     except KeyError:
         raise PresQTResponseException(
             "Article with id, {}, could not be found by the requesting user.".format(
                 article_id), status.HTTP_400_BAD_REQUEST)
 
-    # Get md5, size and name of zip file to be uploaded
-    for path, subdirs, files in os.walk(resource_main_dir):
-        for name in files:
-            file_info = open(os.path.join(path, name), 'rb')
-            zip_hash = hash_generator(file_info.read(), 'md5')
-
-            figshare_file_upload_process(file_info, headers, name, article_id, file_type='zip',
-                                         path=path)
-
-            file_metadata_list.append({
-                'actionRootPath': os.path.join(path, name),
-                'destinationPath': '/{}/{}/{}'.format(project_title, article_title, name),
-                'title': name,
-                'destinationHash': zip_hash})
-            increment_process_info(process_info_path, action, 'upload')
+    upload_list = [{'file_path': os.path.join(path, name), 'name': name}
+                   for path, subdirs, files in os.walk(resource_main_dir) for name in files]
+    file_md5s = figshare_upload_files(headers, article_id, upload_list, process_info_path,
+                                      action)
+
+    for upload, file_md5 in zip(upload_list, file_md5s):
+        file_metadata_list.append({
+            'actionRootPath': upload['file_path'],
+            'destinationPath': '/{}/{}/{}'.format(project_title, article_title, upload['name']),
+            'title': upload['name'],
+            'destinationHash': file_md5})
 
     return {
         "resources_ignored": resources_ignored,
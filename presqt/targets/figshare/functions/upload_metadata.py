@@ -1,4 +1,3 @@
-import requests
 import itertools
 
 from rest_framework import status
@@ -8,6 +7,7 @@ from presqt.targets.figshare.utilities.helpers.upload_helpers import figshare_fi
 from presqt.targets.figshare.utilities.upload_extra_metadata import upload_extra_metadata
 from presqt.targets.figshare.utilities.validation_check import validation_check
 from presqt.targets.figshare.utilities.helpers.create_article import create_article
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -33,21 +33,23 @@ def figshare_upload_metadata(token, article_id, metadata_dict):
     file_name = 'PRESQT_FTS_METADATA.json'
 
     # We need to check for a metadata article.
-    article_list = requests.get(
+    article_list = get_http_session('figshare').get(
         "https://api.figshare.com/v2/account/projects/{}/articles".format(split_id[0]),
         headers=headers).json()
 
     for article in article_list:
         if article['title'] == "PRESQT_FTS_METADATA":
             # Check for metadata file
-            project_files = requests.get("{}/files".format(article['url']), headers=headers).json()
+            project_files = get_http_session('figshare').get(
+                "{}/files".format(article['url']), headers=headers).json()
             for file in project_files:
                 if file['name'] == "PRESQT_FTS_METADATA.json":
                     # Download file, delete old file, mixem up, have a time.
-                    file_contents = requests.get(file['download_url'], headers=headers).json()
+                    file_contents = get_http_session('figshare').get(
+                        file['download_url'], headers=headers).json()
                     # Load the existing metadata to be updated.
                     updated_metadata = file_contents
-                    requests.delete("https://api.figshare.com/v2/account/articles/{}/files/{}".format(
+                    get_http_session('figshare').delete("https://api.figshare.com/v2/account/articles/{}/files/{}".format(
                         article['id'], file['id']),
                         headers=headers)
 
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import shutil
+import tempfile
+from importlib import import_module
+from unittest.mock import patch
+
+from aiohttp import web
+from django.test import SimpleTestCase
+
+from presqt.targets.figshare.functions.download import async_download_project
+from presqt.targets.figshare.utilities.helpers.project_tree import get_figshare_resource
+from presqt.targets.utilities import run_async
+from presqt.targets.utilities.tests.shared_fake_server import FakeServer
+from presqt.utilities import PresQTResponseException, get_job_store, get_process_info_path
+
+project_tree = import_module('presqt.targets.figshare.utilities.helpers.project_tree')
+
+
+class TestProjectTree(SimpleTestCase):
+    def setUp(self):
+        self.ticket_number = 'test_figshare_project_tree'
+        self.directory = tempfile.mkdtemp()
+        self.requested = []
+        self.articles_running = 0
+        self.most_articles_running = 0
+
+        # Serve a fake FigShare API from its own loop in the background
+        self.server = FakeServer([
+            web.get('/public/{project_id}', self.handle_public_project),
+            web.get('/private/{project_id}', self.handle_private_project),
+            web.get('/private/1/articles', self.handle_articles),
+            web.get('/articles/{article_id}', self.handle_article),
+            web.get('/download/{article_id}/{file_id}', self.handle_download)])
+        self.url = self.server.url
+
+        self.patches = [patch.object(project_tree, 'ARTICLE_CONCURRENCY', 3),
+                        patch.object(project_tree, 'PROJECT_VISIBILITY', {})]
+        for patcher in self.patches:
+            patcher.start()
+        get_job_store().set_action(self.ticket_number, 'resource_download', {
+            'status': 'in_progress', 'download_files_finished': 0})
+
+    def tearDown(self):
+        for patcher in self.patches:
+            patcher.stop()
+        self.server.stop()
+        shutil.rmtree(self.directory)
+        shutil.rmtree(os.path.dirname(get_process_info_path(self.ticket_number)),
+                      ignore_errors=True)
+
+    async def handle_private_project(self, request):
+        self.requested.append(request.path)
+        if request.match_info['project_id'] != '1':
+            return web.Response(status=404)
+        return web.json_response({'title': 'Private Project'})
+
+    async def handle_public_project(self, request):
+        self.requested.append(request.path)
+        return web.json_response({'title': 'Public Project'})
+
+    async def handle_articles(self, request):
+        return web.json_response([{'url': '{}/articles/{}'.format(self.url, article_id)}
+                                  for article_id in range(6)])
+
+    async def handle_article(self, request):
+        self.articles_running += 1
+        self.most_articles_running = max(self.most_articles_running, self.articles_running)
+        await asyncio.sleep(0.02)
+        self.articles_running -= 1
+        article_id = request.match_info['article_id']
+        return web.json_response({'title': 'Article {}'.format(article_id), 'files': [
+            {'name': 'file_{}.txt'.format(file_id), 'computed_md5': 'abc', 'size': 5,
+             'download_url': '{}/download/{}/{}'.format(self.url, article_id, file_id)}
+            for file_id in range(2)]})
+
+    async def handle_download(self, request):
+        return web.Response(body='{}/{}'.format(request.match_info['article_id'],
+                                                request.match_info['file_id']).encode())
+
+    def test_get_figshare_resource_remembers_visibility(self):
+        """
+        Once a project has been found through the public API it should be asked first, and a
+        resource that is in neither should be a 404.
+        """
+        headers = {'Authorization': 'token eggs'}
+        urls = ('{}/private/2'.format(self.url), '{}/public/2'.format(self.url))
+        self.assertEqual(get_figshare_resource(headers, '2', *urls),
+                         (urls[1], {'title': 'Public Project'}))
+        self.assertEqual(self.requested, ['/private/2', '/public/2'])
+
+        self.requested = []
+        get_figshare_resource(headers, '2', *urls)
+        self.assertEqual(self.requested, ['/public/2'])
+
+        with self.assertRaises(PresQTResponseException) as context:
+            get_figshare_resource(headers, '3', '{}/private/3'.format(self.url),
+                                  '{}/missing/3'.format(self.url))
+        self.assertEqual(context.exception.status_code, 404)
+
+    def test_async_download_project(self):
+        """
+        Every article should be expanded, no more than the allowed number at a time, and every
+        one of their files downloaded.
+        """
+        files = run_async(async_download_project(
+            '{}/private/1/articles'.format(self.url), {'Authorization': 'token eggs'},
+            'Private Project', get_process_info_path(self.ticket_number), 'resource_download',
+            self.directory))
+
+        self.assertEqual(len(files), 12)
+        self.assertEqual(self.most_articles_running, 3)
+        for file in files:
+            article = file['source_path'].split('/')[2]
+            self.assertEqual(file['path'], '/Private Project/{}/{}'.format(article, file['title']))
+            with open(file['file'], 'rb') as spooled_file:
+                self.assertEqual(spooled_file.read(), '{}/{}'.format(
+                    article.split(' ')[1], file['title'][5]).encode())
+        job = get_job_store().get_job(self.ticket_number)['resource_download']
+        self.assertEqual(job['download_files_finished'], 12)
+        self.assertEqual(job['download_total_files'], 12)
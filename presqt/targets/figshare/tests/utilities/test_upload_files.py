@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+from importlib import import_module
+from unittest.mock import patch
+
+from aiohttp import web
+from django.test import SimpleTestCase
+
+from presqt.targets.figshare.utilities.helpers.upload_files import figshare_upload_files
+from presqt.targets.utilities.tests.shared_fake_server import FakeServer
+from presqt.utilities import PresQTResponseException, get_job_store, get_process_info_path
+
+upload_files = import_module('presqt.targets.figshare.utilities.helpers.upload_files')
+
+PART_SIZE = 1000
+
+
+class TestUploadFiles(SimpleTestCase):
+    def setUp(self):
+        self.ticket_number = 'test_figshare_upload_files'
+        self.directory = tempfile.mkdtemp()
+        self.files = {}
+        self.parts_running = 0
+        self.most_parts_running = 0
+        self.failed_parts = set()
+        self.completed = []
+
+        # Serve a fake FigShare API and uploader service from their own loop in the background
+        self.server = FakeServer([
+            web.post('/articles/1/files', self.handle_initiate),
+            web.get('/articles/1/files/{file_id}', self.handle_file),
+            web.post('/articles/1/files/{file_id}', self.handle_complete),
+            web.get('/upload/{file_id}', self.handle_parts),
+            web.put('/upload/{file_id}/{part_no}', self.handle_part)])
+        self.url = self.server.url
+
+        self.patches = [
+            patch.object(upload_files, 'ARTICLES_URL', '{}/articles'.format(self.url)),
+            patch.object(upload_files, 'PART_UPLOAD_CONCURRENCY', 3),
+            patch.object(upload_files, 'PART_RETRY_DELAY', 0)]
+        for patcher in self.patches:
+            patcher.start()
+        get_job_store().set_action(self.ticket_number, 'resource_upload', {
+            'status': 'in_progress', 'upload_files_finished': 0})
+
+    def tearDown(self):
+        for patcher in self.patches:
+            patcher.stop()
+        self.server.stop()
+        shutil.rmtree(self.directory)
+        shutil.rmtree(os.path.dirname(get_process_info_path(self.ticket_number)),
+                      ignore_errors=True)
+
+    async def handle_initiate(self, request):
+        data = await request.json()
+        file_id = str(len(self.files))
+        self.files[file_id] = dict(data, parts={})
+        return web.json_response(
+            {'location': '{}/articles/1/files/{}'.format(self.url, file_id)}, status=201)
+
+    async def handle_file(self, request):
+        file_id = request.match_info['file_id']
+        return web.json_response(
+            {'id': file_id, 'upload_url': '{}/upload/{}'.format(self.url, file_id)})
+
+    async def handle_parts(self, request):
+        size = self.files[request.match_info['file_id']]['size']
+        return web.json_response({'parts': [
+            {'partNo': number + 1, 'startOffset': offset,
+             'endOffset': min(offset + PART_SIZE, size) - 1}
+            for number, offset in enumerate(range(0, size, PART_SIZE))]})
+
+    async def handle_part(self, request):
+        self.parts_running += 1
+        self.most_parts_running = max(self.most_parts_running, self.parts_running)
+        await asyncio.sleep(0.02)
+        self.parts_running -= 1
+        part = (request.match_info['file_id'], request.match_info['part_no'])
+        # The second part of every file fails the first time it's sent
+        if part[1] == '2' and part not in self.failed_parts:
+            self.failed_parts.add(part)
+            return web.Response(status=500)
+        self.files[part[0]]['parts'][int(part[1])] = await request.read()
+        return web.Response(status=200)
+
+    async def handle_complete(self, request):
+        self.completed.append(request.match_info['file_id'])
+        return web.Response(status=202)
+
+    def write_file(self, name, contents):
+        file_path = os.path.join(self.directory, name)
+        with open(file_path, 'wb') as file:
+            file.write(contents)
+        return {'file_path': file_path, 'name': name}
+
+    def test_upload_files(self):
+        """
+        Every part of every file should be uploaded, retried if it fails, with no more than the
+        allowed number of parts at a time. The md5 sent and returned should be the file's.
+        """
+        contents = [os.urandom(PART_SIZE * 3 + 17), os.urandom(PART_SIZE * 2)]
+        upload_list = [self.write_file('file_{}.bin'.format(index), file_contents)
+                       for index, file_contents in enumerate(contents)]
+
+        md5s = figshare_upload_files({'Authorization': 'token eggs'}, '1', upload_list,
+                                     get_process_info_path(self.ticket_number),
+                                     'resource_upload')
+
+        self.assertEqual(md5s, [hashlib.md5(file_contents).hexdigest()
+                                for file_contents in contents])
+        self.assertEqual(sorted(self.completed), ['0', '1'])
+        for file in self.files.values():
+            uploaded = b''.join(part for _, part in sorted(file['parts'].items()))
+            self.assertEqual(hashlib.md5(uploaded).hexdigest(), file['md5'])
+            self.assertEqual(len(uploaded), file['size'])
+        self.assertEqual(len(self.failed_parts), 2)
+        self.assertEqual(self.most_parts_running, 3)
+        self.assertEqual(get_job_store().get_job(self.ticket_number)['resource_upload'][
+            'upload_files_finished'], 2)
+
+    def test_upload_files_part_keeps_failing(self):
+        """
+        A part that fails every retry should fail the upload and leave the file incomplete.
+        """
+        upload_list = [self.write_file('file.bin', os.urandom(PART_SIZE * 2))]
+        with patch.object(upload_files, 'PART_RETRIES', 0):
+            self.assertRaises(PresQTResponseException, figshare_upload_files,
+                              {'Authorization': 'token eggs'}, '1', upload_list,
+                              get_process_info_path(self.ticket_number), 'resource_upload')
+        self.assertEqual(self.completed, [])
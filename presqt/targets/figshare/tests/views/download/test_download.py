@@ -40,7 +40,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -88,7 +88,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -127,7 +127,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -166,7 +166,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -197,7 +197,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -236,7 +236,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
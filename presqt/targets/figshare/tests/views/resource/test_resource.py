@@ -593,13 +593,13 @@ class TestResourcePost(SimpleTestCase):
 
         # Now I'll make an explicit call to our metadata function with a mocked server error and ensure
         # it is raising an exception.
-        with patch('requests.put') as mock_request:
+        with patch('requests.Session.put') as mock_request:
             mock_request.return_value = mock_req
             # Attempt to update the metadata, but the server is down!
             self.assertRaises(PresQTError, figshare_upload_metadata, self.token, project_id,
                               {"context": {}, "allKeywords": [], "actions": []})
 
-        with patch('requests.post') as mock_request:
+        with patch('requests.Session.post') as mock_request:
             # Attempt to update the metadata, but the server is down!
             self.assertRaises(PresQTError, figshare_upload_metadata, self.token, project_id,
                               {"context": {}, "allKeywords": [], "actions": []})
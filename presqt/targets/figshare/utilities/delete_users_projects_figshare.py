@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 def delete_users_projects_figshare(auth_token):
     """
@@ -12,11 +13,12 @@ def delete_users_projects_figshare(auth_token):
         The Authorization Token of the requesting user.
     """
     headers = {'Authorization': 'token {}'.format(auth_token)}
-    response_data = requests.get("https://api.figshare.com/v2/account/projects", headers=headers).json()
+    response_data = get_http_session('figshare').get("https://api.figshare.com/v2/account/projects", headers=headers).json()
     for project_data in response_data:
         if project_data['title'] == 'NewProject' or project_data['title'] == 'NewProject(PresQT1)' or project_data['title'] == 'Extra_Eggs':
-            articles_response_data = requests.get(project_data['url']+ '/articles', headers=headers).json()
+            articles_response_data = get_http_session('figshare').get(project_data['url']+ '/articles', headers=headers).json()
             for article_data in articles_response_data:
-                requests.delete(article_data['url_private_api'], headers=headers)
-            requests.delete(project_data['url'], headers=headers)
+                get_http_session('figshare').delete(
+                    article_data['url_private_api'], headers=headers)
+            get_http_session('figshare').delete(project_data['url'], headers=headers)
 
@@ -1,8 +1,8 @@
 import json
-import requests
 
 from rest_framework import status
 
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -19,7 +19,7 @@ def create_article(article_title, headers, project_id):
     """
     article_payload = {"title": article_title}
 
-    response = requests.post(
+    response = get_http_session('figshare').post(
         "https://api.figshare.com/v2/account/projects/{}/articles".format(project_id),
         headers=headers,
         data=json.dumps(article_payload)
@@ -31,6 +31,7 @@ def create_article(article_title, headers, project_id):
                                                                            article_title),
             status.HTTP_400_BAD_REQUEST)
 
-    article_response = requests.get(response.json()['location'], headers=headers).json()
+    article_response = get_http_session('figshare').get(
+        response.json()['location'], headers=headers).json()
 
     return article_response['id']
@@ -1,9 +1,8 @@
 import json
-import requests
 
 from rest_framework import status
 
-from presqt.targets.utilities import get_duplicate_title
+from presqt.targets.utilities import get_duplicate_title, get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -29,7 +28,7 @@ def create_project(project_title, headers, token):
 
     project_payload = {"title": title}
 
-    response = requests.post(
+    response = get_http_session('figshare').post(
         "https://api.figshare.com/v2/account/projects",
         headers=headers,
         data=json.dumps(project_payload))
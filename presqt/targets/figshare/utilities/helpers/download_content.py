@@ -1,87 +1,34 @@
-import base64
-import requests
-
-
-def download_project(username, url, headers, project_name, files):
-    """
-    Function to extract all files from a given project.
-
-    Parameters
-    ----------
-    username : str
-        The user's FigShare username.
-    url : str
-        The url of the project's contents
-    headers: dict
-        API header expected by FigShare
-    project_name : str
-        The name of the project that is being downloaded
-    files : list
-        A list of dictionaries with file information
-
-    Returns
-    -------
-    A list of file dictionaries and a list of empty containers
+def article_files(article_data, project_name, in_project):
     """
-    initial_data = requests.get(url, headers=headers).json()
-    action_metadata = {"sourceUsername": username}
-
-    # Build list of article urls
-    article_urls = [article['url'] for article in initial_data]
-
-    for url in article_urls:
-        # Here we go....
-        article_data = requests.get(url, headers=headers).json()
-
-        for file in article_data['files']:
-            files.append({
-                "file": file['download_url'],
-                "hashes": {"md5": file['computed_md5']},
-                "title": file['name'],
-                "path": "/{}/{}/{}".format(project_name, article_data['title'], file['name']),
-                "source_path": "/{}/{}/{}".format(project_name, article_data['title'], file['name']),
-                "extra_metadata": {
-                    "size": file['size']
-                }
-            })
-
-    return files, [], action_metadata
-
-
-def download_article(username, url, headers, project_name, files):
-    """
-    Function to extract all files from a given article.
+    Build the file dictionaries of an article's files.
 
     Parameters
     ----------
-    username : str
-        The user's FigShare username.
-    url : str
-        The url of the project's contents
-    headers: dict
-        API header expected by FigShare
+    article_data : dict
+        The article's details, files included
     project_name : str
-        The name of the project that is being downloaded
-    files : list
-        A list of dictionaries with file information
+        The name of the project the article is in
+    in_project : bool
+        True if the whole project is being downloaded, in which case the files' paths start
+        with the project's name
 
     Returns
     -------
-    A list of file dictionaries and a list of empty containers
+    A list of file dictionaries. Each file's 'file' is the url to download it from.
     """
-    article_data = requests.get(url, headers=headers).json()
-    action_metadata = {"sourceUsername": username}
-
+    files = []
     for file in article_data['files']:
+        source_path = "/{}/{}/{}".format(project_name, article_data['title'], file['name'])
         files.append({
             "file": file['download_url'],
             "hashes": {"md5": file['computed_md5']},
             "title": file['name'],
-            "path": "/{}/{}".format(article_data['title'], file['name']),
-            "source_path": "/{}/{}/{}".format(project_name, article_data['title'], file['name']),
+            "path": source_path if in_project else "/{}/{}".format(
+                article_data['title'], file['name']),
+            "source_path": source_path,
             "extra_metadata": {
                 "size": file['size']
             }
         })
 
-    return files, [], action_metadata
+    return files
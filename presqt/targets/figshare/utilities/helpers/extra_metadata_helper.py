@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 
 def extra_metadata_helper(project_url, headers):
@@ -16,7 +17,7 @@ def extra_metadata_helper(project_url, headers):
     -------
         Extra metadata dictionary
     """
-    project_info = requests.get(project_url, headers=headers).json()
+    project_info = get_http_session('figshare').get(project_url, headers=headers).json()
 
     creators = [{
         "first_name": author['name'].partition(' ')[0],
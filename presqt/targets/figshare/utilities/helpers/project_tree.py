@@ -0,0 +1,111 @@
+import asyncio
+
+from rest_framework import status
+
+from presqt.targets.utilities import get_http_session
+from presqt.utilities import PresQTResponseException
+
+# Largest number of a project's articles fetched at the same time
+ARTICLE_CONCURRENCY = 8
+# Whether each project was last found among the user's own projects ('private') or the public
+# ones ('public'), keyed by the user's Authorization header and the project's id. Lookups in a
+# project go to that API first.
+PROJECT_VISIBILITY = {}
+
+
+def get_figshare_resource(headers, project_id, private_url, public_url):
+    """
+    GET a project, or an article in it, from the user's own projects or from the public ones.
+    The API the project was last found through is asked first, so the other one is only tried
+    if the resource isn't there.
+
+    Parameters
+    ----------
+    headers: dict
+        The user's FigShare Auth header
+    project_id: str
+        ID of the project the resource is in
+    private_url: str
+        URL of the resource in the user's own projects
+    public_url: str
+        URL of the resource in the public projects
+
+    Returns
+    -------
+    Tuple of the URL the resource was found at and its JSON.
+    """
+    visibility_key = (headers['Authorization'], str(project_id))
+    urls = [('private', private_url), ('public', public_url)]
+    if PROJECT_VISIBILITY.get(visibility_key) == 'public':
+        urls.reverse()
+
+    for visibility, url in urls:
+        response = get_http_session('figshare').get(url, headers=headers)
+        if response.status_code == 200:
+            PROJECT_VISIBILITY[visibility_key] = visibility
+            return url, response.json()
+
+    raise PresQTResponseException("The resource could not be found by the requesting user.",
+                                  status.HTTP_404_NOT_FOUND)
+
+
+async def async_get_article(session, semaphore, headers, article_url):
+    """
+    Coroutine that uses aiohttp to get the details of an article, files included.
+
+    Parameters
+    ----------
+    session: ClientSession object
+        aiohttp ClientSession Object
+    semaphore: asyncio.Semaphore
+        Bounds the number of articles fetched at the same time
+    headers: dict
+        The user's FigShare Auth header
+    article_url: str
+        URL of the article
+
+    Returns
+    -------
+    The JSON of the article.
+    """
+    async with semaphore:
+        async with session.get(article_url, headers=headers) as response:
+            if response.status != 200:
+                raise PresQTResponseException(
+                    "FigShare returned a {} error trying to get an article.".format(
+                        response.status), status.HTTP_400_BAD_REQUEST)
+            return await response.json(content_type=None)
+
+
+async def async_expand_articles(session, headers, articles_url):
+    """
+    Asynchronous generator that lists a project's articles and fetches all of them at the same
+    time through the given session, yielding each article's details as soon as they arrive.
+    If an article can't be fetched the rest are cancelled.
+
+    Parameters
+    ----------
+    session: ClientSession object
+        aiohttp ClientSession Object
+    headers: dict
+        The user's FigShare Auth header
+    articles_url: str
+        URL of the project's list of articles
+
+    Yields
+    ------
+    The JSON of each article, in the order they arrive.
+    """
+    async with session.get(articles_url, headers=headers) as response:
+        articles = await response.json(content_type=None)
+
+    semaphore = asyncio.Semaphore(ARTICLE_CONCURRENCY)
+    tasks = [asyncio.ensure_future(async_get_article(session, semaphore, headers, article['url']))
+             for article in articles]
+    try:
+        for next_article in asyncio.as_completed(tasks):
+            yield await next_article
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
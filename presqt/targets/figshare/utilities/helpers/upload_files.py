@@ -0,0 +1,201 @@
+import asyncio
+import os
+
+import aiohttp
+from rest_framework import status
+
+from presqt.targets.utilities import get_async_session, run_async
+from presqt.utilities import (PresQTResponseException, file_multi_hash_generator,
+                              increment_process_info)
+
+ARTICLES_URL = 'https://api.figshare.com/v2/account/articles'
+# Largest number of files uploaded to an article at the same time
+FILE_UPLOAD_CONCURRENCY = 4
+# Largest number of parts uploaded at the same time, across every file. Each part is held in
+# memory while it's being uploaded.
+PART_UPLOAD_CONCURRENCY = 8
+# Times a part is retried if FigShare's uploader fails to take it
+PART_RETRIES = 3
+# Seconds to wait before retrying a part, multiplied by the number of the attempt
+PART_RETRY_DELAY = 1
+
+
+def figshare_upload_files(headers, article_id, upload_list, process_info_path, action):
+    """
+    Open an async loop and upload files to an article, at most FILE_UPLOAD_CONCURRENCY at a
+    time. The parts of every file are uploaded at the same time, each read from its offset in
+    the file, so a file is never held in memory all at once.
+
+    Parameters
+    ----------
+    headers: dict
+        The user's FigShare Auth header
+    article_id: str
+        The id of the article to upload to
+    upload_list : list
+        List of dictionaries holding the 'file_path' of each file on disk and the 'name' to
+        give it in the article
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    List of the md5 of each file, in the order of upload_list.
+    """
+    return run_async(async_main(headers, article_id, upload_list, process_info_path, action))
+
+
+def _upload_error(name):
+    return PresQTResponseException(
+        "FigShare returned an error trying to upload {}. Some items may still have been "
+        "created on FigShare.".format(name), status.HTTP_400_BAD_REQUEST)
+
+
+async def async_upload_part(session, part_semaphore, headers, upload_url, part, upload):
+    """
+    Coroutine that reads a part from its offset in the file and uploads it, retrying it up to
+    PART_RETRIES times.
+
+    Parameters
+    ----------
+    session: ClientSession object
+        aiohttp ClientSession Object
+    part_semaphore: asyncio.Semaphore
+        Bounds the number of parts uploaded at the same time
+    headers: dict
+        The user's FigShare Auth header
+    upload_url: str
+        The uploader service's url for the file
+    part: dict
+        The part, as the uploader service describes it
+    upload: dict
+        The file the part belongs to
+    """
+    async with part_semaphore:
+        with open(upload['file_path'], 'rb') as file:
+            file.seek(part['startOffset'])
+            data = file.read(part['endOffset'] - part['startOffset'] + 1)
+
+        for attempt in range(PART_RETRIES + 1):
+            try:
+                async with session.put('{}/{}'.format(upload_url, part['partNo']),
+                                       headers=dict(headers,
+                                                    **{'Content-Type': 'application/binary'}),
+                                       data=data) as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            if attempt < PART_RETRIES:
+                await asyncio.sleep(PART_RETRY_DELAY * (attempt + 1))
+        raise _upload_error(upload['name'])
+
+
+async def async_upload_file(session, file_semaphore, part_semaphore, headers, article_id,
+                            upload, process_info_path, action):
+    """
+    Coroutine that uploads a file through FigShare's upload process.
+        1. Initiate the upload with the file's size, md5 and name.
+        2. Ask the uploader service which parts to split the file into.
+        3. Upload every part.
+        4. Complete the upload.
+
+    Parameters
+    ----------
+    session: ClientSession object
+        aiohttp ClientSession Object
+    file_semaphore: asyncio.Semaphore
+        Bounds the number of files uploaded at the same time
+    part_semaphore: asyncio.Semaphore
+        Bounds the number of parts uploaded at the same time
+    headers: dict
+        The user's FigShare Auth header
+    article_id: str
+        The id of the article to upload to
+    upload: dict
+        The file to upload
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    The md5 of the file.
+    """
+    async with file_semaphore:
+        # The file is hashed in chunks, off of the loop so other uploads keep going
+        md5 = (await asyncio.get_event_loop().run_in_executor(
+            None, file_multi_hash_generator, upload['file_path'], ['md5']))['md5']
+        file_size = os.path.getsize(upload['file_path'])
+
+        files_url = '{}/{}/files'.format(ARTICLES_URL, article_id)
+        async with session.post(files_url, headers=headers, json={
+                'md5': md5, 'name': upload['name'], 'size': file_size}) as response:
+            if response.status != 201:
+                raise _upload_error(upload['name'])
+            file_url = (await response.json(content_type=None))['location']
+
+        async with session.get(file_url, headers=headers) as response:
+            file_data = await response.json(content_type=None)
+        async with session.get(file_data['upload_url'], headers=headers) as response:
+            parts = (await response.json(content_type=None))['parts']
+
+        part_tasks = [asyncio.ensure_future(async_upload_part(
+            session, part_semaphore, headers, file_data['upload_url'], part, upload))
+            for part in parts]
+        try:
+            await asyncio.gather(*part_tasks)
+        except BaseException:
+            for task in part_tasks:
+                task.cancel()
+            await asyncio.gather(*part_tasks, return_exceptions=True)
+            raise
+
+        async with session.post('{}/{}'.format(files_url, file_data['id']),
+                                headers=headers) as response:
+            if response.status != 202:
+                raise _upload_error(upload['name'])
+
+    increment_process_info(process_info_path, action, 'upload', file_size, upload['file_path'])
+    return md5
+
+
+async def async_main(headers, article_id, upload_list, process_info_path, action):
+    """
+    Main coroutine method that will gather the files to upload and will upload them
+    asynchronously. If a file fails to upload the rest are cancelled.
+
+    Parameters
+    ----------
+    headers: dict
+        The user's FigShare Auth header
+    article_id: str
+        The id of the article to upload to
+    upload_list : list
+        List of the files to upload
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    List of the md5 of each file, in the order of upload_list.
+    """
+    file_semaphore = asyncio.Semaphore(FILE_UPLOAD_CONCURRENCY)
+    part_semaphore = asyncio.Semaphore(PART_UPLOAD_CONCURRENCY)
+    session = get_async_session('figshare')
+    tasks = [asyncio.ensure_future(async_upload_file(
+        session, file_semaphore, part_semaphore, headers, article_id, upload,
+        process_info_path, action))
+        for upload in upload_list]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
@@ -1,5 +1,6 @@
 import json
-import requests
+
+from presqt.targets.utilities import get_http_session
 
 
 def upload_extra_metadata(extra_metadata, headers, attribute_url):
@@ -19,4 +20,4 @@ def upload_extra_metadata(extra_metadata, headers, attribute_url):
     """
     if extra_metadata['description']:
         data = json.dumps({'description': extra_metadata['description']})
-        requests.put(attribute_url, headers=headers, data=data)
+        get_http_session('figshare').put(attribute_url, headers=headers, data=data)
@@ -1,7 +1,6 @@
-import requests
-
 from rest_framework import status
 
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -20,7 +19,8 @@ def validation_check(token):
     """
 
     headers = {"Authorization": "token {}".format(token)}
-    request = requests.get("http://api.figshare.com/v2/account", headers=headers)
+    request = get_http_session('figshare').get(
+        "http://api.figshare.com/v2/account", headers=headers)
 
     if request.status_code == 403:
         raise PresQTResponseException("Token is invalid. Response returned a 403 status code.",
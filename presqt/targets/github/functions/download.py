@@ -1,71 +1,177 @@
 import asyncio
-
-import aiohttp
-import requests
+import os
 
 from rest_framework import status
 
 from presqt.targets.github.utilities import (
-    validation_check, download_content, download_directory, download_file, extra_metadata_helper)
-from presqt.utilities import (PresQTResponseException, get_dictionary_from_list,
-                              update_process_info, increment_process_info, update_process_info_message)
+    validation_check, download_content, download_file, extra_metadata_helper,
+    get_repository_tree, tree_files)
+from presqt.targets.utilities import (async_spool_response, get_async_session, get_http_session,
+                                      git_blob_hasher, GIT_BLOB_DIGEST, run_async,
+                                      spool_tar_archive)
+from presqt.utilities import (PresQTResponseException, update_process_info,
+                              increment_process_info, update_process_info_message,
+                              report_downloaded_file, get_resumed_file)
+
+# Largest number of files downloaded at the same time
+DOWNLOAD_CONCURRENCY = 8
+# Repositories and top level directories with at least this many files are downloaded as a
+# single archive instead of one file at a time
+ARCHIVE_MIN_FILES = 10
 
 
-async def async_get(url, session, header, process_info_path, action):
+async def async_get(file, session, semaphore, header, process_info_path, action, spool_directory,
+                    blob_size=None):
     """
-    Coroutine that uses aiohttp to make a GET request. This is the method that will be called
-    asynchronously with other GETs.
+    Coroutine that uses aiohttp to make a GET request and stream the file to the job's spool
+    directory. This is the method that will be called asynchronously with other GETs.
 
     Parameters
     ----------
-    url: str
-        URL to call
+    file: dict
+        The file's dictionary. Its 'file' is the URL to call, which is replaced with the path to
+        the spooled file.
     session: ClientSession object
         aiohttp ClientSession Object
+    semaphore: asyncio.Semaphore
+        Bounds the number of files downloaded at the same time
     header: str
         Header for request
     process_info_path: str
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory the downloaded file will be spooled to
+    blob_size: int
+        Size of the file's git blob. If given, the file's git blob SHA is calculated as it's
+        streamed so it can be checked against the one GitHub gave.
 
     Returns
     -------
-    Response JSON
+    The file's dictionary
     """
-    async with session.get(url, headers=header) as response:
-        assert response.status == 200
-        content = await response.read()
-        # Increment the number of files done in the process info file.
-        increment_process_info(process_info_path, action, 'download')
-        return {'url': url, 'binary_content': content}
+    hashers = {}
+    if blob_size is not None:
+        hashers[GIT_BLOB_DIGEST] = git_blob_hasher(blob_size)
+
+    # A resumed transfer hands back the files the stopped one had already downloaded
+    resumed_file = get_resumed_file(process_info_path, file)
+    if resumed_file:
+        file['file'] = resumed_file
+    else:
+        async with semaphore:
+            async with session.get(file['file'], headers=header) as response:
+                assert response.status == 200
+                file['file'] = await async_spool_response(response, spool_directory, hashers)
+    # Increment the number of files done in the process info file.
+    increment_process_info(process_info_path, action, 'download', os.path.getsize(file['file']))
+    # Hand the file over before the rest have been downloaded
+    report_downloaded_file(process_info_path, file)
+    return file
 
 
-async def async_main(url_list, header, process_info_path, action):
+async def async_main(files, header, process_info_path, action, spool_directory,
+                     blob_sizes=None):
     """
     Main coroutine method that will gather the url calls to be made and will make them
-    asynchronously.
+    asynchronously, at most DOWNLOAD_CONCURRENCY at a time.
 
     Parameters
     ----------
-    url_list: list
-        List of urls to call
+    files: list
+        List of file dictionaries whose 'file' is the URL to call
     header: str
         Header for request
     process_info_path: str
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory the downloaded files will be spooled to
+    blob_sizes: list
+        Size of each file's git blob, in the order of files
 
     Returns
     -------
     List of data brought back from each coroutine called.
     """
-    async with aiohttp.ClientSession() as session:
-        return await asyncio.gather(*[async_get(url, session, header, process_info_path, action) for url in url_list])
+    semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+    blob_sizes = blob_sizes or [None] * len(files)
+    session = get_async_session('github')
+    return await asyncio.gather(*[async_get(file, session, semaphore, header,
+                                            process_info_path, action, spool_directory,
+                                            blob_size)
+                                  for file, blob_size in zip(files, blob_sizes)])
+
+
+def download_files_async(files, header, process_info_path, action, spool_directory,
+                         blob_sizes=None):
+    """
+    Open an async loop and download the files. Each file's url is replaced with its spooled
+    file path as it's downloaded.
+    """
+    run_async(async_main(files, header, process_info_path, action, spool_directory, blob_sizes))
 
 
-def github_download_resource(token, resource_id, process_info_path, action):
+def download_tree(header, repo_data, commit_sha, tree, path_to_resource, process_info_path,
+                  action, spool_directory):
+    """
+    Download the files of a repository's tree, or of one of its directories. A whole repository
+    or top level directory of at least ARCHIVE_MIN_FILES files is streamed as a single tarball of
+    the commit. Other files, and any file missing from the tarball, are downloaded one by one.
+
+    Parameters
+    ----------
+    header: dict
+        API header expected by GitHub
+    repo_data: dict
+        Repository data gathered in the repo GET request
+    commit_sha: str
+        SHA of the commit the tree belongs to
+    tree: list
+        The entries of the repository's tree
+    path_to_resource: str
+        The path to the requested directory, or None for the whole repository
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+    spool_directory: str
+        Path to the directory the downloaded files will be spooled to
+
+    Returns
+    -------
+    A list of dictionaries for each file downloaded
+    """
+    files, blobs = tree_files(repo_data, commit_sha, tree, path_to_resource)
+    update_process_info_message(process_info_path, action, 'Downloading files from GitHub...')
+    # Add the total number of files to the process info file.
+    # This is necessary to keep track of the progress of the request.
+    update_process_info(process_info_path, len(files), action, 'download')
+
+    files_by_path = {blob['path']: file for file, blob in zip(files, blobs)}
+    blob_sizes = {blob['path']: blob['size'] for blob in blobs}
+    paths_left = list(files_by_path)
+    if len(files) >= ARCHIVE_MIN_FILES and (path_to_resource is None or
+                                            '/' not in path_to_resource):
+        tarball_response = get_http_session('github').get(
+            'https://api.github.com/repos/{}/tarball/{}'.format(repo_data['full_name'], commit_sha),
+            headers=header, stream=True)
+        if tarball_response.status_code == 200:
+            paths_left = spool_tar_archive(tarball_response, files_by_path, spool_directory,
+                                           process_info_path, action)
+        else:
+            tarball_response.close()
+
+    # The blobs are streamed raw instead of base64 encoded in JSON
+    download_files_async([files_by_path[path] for path in paths_left],
+                         dict(header, Accept='application/vnd.github.raw'), process_info_path,
+                         action, spool_directory, [blob_sizes[path] for path in paths_left])
+    return files
+
+
+def github_download_resource(token, resource_id, process_info_path, action, spool_directory):
     """
     Fetch the requested resource from GitHub along with its hash information.
 
@@ -79,7 +185,8 @@ def github_download_resource(token, resource_id, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
-
+    spool_directory: str
+        Path to the directory in the job's ticket path that files should be streamed to
 
     Returns
     -------
@@ -87,7 +194,7 @@ def github_download_resource(token, resource_id, process_info_path, action):
         'resources': List of dictionary objects that each hold a file and its information.
                      Dictionary must be in the following format:
                          {
-                            'file': binary_file,
+                            'file': '/path/to/spooled/file',
                             'hashes': {'hash_algorithm': 'the_hash'},
                             'title': 'file.jpg',
                             'path': '/path/to/file',
@@ -111,7 +218,7 @@ def github_download_resource(token, resource_id, process_info_path, action):
     # Without a colon, we know this is a top level repo
     if ':' not in resource_id:
         project_url = 'https://api.github.com/repositories/{}'.format(resource_id)
-        response = requests.get(project_url, headers=header)
+        response = get_http_session('github').get(project_url, headers=header)
 
         if response.status_code != 200:
             raise PresQTResponseException(
@@ -120,29 +227,28 @@ def github_download_resource(token, resource_id, process_info_path, action):
         data = response.json()
 
         repo_name = data['name']
-        # Strip off the unnecessary {+path} that's included in the url
-        # Example: https://api.github.com/repos/eggyboi/djangoblog/contents/{+path} becomes
-        # https://api.github.com/repos/eggyboi/djangoblog/contents
-        contents_url = data['contents_url'].partition('/{+path}')[0]
-
-        files, empty_containers, action_metadata = download_content(
-            username, contents_url, header, repo_name, [])
-        file_urls = [file['file'] for file in files]
-
-        update_process_info_message(process_info_path, action, 'Downloading files from GitHub...')
-        # Add the total number of repository to the process info file.
-        # This is necessary to keep track of the progress of the request.
-        update_process_info(process_info_path, len(file_urls), action, 'download')
-
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        download_data = loop.run_until_complete(
-            async_main(file_urls, header, process_info_path, action))
-
-        # Go through the file dictionaries and replace the file path with the binary_content
-        for file in files:
-            file['file'] = get_dictionary_from_list(
-                download_data, 'url', file['file'])['binary_content']
+        commit_sha, tree, truncated = get_repository_tree(header, data)
+        if truncated:
+            # GitHub only lists part of very large trees, so walk the contents API instead.
+            # Strip off the unnecessary {+path} that's included in the url
+            # Example: https://api.github.com/repos/eggyboi/djangoblog/contents/{+path} becomes
+            # https://api.github.com/repos/eggyboi/djangoblog/contents
+            contents_url = data['contents_url'].partition('/{+path}')[0]
+
+            files, empty_containers, action_metadata = download_content(
+                username, contents_url, header, repo_name, [])
+            update_process_info_message(process_info_path, action,
+                                        'Downloading files from GitHub...')
+            # Add the total number of repository to the process info file.
+            # This is necessary to keep track of the progress of the request.
+            update_process_info(process_info_path, len(files), action, 'download')
+
+            download_files_async(files, header, process_info_path, action, spool_directory)
+        else:
+            files = download_tree(header, data, commit_sha, tree, None, process_info_path,
+                                  action, spool_directory)
+            empty_containers = []
+            action_metadata = {"sourceUsername": username}
 
         extra_metadata = extra_metadata_helper(response.json(), repo_name, header)
 
@@ -155,7 +261,7 @@ def github_download_resource(token, resource_id, process_info_path, action):
 
         # Get initial repo data for the resource requested
         repo_url = 'https://api.github.com/repositories/{}'.format(repo_id)
-        response = requests.get(repo_url, headers=header)
+        response = get_http_session('github').get(repo_url, headers=header)
 
         if response.status_code != 200:
             raise PresQTResponseException(
@@ -167,19 +273,19 @@ def github_download_resource(token, resource_id, process_info_path, action):
         repo_full_name = repo_data['full_name']
         resource_url = 'https://api.github.com/repos/{}/contents/{}'.format(repo_full_name,
                                                                             path_to_file)
-        resource_response = requests.get(resource_url, headers=header)
+        resource_response = get_http_session('github').get(resource_url, headers=header)
         resource_data = resource_response.json()
         if resource_response.status_code == 403:
             # 403 most likely means the blob contents were too big so we have to attempt to
             # get the file contents a different method
             trees_url = '{}/master?recursive=1'.format(repo_data['trees_url'][:-6])
-            trees_response = requests.get(trees_url, headers=header)
+            trees_response = get_http_session('github').get(trees_url, headers=header)
             for tree in trees_response.json()['tree']:
                 if path_to_file == tree['path']:
                     file_sha = tree['sha']
             git_blob_url = 'https://api.github.com/repos/{}/git/blobs/{}'.format(
                 repo_data['full_name'], file_sha)
-            file_get = requests.get(git_blob_url, headers=header)
+            file_get = get_http_session('github').get(git_blob_url, headers=header)
             resource_data = file_get.json()
             resource_data['name'] = path_to_file.rpartition('/')[2]
             resource_data['path'] = path_to_file.rpartition('/')
@@ -191,15 +297,16 @@ def github_download_resource(token, resource_id, process_info_path, action):
 
         # If the resource to get is a folder
         if isinstance(resource_data, list):
-            update_process_info_message(process_info_path, action,
-                                        'Downloading files from GitHub...')
-            files = download_directory(header, path_to_file, repo_data, process_info_path, action)
+            commit_sha, tree, truncated = get_repository_tree(header, repo_data)
+            files = download_tree(header, repo_data, commit_sha, tree, path_to_file,
+                                  process_info_path, action, spool_directory)
         # If the resource to get is a file
         elif resource_data['type'] == 'file':
             update_process_info_message(process_info_path, action,
                                         'Downloading files from GitHub...')
             update_process_info(process_info_path, 1, action, 'download')
-            files = download_file(repo_data, resource_data, process_info_path, action)
+            files = download_file(repo_data, resource_data, process_info_path, action,
+                                  spool_directory)
 
         empty_containers = []
         action_metadata = {"sourceUsername": username}
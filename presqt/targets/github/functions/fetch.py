@@ -1,11 +1,10 @@
-import requests
-
 from rest_framework import status
 
 from presqt.targets.github.utilities import validation_check, github_paginated_data
 from presqt.targets.github.utilities.helpers.github_file_data import get_github_repository_data
 from presqt.targets.github.utilities.helpers.get_page_numbers import get_page_numbers
 from presqt.targets.github.utilities.helpers.github_get_children import github_get_children
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -72,7 +71,7 @@ def github_fetch_resources(token, query_parameter):
             url = "https://api.github.com/users/{}/repos?page={}".format(
                 query_parameter['author'], query_parameter['page'])
             page_number = query_parameter['page']
-        initial_data = requests.get(url, headers=header)
+        initial_data = get_http_session('github').get(url, headers=header)
         # Check for error
         if initial_data.status_code != 200:
             return [], pages
@@ -85,12 +84,12 @@ def github_fetch_resources(token, query_parameter):
             page_number = query_parameter['page']
             url = "https://api.github.com/search/repositories?q={}&page={}".format(
                 query_parameter['general'], page_number)
-        data = requests.get(url, headers=header).json()['items']
+        data = get_http_session('github').get(url, headers=header).json()['items']
 
     elif 'id' in query_parameter:
         query_parameters = query_parameter['id']
         url = "https://api.github.com/repositories/{}".format(query_parameters)
-        data = requests.get(url, headers=header)
+        data = get_http_session('github').get(url, headers=header)
         if data.status_code != 200:
             return [], pages
         return get_github_repository_data([data.json()], header, []), pages
@@ -103,7 +102,7 @@ def github_fetch_resources(token, query_parameter):
             page_number = query_parameter['page']
             url = "https://api.github.com/search/repositories?q={}+in:name+sort:updated&page={}".format(
                 query_parameters, page_number)
-        data = requests.get(url, headers=header).json()['items']
+        data = get_http_session('github').get(url, headers=header).json()['items']
 
     elif 'keywords' in query_parameter:
         query_parameters = query_parameter['keywords'].replace(' ', '+')
@@ -113,7 +112,7 @@ def github_fetch_resources(token, query_parameter):
             page_number = query_parameter['page']
             url = "https://api.github.com/search/repositories?q={}+in:topics+sort:updated&page={}".format(
                 query_parameters, page_number)
-        data = requests.get(url, headers=header).json()['items']
+        data = get_http_session('github').get(url, headers=header).json()['items']
 
     else:
         data = github_paginated_data(token, '1')
@@ -167,7 +166,7 @@ def github_fetch_resource(token, resource_id):
     # Without a colon, we know this is a top level repo
     if ':' not in str(resource_id):
         project_url = 'https://api.github.com/repositories/{}'.format(resource_id)
-        response = requests.get(project_url, headers=header)
+        response = get_http_session('github').get(project_url, headers=header)
 
         if response.status_code != 200:
             raise PresQTResponseException("The resource could not be found by the requesting user.",
@@ -204,7 +203,7 @@ def github_fetch_resource(token, resource_id):
         # This initial request will get the repository, which we need to get the proper contents url
         # The contents url contains a username and project name which we don't have readily available
         # to us.
-        initial_repo_get = requests.get(
+        initial_repo_get = get_http_session('github').get(
             'https://api.github.com/repositories/{}'.format(repo_id), headers=header)
         repo_data = initial_repo_get.json()
         if initial_repo_get.status_code != 200:
@@ -212,19 +211,19 @@ def github_fetch_resource(token, resource_id):
                                           status.HTTP_404_NOT_FOUND)
 
         get_url = '{}{}'.format(repo_data['contents_url'].partition('{')[0], path_to_resource)
-        file_get = requests.get(get_url, headers=header)
+        file_get = get_http_session('github').get(get_url, headers=header)
         file_json = file_get.json()
         if file_get.status_code == 403:
             # 403 most likely means the blob contents were too big so we have to attempt to
             # get the file contents a different method
             trees_url = '{}/master?recursive=1'.format(repo_data['trees_url'][:-6])
-            trees_response = requests.get(trees_url, headers=header)
+            trees_response = get_http_session('github').get(trees_url, headers=header)
             for tree in trees_response.json()['tree']:
                 if path_to_resource == tree['path']:
                     file_sha = tree['sha']
             git_blob_url = 'https://api.github.com/repos/{}/git/blobs/{}'.format(
                 repo_data['full_name'], file_sha)
-            file_get = requests.get(git_blob_url, headers=header)
+            file_get = get_http_session('github').get(git_blob_url, headers=header)
             file_json = file_get.json()
             file_json['name'] = path_to_resource.rpartition('/')[2]
             file_json['path'] = path_to_resource.rpartition('/')
@@ -2,11 +2,10 @@ import base64
 import json
 import re
 
-import requests
-
 from rest_framework import status
 
 from presqt.targets.github.utilities import validation_check
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -50,13 +49,13 @@ def github_fetch_keywords(token, resource_id):
 
     # See if a metadata file exists
     metadata = None
-    project_data = requests.get(
+    project_data = get_http_session('github').get(
         "https://api.github.com/repositories/{}".format(resource_id), headers=header)
     if project_data.status_code == 200:
         project_name = project_data.json()['name']
         metadata_url = "https://api.github.com/repos/{}/{}/contents/PRESQT_FTS_METADATA.json".format(
             username, project_name)
-        metadata_file_data = requests.get(metadata_url, headers=header).json()
+        metadata_file_data = get_http_session('github').get(metadata_url, headers=header).json()
         try:
             sha = metadata_file_data['sha']
         except KeyError:
@@ -130,7 +129,7 @@ def github_upload_keywords(token, resource_id, keywords):
                 new_keywords.append(stripped_keyword)
     data = {'names': list(set(new_keywords))}
 
-    response = requests.put(put_url, headers=headers, data=json.dumps(data))
+    response = get_http_session('github').put(put_url, headers=headers, data=json.dumps(data))
 
     if response.status_code != 200:
         raise PresQTResponseException("GitHub returned a {} error trying to update keywords.".format(
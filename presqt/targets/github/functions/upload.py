@@ -1,13 +1,16 @@
 import base64
 import json
 import os
-import requests
 
 from rest_framework import status
 
-from presqt.targets.github.utilities import validation_check, create_repository
-from presqt.utilities import PresQTResponseException, update_process_info, increment_process_info, update_process_info_message
-from presqt.targets.utilities import upload_total_files
+from presqt.targets.github.utilities import validation_check, create_repository, git_data_upload
+from presqt.utilities import PresQTResponseException, update_process_info, increment_process_info, update_process_info_message, record_upload_destination, file_multi_hash_generator
+from presqt.targets.utilities import upload_total_files, git_blob_sha, get_http_session
+
+# Uploads of fewer files than this are made one commit per file through the contents API instead
+# of in a single commit through the Git Data API
+GIT_DATA_MIN_FILES = 10
 
 
 def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm, file_duplicate_action, process_info_path, action):
@@ -69,23 +72,27 @@ def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
     update_process_info(process_info_path, total_files, action, 'upload')
     update_process_info_message(process_info_path, action, "Uploading files to GitHub...")
 
+    resources_ignored = []
+    resources_updated = []
+    file_metadata_list = []
+    action_metadata = {"destinationUsername": username}
+    # The files to upload, with their path in the repository and the blob SHA of the file they
+    # replace if there is one
+    files_to_upload = []
+
     # Upload a new repository
     if not resource_id:
         # Create a new repository with the name being the top level directory's name.
         # Note: GitHub doesn't allow spaces, or circlebois in repo_names
         repo_title = os_path[1][0].replace(' ', '_').replace("(", "-").replace(")", "-").replace(":", "-")
         repo_name, repo_id, repo_url = create_repository(repo_title, token)
-        resources_ignored = []
-        resources_updated = []
-        action_metadata = {"destinationUsername": username}
-        file_metadata_list = []
+        record_upload_destination(process_info_path, repo_id)
+        repo_full_name = '{}/{}'.format(username, repo_name)
+
         for path, subdirs, files in os.walk(resource_main_dir):
             if not subdirs and not files:
                 resources_ignored.append(path)
             for name in files:
-                # Extract and encode the file bytes in the way expected by GitHub.
-                file_bytes = open(os.path.join(path, name), 'rb').read()
-                encoded_file = base64.b64encode(file_bytes).decode('utf-8')
                 # A relative path to the file is what is added to the GitHub PUT address
                 path_to_add = os.path.join(path.partition('/data/')[2], name)
                 path_to_add_to_url = path_to_add.partition('/')[2].replace(' ', '_')
@@ -95,21 +102,8 @@ def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
                     "destinationPath": finished_path,
                     "title": name,
                     "destinationHash": None})
-                put_url = "https://api.github.com/repos/{}/{}/contents/{}".format(
-                    username, repo_name, path_to_add_to_url)
-                data = {
-                    "message": "PresQT Upload",
-                    "committer": {
-                        "name": "PresQT",
-                        "email": "N/A"},
-                    "content": encoded_file}
-
-                file_response = requests.put(put_url, headers=header, data=json.dumps(data))
-                if file_response.status_code != 201:
-                    raise PresQTResponseException("Github returned the following error: '{}'".format(str(file_response.json()['message'])), status.HTTP_400_BAD_REQUEST)
-
-                # Increment the file counter
-                increment_process_info(process_info_path, action, 'upload')
+                files_to_upload.append({'file_path': os.path.join(path, name),
+                                        'repo_path': path_to_add_to_url, 'sha': None})
     else:
         # Upload to an existing repository
         if ':' not in resource_id:
@@ -124,7 +118,7 @@ def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
 
         # Get initial repo data for the resource requested
         repo_url = 'https://api.github.com/repositories/{}'.format(repo_id)
-        response = requests.get(repo_url, headers=header)
+        response = get_http_session('github').get(repo_url, headers=header)
 
         if response.status_code != 200:
             raise PresQTResponseException(
@@ -133,81 +127,75 @@ def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
         repo_data = response.json()
         repo_name = repo_data['name']
         repo_url = repo_data['svn_url']
-
-        # Get all repo resources so we can check if any files already exist
-        repo_resources = requests.get(
-            '{}/master?recursive=1'.format(repo_data['trees_url'][:-6]), headers=header).json()
-        if 'message' in repo_resources:
-            repo_resources = requests.get(
-                '{}/main?recursive=1'.format(repo_data['trees_url'][:-6]), headers=header).json()
-        # current_file_paths = ['/' + resource['path'] for resource in repo_resources['tree'] if resource['type'] == 'blob']
-        current_file_paths = []
-        for resource in repo_resources['tree']:
+        repo_full_name = repo_data['full_name']
+
+        # Get all repo resources so we can check if any files already exist. The tree holds the
+        # blob SHA of each file, which GitHub needs to update it.
+        repo_resources = get_http_session('github').get('{}/{}?recursive=1'.format(
+            repo_data['trees_url'][:-6], repo_data['default_branch']), headers=header).json()
+        current_file_shas = {}
+        for resource in repo_resources.get('tree', []):
             if resource['type'] == 'blob':
-                current_file_paths.append('/' + resource['path'])
+                current_file_shas['/' + resource['path']] = resource['sha']
 
         # Check if the provided path to upload to is actually a path to an existing file
-        if path_to_upload_to in current_file_paths:
+        if path_to_upload_to in current_file_shas:
             raise PresQTResponseException(
                 'The Resource provided, {}, is not a container'.format(resource_id),
                 status.HTTP_400_BAD_REQUEST)
 
-        resources_ignored = []
-        resources_updated = []
-        file_metadata_list = []
-        sha = None
-        action_metadata = {"destinationUsername": username}
-
         for path, subdirs, files in os.walk(resource_main_dir):
             if not subdirs and not files:
                 resources_ignored.append(path)
             for name in files:
-                path_to_file = os.path.join('/', path.partition('/data/')
-                                            [2], name).replace(' ', '_')
+                path_to_file = os.path.join('/', os.path.relpath(
+                    os.path.join(path, name), resource_main_dir)).replace(' ', '_')
 
                 # Check if the file already exists in this repository
                 full_file_path = '{}{}'.format(path_to_upload_to, path_to_file)
-                if full_file_path in current_file_paths:
+                if full_file_path in current_file_shas:
                     if file_duplicate_action == 'ignore':
                         resources_ignored.append(os.path.join(path, name))
                         continue
                     else:
                         resources_updated.append(os.path.join(path, name))
-                        # Get the sha
-                        sha_url = 'https://api.github.com/repos/{}/contents{}'.format(
-                            repo_data['full_name'], full_file_path)
-                        sha_response = requests.get(sha_url, headers=header)
-                        sha = sha_response.json()['sha']
-
-                # Extract and encode the file bytes in the way expected by GitHub.
-                file_bytes = open(os.path.join(path, name), 'rb').read()
-                encoded_file = base64.b64encode(file_bytes).decode('utf-8')
-                # A relative path to the file is what is added to the GitHub PUT address
+
                 file_metadata_list.append({
                     "actionRootPath": os.path.join(path, name),
                     "destinationPath": '/{}{}{}'.format(repo_name, path_to_upload_to, path_to_file),
                     "title": name,
                     "destinationHash": None})
-                put_url = 'https://api.github.com/repos/{}/contents{}{}'.format(
-                    repo_data['full_name'], path_to_upload_to, path_to_file)
-
-                data = {
-                    "message": "PresQT Upload",
-                    "sha": sha,
-                    "committer": {
-                        "name": "PresQT",
-                        "email": "N/A"},
-                    "content": encoded_file}
-
-                upload_response = requests.put(put_url, headers=header, data=json.dumps(data))
-
-                if upload_response.status_code not in [200, 201]:
-                    raise PresQTResponseException(
-                        'Upload failed with a status code of {}'.format(
-                            upload_response.status_code),
-                        status.HTTP_400_BAD_REQUEST)
-                # Increment the file counter
-                increment_process_info(process_info_path, action, 'upload')
+                files_to_upload.append({'file_path': os.path.join(path, name),
+                                        'repo_path': full_file_path[1:],
+                                        'sha': current_file_shas.get(full_file_path)})
+
+    # The Git Data API can't be used on an empty repository, so a new repository gets its
+    # first file through the contents API
+    blob_shas = {}
+    if not resource_id and files_to_upload:
+        first_file = files_to_upload.pop(0)
+        blob_shas[first_file['file_path']] = upload_file_contents(
+            header, repo_full_name, first_file, process_info_path, action)
+
+    if len(files_to_upload) >= GIT_DATA_MIN_FILES:
+        # Find the branch now that a new repository has one
+        branch = get_http_session('github').get(
+            'https://api.github.com/repos/{}'.format(repo_full_name),
+            headers=header).json()['default_branch']
+        blob_shas.update(git_data_upload(header, repo_full_name, branch, files_to_upload,
+                                         process_info_path, action))
+    else:
+        for file in files_to_upload:
+            blob_shas[file['file_path']] = upload_file_contents(
+                header, repo_full_name, file, process_info_path, action)
+
+    # GitHub's blob SHA of a file is checked against the file's contents, so the file's hash
+    # is only given as the destination's hash if GitHub received the file unchanged
+    for file_metadata in file_metadata_list:
+        file_path = file_metadata['actionRootPath']
+        if git_blob_sha(file_path) == blob_shas[file_path]:
+            file_metadata['destinationHash'] = file_multi_hash_generator(
+                file_path, [hash_algorithm])[hash_algorithm]
 
     return {
         'resources_ignored': resources_ignored,
@@ -217,3 +205,51 @@ def github_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
         'project_id': repo_id,
         "project_link": repo_url
     }
+
+
+def upload_file_contents(header, repo_full_name, file, process_info_path, action):
+    """
+    Upload a single file through the contents API, which makes a commit for the file.
+
+    Parameters
+    ----------
+    header : dict
+        GitHub Auth header
+    repo_full_name : str
+        The repository's 'owner/name'
+    file : dict
+        The file's 'file_path' on disk, 'repo_path' in the repository and the 'sha' of the blob
+        it replaces, if any
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    The SHA of the blob GitHub created for the file.
+    """
+    # Extract and encode the file bytes in the way expected by GitHub.
+    with open(file['file_path'], 'rb') as file_to_read:
+        file_bytes = file_to_read.read()
+    data = {
+        "message": "PresQT Upload",
+        "committer": {
+            "name": "PresQT",
+            "email": "N/A"},
+        "content": base64.b64encode(file_bytes).decode('utf-8')}
+    if file['sha']:
+        data['sha'] = file['sha']
+
+    put_url = 'https://api.github.com/repos/{}/contents/{}'.format(
+        repo_full_name, file['repo_path'])
+    upload_response = get_http_session('github').put(put_url, headers=header, data=json.dumps(data))
+    if upload_response.status_code not in [200, 201]:
+        raise PresQTResponseException(
+            "Github returned the following error: '{}'".format(
+                str(upload_response.json()['message'])), status.HTTP_400_BAD_REQUEST)
+
+    # Increment the file counter
+    increment_process_info(process_info_path, action, 'upload', len(file_bytes),
+                           file['file_path'])
+    return upload_response.json()['content']['sha']
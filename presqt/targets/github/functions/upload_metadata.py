@@ -1,11 +1,11 @@
 import base64
 import itertools
 import json
-import requests
 
 from presqt.json_schemas.schema_handlers import schema_validator
 from presqt.targets.github.utilities import validation_check
 from presqt.targets.github.utilities.utils.upload_extra_metadata import upload_extra_metadata
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTError
 
 
@@ -23,7 +23,7 @@ def github_upload_metadata(token, project_id, metadata_dict):
         The metadata to be written to the repo
     """
     header, username = validation_check(token)
-    project_data = requests.get(
+    project_data = get_http_session('github').get(
         "https://api.github.com/repositories/{}".format(project_id), headers=header)
 
     if project_data.status_code == 200:
@@ -34,8 +34,8 @@ def github_upload_metadata(token, project_id, metadata_dict):
                 project_data.status_code))
 
     base_put_url = "https://api.github.com/repos/{}/{}/contents/".format(username, project_name)
-    metadata_file_data = requests.get('{}PRESQT_FTS_METADATA.json'.format(base_put_url),
-                                      headers=header).json()
+    metadata_file_data = get_http_session('github').get(
+        '{}PRESQT_FTS_METADATA.json'.format(base_put_url), headers=header).json()
 
     try:
         sha = metadata_file_data['sha']
@@ -58,9 +58,9 @@ def github_upload_metadata(token, project_id, metadata_dict):
                     "email": "N/A"},
                 "content": invalid_base64_metadata}
 
-            response = requests.put('{}{}'.format(base_put_url, 'INVALID_PRESQT_FTS_METADATA.json'),
-                                    headers=header,
-                                    data=json.dumps(rename_payload))
+            response = get_http_session('github').put(
+                '{}{}'.format(base_put_url, 'INVALID_PRESQT_FTS_METADATA.json'), headers=header,
+                data=json.dumps(rename_payload))
             if response.status_code != 201:
                 raise PresQTError(
                     "The request to rename the invalid metadata file has returned a {} error code from Github.".format(
@@ -88,9 +88,9 @@ def github_upload_metadata(token, project_id, metadata_dict):
             }
 
             # Now we need to update the metadata file with this updated metadata
-            response = requests.put('{}{}'.format(base_put_url, 'PRESQT_FTS_METADATA.json'),
-                                    headers=header,
-                                    data=json.dumps(update_payload))
+            response = get_http_session('github').put(
+                '{}{}'.format(base_put_url, 'PRESQT_FTS_METADATA.json'), headers=header,
+                data=json.dumps(update_payload))
             if response.status_code != 200:
                 raise PresQTError(
                     "The request to create a metadata file has resulted in a {} error code from GitHub.".format(
@@ -107,9 +107,9 @@ def github_upload_metadata(token, project_id, metadata_dict):
             "name": "PresQT",
             "email": "N/A"},
         "content": base64_metadata}
-    response = requests.put('{}{}'.format(base_put_url, 'PRESQT_FTS_METADATA.json'),
-                            headers=header,
-                            data=json.dumps(payload))
+    response = get_http_session('github').put(
+        '{}{}'.format(base_put_url, 'PRESQT_FTS_METADATA.json'), headers=header,
+        data=json.dumps(payload))
 
     if response.status_code != 201 and response.status_code != 200:
         raise PresQTError(
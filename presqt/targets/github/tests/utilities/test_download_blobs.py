@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+
+from aiohttp import web
+from django.test import SimpleTestCase
+
+from presqt.api_v1.utilities.fixity import download_fixity_checker
+from presqt.targets.github.functions.download import download_files_async
+from presqt.targets.utilities import get_spool_file_digests
+from presqt.targets.utilities.tests.shared_fake_server import FakeServer
+from presqt.utilities import get_job_store, get_process_info_path
+
+
+class TestDownloadBlobs(SimpleTestCase):
+    def setUp(self):
+        self.ticket_number = 'test_github_download_blobs'
+        self.directory = tempfile.mkdtemp()
+        self.blobs = {'ce013625030ba8dba906f756967f9e9ca394464a': b'hello\n',
+                      'bad': b'changed\n'}
+
+        # Serve fake raw blobs from their own loop in the background
+        self.server = FakeServer([web.get('/blobs/{sha}', self.handle_blob)])
+        self.url = '{}/blobs/'.format(self.server.url)
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.directory)
+        shutil.rmtree(os.path.dirname(get_process_info_path(self.ticket_number)),
+                      ignore_errors=True)
+
+    async def handle_blob(self, request):
+        self.headers = request.headers
+        return web.Response(body=self.blobs[request.match_info['sha']])
+
+    def test_download_blobs(self):
+        """
+        The git blob SHA of each file should be calculated as it's streamed, so the file fails
+        fixity if its contents don't match the SHA GitHub gave it.
+        """
+        get_job_store().set_action(self.ticket_number, 'resource_download', {
+            'status': 'in_progress', 'download_files_finished': 0})
+        files = [{'file': '{}{}'.format(self.url, sha), 'hashes': {'git-blob-sha1': sha},
+                  'title': sha, 'path': '/{}'.format(sha)} for sha in self.blobs]
+        download_files_async(files, {'Authorization': 'token eggs'},
+                             get_process_info_path(self.ticket_number), 'resource_download',
+                             self.directory, [6, 8])
+
+        self.assertEqual(self.headers['Authorization'], 'token eggs')
+        fixity_results = [download_fixity_checker.download_fixity_checker(
+            file, get_spool_file_digests(file['file']))[0] for file in files]
+        self.assertEqual([result['fixity'] for result in fixity_results], [True, False])
+        self.assertEqual(fixity_results[0]['hash_algorithm'], 'git-blob-sha1')
+        self.assertEqual(fixity_results[1]['presqt_hash'],
+                         '5ea2ed416fbd4a4cbe227b75fe255dd7fa6bd4d6')
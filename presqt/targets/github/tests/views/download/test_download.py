@@ -40,7 +40,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -80,7 +80,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -126,7 +126,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -162,7 +162,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -172,12 +172,12 @@ class TestDownload(SimpleTestCase):
         # Verify the number of resources in the zip is correct
         self.assertEqual(len(zip_file.namelist()), 84)
 
-        # GitHub does not provide file hashes, and thus we can't properly check fixity.
+        # The git blob SHA GitHub gives each file is checked as the repository's archive is read.
         with zip_file.open('{}_download_{}/fixity_info.json'.format(self.target_name, resource_id)) as fixityfile:
             zip_json = json.load(fixityfile)
             for file_fixity in zip_json:
                 self.assertEqual(file_fixity['fixity_details'],
-                                 "Either a Source Hash was not provided or the source hash algorithm is not supported.")
+                                 "Source Hash and PresQT Calculated hash matched.")
 
         # Delete corresponding folder
         shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number))
@@ -195,7 +195,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
 
         # Verify the name of the zip file
         self.assertEquals(
@@ -206,6 +206,13 @@ class TestDownload(SimpleTestCase):
         # Verify the number of resources in the zip is correct
         self.assertEqual(len(zip_file.namelist()), 27)
 
+        # The git blob SHA of each file is checked as it's downloaded
+        with zip_file.open('{}_download_{}/fixity_info.json'.format(self.target_name, resource_id)) as fixityfile:
+            zip_json = json.load(fixityfile)
+            for file_fixity in zip_json:
+                self.assertEqual(file_fixity['hash_algorithm'], 'git-blob-sha1')
+                self.assertEqual(file_fixity['fixity'], True)
+
         # Delete corresponding folder
         shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number))
 
@@ -222,7 +229,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
 
         # Verify the name of the zip file
         self.assertEquals(
@@ -249,7 +256,7 @@ class TestDownload(SimpleTestCase):
     #     # Verify the status code
     #     self.assertEqual(response.status_code, 200)
 
-    #     zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+    #     zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
 
     #     # Verify the name of the zip file
     #     self.assertEquals(
@@ -158,7 +158,7 @@ class TestResourceKeywordsPOST(SimpleTestCase):
                 self.json_data = json_data
                 self.status_code = status_code
         mock_req = MockResponse({'error': 'The server is down.'}, 500)
-        with patch('requests.put') as mock_request:
+        with patch('requests.Session.put') as mock_request:
             mock_request.return_value = mock_req
             # Upload new keywords
             resource_id = '209372336'
@@ -167,11 +167,10 @@ class TestResourcePOST(SimpleTestCase):
         self.url = reverse('resource_collection', kwargs={'target_name': 'github'})
         self.file = 'presqt/api_v1/tests/resources/upload/ProjectBagItToUpload.zip'
         self.resources_ignored = []
-        self.failed_fixity = [
-            '/NewProject/funnyfunnyimages/Screen Shot 2019-07-15 at 3.26.49 PM.png']
+        self.failed_fixity = []
         self.resources_updated = []
         self.hash_algorithm = 'md5'
-        self.process_message = "Upload successful. Fixity can't be determined because GitHub may not have provided a file checksum. See PRESQT_FTS_METADATA.json for more details."
+        self.process_message = 'Upload successful.'
 
     def tearDown(self):
         """
@@ -227,10 +226,9 @@ class TestResourcePOST(SimpleTestCase):
         self.url = reverse('resource', kwargs={'target_name': 'github', 'resource_id': repo_id})
         self.resources_updated = [
             '/NewProject/funnyfunnyimages/Screen Shot 2019-07-15 at 3.26.49 PM.png']
-        self.failed_fixity = [
-            '/NewProject/funnyfunnyimages/Screen Shot 2019-07-15 at 3.26.49 PM.png']
+        self.failed_fixity = []
         self.resources_ignored = []
-        self.process_message = "Upload successful. Fixity can't be determined because GitHub may not have provided a file checksum. See PRESQT_FTS_METADATA.json for more details."
+        self.process_message = 'Upload successful.'
         shared_upload_function_github(self)
 
         # Delete upload folder
@@ -241,8 +239,7 @@ class TestResourcePOST(SimpleTestCase):
                            'target_name': 'github', 'resource_id': '{}:funnyfunnyimages'.format(repo_id)})
         self.resources_ignored = []
         self.resources_updated = []
-        self.failed_fixity = [
-            '/NewProject/funnyfunnyimages/Screen Shot 2019-07-15 at 3.26.49 PM.png']
+        self.failed_fixity = []
         shared_upload_function_github(self)
 
         # Delete upload folder
@@ -317,7 +314,7 @@ class TestResourcePOST(SimpleTestCase):
         # Delete upload folder
         shutil.rmtree(self.ticket_path)
         self.file = 'presqt/api_v1/tests/resources/upload/Empty_Directory_Bag.zip'
-        self.failed_fixity = ['/Egg/egg.json']
+        self.failed_fixity = []
         self.resources_ignored = ['/Egg/Empty_Folder']
         self.url = reverse('resource', kwargs={'target_name': 'github', 'resource_id': repo_id})
         shared_upload_function_github(self)
@@ -362,7 +359,7 @@ class TestResourcePOST(SimpleTestCase):
 
         # Now I'll make an explicit call to our metadata function with a mocked server error and ensure
         # it is raising an exception.
-        with patch('requests.put') as mock_request:
+        with patch('requests.Session.put') as mock_request:
             mock_request.return_value = mock_req
             # Attempt to update the metadata, but the server is down!
             self.assertRaises(PresQTError, github_upload_metadata, self.token, repo_id,
@@ -420,7 +417,7 @@ class TestResourcePOST(SimpleTestCase):
 
         # Now I'll make an explicit call to our metadata function with a mocked server error and ensure
         # it is raising an exception.
-        with patch('requests.put') as mock_request:
+        with patch('requests.Session.put') as mock_request:
             mock_request.return_value = mock_req
             # Attempt to update the metadata, but the server is down!
             self.assertRaises(PresQTError, github_upload_metadata, self.token, repo_id,
@@ -509,7 +506,7 @@ class TestResourcePOST(SimpleTestCase):
 
         # Now I'll make an explicit call to our metadata function with a mocked server error and ensure
         # it is raising an exception.
-        with patch('requests.put') as mock_request:
+        with patch('requests.Session.put') as mock_request:
             mock_request.return_value = mock_req
 
             # Upload to the newly created project
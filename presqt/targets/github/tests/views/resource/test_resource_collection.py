@@ -190,11 +190,10 @@ class TestResourceCollectionPOST(SimpleTestCase):
         self.url = reverse('resource_collection', kwargs={'target_name': 'github'})
         self.file = 'presqt/api_v1/tests/resources/upload/ProjectBagItToUpload.zip'
         self.resources_ignored = []
-        self.failed_fixity = [
-            '/NewProject/funnyfunnyimages/Screen Shot 2019-07-15 at 3.26.49 PM.png']
+        self.failed_fixity = []
         self.resources_updated = []
         self.hash_algorithm = 'md5'
-        self.process_message = "Upload successful. Fixity can't be determined because GitHub may not have provided a file checksum. See PRESQT_FTS_METADATA.json for more details."
+        self.process_message = 'Upload successful.'
 
     def tearDown(self):
         """
@@ -363,8 +362,9 @@ class TestResourceCollectionPOST(SimpleTestCase):
                          '/NewProject/funnyfunnyimages/Screen Shot 2019-07-15 at 3.26.49 PM.png')
         self.assertEqual(metadata_file['actions'][0]['files']['created'][0]['destinationPath'],
                          '/NewProject/funnyfunnyimages/Screen_Shot_2019-07-15_at_3.26.49_PM.png')
-        self.assertEqual(metadata_file['actions'][0]['files']['created'][0]['destinationHashes'],
-                         {})
+        self.assertEqual(
+            list(metadata_file['actions'][0]['files']['created'][0]['destinationHashes']),
+            ['md5'])
 
         # Delete upload folder
         shutil.rmtree(self.ticket_path)
@@ -375,7 +375,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
         """
         self.file = 'presqt/api_v1/tests/resources/upload/Upload_Extra_Metadata.zip'
         self.repo_title = 'Extra_Eggs'
-        self.failed_fixity = ['/Extra_Eggs/starfishjump.gif']
+        self.failed_fixity = []
         # 202 when uploading a new top level repo
         shared_upload_function_github(self)
         header = {"Authorization": "token {}".format(self.token)}
@@ -568,7 +568,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
                 self.status_code = status_code
         mock_req = MockResponse({'error': 'The server is down.'}, 500)
 
-        with patch('requests.post') as fake_post:
+        with patch('requests.Session.post') as fake_post:
             fake_post.return_value = mock_req
 
             self.headers['HTTP_PRESQT_FILE_DUPLICATE_ACTION'] = self.duplicate_action
@@ -1,8 +1,10 @@
 from presqt.targets.github.utilities.helpers.create_repository import create_repository
 from presqt.targets.github.utilities.helpers.download_content import (download_content,
-                                                                      download_directory,
-                                                                      download_file)
+                                                                      download_file,
+                                                                      get_repository_tree,
+                                                                      tree_files)
 from presqt.targets.github.utilities.helpers.get_page_total import get_page_total
+from presqt.targets.github.utilities.helpers.git_data_upload import git_data_upload
 from presqt.targets.github.utilities.helpers.github_paginated_data import github_paginated_data
 from presqt.targets.github.utilities.helpers.validation_check import validation_check
 from presqt.targets.github.utilities.utils.delete_github_repo import delete_github_repo
@@ -15,6 +17,7 @@ all = [
     github_paginated_data,
     validation_check,
     create_repository,
-    download_directory,
-    download_file
+    download_file,
+    get_repository_tree,
+    tree_files
 ]
\ No newline at end of file
@@ -1,9 +1,8 @@
 import json
-import requests
 
 from rest_framework import status
 
-from presqt.targets.utilities import get_duplicate_title
+from presqt.targets.utilities import get_duplicate_title, get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -20,9 +19,9 @@ def create_repository(title, token):
     """
     header = {"Authorization": "token {}".format(token)}
     repository_payload = {"name": title}
-    response = requests.post('https://api.github.com/user/repos',
-                             headers=header,
-                             data=json.dumps(repository_payload))
+    response = get_http_session('github').post('https://api.github.com/user/repos',
+                                               headers=header,
+                                               data=json.dumps(repository_payload))
 
     if response.status_code == 201:
         return title, response.json()['id'], response.json()['svn_url']
@@ -1,8 +1,8 @@
 import base64
+import os
 
-import requests
-
-from presqt.utilities import increment_process_info, update_process_info, update_process_info_message
+from presqt.targets.utilities import spool_bytes, GIT_BLOB_DIGEST, get_http_session
+from presqt.utilities import increment_process_info
 
 
 def download_content(username, url, header, repo_name, files):
@@ -26,7 +26,7 @@ def download_content(username, url, header, repo_name, files):
     -------
     A list of file dictionaries and a list of empty containers
     """
-    initial_data = requests.get(url, headers=header).json()
+    initial_data = get_http_session('github').get(url, headers=header).json()
     action_metadata = {"sourceUsername": username}
     # Loop through the initial data and build up the file urls and if the type is directory
     # recursively call function.
@@ -50,65 +50,95 @@ def download_content(username, url, header, repo_name, files):
     return files, [], action_metadata
 
 
-def download_directory(header, path_to_resource, repo_data, process_info_path, action):
+def get_repository_tree(header, repo_data):
     """
-    Go through a repo's tree and download all files inside of a given resource directory path.
+    Get every entry of a repository's tree at the latest commit of its default branch.
 
     Parameters
     ----------
     header: dict
         API header expected by GitHub
-    path_to_resource: str
-        The path to the requested directory
     repo_data: dict
         Repository data gathered in the repo GET request
-    process_info_path: str
-        Path to the process info file that keeps track of the action's progress
-    action: str
-        The action being performed
 
     Returns
     -------
-    A list of dictionaries for each file being downloaded
+    The SHA of the commit, the list of the tree's entries and whether GitHub truncated the list.
+    The commit is None if the repository is empty.
     """
-    repo_name = repo_data['name']
-    # Strip {/sha} off the end
-    trees_url = '{}/master?recursive=1'.format(repo_data['trees_url'][:-6])
-    contents = requests.get(trees_url, headers=header).json()
+    git_url = 'https://api.github.com/repos/{}/git'.format(repo_data['full_name'])
+    ref_response = get_http_session('github').get(
+        '{}/ref/heads/{}'.format(git_url, repo_data['default_branch']), headers=header)
+    if ref_response.status_code != 200:
+        return None, [], False
+    commit_sha = ref_response.json()['object']['sha']
 
-    number_of_files = len([file for file in contents['tree'] if file['path'].startswith(
-        path_to_resource) and file['type'] == 'blob'])
-    # Add the total number of repository to the process info file.
-    # This is necessary to keep track of the progress of the request.
-    update_process_info(process_info_path, number_of_files, action, 'download')
-    update_process_info_message(process_info_path, action, 'Downloading files from GitHub...')
+    tree = get_http_session('github').get('{}/trees/{}?recursive=1'.format(git_url, commit_sha),
+                                          headers=header).json()
+    return commit_sha, tree['tree'], tree['truncated']
 
+
+def tree_files(repo_data, commit_sha, tree, path_to_resource=None):
+    """
+    Build the dictionaries of the files in a repository's tree, or inside of a given directory
+    of it. Each file's 'file' is the URL of its blob, to be downloaded afterwards, and its hashes
+    hold the SHA git gave the blob.
+
+    Parameters
+    ----------
+    repo_data: dict
+        Repository data gathered in the repo GET request
+    commit_sha: str
+        SHA of the commit the tree belongs to
+    tree: list
+        The entries of the repository's tree
+    path_to_resource: str
+        The path to the requested directory, or None for the whole repository
+
+    Returns
+    -------
+    A list of dictionaries for each file being downloaded and a list of the tree entry of each
+    file, in the same order
+    """
+    repo_name = repo_data['name']
     files = []
-    for resource in contents['tree']:
-        if resource['path'].startswith(path_to_resource) and resource['type'] == 'blob':
+    blobs = []
+    for resource in tree:
+        if resource['type'] != 'blob':
+            continue
+
+        if path_to_resource is None:
+            file_path = '/{}/{}'.format(repo_name, resource['path'])
+        elif resource['path'].startswith('{}/'.format(path_to_resource)):
             # Strip the requested directory's parents off the directory path
             path_to_strip = path_to_resource.rpartition('/')[0]
             if path_to_strip:
-                directory_path = '{}'.format(resource['path'].partition(path_to_strip)[2])
+                file_path = '{}'.format(resource['path'].partition(path_to_strip)[2])
             else:
-                directory_path = '/{}'.format(resource['path'])
-
-            file_data = requests.get(resource['url']).json()
-
-            files.append({
-                'file': base64.b64decode(file_data['content']),
-                'hashes': {},
-                'title': resource['path'].rpartition('/')[0],
-                'path': directory_path,
-                'source_path': '/{}/{}'.format(repo_name, resource['path']),
-                'extra_metadata': {}
-            })
-            # Increment the number of files done in the process info file.
-            increment_process_info(process_info_path, action, 'download')
-    return files
-
-
-def download_file(repo_data, resource_data, process_info_path, action):
+                file_path = '/{}'.format(resource['path'])
+        else:
+            continue
+
+        files.append({
+            'file': resource['url'],
+            'hashes': {GIT_BLOB_DIGEST: resource['sha']},
+            'title': resource['path'].rpartition('/')[2],
+            'path': file_path,
+            'source_path': '/{}/{}'.format(repo_name, resource['path']),
+            'extra_metadata': {
+                'commit_hash': resource['sha'],
+                'size': resource['size'],
+                'git_url': resource['url'],
+                'html_url': '{}/blob/{}/{}'.format(repo_data['html_url'], commit_sha,
+                                                   resource['path']),
+                'type': 'file'}
+        })
+        blobs.append(resource)
+
+    return files, blobs
+
+
+def download_file(repo_data, resource_data, process_info_path, action, spool_directory):
     """
     Build a dictionary for the requested file
 
@@ -122,16 +152,19 @@ def download_file(repo_data, resource_data, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory the downloaded file will be spooled to
 
     Returns
     -------
     A list of a single dictionary representing the file requested and delivered. Boom.
     """
     repo_name = repo_data['name']
+    file_path = spool_bytes(base64.b64decode(resource_data['content']), spool_directory)
     # Increment the number of files done in the process info file.
-    increment_process_info(process_info_path, action, 'download')
+    increment_process_info(process_info_path, action, 'download', os.path.getsize(file_path))
     return [{
-        'file': base64.b64decode(resource_data['content']),
+        'file': file_path,
         'hashes': {},
         'title': resource_data['name'],
         'path': '/{}'.format(resource_data['name']),
@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 
 def extra_metadata_helper(json_content, repo_name, header):
@@ -19,7 +20,7 @@ def extra_metadata_helper(json_content, repo_name, header):
         Extra metadata dictionary
     """
     # Build up extra metadata
-    name_helper = requests.get(json_content['owner']['url'], headers=header)
+    name_helper = get_http_session('github').get(json_content['owner']['url'], headers=header)
     first_name = None
     last_name = None
 
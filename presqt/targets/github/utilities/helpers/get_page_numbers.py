@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 
 def get_page_numbers(url, headers, page_number):
@@ -19,7 +20,7 @@ def get_page_numbers(url, headers, page_number):
     A dictionary of page numbers
     """
     try:
-        pagination_info = requests.get(url, headers=headers).headers['Link']
+        pagination_info = get_http_session('github').get(url, headers=headers).headers['Link']
     except KeyError:
         return {
             "first_page": '1',
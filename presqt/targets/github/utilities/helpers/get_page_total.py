@@ -1,5 +1,6 @@
 import math
-import requests
+
+from presqt.targets.utilities import get_http_session
 
 
 def get_page_total(token):
@@ -17,7 +18,7 @@ def get_page_total(token):
     """
     header = {"Authorization": "token {}".format(token)}
     user_url = 'https://api.github.com/user'
-    user_data = requests.get(user_url, headers=header).json()
+    user_data = get_http_session('github').get(user_url, headers=header).json()
     public_repos = user_data['public_repos']
     private_repos = user_data['total_private_repos']
     total_repos = public_repos + private_repos
@@ -0,0 +1,176 @@
+import asyncio
+import base64
+import json
+import os
+
+from rest_framework import status
+
+from presqt.targets.utilities import get_async_session, get_http_session, run_async
+from presqt.utilities import PresQTResponseException, increment_process_info
+
+# Largest number of blobs created at the same time
+BLOB_CONCURRENCY = 4
+# Times a blob is retried when GitHub's secondary rate limit asks us to wait
+BLOB_RETRIES = 3
+# Bytes of a file base64 encoded at a time while its blob is sent. A multiple of 3 so the
+# encoded pieces join without padding.
+BLOB_READ_SIZE = 3 * 256 * 1024
+
+
+def git_data_upload(header, repo_full_name, branch, files, process_info_path, action):
+    """
+    Upload files to a repository in a single commit through the Git Data API. A blob is created
+    for every file at the same time, then one tree holding all of them is built on top of the
+    branch's tree, committed and the branch moved to the commit. The repository can't be empty.
+
+    Parameters
+    ----------
+    header : dict
+        GitHub Auth header
+    repo_full_name : str
+        The repository's 'owner/name'
+    branch : str
+        Branch to commit to
+    files : list
+        List of dictionaries holding the 'file_path' of each file on disk and its 'repo_path' in
+        the repository
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    Dictionary of file paths on disk (key) and the SHA of the blob GitHub created (value).
+    """
+    git_url = 'https://api.github.com/repos/{}/git'.format(repo_full_name)
+
+    blob_shas = run_async(async_main(git_url, header, files, process_info_path, action))
+
+    ref_url = '{}/refs/heads/{}'.format(git_url, branch)
+    parent_sha = _github_request('get', ref_url, header, 200)['object']['sha']
+    base_tree_sha = _github_request(
+        'get', '{}/commits/{}'.format(git_url, parent_sha), header, 200)['tree']['sha']
+
+    tree_sha = _github_request('post', '{}/trees'.format(git_url), header, 201, {
+        "base_tree": base_tree_sha,
+        "tree": [{"path": file['repo_path'], "mode": "100644", "type": "blob", "sha": blob_sha}
+                 for file, blob_sha in zip(files, blob_shas)]})['sha']
+    commit_sha = _github_request('post', '{}/commits'.format(git_url), header, 201, {
+        "message": "PresQT Upload",
+        "tree": tree_sha,
+        "parents": [parent_sha],
+        "committer": {
+            "name": "PresQT",
+            "email": "N/A"}})['sha']
+    _github_request('patch', ref_url, header, 200, {"sha": commit_sha})
+
+    return {file['file_path']: blob_sha for file, blob_sha in zip(files, blob_shas)}
+
+
+def _github_request(method, url, header, expected_status, data=None):
+    """
+    Make a request to the Git Data API and raise GitHub's error if it fails.
+    """
+    response = getattr(get_http_session('github'), method)(
+        url, headers=header, data=json.dumps(data) if data is not None else None)
+    if response.status_code != expected_status:
+        raise PresQTResponseException(
+            "Github returned the following error: '{}'".format(response.json().get('message')),
+            status.HTTP_400_BAD_REQUEST)
+    return response.json()
+
+
+async def async_create_blob(git_url, session, semaphore, header, file, process_info_path,
+                            action):
+    """
+    Coroutine that creates a blob from a file. The file is encoded as it is sent so only a
+    piece of it is held in memory at a time.
+
+    Parameters
+    ----------
+    git_url : str
+        URL of the repository's Git Data API
+    session: ClientSession object
+        aiohttp ClientSession Object
+    semaphore: asyncio.Semaphore
+        Bounds the number of blobs created at the same time
+    header : dict
+        GitHub Auth header
+    file : dict
+        The file to create the blob from
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    The SHA of the blob.
+    """
+    blob_header = dict(header, **{'Content-Type': 'application/json'})
+    async with semaphore:
+        for attempt in range(BLOB_RETRIES + 1):
+            async with session.post('{}/blobs'.format(git_url), headers=blob_header,
+                                    data=_blob_body(file['file_path'])) as response:
+                response_data = await response.json(content_type=None)
+                retry_after = response.headers.get('Retry-After')
+                if response.status == 201:
+                    break
+            if response.status in [403, 429] and retry_after and attempt < BLOB_RETRIES:
+                await asyncio.sleep(int(retry_after))
+            else:
+                raise PresQTResponseException(
+                    "Github returned the following error: '{}'".format(
+                        (response_data or {}).get('message')), status.HTTP_400_BAD_REQUEST)
+
+    increment_process_info(process_info_path, action, 'upload',
+                           os.path.getsize(file['file_path']), file['file_path'])
+    return response_data['sha']
+
+
+async def _blob_body(file_path):
+    """
+    Yield the JSON body of a blob request for a file, base64 encoding the file a piece at a time.
+    """
+    yield b'{"encoding": "base64", "content": "'
+    with open(file_path, 'rb') as file_to_read:
+        for chunk in iter(lambda: file_to_read.read(BLOB_READ_SIZE), b''):
+            yield base64.b64encode(chunk)
+    yield b'"}'
+
+
+async def async_main(git_url, header, files, process_info_path, action):
+    """
+    Main coroutine method that will gather the blobs to be created and will create them
+    asynchronously. If a blob can't be created the rest are cancelled.
+
+    Parameters
+    ----------
+    git_url : str
+        URL of the repository's Git Data API
+    header : dict
+        GitHub Auth header
+    files : list
+        List of the files to create blobs from
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    List of the SHA of each blob, in the order of files.
+    """
+    semaphore = asyncio.Semaphore(BLOB_CONCURRENCY)
+    session = get_async_session('github')
+    tasks = [asyncio.ensure_future(async_create_blob(
+        git_url, session, semaphore, header, file, process_info_path, action))
+        for file in files]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
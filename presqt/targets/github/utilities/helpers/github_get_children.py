@@ -1,5 +1,6 @@
 import urllib.parse
-import requests
+
+from presqt.targets.utilities import get_http_session
 
 
 def github_get_children(data, header, parent_id, repo_id):
@@ -26,7 +27,8 @@ def github_get_children(data, header, parent_id, repo_id):
     if isinstance(data, dict):
         # Get the contents of the top level repo
         # Partition is to strip the extra from GitHub API links
-        data = requests.get(data['contents_url'].partition('{+path}')[0], headers=header).json()
+        data = get_http_session('github').get(
+            data['contents_url'].partition('{+path}')[0], headers=header).json()
 
     for child in data:
         if child['type'] == 'dir':
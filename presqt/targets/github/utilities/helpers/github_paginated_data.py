@@ -1,6 +1,5 @@
-import requests
-
 from presqt.targets.github.utilities import get_page_total
+from presqt.targets.utilities import get_http_session
 
 
 def github_paginated_data(token, page_number=None):
@@ -21,16 +20,16 @@ def github_paginated_data(token, page_number=None):
     header = {"Authorization": "token {}".format(token)}
     if page_number:
         url = "https://api.github.com/user/repos?page={}&sort=updated".format(page_number)
-        data = requests.get(url, headers=header).json()
+        data = get_http_session('github').get(url, headers=header).json()
     else:
         base_url = "https://api.github.com/user/repos?sort=updated"
-        data = requests.get(base_url, headers=header).json()
+        data = get_http_session('github').get(base_url, headers=header).json()
         page_total = get_page_total(token)
         # We want to start building urls from page 2 as we already have the data from page 1.
         page_count = 2
         while page_count <= page_total:
             next_url = "https://api.github.com/user/repos?page={}&sort=updated".format(page_count)
-            next_data = requests.get(next_url, headers=header).json()
+            next_data = get_http_session('github').get(next_url, headers=header).json()
             data.extend(next_data)
             page_count += 1
 
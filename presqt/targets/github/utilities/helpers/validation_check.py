@@ -1,7 +1,6 @@
-import requests
-
 from rest_framework import status
 
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -19,7 +18,8 @@ def validation_check(token):
     The requesting user's username and properly formatted GitHub Auth header.
     """
     header = {"Authorization": "token {}".format(token), "Accept": "application/vnd.github.mercy-preview+json"}
-    validation = requests.get("https://api.github.com/user", headers=header).json()
+    validation = get_http_session('github').get(
+        "https://api.github.com/user", headers=header).json()
     try:
         username = validation['login']
     except:
@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 
 def delete_github_repo(username, repo_name, header):
@@ -16,4 +17,4 @@ def delete_github_repo(username, repo_name, header):
     """
     delete_url = 'https://api.github.com/repos/{}/{}'.format(username, repo_name)
 
-    requests.delete(delete_url, headers=header)
\ No newline at end of file
+    get_http_session('github').delete(delete_url, headers=header)
\ No newline at end of file
@@ -1,27 +1,33 @@
 import asyncio
-import aiohttp
-import requests
+import os
 import base64
 
 from rest_framework import status
 
 from presqt.targets.gitlab.utilities import (
     validation_check, gitlab_paginated_data, download_content, extra_metadata_helper)
-from presqt.utilities import (PresQTResponseException, get_dictionary_from_list,
-                              update_process_info,
-                              increment_process_info,
-                              update_process_info_message)
+from presqt.targets.utilities import (get_async_session, get_http_session,
+                                      get_spool_file_digests, run_async, spool_bytes,
+                                      spool_tar_archive)
+from presqt.utilities import (PresQTResponseException, update_process_info,
+                              increment_process_info, update_process_info_message,
+                              report_downloaded_file, get_resumed_file)
 
+# Projects and directories with at least this many files are downloaded as a single archive
+# instead of one file at a time
+ARCHIVE_MIN_FILES = 10
 
-async def async_get(url, session, header, process_info_path, action):
+
+async def async_get(file, session, header, process_info_path, action, spool_directory):
     """
-    Coroutine that uses aiohttp to make a GET request. This is the method that will be called
-    asynchronously with other GETs.
+    Coroutine that uses aiohttp to make a GET request and stream the file to the job's spool
+    directory. This is the method that will be called asynchronously with other GETs.
 
     Parameters
     ----------
-    url: str
-        URL to call
+    file: dict
+        The file's dictionary. Its 'file' is the URL to call, which is replaced with the path to
+        the spooled file.
     session: ClientSession object
         aiohttp ClientSession Object
     header: str
@@ -30,47 +36,61 @@ async def async_get(url, session, header, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory the downloaded file will be spooled to
 
     Returns
     -------
-    Response JSON
+    The file's dictionary, with its hashes
     """
-    async with session.get(url, headers=header) as response:
-        assert response.status == 200
-        content = await response.json()
-        # Increment the number of files done in the process info file.
-        increment_process_info(process_info_path, action, 'download')
-        return {
-            'url': url,
-            'binary_content': base64.b64decode(content['content']),
-            'hashes': {'sha256': content['content_sha256']}}
-
-
-async def async_main(url_list, header, process_info_path, action):
+    # A resumed transfer hands back the files the stopped one had already downloaded. Their
+    # hash was checked against GitLab's when they were first downloaded.
+    resumed_file = get_resumed_file(process_info_path, file)
+    if resumed_file:
+        file['file'] = resumed_file
+        file['hashes'] = {'sha256': get_spool_file_digests(resumed_file)['sha256']}
+    else:
+        async with session.get(file['file'], headers=header) as response:
+            assert response.status == 200
+            content = await response.json()
+            # GitLab returns the file contents inline so write them out and let go of the JSON.
+            file['file'] = spool_bytes(base64.b64decode(content['content']), spool_directory)
+            file['hashes'] = {'sha256': content['content_sha256']}
+    # Increment the number of files done in the process info file.
+    increment_process_info(process_info_path, action, 'download', os.path.getsize(file['file']))
+    # Hand the file over before the rest have been downloaded
+    report_downloaded_file(process_info_path, file)
+    return file
+
+
+async def async_main(files, header, process_info_path, action, spool_directory):
     """
     Main coroutine method that will gather the url calls to be made and will make them
     asynchronously.
 
     Parameters
     ----------
-    url_list: list
-        List of urls to call
+    files: list
+        List of file dictionaries whose 'file' is the URL to call
     header: str
         Proper header for calls
     process_info_path: str
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory the downloaded files will be spooled to
 
     Returns
     -------
     List of data brought back from each coroutine called.
     """
-    async with aiohttp.ClientSession() as session:
-        return await asyncio.gather(*[async_get(url, session, header, process_info_path, action) for url in url_list])
+    session = get_async_session('gitlab')
+    return await asyncio.gather(*[async_get(file, session, header, process_info_path, action, spool_directory)
+                                  for file in files])
 
 
-def gitlab_download_resource(token, resource_id, process_info_path, action):
+def gitlab_download_resource(token, resource_id, process_info_path, action, spool_directory):
     """
     Fetch the requested resource from GitLab along with its hash information.
 
@@ -84,6 +104,8 @@ def gitlab_download_resource(token, resource_id, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory in the job's ticket path that files should be streamed to
 
     Returns
     -------
@@ -91,7 +113,7 @@ def gitlab_download_resource(token, resource_id, process_info_path, action):
         'resources': List of dictionary objects that each hold a file and its information.
                      Dictionary must be in the following format:
                          {
-                            'file': binary_file,
+                            'file': '/path/to/spooled/file',
                             'hashes': {'hash_algorithm': 'the_hash'},
                             'title': 'file.jpg',
                             'path': '/path/to/file',
@@ -112,7 +134,8 @@ def gitlab_download_resource(token, resource_id, process_info_path, action):
                                       status.HTTP_401_UNAUTHORIZED)
 
     # Get the user's GitLab username for action metadata
-    username = requests.get("https://gitlab.com/api/v4/user", headers=header).json()['username']
+    username = get_http_session('gitlab').get(
+        "https://gitlab.com/api/v4/user", headers=header).json()['username']
 
     partitioned_id = resource_id.partition(':')
     if ':' in resource_id:
@@ -122,7 +145,7 @@ def gitlab_download_resource(token, resource_id, process_info_path, action):
 
     project_url = 'https://gitlab.com/api/v4/projects/{}'.format(project_id)
 
-    response = requests.get(project_url, headers=header)
+    response = get_http_session('gitlab').get(project_url, headers=header)
     if response.status_code != 200:
         raise PresQTResponseException(
             'The resource with id, {}, does not exist for this user.'.format(resource_id),
@@ -157,18 +180,19 @@ def gitlab_download_resource(token, resource_id, process_info_path, action):
         update_process_info(process_info_path, 1, action, 'download')
 
         # This is a single file
-        data = requests.get('https://gitlab.com/api/v4/projects/{}/repository/files/{}?ref=master'.format(
+        data = get_http_session('gitlab').get('https://gitlab.com/api/v4/projects/{}/repository/files/{}?ref=master'.format(
             project_id, partitioned_id[2].replace('+', ' ')), headers=header).json()
         if 'message' in data.keys():
             raise PresQTResponseException(
                 'The resource with id, {}, does not exist for this user.'.format(resource_id),
                 status.HTTP_404_NOT_FOUND)
 
+        file_path = spool_bytes(base64.b64decode(data['content']), spool_directory)
         # Increment the number of files done in the process info file.
-        increment_process_info(process_info_path, action, 'download')
+        increment_process_info(process_info_path, action, 'download', os.path.getsize(file_path))
         return {
             'resources': [{
-                'file': base64.b64decode(data['content']),
+                'file': file_path,
                 'hashes': {'sha256': data['content_sha256']},
                 'title': data['file_name'],
                 'path': '/{}'.format(data['file_name']),
@@ -181,25 +205,30 @@ def gitlab_download_resource(token, resource_id, process_info_path, action):
 
     files, empty_containers, action_metadata = download_content(
         username, project_name, project_id, data, [], is_project)
-    file_urls = [file['file'] for file in files]
-
     update_process_info_message(process_info_path, action, 'Downloading files from GitLab...')
     # Add the total number of projects to the process info file.
     # This is necessary to keep track of the progress of the request.
-    update_process_info(process_info_path, len(file_urls), action, 'download')
-
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    download_data = loop.run_until_complete(
-        async_main(file_urls, header, process_info_path, action))
-
-    # Go through the file dictionaries and replace the file path with the binary_content
-    # and replace the hashes with the correct file hashes
-    for file in files:
-        file['hashes'] = get_dictionary_from_list(
-            download_data, 'url', file['file'])['hashes']
-        file['file'] = get_dictionary_from_list(
-            download_data, 'url', file['file'])['binary_content']
+    update_process_info(process_info_path, len(files), action, 'download')
+
+    # The files are in the same order as the blobs of the tree
+    files_by_path = dict(zip([entry['path'] for entry in data if entry['type'] == 'blob'], files))
+    paths_left = list(files_by_path)
+    if len(files) >= ARCHIVE_MIN_FILES:
+        # Stream the whole project, or only the directory, as a single archive
+        archive_params = {} if is_project else {'path': partitioned_id[2].replace('+', ' ')}
+        archive_response = get_http_session('gitlab').get(
+            'https://gitlab.com/api/v4/projects/{}/repository/archive.tar.gz'.format(project_id),
+            headers=header, params=archive_params, stream=True)
+        if archive_response.status_code == 200:
+            paths_left = spool_tar_archive(archive_response, files_by_path, spool_directory,
+                                           process_info_path, action)
+        else:
+            archive_response.close()
+
+    # Each file's url is replaced with its spooled file path, and its hashes with the correct
+    # file hashes, as it's downloaded
+    run_async(async_main([files_by_path[path] for path in paths_left], header,
+                         process_info_path, action, spool_directory))
 
     return {
         'resources': files,
@@ -1,4 +1,3 @@
-import requests
 from rest_framework import status
 
 from presqt.targets.gitlab.utilities.gitlab_paginated_data import gitlab_paginated_data
@@ -6,6 +5,7 @@ from presqt.targets.gitlab.utilities.validation_check import validation_check
 from presqt.targets.gitlab.utilities.get_gitlab_project_data import get_gitlab_project_data
 from presqt.targets.gitlab.utilities.get_page_numbers import get_page_numbers
 from presqt.targets.gitlab.utilities.gitlab_get_children import gitlab_get_children
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -71,7 +71,8 @@ def gitlab_fetch_resources(token, query_parameter):
         else:
             if 'author' in query_parameter:
                 author_url = "{}users?username={}".format(base_url, query_parameter['author'])
-                author_response_json = requests.get(author_url, headers=headers).json()
+                author_response_json = get_http_session('gitlab').get(
+                    author_url, headers=headers).json()
                 if not author_response_json:
                     return [], pages
                 url = "https://gitlab.com/api/v4/users/{}/projects".format(
@@ -86,7 +87,7 @@ def gitlab_fetch_resources(token, query_parameter):
 
             elif 'id' in query_parameter:
                 project_url = "{}projects/{}".format(base_url, query_parameter['id'])
-                project_response = requests.get(project_url, headers=headers)
+                project_response = get_http_session('gitlab').get(project_url, headers=headers)
 
                 if project_response.status_code == 404:
                     return [], pages
@@ -98,7 +99,7 @@ def gitlab_fetch_resources(token, query_parameter):
             if 'page' in query_parameter and 'page' not in url:
                 url = '{}&page={}'.format(url, query_parameter['page'])
 
-            data = requests.get(url, headers=headers).json()
+            data = get_http_session('gitlab').get(url, headers=headers).json()
             pages = get_page_numbers(url, headers)
 
     return get_gitlab_project_data(data, headers, []), pages
@@ -147,7 +148,7 @@ def gitlab_fetch_resource(token, resource_id):
         project_id = partitioned_id[0]
         project_url = "https://gitlab.com/api/v4/projects/{}".format(project_id)
 
-        response = requests.get(project_url, headers=headers)
+        response = get_http_session('gitlab').get(project_url, headers=headers)
         if response.status_code != 200:
             raise PresQTResponseException("The resource could not be found by the requesting user.",
                                           status.HTTP_404_NOT_FOUND)
@@ -167,7 +168,7 @@ def gitlab_fetch_resource(token, resource_id):
 
         # Resource is a file
         if resource_type == 'file':
-            response = requests.get(
+            response = get_http_session('gitlab').get(
                 'https://gitlab.com/api/v4/projects/{}/repository/files/{}?ref=master'.format(
                     project_id, path_to_resource), headers=headers)
 
@@ -186,7 +187,7 @@ def gitlab_fetch_resource(token, resource_id):
 
         # Resource is a folder
         else:
-            response = requests.get(
+            response = get_http_session('gitlab').get(
                 'https://gitlab.com/api/v4/projects/{}/repository/tree?path={}'.format(
                     project_id, path_to_resource), headers=headers)
             # If the directory doesn't exist, they return an empty list
@@ -210,13 +211,13 @@ def gitlab_fetch_resource(token, resource_id):
     else:
         project_url = "https://gitlab.com/api/v4/projects/{}".format(resource_id)
 
-        response = requests.get(project_url, headers=headers)
+        response = get_http_session('gitlab').get(project_url, headers=headers)
         if response.status_code != 200:
             raise PresQTResponseException("The resource could not be found by the requesting user.",
                                           status.HTTP_404_NOT_FOUND)
 
         data = response.json()
-        children_data = requests.get("{}/repository/tree".format(project_url), headers=headers).json()
+        children_data = get_http_session('gitlab').get("{}/repository/tree".format(project_url), headers=headers).json()
 
         # ERROR, return no children
         if children_data == [] or 'message' in children_data:
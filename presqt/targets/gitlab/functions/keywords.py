@@ -1,10 +1,10 @@
 import base64
 import json
-import requests
 
 from rest_framework import status
 
 from presqt.targets.gitlab.utilities.validation_check import validation_check
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -50,7 +50,7 @@ def gitlab_fetch_keywords(token, resource_id):
     metadata = None
     metadata_url = "https://gitlab.com/api/v4/projects/{}/repository/files/PRESQT_FTS_METADATA.json?ref=master".format(
         resource_id)
-    metadata_file_response = requests.get(metadata_url, headers=headers)
+    metadata_file_response = get_http_session('gitlab').get(metadata_url, headers=headers)
 
     if metadata_file_response.status_code == 200:
         base64_metadata = base64.b64decode(metadata_file_response.json()['content'])
@@ -110,7 +110,8 @@ def gitlab_upload_keywords(token, resource_id, keywords):
 
     new_keywords_string = ','.join(list(set(new_keywords)))
 
-    response = requests.put("{}?tag_list={}".format(put_url, new_keywords_string), headers=headers)
+    response = get_http_session('gitlab').put(
+        "{}?tag_list={}".format(put_url, new_keywords_string), headers=headers)
 
     if response.status_code != 200:
         raise PresQTResponseException("GitLab returned a {} error trying to update keywords.".format(
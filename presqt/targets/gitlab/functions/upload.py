@@ -1,14 +1,12 @@
-import base64
 import os
 
-import requests
 from rest_framework import status
 
-from presqt.api_v1.utilities import hash_generator
-from presqt.targets.gitlab.utilities import gitlab_paginated_data
+from presqt.targets.gitlab.utilities import gitlab_paginated_data, commit_files, get_blob_ids
 from presqt.targets.gitlab.utilities.validation_check import validation_check
-from presqt.targets.utilities import get_duplicate_title, upload_total_files
-from presqt.utilities import PresQTResponseException, update_process_info, increment_process_info, update_process_info_message
+from presqt.targets.utilities import get_duplicate_title, upload_total_files, git_blob_sha
+from presqt.targets.utilities import get_http_session
+from presqt.utilities import PresQTResponseException, update_process_info, update_process_info_message, record_upload_destination, file_multi_hash_generator
 
 
 def gitlab_upload_resource(token, resource_id, resource_main_dir, hash_algorithm, file_duplicate_action, process_info_path, action):
@@ -66,7 +64,8 @@ def gitlab_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
     except PresQTResponseException:
         raise PresQTResponseException("Token is invalid. Response returned a 401 status code.",
                                       status.HTTP_401_UNAUTHORIZED)
-    username = requests.get("https://gitlab.com/api/v4/user", headers=headers).json()['username']
+    username = get_http_session('gitlab').get(
+        "https://gitlab.com/api/v4/user", headers=headers).json()['username']
     action_metadata = {"destinationUsername": username}
 
     os_path = next(os.walk(resource_main_dir))
@@ -88,20 +87,23 @@ def gitlab_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
         titles = [data['name'] for data in gitlab_paginated_data(headers, user_id)]
         title = get_duplicate_title(project_title, titles,
                                     '-PresQT*-').replace('(', '-').replace(')', '-')
-        response = requests.post('{}projects?name={}&visibility=public'.format(
+        response = get_http_session('gitlab').post('{}projects?name={}&visibility=public'.format(
             base_url, title), headers=headers)
         if response.status_code == 201:
             project_id = response.json()['id']
+            record_upload_destination(process_info_path, project_id)
             project_name = response.json()['name']
             web_url = response.json()['web_url']
+            # The new repository is empty, so its first commit creates the default branch
+            branch = response.json().get('default_branch') or 'master'
         else:
             raise PresQTResponseException(
                 "Response has status code {} while creating project {}.".format(
                     response.status_code, project_title), status.HTTP_400_BAD_REQUEST)
 
-        #*** UPLOAD FILES ***#
-        # Upload files to project's repository
-        base_repo_path = "{}projects/{}/repository/files/".format(base_url, project_id)
+        # The files to upload, with their path in the repository and the commit action that
+        # uploads them
+        files_to_upload = []
         for path, subdirs, files in os.walk(resource_main_dir):
             if not subdirs and not files:
                 resources_ignored.append(path)
@@ -109,27 +111,9 @@ def gitlab_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
                 # Strip server directories from file path
                 relative_file_path = os.path.join(path.partition('/data/{}/'.format(
                     project_title))[2], name)
-
-                # Extract and encode the file bytes in the way expected by GitLab.
-                file_bytes = open(os.path.join(path, name), 'rb').read()
-                encoded_file = base64.b64encode(file_bytes)
-
-                # A relative path to the file is what is added to the GitLab POST address
-                encoded_file_path = relative_file_path.replace('/', '%2F').replace('.', '%2E')
-
-                request_data = {"branch": "master",
-                                "commit_message": "PresQT Upload",
-                                "encoding": "base64",
-                                "content": encoded_file}
-
-                requests.post("{}{}".format(
-                    base_repo_path, encoded_file_path), headers=headers, data=request_data)
-
-                # Get the file hash
-                file_json = requests.get("{}{}?ref=master".format(base_repo_path, encoded_file_path),
-                                         headers=headers)
-                # Increment files finished
-                increment_process_info(process_info_path, action, 'upload')
+                files_to_upload.append({'file_path': os.path.join(path, name),
+                                        'repo_path': relative_file_path,
+                                        'action': 'create'})
 
                 file_metadata_list.append({
                     "actionRootPath": os.path.join(path, name),
@@ -137,110 +121,79 @@ def gitlab_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
                     "destinationPath": os.path.join(project_name, path.partition(
                         '/data/')[2].partition('/')[2], name),
                     "title": name,
-                    "destinationHash": file_json.json()['content_sha256']
+                    "destinationHash": None
                 })
     else:
         if ':' not in resource_id:
             project_id = resource_id
-            base_repo_url = "{}projects/{}/repository/files/".format(base_url, project_id)
             string_path_to_resource = ''
         else:
             partitioned_id = resource_id.partition(':')
             project_id = partitioned_id[0]
-            base_repo_url = "{}projects/{}/repository/files/{}".format(
-                base_url, project_id, partitioned_id[2])
             string_path_to_resource = partitioned_id[2].replace('%2F', '/').replace('%2E', '.')
 
-        # Check if the resource_id belongs to a file
-        tree_url = 'https://gitlab.com/api/v4/projects/{}/repository/tree?recursive=1'.format(
-            project_id)
-        file_data = gitlab_paginated_data(headers, None, tree_url)
-        for data in file_data:
-            if data['path'] == string_path_to_resource:
-                if data['type'] == 'blob':
-                    raise PresQTResponseException("Resource with id, {}, belongs to a file.".format(
-                        resource_id), status.HTTP_400_BAD_REQUEST)
-
         # Get project data
-        project = requests.get('{}projects/{}'.format(base_url, project_id), headers=headers)
+        project = get_http_session('gitlab').get(
+            '{}projects/{}'.format(base_url, project_id), headers=headers)
         if project.status_code != 200:
             raise PresQTResponseException("Project with id, {}, could not be found.".format(
                 project_id), status.HTTP_404_NOT_FOUND)
         project_name = project.json()['name']
         web_url = project.json()['web_url']
+        # An empty repository has no default branch yet
+        branch = project.json()['default_branch'] or 'master'
+
+        # Get the blob id of every file in the repository so we can check if the resource_id
+        # belongs to a file and plan which files are created and which are updated
+        current_blob_ids = get_blob_ids(headers, project_id, branch)
+        if string_path_to_resource in current_blob_ids:
+            raise PresQTResponseException("Resource with id, {}, belongs to a file.".format(
+                resource_id), status.HTTP_400_BAD_REQUEST)
 
+        files_to_upload = []
         for path, subdirs, files in os.walk(resource_main_dir):
             if not subdirs and not files:
                 resources_ignored.append(path)
             for name in files:
                 # Strip server directories from file path
-                relative_file_path = os.path.join(path.partition('/data/')[2], name)
-
-                # A relative path to the file is what is added to the GitLab POST address
-                if base_repo_url == "{}projects/{}/repository/files/".format(base_url, project_id):
-                    encoded_file_path = relative_file_path.replace('/', '%2F').replace('.', '%2E')
-                else:
-                    encoded_file_path = '%2F{}'.format(
-                        relative_file_path.replace('/', '%2F').replace('.', '%2E'))
-                full_encoded_url = '{}{}'.format(base_repo_url, encoded_file_path)
-
-                ignore_file = False
-                upload_request = requests.post
-                file_bytes = None
+                relative_file_path = os.path.relpath(os.path.join(path, name),
+                                                     resource_main_dir)
+                repo_path = os.path.join(string_path_to_resource, relative_file_path)
+                commit_action = 'create'
+
                 # Check if this file exists already
-                for file in file_data:
-                    if os.path.join(string_path_to_resource, relative_file_path) == file['path']:
-                        if file_duplicate_action == 'ignore':
-                            resources_ignored.append(os.path.join(path, name))
-                            ignore_file = True
-                            break
-                        else:
-                            file_url = '{}?ref=master'.format(full_encoded_url)
-                            file_response = requests.get(file_url, headers=headers)
-                            file_bytes = open(os.path.join(path, name), 'rb').read()
-                            if hash_generator(file_bytes, 'sha256') == file_response.json()['content_sha256']:
-                                resources_ignored.append(os.path.join(path, name))
-                                ignore_file = True
-                            else:
-                                resources_updated.append(os.path.join(path, name))
-                                upload_request = requests.put
-
-                            # Break out of this for loop and attempt to upload this duplicate
-                            break
-                # If we find a file to ignore then move onto the next file in the os.walk
-                if ignore_file:
-                    continue
-
-                # Extract and encode the file bytes in the way expected by GitLab.
-                if not file_bytes:
-                    file_bytes = open(os.path.join(path, name), 'rb').read()
-                encoded_file = base64.b64encode(file_bytes)
-
-                request_data = {"branch": "master",
-                                "commit_message": "PresQT Upload",
-                                "encoding": "base64",
-                                "content": encoded_file}
-
-                response = upload_request("{}".format(full_encoded_url),
-                                          headers=headers, data=request_data)
-                if response.status_code not in [201, 200]:
-                    raise PresQTResponseException(
-                        'Upload failed with a status code of {}'.format(response.status_code),
-                        status.HTTP_400_BAD_REQUEST)
-
-                # Get the file hash
-                file_json = requests.get("{}?ref=master".format(full_encoded_url),
-                                         headers=headers).json()
-                # Increment files finished
-                increment_process_info(process_info_path, action, 'upload')
+                if repo_path in current_blob_ids:
+                    # A file whose contents haven't changed is ignored either way
+                    if file_duplicate_action == 'ignore' or \
+                            git_blob_sha(os.path.join(path, name)) == current_blob_ids[repo_path]:
+                        resources_ignored.append(os.path.join(path, name))
+                        continue
+                    resources_updated.append(os.path.join(path, name))
+                    commit_action = 'update'
+
+                files_to_upload.append({'file_path': os.path.join(path, name),
+                                        'repo_path': repo_path,
+                                        'action': commit_action})
 
                 file_metadata_list.append({
                     "actionRootPath": os.path.join(path, name),
-                    "destinationPath": os.path.join(project_name, path.partition('/data/')[2], name),
+                    "destinationPath": os.path.join(project_name, relative_file_path),
                     "title": name,
-                    "destinationHash": file_json['content_sha256']
+                    "destinationHash": None
                 })
 
+    #*** UPLOAD FILES ***#
+    commit_files(headers, project_id, branch, files_to_upload, process_info_path, action)
+
+    # Get the hashes of the uploaded files from one listing of the repository. GitLab's blob id
+    # of a file is checked against the file's contents, so the file's hash is only given as the
+    # destination's hash if GitLab received the file unchanged.
+    uploaded_blob_ids = get_blob_ids(headers, project_id, branch)
+    for file, file_metadata in zip(files_to_upload, file_metadata_list):
+        if git_blob_sha(file['file_path']) == uploaded_blob_ids.get(file['repo_path']):
+            file_metadata['destinationHash'] = file_multi_hash_generator(
+                file['file_path'], [hash_algorithm])[hash_algorithm]
+
     return {
         'resources_ignored': resources_ignored,
         'resources_updated': resources_updated,
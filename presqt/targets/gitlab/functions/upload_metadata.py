@@ -7,6 +7,7 @@ import requests
 from presqt.json_schemas.schema_handlers import schema_validator
 from presqt.targets.gitlab.utilities import validation_check
 from presqt.targets.gitlab.utilities.upload_extra_metadata import upload_extra_metadata
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTError
 
 
@@ -25,11 +26,16 @@ def gitlab_upload_metadata(token, project_id, metadata_dict):
     """
     headers, user_id = validation_check(token)
 
+    # The metadata goes on the branch the upload committed to
+    branch = get_http_session('gitlab').get(
+        "https://gitlab.com/api/v4/projects/{}".format(project_id),
+        headers=headers).json().get('default_branch') or 'master'
+
     # Check if metadata exists
-    base_post_url = "https://gitlab.com/api/v4/projects/{}/repository/files/PRESQT_FTS_METADATA.json?ref=master".format(
-        project_id)
+    base_post_url = "https://gitlab.com/api/v4/projects/{}/repository/files/PRESQT_FTS_METADATA.json?ref={}".format(
+        project_id, branch)
 
-    metadata_file_response = requests.get(base_post_url, headers=headers)
+    metadata_file_response = get_http_session('gitlab').get(base_post_url, headers=headers)
     metadata_file_data = metadata_file_response.json()
     request_type = requests.post
 
@@ -41,12 +47,12 @@ def gitlab_upload_metadata(token, project_id, metadata_dict):
             # We need to change the file name, this metadata is improperly formatted and
             # therefore invalid.
             invalid_base64_metadata = base64.b64encode(base64_metadata)
-            data = {"branch": "master",
+            data = {"branch": branch,
                     "commit_message": "PresQT Invalid Metadata Upload",
                     "encoding": "base64",
                     "content": invalid_base64_metadata}
 
-            invalid_metadata_response = requests.post(
+            invalid_metadata_response = get_http_session('gitlab').post(
                 'https://gitlab.com/api/v4/projects/{}/repository/files/INVALID_PRESQT_FTS_METADATA%2Ejson'.format(
                     project_id),
                 headers=headers,
@@ -69,12 +75,12 @@ def gitlab_upload_metadata(token, project_id, metadata_dict):
             updated_metadata_bytes = json.dumps(updated_metadata, indent=4).encode('utf-8')
             updated_base64_metadata = base64.b64encode(updated_metadata_bytes)
 
-            data = {"branch": "master",
+            data = {"branch": branch,
                     "commit_message": "Updated PresQT Metadata Upload",
                     "encoding": "base64",
                     "content": updated_base64_metadata}
 
-            metadata_response = requests.put(
+            metadata_response = get_http_session('gitlab').put(
                 "https://gitlab.com/api/v4/projects/{}/repository/files/PRESQT_FTS_METADATA%2Ejson".format(
                     project_id),
                 headers=headers,
@@ -92,7 +98,7 @@ def gitlab_upload_metadata(token, project_id, metadata_dict):
     post_url = "https://gitlab.com/api/v4/projects/{}/repository/files/PRESQT_FTS_METADATA%2Ejson".format(
         project_id)
 
-    data = {"branch": "master",
+    data = {"branch": branch,
             "commit_message": "PresQT Metadata Upload",
             "encoding": "base64",
             "content": base64_metadata}
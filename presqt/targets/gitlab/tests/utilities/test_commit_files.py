@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+from importlib import import_module
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from presqt.targets.gitlab.utilities.commit_files import _commit_batches
+
+# The package exports the function under the module's name, so patch the module itself
+commit_files_module = import_module('presqt.targets.gitlab.utilities.commit_files')
+
+
+class TestCommitBatches(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_files(self, sizes):
+        files = []
+        for index, size in enumerate(sizes):
+            file_path = os.path.join(self.directory, 'file_{}'.format(index))
+            with open(file_path, 'wb') as file:
+                file.write(b'e' * size)
+            files.append({'file_path': file_path, 'repo_path': 'file_{}'.format(index),
+                          'action': 'create'})
+        return files
+
+    @patch.object(commit_files_module, 'COMMIT_MAX_ACTIONS', 3)
+    @patch.object(commit_files_module, 'COMMIT_MAX_BYTES', 100)
+    def test_commit_batches(self):
+        """
+        A batch should be closed before it goes over either limit, and a file over the byte
+        limit should get a batch of its own.
+        """
+        # 30 bytes are 40 once base64 encoded
+        files = self.write_files([30, 30, 30, 300, 3, 3, 3, 3])
+        batches = list(_commit_batches(files))
+
+        self.assertEqual([[file['repo_path'] for file in batch] for batch in batches],
+                         [['file_0', 'file_1'], ['file_2'], ['file_3'],
+                          ['file_4', 'file_5', 'file_6'], ['file_7']])
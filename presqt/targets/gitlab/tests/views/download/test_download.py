@@ -40,7 +40,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -86,7 +86,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -126,7 +126,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -161,7 +161,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -196,7 +196,7 @@ class TestDownload(SimpleTestCase):
         # Verify the status code
         self.assertEqual(response.status_code, 200)
 
-        zip_file = zipfile.ZipFile(io.BytesIO(response.content))
+        zip_file = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
         # Verify the name of the zip file
         self.assertEquals(
             response._headers['content-disposition'][1],
@@ -389,7 +389,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
                 self.status_code = status_code
         mock_req = MockResponse({'error': 'The server is down.'}, 500)
 
-        with patch('requests.post') as fake_post:
+        with patch('requests.Session.post') as fake_post:
             fake_post.return_value = mock_req
 
             self.headers['HTTP_PRESQT_FILE_DUPLICATE_ACTION'] = self.duplicate_action
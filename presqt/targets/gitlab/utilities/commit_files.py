@@ -0,0 +1,81 @@
+import base64
+import os
+
+from rest_framework import status
+
+from presqt.targets.utilities import get_http_session
+from presqt.utilities import PresQTResponseException, increment_process_info
+
+# Most base64 encoded bytes sent in a single commit. A file larger than this gets a commit of
+# its own.
+COMMIT_MAX_BYTES = 20 * 1024 * 1024
+# Most files sent in a single commit
+COMMIT_MAX_ACTIONS = 100
+
+
+def commit_files(headers, project_id, branch, files, process_info_path, action):
+    """
+    Upload files to a project's repository through the commits API. Files are sent in as few
+    commits as the limits on a commit's size allow, each commit creating or updating many files.
+
+    Parameters
+    ----------
+    headers : dict
+        Headers for requests.
+    project_id : str
+        ID of the project to upload to
+    branch : str
+        Branch to commit to. It's created if the repository is empty.
+    files : list
+        List of dictionaries holding the 'file_path' of each file on disk, its 'repo_path' in
+        the repository and whether the commit action must 'create' or 'update' it
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+    """
+    commit_url = 'https://gitlab.com/api/v4/projects/{}/repository/commits'.format(project_id)
+
+    for commit_batch in _commit_batches(files):
+        commit_actions = []
+        for file in commit_batch:
+            with open(file['file_path'], 'rb') as file_to_read:
+                commit_actions.append({
+                    "action": file['action'],
+                    "file_path": file['repo_path'],
+                    "encoding": "base64",
+                    "content": base64.b64encode(file_to_read.read()).decode('utf-8')})
+
+        response = get_http_session('gitlab').post(commit_url, headers=headers, json={
+            "branch": branch,
+            "commit_message": "PresQT Upload",
+            "actions": commit_actions})
+        if response.status_code != 201:
+            raise PresQTResponseException(
+                'Upload failed with a status code of {}'.format(response.status_code),
+                status.HTTP_400_BAD_REQUEST)
+
+        # Increment files finished
+        for file in commit_batch:
+            increment_process_info(process_info_path, action, 'upload',
+                                   os.path.getsize(file['file_path']), file['file_path'])
+
+
+def _commit_batches(files):
+    """
+    Split the files into batches that each fit in a single commit.
+    """
+    batch = []
+    batch_bytes = 0
+    for file in files:
+        # Size of the file once it's base64 encoded
+        file_bytes = (os.path.getsize(file['file_path']) + 2) // 3 * 4
+        if batch and (batch_bytes + file_bytes > COMMIT_MAX_BYTES
+                      or len(batch) == COMMIT_MAX_ACTIONS):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(file)
+        batch_bytes += file_bytes
+    if batch:
+        yield batch
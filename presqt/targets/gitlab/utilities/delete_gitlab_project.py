@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 
 def delete_gitlab_project(project_id, token):
@@ -14,4 +15,5 @@ def delete_gitlab_project(project_id, token):
     """
     headers = {"Private-Token": "{}".format(token)}
 
-    requests.delete("https://gitlab.com/api/v4/projects/{}".format(project_id), headers=headers)
\ No newline at end of file
+    get_http_session('gitlab').delete(
+        "https://gitlab.com/api/v4/projects/{}".format(project_id), headers=headers)
\ No newline at end of file
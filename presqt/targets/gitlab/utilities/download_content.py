@@ -1,5 +1,7 @@
 import requests
 
+from presqt.targets.utilities import GIT_BLOB_DIGEST
+
 
 def download_content(username, project_name, resource_id, data, files, is_project):
     """
@@ -40,7 +42,7 @@ def download_content(username, project_name, resource_id, data, files, is_projec
 
             files.append({
                 'file': file_url,
-                'hashes': {},
+                'hashes': {GIT_BLOB_DIGEST: entry['id']},
                 'title': entry['name'],
                 'path': file_path,
                 'source_path': "/{}/{}".format(project_name, entry['path']),
@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 
 def extra_metadata_helper(json_content, headers):
@@ -23,8 +24,8 @@ def extra_metadata_helper(json_content, headers):
 
     # Get the license if it exists
     license = None
-    license_data = requests.get("{}/managed_licenses".format(json_content['_links']['self']),
-                                headers=headers)
+    license_data = get_http_session('gitlab').get(
+        "{}/managed_licenses".format(json_content['_links']['self']), headers=headers)
     if license_data.status_code == 200:
         if len(license_data.json()) > 0:
             license = license_data.json()[0]['name']
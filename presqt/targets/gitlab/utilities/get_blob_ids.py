@@ -0,0 +1,25 @@
+from presqt.targets.gitlab.utilities.gitlab_paginated_data import gitlab_paginated_data
+
+
+def get_blob_ids(headers, project_id, branch):
+    """
+    Get the blob id of every file in a project's repository from one listing of its tree.
+
+    Parameters
+    ----------
+    headers : dict
+        Headers for requests.
+    project_id : str
+        ID of the project
+    branch : str
+        Branch whose tree is listed
+
+    Returns
+    -------
+    Dictionary of file paths in the repository (key) and the id git gave their blob (value).
+    Empty if the repository is.
+    """
+    tree_url = 'https://gitlab.com/api/v4/projects/{}/repository/tree?recursive=1&per_page=100' \
+               '&ref={}'.format(project_id, branch)
+    return {entry['path']: entry['id'] for entry in gitlab_paginated_data(headers, None, tree_url)
+            if entry['type'] == 'blob'}
@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 
 def get_page_numbers(url, headers):
@@ -16,7 +17,7 @@ def get_page_numbers(url, headers):
     -------
     A dictionary of page numbers
     """
-    page_info = requests.get(url, headers=headers).headers
+    page_info = get_http_session('gitlab').get(url, headers=headers).headers
 
     if not page_info['X-Prev-Page']:
         page_info['X-Prev-Page'] = None
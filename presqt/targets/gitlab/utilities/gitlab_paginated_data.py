@@ -1,5 +1,7 @@
 import requests
 
+from presqt.targets.utilities import get_http_session
+
 
 def gitlab_paginated_data(headers, user_id, url=None, page_number=None):
     """
@@ -25,12 +27,13 @@ def gitlab_paginated_data(headers, user_id, url=None, page_number=None):
 
     data = []
     if page_number:
-        response = requests.get("{}?page={}".format(url, page_number), headers=headers)
+        response = get_http_session('gitlab').get(
+            "{}?page={}".format(url, page_number), headers=headers)
         if response.status_code != 200:
             return data
         data.extend(response.json())
     else:
-        response = requests.get(url, headers=headers)
+        response = get_http_session('gitlab').get(url, headers=headers)
         if response.status_code != 200:
             return data
         next_page_number = response.headers['X-Next-Page']
@@ -41,7 +44,7 @@ def gitlab_paginated_data(headers, user_id, url=None, page_number=None):
                 next_url = "{}?page={}".format(url, next_page_number)
             else:
                 next_url = "{}&page={}".format(url, next_page_number)
-            next_response = requests.get(next_url, headers=headers)
+            next_response = get_http_session('gitlab').get(next_url, headers=headers)
             data.extend(next_response.json())
             next_page_number = next_response.headers['X-Next-Page']
 
@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 
 def upload_extra_metadata(extra_metadata, headers, attribute_url):
@@ -18,4 +19,4 @@ def upload_extra_metadata(extra_metadata, headers, attribute_url):
     """
     if extra_metadata['description']:
         data = {'description': extra_metadata['description']}
-        requests.put(attribute_url, headers=headers, data=data)
\ No newline at end of file
+        get_http_session('gitlab').put(attribute_url, headers=headers, data=data)
\ No newline at end of file
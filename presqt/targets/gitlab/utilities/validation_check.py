@@ -1,6 +1,6 @@
-import requests
 from rest_framework import status
 
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -18,7 +18,7 @@ def validation_check(token):
     The requesting user's username and properly formatted GitLab Auth header.
     """
     headers = {"Private-Token": "{}".format(token)}
-    request = requests.get("https://gitlab.com/api/v4/user", headers=headers)
+    request = get_http_session('gitlab').get("https://gitlab.com/api/v4/user", headers=headers)
 
     if request.status_code == 401:
         raise PresQTResponseException("Token is invalid. Response returned a 401 status code.",
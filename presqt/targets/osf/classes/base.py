@@ -16,7 +16,7 @@ class OSFBase(object):
     def __init__(self, json, session=None):
         # Set the session attribute with the existing session or a new one if one doesn't exist.
         if session is None:
-            self.session = PresQTSession('https://api.osf.io/v2')
+            self.session = PresQTSession('https://api.osf.io/v2', 'osf')
         else:
             self.session = session
 
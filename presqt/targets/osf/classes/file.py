@@ -1,4 +1,5 @@
 from presqt.targets.osf.classes.base import OSFBase
+from presqt.targets.utilities import spool_response
 
 
 class File(OSFBase):
@@ -43,16 +44,73 @@ class File(OSFBase):
         self.sha256 = extra['hashes']['sha256']
         self.md5 = extra['hashes']['md5']
 
-    def download(self):
+    @classmethod
+    def from_upload_response(cls, file, session):
         """
-        Download the file using the download_url.
+        Create a File from the metadata WaterButler returns when a file is uploaded, so it
+        doesn't have to be fetched from the OSF API again. Attributes only the OSF API provides
+        are None.
+
+        Parameters
+        ----------
+        file : dict
+            The 'data' of the upload response.
+        session : PresQTSession
+            Session of the container the file was uploaded to.
+
+        Returns
+        -------
+        Class instance of the uploaded file.
+        """
+        instance = cls.__new__(cls)
+        OSFBase.__init__(instance, file, session)
+
+        attrs = file['attributes']
+        extra = attrs['extra']
+        instance.id = attrs['path'].strip('/')
+        instance.parent_project_id = attrs.get('resource')
+        # Links
+        instance.endpoint = None
+        instance.download_url = file['links']['move']
+        instance.upload_url = file['links']['upload']
+        instance.delete_url = file['links']['delete']
+        # Attributes
+        instance.kind = 'item'
+        instance.kind_name = 'file'
+        instance.title = attrs['name']
+        instance.last_touched = None
+        instance.materialized_path = attrs['materialized']
+        instance.date_modified = attrs.get('modified_utc')
+        instance.current_version = extra.get('version')
+        instance.date_created = attrs.get('created_utc')
+        instance.provider = attrs['provider']
+        instance.path = attrs['path']
+        instance.current_user_can_comment = None
+        instance.guid = extra.get('guid')
+        instance.checkout = extra.get('checkout')
+        instance.tags = []
+        instance.size = attrs['size']
+        # Extra
+        instance.hashes = extra['hashes']
+        instance.sha256 = extra['hashes']['sha256']
+        instance.md5 = extra['hashes']['md5']
+        return instance
+
+    def download(self, spool_directory):
+        """
+        Download the file using the download_url and stream it to the spool directory.
+
+        Parameters
+        ----------
+        spool_directory : str
+            Path to the directory the file will be spooled to.
 
         Returns
         -------
-        The requested file in byte format.
+        The path to the spooled file.
         """
-        response = self.get(self.download_url)
-        return response.content
+        response = self.get(self.download_url, stream=True)
+        return spool_response(response, spool_directory)
 
     def update(self, file_to_write):
         """
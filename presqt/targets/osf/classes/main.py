@@ -1,9 +1,9 @@
 import json
-import requests
 
 from rest_framework import status
 
 from presqt.targets.utilities import run_urls_async_with_pagination, get_duplicate_title
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import (PresQTResponseException, PresQTInvalidTokenError,
                               get_dictionary_from_list, list_differences,
                               update_process_info, increment_process_info)
@@ -36,8 +36,8 @@ class OSF(OSFBase):
         """
         self.session.token_auth({'Authorization': 'Bearer {}'.format(token)})
         # Verify that the token provided is a valid one.
-        response = requests.get('https://api.osf.io/v2/users/me/',
-                                headers={'Authorization': 'Bearer {}'.format(token)})
+        response = get_http_session('osf').get('https://api.osf.io/v2/users/me/',
+                                               headers={'Authorization': 'Bearer {}'.format(token)})
         if response.status_code == 401:
             raise PresQTInvalidTokenError(
                 "Token is invalid. Response returned a 401 status code.")
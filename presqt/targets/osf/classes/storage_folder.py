@@ -1,18 +1,24 @@
 import os
+from urllib.parse import quote
 
 from requests.exceptions import ConnectionError
 from rest_framework import status
 
 from presqt.api_v1.utilities import hash_generator
-from presqt.utilities import read_file, increment_process_info
+from presqt.utilities import read_file, increment_process_info, file_multi_hash_generator
 from presqt.utilities import PresQTResponseException
 from presqt.targets.osf.classes.base import OSFBase
 from presqt.targets.osf.classes.file import File
-from presqt.targets.osf.utilities import osf_download_metadata
+from presqt.targets.osf.utilities import osf_download_metadata, run_uploads_async
 
 
 
 class ContainerMixin:
+    # Largest number of files uploaded at the same time by create_directory
+    upload_concurrency = 8
+    # Index of the container's children by name, built by get_children_index
+    _children_index = None
+
     def get_all_files(self, initial_path, files, empty_containers):
         """
         Recursively gets all files for a given container.
@@ -66,6 +72,25 @@ class ContainerMixin:
             if kind_ == kind:
                 yield klass(child, self.session)
 
+    def get_children_index(self):
+        """
+        Get the index of this container's files and folders by name. The children are listed
+        from the API the first time the index is needed and the index is kept up to date as
+        resources are created, so looking a child up doesn't list the container again.
+
+        Returns
+        -------
+        Dictionary of 'file' and 'folder' to dictionaries of child names to class instances.
+        """
+        if self._children_index is None:
+            children_index = {'file': {}, 'folder': {}}
+            for child in self._get_all_paginated_data(self._files_url):
+                kind = child['attributes']['kind']
+                klass = File if kind == 'file' else Folder
+                children_index[kind][child['attributes']['name']] = klass(child, self.session)
+            self._children_index = children_index
+        return self._children_index
+
     def get_folder_by_name(self, folder_name):
         """
         Gets a folder object based on the name. Only looks for top level folders.
@@ -79,9 +104,7 @@ class ContainerMixin:
         -------
         Returns an instance of the requested Folder class.
         """
-        for folder in self.iter_children(self._files_url, 'folder', Folder):
-            if folder.title == folder_name:
-                return folder
+        return self.get_children_index()['folder'].get(folder_name)
 
     def get_file_by_name(self, file_name):
         """
@@ -96,9 +119,65 @@ class ContainerMixin:
         -------
         Returns an instance of the requested File class.
         """
-        for file in self.iter_children(self._files_url, 'file', File):
-            if file.title == file_name:
-                return file
+        return self.get_children_index()['file'].get(file_name)
+
+    def _refresh_children_index(self):
+        """
+        Drop the index of this container's children so it's listed again the next time it's
+        needed, for when a child was created by someone else.
+        """
+        self._children_index = None
+
+    def _find_new_folder(self, folder_name):
+        """
+        Get a folder that was just created. Only the children named like it are listed, unless
+        that doesn't find it.
+
+        Parameters
+        ----------
+        folder_name : str
+            Name of the created folder.
+
+        Returns
+        -------
+        Returns an instance of the requested Folder class.
+        """
+        children = self._get_all_paginated_data('{}?filter[name]={}'.format(
+            self._files_url, quote(folder_name)))
+        for child in children:
+            attributes = child['attributes']
+            if attributes['kind'] == 'folder' and attributes['name'] == folder_name:
+                return Folder(child, self.session)
+
+        self._refresh_children_index()
+        return self.get_folder_by_name(folder_name)
+
+    def index_uploaded_file(self, response_data, file_name):
+        """
+        Add a file to the index of this container's children from the metadata WaterButler
+        returned when it was uploaded. If the metadata can't be read the container is listed
+        again instead.
+
+        Parameters
+        ----------
+        response_data : dict
+            JSON of the upload response.
+        file_name : str
+            Name of the uploaded file.
+
+        Returns
+        -------
+        Class instance of the uploaded file.
+        """
+        try:
+            file = File.from_upload_response(response_data['data'], self.session)
+        except (KeyError, TypeError):
+            self._refresh_children_index()
+            return self.get_file_by_name(file_name)
+
+        if self._children_index is not None:
+            self._children_index['file'][file.title] = file
+        return file
 
     def create_folder(self, folder_name):
         """
@@ -113,12 +192,19 @@ class ContainerMixin:
         -------
         Class instance of the created folder.
         """
-        response = self.put(self._new_folder_url, params={'name': folder_name})
-        if response.status_code == 409:
-            return self.get_folder_by_name(folder_name)
+        # Folders this container already has aren't created again
+        if self._children_index is not None and folder_name in self._children_index['folder']:
+            return self._children_index['folder'][folder_name]
 
-        elif response.status_code == 201:
-            return self.get_folder_by_name(folder_name)
+        response = self.put(self._new_folder_url, params={'name': folder_name})
+        if response.status_code in [201, 409]:
+            folder = self._find_new_folder(folder_name)
+            # A folder that was just created has no children to list
+            if response.status_code == 201:
+                folder._children_index = {'file': {}, 'folder': {}}
+            if self._children_index is not None:
+                self._children_index['folder'][folder_name] = folder
+            return folder
 
         else:
             raise PresQTResponseException(
@@ -134,8 +220,9 @@ class ContainerMixin:
         ----------
         file_name : str
             Name of the file to create.
-        file_to_write : bytes
-            File to create.
+        file_to_write : bytes or file
+            File to create. An open file is streamed, and can only be used when duplicates are
+            ignored.
         file_duplicate_action : str
             Flag for how to handle the case of the file already existing.
 
@@ -143,44 +230,49 @@ class ContainerMixin:
         -------
         Class instance of the created file.
         """
-        # When uploading a large file (>a few MB) that already exists
-        # we sometimes get a ConnectionError instead of a status == 409.
-        connection_error = False
-        try:
-            response = self.put(self._new_file_url, params={'name': file_name}, data=file_to_write)
-        except ConnectionError:
-            connection_error = True
+        original_file = self.get_file_by_name(file_name)
+
+        if original_file is None:
+            # When uploading a large file (>a few MB) that already exists
+            # we sometimes get a ConnectionError instead of a status == 409.
+            connection_error = False
+            try:
+                response = self.put(self._new_file_url, params={'name': file_name},
+                                    data=file_to_write)
+            except ConnectionError:
+                connection_error = True
+
+            # File uploaded successfully
+            if not connection_error and response.status_code == 201:
+                return 'created', self.index_uploaded_file(self._json(response), file_name)
+
+            # The file was created since this container was listed
+            elif connection_error or response.status_code == 409:
+                self._refresh_children_index()
+                original_file = self.get_file_by_name(file_name)
 
-        # If the file is a duplicate then either ignore or update it
-        if connection_error or response.status_code == 409:
-            original_file = self.get_file_by_name(file_name)
-
-            if file_duplicate_action == 'ignore':
-                return 'ignored', original_file
+            else:
+                raise PresQTResponseException(
+                    "Response has status code {} while creating file {}".format(
+                        response.status_code, file_name), status.HTTP_400_BAD_REQUEST)
 
-            elif file_duplicate_action == 'update':
-                # Only attempt to update the file if the new file is different than the original
-                if hash_generator(file_to_write, 'md5') != original_file.hashes['md5']:
-                    response = self.get_file_by_name(file_name).update(file_to_write)
-
-                    if response.status_code == 200:
-                        return 'updated', self.get_file_by_name(file_name)
-                    else:
-                        raise PresQTResponseException(
-                            "Response has status code {} while updating file {}".format(
-                                response.status_code, file_name), status.HTTP_400_BAD_REQUEST)
-                else:
-                    return 'ignored', original_file
+        # The file is a duplicate so either ignore or update it
+        if file_duplicate_action == 'ignore':
+            return 'ignored', original_file
 
-        # File uploaded successfully
-        elif response.status_code == 201:
-            return 'created', self.get_file_by_name(file_name)
+        elif file_duplicate_action == 'update':
+            # Only attempt to update the file if the new file is different than the original
+            if hash_generator(file_to_write, 'md5') != original_file.hashes['md5']:
+                response = original_file.update(file_to_write)
 
-        else:
-            raise PresQTResponseException(
-                "Response has status code {} while creating file {}".format(response.status_code,
-                                                                            file_name),
-                status.HTTP_400_BAD_REQUEST)
+                if response.status_code == 200:
+                    return 'updated', self.index_uploaded_file(self._json(response), file_name)
+                else:
+                    raise PresQTResponseException(
+                        "Response has status code {} while updating file {}".format(
+                            response.status_code, file_name), status.HTTP_400_BAD_REQUEST)
+            else:
+                return 'ignored', original_file
 
     def create_directory(self, directory_path, file_duplicate_action, file_hashes,
                          resources_ignored, resources_updated, file_metadata_list,
@@ -211,20 +303,62 @@ class ContainerMixin:
         -------
         Returns same file_hashes, resources ignored, resources updated parameters.
         """
-        directory, folders, files = next(os.walk(directory_path))
+        # Create the folder tree first so the files of every folder can be uploaded at once
+        containers = []
+        self._create_folder_tree(directory_path, containers)
+
+        # Duplicates are found up front from each folder's files instead of from a 409 per file
+        upload_list = []
+        planned_files = []
+        for container, directory, filenames in containers:
+            existing_files = container.get_children_index()['file']
+            for filename in filenames:
+                file_path = '{}/{}'.format(directory, filename)
+                original_file = existing_files.get(filename)
+                if original_file is None:
+                    upload_list.append({'url': container._new_file_url,
+                                        'params': {'name': filename}, 'file_path': file_path})
+                    planned_files.append((container, file_path, 'created'))
+                # Only update the file if the new file is different than the original
+                elif file_duplicate_action == 'update' and file_multi_hash_generator(
+                        file_path, ['md5'])['md5'] != original_file.hashes['md5']:
+                    upload_list.append({'url': original_file.upload_url, 'params': {},
+                                        'file_path': file_path})
+                    planned_files.append((container, file_path, 'updated'))
+                else:
+                    increment_process_info(process_info_path, action, 'upload',
+                                           os.path.getsize(file_path), file_path)
+                    planned_files.append((container, file_path, original_file))
 
-        for filename in files:
-            file_path = '{}/{}'.format(directory, filename)
-            file_to_write = read_file(file_path)
+        responses = iter(run_uploads_async(upload_list, self.session.headers,
+                                           self.upload_concurrency, process_info_path, action))
 
-            file_action, file = self.create_file(filename, file_to_write, file_duplicate_action)
+        for container, file_path, file_action in planned_files:
+            filename = os.path.basename(file_path)
+            if isinstance(file_action, File):
+                file_action, file = 'ignored', file_action
+            else:
+                status_code, response_data = next(responses)
+                if status_code in [None, 409]:
+                    # The file was created while the others were uploading or the connection
+                    # dropped, so upload it again on its own
+                    file_action, file = container.create_file(
+                        filename, read_file(file_path), file_duplicate_action)
+                    increment_process_info(process_info_path, action, 'upload',
+                                           os.path.getsize(file_path), file_path)
+                elif status_code not in [200, 201]:
+                    raise PresQTResponseException(
+                        "Response has status code {} while {} file {}".format(
+                            status_code, 'creating' if file_action == 'created' else 'updating',
+                            filename), status.HTTP_400_BAD_REQUEST)
+                else:
+                    file = container.index_uploaded_file(response_data, filename)
 
             file_metadata_list.append({
                 "actionRootPath": file_path,
                 "destinationPath": '{}{}'.format(file.provider, file.materialized_path),
                 "title": file.title,
                 "destinationHash": file.hashes})
-            increment_process_info(process_info_path, action, 'upload')
 
             file_hashes[file_path] = file.hashes
             if file_action == 'ignored':
@@ -232,14 +366,23 @@ class ContainerMixin:
             elif file_action == 'updated':
                 resources_updated.append(file_path)
 
-        for folder in folders:
-            created_folder = self.create_folder(folder)
-            created_folder.create_directory('{}/{}'.format(directory, folder),
-                                            file_duplicate_action, file_hashes,
-                                            resources_ignored, resources_updated, file_metadata_list,
-                                            process_info_path, action)
+    def _create_folder_tree(self, directory_path, containers):
+        """
+        Create the folders found in the given directory_path, one level at a time.
 
+        Parameters
+        ----------
+        directory_path : str
+            Directory to find the folders to create.
+        containers : list
+            List the container, directory and file names of each folder are appended to.
+        """
+        directory, folders, files = next(os.walk(directory_path))
+        containers.append((self, directory, files))
 
+        for folder in folders:
+            created_folder = self.create_folder(folder)
+            created_folder._create_folder_tree('{}/{}'.format(directory, folder), containers)
 
 
 class Storage(OSFBase, ContainerMixin):
@@ -1,25 +1,29 @@
 import asyncio
-import aiohttp
+import os
 import requests
 
 from rest_framework import status
 
 from presqt.targets.osf.utilities import get_osf_resource, osf_download_metadata, extra_metadata_helper
+from presqt.targets.utilities import async_spool_response, get_async_session, run_async
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import (PresQTResponseException, PresQTInvalidTokenError,
-                              get_dictionary_from_list, update_process_info, increment_process_info,
-                              update_process_info_message)
+                              update_process_info, increment_process_info,
+                              update_process_info_message, report_downloaded_file,
+                              get_resumed_file)
 from presqt.targets.osf.classes.main import OSF
 
 
-async def async_get(url, session, token, process_info_path, action):
+async def async_get(file, session, token, process_info_path, action, spool_directory):
     """
-    Coroutine that uses aiohttp to make a GET request. This is the method that will be called
-    asynchronously with other GETs.
+    Coroutine that uses aiohttp to make a GET request and stream the file to the job's spool
+    directory. This is the method that will be called asynchronously with other GETs.
 
     Parameters
     ----------
-    url: str
-        URL to call
+    file: dict
+        The file's dictionary. Its 'file' is the File to download, which is replaced with the
+        path to the spooled file.
     session: ClientSession object
         aiohttp ClientSession Object
     token: str
@@ -28,44 +32,57 @@ async def async_get(url, session, token, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory the downloaded file will be spooled to
 
     Returns
     -------
-    Response JSON
+    The file's dictionary
     """
-    async with session.get(url, headers={'Authorization': 'Bearer {}'.format(token)}) as response:
-        assert response.status == 200
-        content = await response.read()
-        # Increment the number of files done in the process info file.
-        increment_process_info(process_info_path, action, 'download')
-        return {'url': url, 'binary_content': content}
-
-
-async def async_main(url_list, token, process_info_path, action):
+    # A resumed transfer hands back the files the stopped one had already downloaded
+    resumed_file = get_resumed_file(process_info_path, file)
+    if resumed_file:
+        file['file'] = resumed_file
+    else:
+        async with session.get(file['file'].download_url,
+                               headers={'Authorization': 'Bearer {}'.format(token)}) as response:
+            assert response.status == 200
+            file['file'] = await async_spool_response(response, spool_directory)
+    # Increment the number of files done in the process info file.
+    increment_process_info(process_info_path, action, 'download', os.path.getsize(file['file']))
+    # Hand the file over before the rest have been downloaded
+    report_downloaded_file(process_info_path, file)
+    return file
+
+
+async def async_main(files, token, process_info_path, action, spool_directory):
     """
     Main coroutine method that will gather the url calls to be made and will make them
     asynchronously.
 
     Parameters
     ----------
-    url_list: list
-        List of urls to call
+    files: list
+        List of file dictionaries whose 'file' is the File to download
     token: str
         User's OSF token
     process_info_path: str
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory the downloaded files will be spooled to
 
     Returns
     -------
     List of data brought back from each coroutine called.
     """
-    async with aiohttp.ClientSession() as session:
-        return await asyncio.gather(*[async_get(url, session, token, process_info_path, action) for url in url_list])
+    session = get_async_session('osf')
+    return await asyncio.gather(*[async_get(file, session, token, process_info_path, action, spool_directory)
+                                  for file in files])
 
 
-def osf_download_resource(token, resource_id, process_info_path, action):
+def osf_download_resource(token, resource_id, process_info_path, action, spool_directory):
     """
     Fetch the requested resource from OSF along with its hash information.
 
@@ -79,6 +96,8 @@ def osf_download_resource(token, resource_id, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory in the job's ticket path that files should be streamed to
 
     Returns
     -------
@@ -86,7 +105,7 @@ def osf_download_resource(token, resource_id, process_info_path, action):
         'resources': List of dictionary objects that each hold a file and its information.
                      Dictionary must be in the following format:
                          {
-                            'file': binary_file,
+                            'file': '/path/to/spooled/file',
                             'hashes': {'hash_algorithm': 'the_hash'},
                             'title': 'file.jpg',
                             'path': '/path/to/file',
@@ -106,9 +125,9 @@ def osf_download_resource(token, resource_id, process_info_path, action):
         raise PresQTResponseException("Token is invalid. Response returned a 401 status code.",
                                       status.HTTP_401_UNAUTHORIZED)
     # Get contributor name
-    contributor_name = requests.get('https://api.osf.io/v2/users/me/',
-                                    headers={'Authorization': 'Bearer {}'.format(token)}).json()[
-                                        'data']['attributes']['full_name']
+    contributor_name = get_http_session('osf').get(
+        'https://api.osf.io/v2/users/me/', headers={'Authorization': 'Bearer {}'.format(token)}
+    ).json()['data']['attributes']['full_name']
     action_metadata = {"sourceUsername": contributor_name}
     # Get the resource
     resource = get_osf_resource(resource_id, osf_instance)
@@ -127,8 +146,9 @@ def osf_download_resource(token, resource_id, process_info_path, action):
         update_process_info(process_info_path, 1, action, 'download')
 
         project = osf_instance.project(resource.parent_project_id)
+        file_path = resource.download(spool_directory)
         files.append({
-            "file": resource.download(),
+            "file": file_path,
             "hashes": resource.hashes,
             "title": resource.title,
             # If the file is the only resource we are downloading then we don't need it's full path
@@ -137,7 +157,7 @@ def osf_download_resource(token, resource_id, process_info_path, action):
             "extra_metadata": osf_download_metadata(resource)
         })
         # Increment the number of files done in the process info file.
-        increment_process_info(process_info_path, action, 'download')
+        increment_process_info(process_info_path, action, 'download', os.path.getsize(file_path))
     else:
         if resource.kind_name == 'project':
             extra_metadata = extra_metadata_helper(resource_id, {'Authorization': 'Bearer {}'.format(token)})
@@ -157,25 +177,19 @@ def osf_download_resource(token, resource_id, process_info_path, action):
                 path_to_strip = resource.materialized_path[:-(len(resource.title) + 2)]
                 file['path'] = file['file'].materialized_path[len(path_to_strip):]
 
-        file_urls = [file['file'].download_url for file in files]
+        for file in files:
+            file['source_path'] = '/{}/{}{}'.format(project.title,
+                                                    file['file'].provider,
+                                                    file['file'].materialized_path)
 
         update_process_info_message(process_info_path, action, 'Downloading files from OSF...')
         # Add the total number of projects to the process info file.
         # This is necessary to keep track of the progress of the request.
-        update_process_info(process_info_path, len(file_urls), action, 'download')
-
-        # Asynchronously make all download requests
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        download_data = loop.run_until_complete(async_main(file_urls, token, process_info_path, action))
+        update_process_info(process_info_path, len(files), action, 'download')
 
-        # Go through the file dictionaries and replace the file class with the binary_content
-        for file in files:
-            file['source_path'] = '/{}/{}{}'.format(project.title,
-                                                    file['file'].provider,
-                                                    file['file'].materialized_path)
-            file['file'] = get_dictionary_from_list(
-                download_data, 'url', file['file'].download_url)['binary_content']
+        # Asynchronously make all download requests. Each file's File class is replaced with its
+        # spooled file path as it's downloaded.
+        run_async(async_main(files, token, process_info_path, action, spool_directory))
 
     return {
         'resources': files,
@@ -1,11 +1,10 @@
-import requests
-
 from rest_framework import status
 
 from presqt.targets.osf.utilities import (get_osf_resource, validate_token, get_all_paginated_data,
                                           get_search_page_numbers)
 from presqt.targets.osf.utilities.utils.get_page_numbers import get_page_numbers
 from presqt.targets.osf.utilities.utils.get_osf_children import get_osf_children
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import (PresQTResponseException, PresQTInvalidTokenError,
                               PresQTValidationError)
 from presqt.targets.osf.classes.main import OSF
@@ -78,7 +77,8 @@ def osf_fetch_resources(token, query_parameter):
         user_url = 'https://api.osf.io/v2/users/?filter[full_name]={}&page={}'.format(
             query_parameters, page)
 
-        user_data = requests.get(user_url, headers={'Authorization': 'Bearer {}'.format(token)})
+        user_data = get_http_session('osf').get(
+            user_url, headers={'Authorization': 'Bearer {}'.format(token)})
         if user_data.status_code != 200 or len(user_data.json()['data']) == 0:
             return [], pages
         else:
@@ -93,7 +93,8 @@ def osf_fetch_resources(token, query_parameter):
         url = "https://api.osf.io/v2/users/me/nodes/"
 
     try:
-        response = requests.get(url, headers={'Authorization': 'Bearer {}'.format(token)})
+        response = get_http_session('osf').get(
+            url, headers={'Authorization': 'Bearer {}'.format(token)})
         if response.status_code != 200:
             # The page requested doesn't exist
             return [], pages
@@ -244,7 +245,7 @@ def osf_fetch_resource(token, resource_id):
         elif resource_object.kind_name == 'project':
             # Try and find a DOI for this resource
             headers = {'Authorization': 'Bearer {}'.format(token)}
-            identifiers = requests.get(
+            identifiers = get_http_session('osf').get(
                 'https://api.osf.io/v2/nodes/{}/identifiers/'.format(resource_id), headers=headers).json()['data']
             for entry in identifiers:
                 if entry['attributes']['category'] == 'doi':
@@ -1,10 +1,10 @@
 import json
-import requests
 
 from rest_framework import status
 
 from presqt.targets.osf.classes.main import OSF
 from presqt.targets.osf.utilities import get_osf_resource
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTResponseException, PresQTInvalidTokenError
 
 
@@ -57,7 +57,8 @@ def osf_fetch_keywords(token, resource_id):
     metadata = None
     for data in project_data:
         if data['attributes']['name'] == "PRESQT_FTS_METADATA.json":
-            metadata_file = requests.get(data['links']['move'], headers=header).content
+            metadata_file = get_http_session('osf').get(
+                data['links']['move'], headers=header).content
             # Update the existing metadata
             metadata = json.loads(metadata_file)
 
@@ -118,7 +119,7 @@ def osf_upload_keywords(token, resource_id, keywords):
         patch_url = 'https://api.osf.io/v2/nodes/{}/'.format(resource_id)
         data = {"data": {"type": "nodes", "id": resource_id, "attributes": {"tags": keywords}}}
 
-    response = requests.patch(patch_url, headers=headers, data=json.dumps(data))
+    response = get_http_session('osf').patch(patch_url, headers=headers, data=json.dumps(data))
     if response.status_code != 200:
         raise PresQTResponseException("OSF returned a {} error trying to update keywords.".format(
             response.status_code), status.HTTP_400_BAD_REQUEST)
@@ -1,14 +1,13 @@
 import os
-import requests
 
 from rest_framework import status
 
 from presqt.targets.osf.utilities import get_osf_resource
 from presqt.utilities import (
     PresQTInvalidTokenError, PresQTResponseException, update_process_info,
-    update_process_info_message)
+    update_process_info_message, record_upload_destination)
 from presqt.targets.osf.classes.main import OSF
-from presqt.targets.utilities import upload_total_files
+from presqt.targets.utilities import upload_total_files, get_http_session
 
 
 def osf_upload_resource(token, resource_id, resource_main_dir,
@@ -68,9 +67,9 @@ def osf_upload_resource(token, resource_id, resource_main_dir,
                                       status.HTTP_401_UNAUTHORIZED)
 
     # Get contributor name
-    contributor_name = requests.get('https://api.osf.io/v2/users/me/',
-                                    headers={'Authorization': 'Bearer {}'.format(token)}).json()[
-                                        'data']['attributes']['full_name']
+    contributor_name = get_http_session('osf').get(
+        'https://api.osf.io/v2/users/me/', headers={'Authorization': 'Bearer {}'.format(token)}
+    ).json()['data']['attributes']['full_name']
     action_metadata = {"destinationUsername": contributor_name}
 
     hashes = {}
@@ -121,6 +120,7 @@ def osf_upload_resource(token, resource_id, resource_main_dir,
         # Create a new project with the name being the top level directory's name.
         project = osf_instance.create_project(os_path[1][0])
         project_id = project.id
+        record_upload_destination(process_info_path, project_id)
 
         # Upload resources into OSFStorage for the new project.
         project.storage('osfstorage').create_directory(
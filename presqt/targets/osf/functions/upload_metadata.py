@@ -1,10 +1,10 @@
 import itertools
 import json
-import requests
 
 from presqt.json_schemas.schema_handlers import schema_validator
 from presqt.targets.osf.classes.main import OSF
 from presqt.targets.osf.utilities.upload_extra_metadata import upload_extra_metadata
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTError
 
 
@@ -33,7 +33,8 @@ def osf_upload_metadata(token, project_id, metadata_dict):
 
     for data in project_data:
         if data['attributes']['name'] == file_name:
-            old_metadata_file = requests.get(data['links']['move'], headers=header).content
+            old_metadata_file = get_http_session('osf').get(
+                data['links']['move'], headers=header).content
             # Update the existing metadata
             updated_metadata = json.loads(old_metadata_file)
 
@@ -42,8 +43,9 @@ def osf_upload_metadata(token, project_id, metadata_dict):
                 # therefore invalid.
                 rename_payload = {"action": "rename",
                                   "rename": "INVALID_PRESQT_FTS_METADATA.json"}
-                response = requests.post(data['links']['move'], headers=header,
-                                         data=json.dumps(rename_payload).encode('utf-8'))
+                response = get_http_session('osf').post(
+                    data['links']['move'], headers=header,
+                    data=json.dumps(rename_payload).encode('utf-8'))
                 if response.status_code != 201:
                     raise PresQTError(
                         "The request to rename the invalid metadata file has returned a {} error code from OSF.".format(
@@ -62,8 +64,9 @@ def osf_upload_metadata(token, project_id, metadata_dict):
             encoded_metadata = json.dumps(updated_metadata, indent=4).encode('utf-8')
 
             # Now we need to update the metadata file with this updated metadata
-            response = requests.put(data['links']['upload'], headers=header,
-                                    params={'kind': 'file'}, data=encoded_metadata)
+            response = get_http_session('osf').put(
+                data['links']['upload'], headers=header, params={'kind': 'file'},
+                data=encoded_metadata)
 
             # When updating an existing metadata file, OSF returns a 200 status
             if response.status_code != 200:
@@ -73,8 +76,9 @@ def osf_upload_metadata(token, project_id, metadata_dict):
             return
 
     # If there is no existing metadata file, then create a new one.
-    response = requests.put(put_url.format(project_id), headers=header, params={"name": file_name},
-                            data=encoded_metadata)
+    response = get_http_session('osf').put(
+        put_url.format(project_id), headers=header, params={"name": file_name},
+        data=encoded_metadata)
 
     if response.status_code != 201:
         raise PresQTError(
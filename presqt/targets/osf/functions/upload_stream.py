@@ -0,0 +1,116 @@
+import os
+import threading
+
+from rest_framework import status
+
+from presqt.targets.osf.classes.main import OSF
+from presqt.targets.utilities import get_http_session
+from presqt.utilities import (PresQTInvalidTokenError, PresQTResponseException,
+                              increment_process_info, record_upload_destination)
+
+
+class OSFUploadStream(object):
+    """
+    Uploads the files of a streaming transfer to a new OSF project as they arrive, while the rest
+    of the files are still being downloaded from the source target.
+    """
+    max_workers = 4
+
+    def __init__(self, token, progress_reporter, action):
+        """
+        Parameters
+        ----------
+        token : str
+            User's OSF token.
+        progress_reporter: ProgressReporter
+            The progress reporter that keeps track of the transfer's progress
+        action: str
+            The action being performed
+        """
+        try:
+            self.osf_instance = OSF(token)
+        except PresQTInvalidTokenError:
+            raise PresQTResponseException("Token is invalid. Response returned a 401 status code.",
+                                          status.HTTP_401_UNAUTHORIZED)
+        # Get contributor name
+        contributor_name = get_http_session('osf').get(
+            'https://api.osf.io/v2/users/me/', headers={'Authorization': 'Bearer {}'.format(token)}
+        ).json()['data']['attributes']['full_name']
+        self.progress_reporter = progress_reporter
+        self.action = action
+        self.action_metadata = {"destinationUsername": contributor_name}
+        self.project_id = None
+        self.project_link = None
+        # Folders already created in the project's storage, by their path in the project
+        self._folders = {}
+        self._folders_lock = threading.Lock()
+
+    def create_project(self, title):
+        """
+        Create the project the files are uploaded to.
+
+        Parameters
+        ----------
+        title : str
+            Name of the top level directory being transferred
+        """
+        self.project = self.osf_instance.create_project(title)
+        self.project_id = self.project.id
+        self.project_link = "https://osf.io/{}".format(self.project_id)
+        record_upload_destination(self.progress_reporter, self.project_id)
+        self._folders[''] = self.project.storage('osfstorage')
+
+    def create_folder(self, folder_path):
+        """
+        Create a folder, and any of its parents that don't exist yet, in the project's storage.
+
+        Parameters
+        ----------
+        folder_path : str
+            Path of the folder inside of the project
+
+        Returns
+        -------
+        Class instance of the folder.
+        """
+        folder = self._folders['']
+        current_path = ''
+        # Folders are created one at a time so two files in a new folder don't both create it
+        with self._folders_lock:
+            for folder_name in filter(None, folder_path.split('/')):
+                current_path = os.path.join(current_path, folder_name)
+                if current_path not in self._folders:
+                    self._folders[current_path] = folder.create_folder(folder_name)
+                folder = self._folders[current_path]
+        return folder
+
+    def upload_file(self, file_path, path_in_project):
+        """
+        Upload a file to the project's storage.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the file on disk
+        path_in_project : str
+            Path of the file inside of the project
+
+        Returns
+        -------
+        The file's metadata in the format of the 'file_metadata_list' upload functions return,
+        with every hash OSF provides as the destinationHash.
+        """
+        folder = self.create_folder(os.path.dirname(path_in_project))
+        # The file is streamed from disk rather than read into memory
+        with open(file_path, 'rb') as file_to_write:
+            # The project is new so the file can't already exist in it
+            file_action, file = folder.create_file(os.path.basename(file_path), file_to_write,
+                                                   'ignore')
+        increment_process_info(self.progress_reporter, self.action, 'upload',
+                               os.path.getsize(file_path), file_path)
+        return {
+            "actionRootPath": file_path,
+            "destinationPath": '/{}/{}{}'.format(self.project.title, file.provider,
+                                                 file.materialized_path),
+            "title": file.title,
+            "destinationHash": file.hashes}
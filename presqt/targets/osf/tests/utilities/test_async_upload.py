@@ -0,0 +1,69 @@
+import asyncio
+import os
+import shutil
+import tempfile
+
+from aiohttp import web
+from django.test import SimpleTestCase
+
+from presqt.targets.osf.utilities import run_uploads_async
+from presqt.targets.utilities.tests.shared_fake_server import FakeServer
+from presqt.utilities import get_job_store, get_process_info_path
+
+
+class TestAsyncUpload(SimpleTestCase):
+    def setUp(self):
+        self.ticket_number = 'test_osf_async_upload'
+        self.directory = tempfile.mkdtemp()
+        self.uploads_running = 0
+        self.most_uploads_running = 0
+        self.received = {}
+
+        # Serve a fake upload endpoint from its own loop in the background
+        self.server = FakeServer([web.put('/upload/', self.handle_upload)])
+        self.url = '{}/upload/'.format(self.server.url)
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.directory)
+        shutil.rmtree(os.path.dirname(get_process_info_path(self.ticket_number)),
+                      ignore_errors=True)
+
+    async def handle_upload(self, request):
+        self.uploads_running += 1
+        self.most_uploads_running = max(self.most_uploads_running, self.uploads_running)
+        await asyncio.sleep(0.05)
+        self.uploads_running -= 1
+        if request.query['name'] == 'duplicate.txt':
+            return web.Response(status=409)
+        self.received[request.query['name']] = await request.read()
+        return web.json_response({'data': {'attributes': {'name': request.query['name']}}},
+                                 status=201)
+
+    def test_run_uploads_async(self):
+        """
+        Every file should be uploaded with no more than the given number at a time, and only the
+        files that were created should be counted as finished.
+        """
+        get_job_store().set_action(self.ticket_number, 'resource_upload', {
+            'status': 'in_progress', 'upload_files_finished': 0})
+        upload_list = []
+        for name in ['file_{}.txt'.format(index) for index in range(10)] + ['duplicate.txt']:
+            file_path = os.path.join(self.directory, name)
+            with open(file_path, 'wb') as file:
+                file.write(name.encode() * 100)
+            upload_list.append({'url': self.url, 'params': {'name': name},
+                                'file_path': file_path})
+
+        responses = run_uploads_async(upload_list, {'Authorization': 'Bearer token'}, 3,
+                                      get_process_info_path(self.ticket_number),
+                                      'resource_upload')
+
+        self.assertEqual([status_code for status_code, _ in responses], [201] * 10 + [409])
+        self.assertEqual(responses[4][1], {'data': {'attributes': {'name': 'file_4.txt'}}})
+        self.assertIsNone(responses[10][1])
+        self.assertEqual(self.most_uploads_running, 3)
+        self.assertEqual(self.received['file_4.txt'], b'file_4.txt' * 100)
+        self.assertEqual(
+            get_job_store().get_job(self.ticket_number)['resource_upload']['upload_files_finished'],
+            10)
@@ -314,7 +314,7 @@ class TestResourceKeywordsPOST(SimpleTestCase):
                 self.json_data = json_data
                 self.status_code = status_code
         mock_req = MockResponse({'error': 'The server is down.'}, 500)
-        with patch('requests.patch') as mock_request:
+        with patch('requests.Session.patch') as mock_request:
             mock_request.return_value = mock_req
             # Upload new keywords
             resource_id = 'cmn5z'
@@ -337,7 +337,7 @@ class TestResourceKeywordsPOST(SimpleTestCase):
                 self.json_data = json_data
                 self.status_code = status_code
         mock_req = MockResponse({'error': 'The server is down.'}, 500)
-        with patch('requests.patch') as mock_request:
+        with patch('requests.Session.patch') as mock_request:
             mock_request.return_value = mock_req
             # Upload new keywords
             resource_id = '5cd9831c054f5b001a5ca2af'
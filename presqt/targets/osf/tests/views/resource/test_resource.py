@@ -1043,7 +1043,7 @@ class TestResourcePOST(SimpleTestCase):
 
         # Now I'll make an explicit call to our metadata function with a mocked server error and ensure
         # it is raising an exception.
-        with patch('requests.put') as mock_request:
+        with patch('requests.Session.put') as mock_request:
             mock_request.return_value = mock_req
             # Attempt to update the metadata, but the server is down!
             self.assertRaises(PresQTError, osf_upload_metadata, self.token, node_id,
@@ -1095,7 +1095,7 @@ class TestResourcePOST(SimpleTestCase):
 
         # Now I'll make an explicit call to our metadata function with a mocked server error and ensure
         # it is raising an exception.
-        with patch('requests.post') as mock_request:
+        with patch('requests.Session.post') as mock_request:
             mock_request.return_value = mock_req
             # Attempt to update the metadata, but the server is down!
             self.assertRaises(PresQTError, osf_upload_metadata, self.token, node_id,
@@ -1140,7 +1140,7 @@ class TestResourcePOST(SimpleTestCase):
 
     def test_success_400_bad_bag_only_single_file(self):
         """
-        Test that we get a 400 error because a bad bag was uploaded.
+        Test that the upload job fails with a 400 error because a bad bag was uploaded.
         """
         self.resource_id = None
         self.duplicate_action = 'ignore'
@@ -1148,9 +1148,16 @@ class TestResourcePOST(SimpleTestCase):
         self.file = 'presqt/api_v1/tests/resources/upload/bagless_zip.zip'
         response = self.client.post(
             self.url, {'presqt-file': open(self.file, 'rb')}, **self.headers)
+        self.assertEqual(response.status_code, 202)
 
-        self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.data['error'], 'PresQT Error: Bag is not formatted properly.')
+        self.ticket_path = 'mediafiles/jobs/{}'.format(self.ticket_number)
+        process_info = read_file('{}/process_info.json'.format(self.ticket_path), True)
+        process_wait(process_info, self.ticket_path)
+
+        process_info = read_file('{}/process_info.json'.format(self.ticket_path), True)
+        self.assertEqual(process_info['resource_upload']['status_code'], 400)
+        self.assertEqual(process_info['resource_upload']['message'],
+                         'PresQT Error: Bag is not formatted properly.')
 
     def test_error_attempt_multiple_uploads(self):
         """
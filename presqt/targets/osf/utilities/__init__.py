@@ -7,3 +7,4 @@ from .utils.get_all_paginated_data import get_all_paginated_data
 from .utils.get_follow_next_urls import get_follow_next_urls
 from .utils.get_search_page_numbers import get_search_page_numbers
 from .utils.extra_metadata_helper import extra_metadata_helper
+from .utils.async_upload import run_uploads_async
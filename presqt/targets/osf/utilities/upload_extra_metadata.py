@@ -1,5 +1,6 @@
 import json
-import requests
+
+from presqt.targets.utilities import get_http_session
 
 
 def upload_extra_metadata(extra_metadata, headers, attribute_url, project_id):
@@ -31,4 +32,4 @@ def upload_extra_metadata(extra_metadata, headers, attribute_url, project_id):
          })
 
         headers['Content-Type'] = 'application/json'
-        requests.patch(attribute_url, headers=headers, data=data)
\ No newline at end of file
+        get_http_session('osf').patch(attribute_url, headers=headers, data=data)
\ No newline at end of file
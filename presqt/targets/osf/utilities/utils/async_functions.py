@@ -1,9 +1,9 @@
 import asyncio
-import aiohttp
 
 from rest_framework import status
 
 from presqt.targets.osf.utilities import get_follow_next_urls
+from presqt.targets.utilities import get_async_session, run_async
 from presqt.utilities import PresQTValidationError
 
 
@@ -23,10 +23,7 @@ def run_urls_async(url_list, headers):
     -------
     The data returned from the async call
     """
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    data = loop.run_until_complete(async_main(url_list, headers))
-    return data
+    return run_async(async_main(url_list, headers))
 
 
 def run_urls_async_with_pagination(url_list, headers):
@@ -102,5 +99,5 @@ async def async_main(url_list, headers):
     -------
     List of data brought back from each coroutine called.
     """
-    async with aiohttp.ClientSession() as session:
-        return await asyncio.gather(*[async_get(url, session, headers) for url in url_list])
+    session = get_async_session('osf')
+    return await asyncio.gather(*[async_get(url, session, headers) for url in url_list])
@@ -0,0 +1,114 @@
+import asyncio
+import os
+
+import aiohttp
+
+from presqt.targets.utilities import get_async_session, run_async
+from presqt.utilities import increment_process_info
+
+
+def run_uploads_async(upload_list, headers, concurrency, process_info_path, action):
+    """
+    Open an async loop and upload files to OSF, at most `concurrency` at a time.
+
+    Parameters
+    ----------
+    upload_list: list
+        List of dictionaries of the uploads to make, each holding the 'url' to PUT the file to,
+        the 'params' of the request and the 'file_path' of the file on disk
+    headers: dict
+        Necessary header for OSF calls
+    concurrency: int
+        Largest number of files uploaded at the same time
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    List of the status code and JSON of the response of each upload, in the order of
+    upload_list. Both are None if the connection failed.
+    """
+    return run_async(async_main(upload_list, headers, concurrency, process_info_path, action))
+
+
+async def async_put(upload, session, semaphore, headers, process_info_path, action):
+    """
+    Coroutine that uses aiohttp to stream a file from disk in a PUT request. Files that upload
+    successfully are counted in the process info.
+
+    Parameters
+    ----------
+    upload: dict
+        The upload to make
+    session: ClientSession object
+        aiohttp ClientSession Object
+    semaphore: asyncio.Semaphore
+        Bounds the number of uploads running at the same time
+    headers: dict
+        Necessary header for OSF calls
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    The status code and JSON of the response, or None for both if the connection failed.
+    """
+    async with semaphore:
+        try:
+            with open(upload['file_path'], 'rb') as file:
+                async with session.put(upload['url'], params=upload['params'], data=file,
+                                       headers=headers) as response:
+                    status_code = response.status
+                    try:
+                        response_data = await response.json(content_type=None)
+                    except ValueError:
+                        response_data = None
+        except aiohttp.ClientConnectionError:
+            # When uploading a large file that already exists OSF sometimes drops the connection
+            # instead of returning a 409.
+            return None, None
+
+    if status_code in [200, 201]:
+        increment_process_info(process_info_path, action, 'upload',
+                               os.path.getsize(upload['file_path']), upload['file_path'])
+    return status_code, response_data
+
+
+async def async_main(upload_list, headers, concurrency, process_info_path, action):
+    """
+    Main coroutine method that will gather the uploads to be made and will make them
+    asynchronously. If an upload raises an error the rest are cancelled.
+
+    Parameters
+    ----------
+    upload_list: list
+        List of the uploads to make
+    headers: dict
+        Necessary header for OSF calls
+    concurrency: int
+        Largest number of files uploaded at the same time
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    List of the status code and JSON of the response of each upload.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    session = get_async_session('osf')
+    tasks = [asyncio.ensure_future(
+        async_put(upload, session, semaphore, headers, process_info_path, action))
+        for upload in upload_list]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
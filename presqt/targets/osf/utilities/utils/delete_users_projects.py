@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 def delete_users_projects(auth_token):
     """
@@ -12,11 +13,15 @@ def delete_users_projects(auth_token):
         The Authorization Token of the requesting user.
     """
     headers = {'Authorization': 'Bearer {}'.format(auth_token)}
-    response = requests.get('http://api.osf.io/v2/users/me/nodes', headers=headers).json()
+    response = get_http_session('osf').get(
+        'http://api.osf.io/v2/users/me/nodes', headers=headers).json()
     for node in response['data']:
-        requests.delete('http://api.osf.io/v2/nodes/{}'.format(node['id']), headers=headers)
+        get_http_session('osf').delete(
+            'http://api.osf.io/v2/nodes/{}'.format(node['id']), headers=headers)
     next_url = response['links']['next']
     while next_url is not None:  # pragma: no cover
-        response_json = requests.get('http://api.osf.io/v2/users/me/nodes', headers=headers).json()
+        response_json = get_http_session('osf').get(
+            'http://api.osf.io/v2/users/me/nodes', headers=headers).json()
         for node in response_json['data']:
-            requests.delete('http://api.osf.io/v2/nodes/{}'.format(node['id']), headers=headers)
\ No newline at end of file
+            get_http_session('osf').delete(
+                'http://api.osf.io/v2/nodes/{}'.format(node['id']), headers=headers)
\ No newline at end of file
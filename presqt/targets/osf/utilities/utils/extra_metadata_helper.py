@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 
 def extra_metadata_helper(resource_id, headers):
@@ -18,10 +19,11 @@ def extra_metadata_helper(resource_id, headers):
     """
     # Get project information
     base_url = "https://api.osf.io/v2/nodes/{}/".format(resource_id)
-    project_info = requests.get(base_url, headers=headers).json()
+    project_info = get_http_session('osf').get(base_url, headers=headers).json()
 
     # Build creators list
-    citation_data = requests.get("{}citation/".format(base_url), headers=headers).json()
+    citation_data = get_http_session('osf').get(
+        "{}citation/".format(base_url), headers=headers).json()
     creators = [{
         "first_name": author['given'],
         "last_name": author['family'],
@@ -30,13 +32,14 @@ def extra_metadata_helper(resource_id, headers):
     # Get license if it exists
     license = None
     if 'license' in project_info['data']['relationships'].keys():
-        license_data = requests.get(project_info['data']['relationships']['license']['links']['related']['href'],
-                                    headers=headers).json()
+        license_data = get_http_session('osf').get(project_info['data']['relationships']['license']['links']['related']['href'],
+                                                   headers=headers).json()
         if license_data['data']['attributes']:
             license = license_data['data']['attributes']['name']
     
     # See if there's an identifier for this project
-    identifier_data = requests.get("{}identifiers/".format(base_url), headers=headers).json()
+    identifier_data = get_http_session('osf').get(
+        "{}identifiers/".format(base_url), headers=headers).json()
     identifiers = [{
         "type": identifier['attributes']['category'],
         "identifier": identifier['attributes']['value']} for identifier in identifier_data['data']]
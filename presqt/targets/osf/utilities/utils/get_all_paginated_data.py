@@ -1,8 +1,7 @@
-import requests
 from rest_framework import status
 
 from presqt.targets.osf.utilities import OSFNotFoundError, OSFForbiddenError
-from presqt.targets.utilities import get_page_total
+from presqt.targets.utilities import get_page_total, get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -24,7 +23,7 @@ def get_all_paginated_data(url, token):
     """
     headers = {'Authorization': 'Bearer {}'.format(token)}
     # Get initial data
-    response = requests.get(url, headers=headers)
+    response = get_http_session('osf').get(url, headers=headers)
 
     if response.status_code == 200:
         response_json = response.json()
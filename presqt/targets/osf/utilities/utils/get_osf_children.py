@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 
 def get_osf_children(resource_id, token, parent_kind):
@@ -73,8 +74,8 @@ def get_osf_children(resource_id, token, parent_kind):
 
     elif parent_kind == 'folder':
         # Get the folder information
-        get_data_for_link = requests.get("https://api.osf.io/v2/files/{}".format(resource_id),
-                                         headers=headers).json()
+        get_data_for_link = get_http_session('osf').get(
+            "https://api.osf.io/v2/files/{}".format(resource_id), headers=headers).json()
         data = get_all_paginated_data(
             get_data_for_link['data']['relationships']['files']['links']['related']['href'], token)
 
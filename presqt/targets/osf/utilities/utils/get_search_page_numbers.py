@@ -1,6 +1,7 @@
-import requests
 import math
 
+from presqt.targets.utilities import get_http_session
+
 def get_search_page_numbers(url, token):
     """
     Get the pagination information for the request.
@@ -15,7 +16,7 @@ def get_search_page_numbers(url, token):
     A dictionary of page numbers
     """
     headers = {"Authorization": "Bearer {}".format(token)}
-    pagination_info = requests.get(url, headers=headers).json()['links']
+    pagination_info = get_http_session('osf').get(url, headers=headers).json()['links']
 
     next_page = pagination_info['next']
     previous_page = pagination_info['prev']
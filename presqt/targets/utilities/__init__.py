@@ -1,7 +1,9 @@
 from presqt.targets.utilities.utils.async_functions import (run_urls_async,
                                                             run_urls_async_with_pagination)
 from presqt.targets.utilities.utils.duplicate_titles  import get_duplicate_title
-from presqt.targets.utilities.utils.session import PresQTSession
+from presqt.targets.utilities.utils.http_client import (get_async_session, get_http_adapter,
+                                                        run_async)
+from presqt.targets.utilities.utils.session import PresQTSession, get_http_session
 from presqt.targets.utilities.utils.get_page_total import get_page_total
 from presqt.targets.utilities.tests.shared_download_test_functions import (
     shared_get_success_function_202, shared_get_success_function_202_with_error,
@@ -10,4 +12,10 @@ from presqt.targets.utilities.tests.shared_upload_test_functions import (shared_
                                                                          shared_upload_function_github,
                                                                          process_wait)
 from presqt.targets.utilities.utils.upload_total_files import upload_total_files
+from presqt.targets.utilities.utils.spool_file import (async_spool_response, spool_response,
+                                                        spool_stream, spool_bytes,
+                                                        get_spool_file_digests, respool_file)
+from presqt.targets.utilities.utils.git_blob import (GIT_BLOB_DIGEST, git_blob_hasher,
+                                                      git_blob_sha)
+from presqt.targets.utilities.utils.spool_archive import spool_tar_archive
 
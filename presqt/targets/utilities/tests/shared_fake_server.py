@@ -0,0 +1,38 @@
+import asyncio
+import threading
+
+from aiohttp import web
+
+
+class FakeServer(object):
+    """
+    Serves fake target endpoints on a free local port from an aiohttp application running on its
+    own event loop in a background thread, so a test can point a target's helpers at it.
+    """
+
+    def __init__(self, routes):
+        """
+        Parameters
+        ----------
+        routes: list
+            aiohttp route definitions, e.g. [web.put('/upload/', handler)]
+        """
+        self.loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.add_routes(routes)
+        self.runner = web.AppRunner(app)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        self.loop.run_until_complete(site.start())
+        self.url = 'http://127.0.0.1:{}'.format(self.runner.addresses[0][1])
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stop serving and close the server's event loop.
+        """
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.run_until_complete(self.runner.cleanup())
+        self.loop.close()
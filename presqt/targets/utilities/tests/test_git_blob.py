@@ -0,0 +1,27 @@
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase
+
+from presqt.targets.utilities import git_blob_sha
+
+
+class TestGitBlobSha(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_git_blob_sha(self):
+        """
+        The SHA should match the one `git hash-object` gives the file, however it is read.
+        """
+        file_path = os.path.join(self.directory, 'hello.txt')
+        with open(file_path, 'wb') as file:
+            file.write(b'hello\n')
+
+        self.assertEqual(git_blob_sha(file_path), 'ce013625030ba8dba906f756967f9e9ca394464a')
+        self.assertEqual(git_blob_sha(file_path, chunk_size=1),
+                         'ce013625030ba8dba906f756967f9e9ca394464a')
@@ -0,0 +1,90 @@
+import asyncio
+from importlib import import_module
+from unittest.mock import patch
+
+from aiohttp import web
+from django.test import SimpleTestCase
+
+from presqt.targets.utilities import (PresQTSession, get_async_session, get_http_adapter,
+                                      get_http_session, run_async)
+from presqt.targets.utilities.tests.shared_fake_server import FakeServer
+
+http_client = import_module('presqt.targets.utilities.utils.http_client')
+
+
+async def get_loop_and_session(target_name):
+    return asyncio.get_event_loop(), get_async_session(target_name)
+
+
+class TestHttpClient(SimpleTestCase):
+    def test_async_sessions_are_reused(self):
+        """
+        Every coroutine run on a thread should share its loop, and a target's session on it.
+        """
+        loop, session = run_async(get_loop_and_session('osf'))
+        self.assertEqual(run_async(get_loop_and_session('osf')), (loop, session))
+        self.assertFalse(session.closed)
+
+        other_loop, other_session = run_async(get_loop_and_session('github'))
+        self.assertIs(other_loop, loop)
+        self.assertIsNot(other_session, session)
+
+    def test_sessions_share_target_pools(self):
+        """
+        Sessions for the same target should mount the same adapter and time out by default.
+        """
+        first_session = PresQTSession('https://api.osf.io/v2', 'osf')
+        second_session = PresQTSession('https://api.osf.io/v2', 'osf')
+        self.assertIs(first_session.get_adapter('https://api.osf.io/v2/nodes/'),
+                      get_http_adapter('osf'))
+        self.assertIs(second_session.get_adapter('https://api.osf.io/v2/nodes/'),
+                      get_http_adapter('osf'))
+        self.assertIsNot(get_http_adapter('curate_nd'), get_http_adapter('osf'))
+        self.assertEqual(get_http_adapter('osf').max_retries.total, http_client.RETRIES)
+
+        with patch('requests.Session.request') as mock_request:
+            first_session.get('https://api.osf.io/v2/nodes/')
+        self.assertEqual(mock_request.call_args[1]['timeout'],
+                         (http_client.CONNECT_TIMEOUT, http_client.READ_TIMEOUT))
+
+    def test_only_reads_are_retried(self):
+        """
+        Reads should be retried when the target is unavailable, but uploads shouldn't be.
+        """
+        retry = get_http_adapter('osf').max_retries
+        self.assertTrue(retry.is_retry('GET', 503))
+        for method in ['PUT', 'POST', 'PATCH', 'DELETE']:
+            self.assertFalse(retry.is_retry(method, 503))
+
+    def test_http_sessions_are_reused(self):
+        """
+        One-off requests to a target should share a session, which doesn't keep cookies.
+        """
+        session = get_http_session('osf')
+        self.assertIs(get_http_session('osf'), session)
+        self.assertIsNot(get_http_session('github'), session)
+        self.assertIs(session.get_adapter('https://api.osf.io/v2/nodes/'),
+                      get_http_adapter('osf'))
+
+        async def set_cookie(request):
+            response = web.Response()
+            response.set_cookie('session_id', 'user_one')
+            return response
+        server = FakeServer([web.get('/', set_cookie)])
+        try:
+            response = session.get('{}/'.format(server.url))
+        finally:
+            server.stop()
+        self.assertEqual(response.cookies['session_id'], 'user_one')
+        self.assertEqual(len(session.cookies), 0)
+
+    def test_forked_process_opens_its_own_pools(self):
+        """
+        A process should not use the pools it inherited from the process it was forked from.
+        """
+        adapter = get_http_adapter('osf')
+        with patch.object(http_client, '_owner_pid', -1), \
+                patch.object(http_client, '_adapters', http_client._adapters), \
+                patch.object(http_client, '_loops', http_client._loops), \
+                patch.object(http_client, '_async_sessions', http_client._async_sessions):
+            self.assertIsNot(get_http_adapter('osf'), adapter)
@@ -0,0 +1,61 @@
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+
+from django.test import SimpleTestCase
+
+from presqt.targets.utilities import get_spool_file_digests, spool_tar_archive
+from presqt.utilities import get_job_store, get_process_info_path
+
+
+class FakeArchiveResponse(object):
+    def __init__(self, contents):
+        self.raw = io.BytesIO(contents)
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestSpoolTarArchive(SimpleTestCase):
+    def setUp(self):
+        self.ticket_number = 'test_spool_tar_archive'
+        self.directory = tempfile.mkdtemp()
+        get_job_store().set_action(self.ticket_number, 'resource_download', {
+            'status': 'in_progress', 'download_files_finished': 0})
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        shutil.rmtree(os.path.dirname(get_process_info_path(self.ticket_number)),
+                      ignore_errors=True)
+
+    def test_spool_tar_archive(self):
+        """
+        The files asked for should be spooled with their git blob SHA, and the paths of the ones
+        missing from the archive returned.
+        """
+        archive_bytes = io.BytesIO()
+        with tarfile.open(fileobj=archive_bytes, mode='w:gz') as archive:
+            for name, contents in [('repo-abc123/hello.txt', b'hello\n'),
+                                   ('repo-abc123/not_asked_for.txt', b'eggs')]:
+                member = tarfile.TarInfo(name)
+                member.size = len(contents)
+                archive.addfile(member, io.BytesIO(contents))
+        response = FakeArchiveResponse(archive_bytes.getvalue())
+
+        files = {'hello.txt': {'file': 'url', 'path': '/hello.txt'},
+                 'missing.txt': {'file': 'url', 'path': '/missing.txt'}}
+        paths_left = spool_tar_archive(response, files, self.directory,
+                                       get_process_info_path(self.ticket_number),
+                                       'resource_download')
+
+        self.assertEqual(paths_left, ['missing.txt'])
+        self.assertTrue(response.closed)
+        self.assertEqual(files['missing.txt']['file'], 'url')
+        with open(files['hello.txt']['file'], 'rb') as spooled_file:
+            self.assertEqual(spooled_file.read(), b'hello\n')
+        self.assertEqual(get_spool_file_digests(files['hello.txt']['file'])['git-blob-sha1'],
+                         'ce013625030ba8dba906f756967f9e9ca394464a')
+        self.assertEqual(len(os.listdir(self.directory)), 2)
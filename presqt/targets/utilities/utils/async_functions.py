@@ -1,8 +1,8 @@
 import asyncio
-import aiohttp
 
 from rest_framework import status
 
+from presqt.targets.utilities.utils.http_client import get_async_session, run_async
 from presqt.utilities import PresQTValidationError
 
 
@@ -22,10 +22,7 @@ def run_urls_async(self_instance, url_list):
     -------
     The data returned from the async call
     """
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    data = loop.run_until_complete(async_main(self_instance, url_list))
-    return data
+    return run_async(async_main(self_instance, url_list))
 
 
 def run_urls_async_with_pagination(self_instance, url_list):
@@ -101,5 +98,5 @@ async def async_main(self_instance, url_list):
     -------
     List of data brought back from each coroutine called.
     """
-    async with aiohttp.ClientSession() as session:
-        return await asyncio.gather(*[async_get(self_instance, url, session) for url in url_list])
+    session = get_async_session(self_instance.session.target_name)
+    return await asyncio.gather(*[async_get(self_instance, url, session) for url in url_list])
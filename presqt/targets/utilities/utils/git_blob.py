@@ -0,0 +1,43 @@
+import hashlib
+import os
+
+# Name of the digest of a file's git blob SHA-1, which git based targets give as a file's hash
+GIT_BLOB_DIGEST = 'git-blob-sha1'
+
+
+def git_blob_hasher(size):
+    """
+    Start the SHA-1 git gives a blob's contents. The contents are fed to the hash object after.
+
+    Parameters
+    ----------
+    size : int
+        Size of the blob's contents in bytes
+
+    Returns
+    -------
+    A hashlib SHA-1 object that has been fed git's blob header.
+    """
+    return hashlib.sha1('blob {}\0'.format(size).encode())
+
+
+def git_blob_sha(file_path, chunk_size=1024 * 1024):
+    """
+    Calculate the SHA-1 git gives a file's contents as a blob.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file on disk
+    chunk_size : int
+        Number of bytes to read from the file at a time
+
+    Returns
+    -------
+    The hex digest of the blob.
+    """
+    hasher = git_blob_hasher(os.path.getsize(file_path))
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
@@ -0,0 +1,158 @@
+import asyncio
+import atexit
+import inspect
+import os
+import threading
+
+import aiohttp
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Most connections to a target kept open, and on the async side made, at the same time
+MAX_CONNECTIONS = 16
+# Seconds an idle connection is kept open for the next request
+KEEPALIVE_TIMEOUT = 30
+# Seconds to wait for a connection to a target, and for a target to send anything once
+# connected. There's no limit on how long a whole request takes, large files take a while.
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 300
+# Times a read is retried after a connection error or one of RETRY_STATUSES. Retries wait
+# RETRY_BACKOFF, then twice as long, and so on, unless the target says how long.
+RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = [502, 503, 504]
+# Methods that are retried. Uploads aren't, their bodies are often streamed from a file and
+# can't be sent again.
+RETRY_METHODS = frozenset(['HEAD', 'GET', 'OPTIONS'])
+
+_lock = threading.Lock()
+_thread_state = threading.local()
+# Connection pools belong to the process that opened them. Jobs are forked from the server, so
+# a process that finds pools opened by its parent starts over with its own.
+_owner_pid = None
+_adapters = {}
+_loops = []
+_async_sessions = {}
+
+
+def _check_owner():
+    """
+    Forget the pools, loops and sessions of the parent process if this is a forked child.
+    """
+    global _owner_pid, _adapters, _loops, _async_sessions
+    if _owner_pid != os.getpid():
+        _owner_pid = os.getpid()
+        _adapters = {}
+        _loops = []
+        _async_sessions = {}
+        _thread_state.__dict__.clear()
+
+
+def _get_retry():
+    """
+    Get the retry policy for a target's connection pool. Older versions of urllib3 call the
+    methods it retries a whitelist.
+    """
+    retry_kwargs = {'total': RETRIES, 'backoff_factor': RETRY_BACKOFF,
+                    'status_forcelist': RETRY_STATUSES, 'raise_on_status': False}
+    if 'allowed_methods' in inspect.signature(Retry).parameters:
+        return Retry(allowed_methods=RETRY_METHODS, **retry_kwargs)
+    return Retry(method_whitelist=RETRY_METHODS, **retry_kwargs)
+
+
+def get_http_adapter(target_name):
+    """
+    Get the process's connection pool for a target, for a requests session to mount. Every
+    session mounting it shares its kept alive connections and retry policy.
+
+    Parameters
+    ----------
+    target_name: str
+        Name of the target the requests are made to
+
+    Returns
+    -------
+    The target's HTTPAdapter.
+    """
+    with _lock:
+        _check_owner()
+        if target_name not in _adapters:
+            _adapters[target_name] = HTTPAdapter(
+                pool_maxsize=MAX_CONNECTIONS,
+                max_retries=_get_retry())
+        return _adapters[target_name]
+
+
+def get_async_session(target_name):
+    """
+    Get the aiohttp session for a target on the running event loop. The session is kept open
+    and reused by every coroutine run on the loop, so its connections are too. It must not be
+    closed by its users. Must be called from a coroutine.
+
+    Parameters
+    ----------
+    target_name: str
+        Name of the target the requests are made to
+
+    Returns
+    -------
+    The target's ClientSession.
+    """
+    loop = asyncio.get_event_loop()
+    with _lock:
+        _check_owner()
+        session = _async_sessions.get((loop, target_name))
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS,
+                                               keepalive_timeout=KEEPALIVE_TIMEOUT),
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=CONNECT_TIMEOUT,
+                                              sock_read=READ_TIMEOUT))
+            _async_sessions[(loop, target_name)] = session
+        return session
+
+
+def run_async(coroutine):
+    """
+    Run a coroutine to completion on the calling thread's event loop. The loop is kept between
+    calls, rather than a new one being made for each, so the sessions opened on it keep their
+    connections for the rest of the job.
+
+    Parameters
+    ----------
+    coroutine: coroutine
+        The coroutine to run
+
+    Returns
+    -------
+    What the coroutine returns.
+    """
+    with _lock:
+        _check_owner()
+        loop = getattr(_thread_state, 'loop', None)
+        if loop is None or loop.is_closed():
+            loop = asyncio.new_event_loop()
+            _thread_state.loop = loop
+            _loops.append(loop)
+    asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coroutine)
+
+
+@atexit.register
+def close_http_clients():
+    """
+    Close every session and loop the process opened, along with their connections.
+    """
+    with _lock:
+        _check_owner()
+        for (loop, target_name), session in _async_sessions.items():
+            if not loop.is_closed() and not loop.is_running():
+                loop.run_until_complete(session.close())
+        for loop in _loops:
+            if not loop.is_closed() and not loop.is_running():
+                loop.close()
+        for adapter in _adapters.values():
+            adapter.close()
+        _async_sessions.clear()
+        _loops.clear()
+        _adapters.clear()
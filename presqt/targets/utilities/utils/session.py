@@ -1,15 +1,25 @@
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
 import requests
 
+from presqt.targets.utilities.utils.http_client import (CONNECT_TIMEOUT, READ_TIMEOUT,
+                                                        get_http_adapter)
+
+_thread_state = threading.local()
+
 
 class PresQTSession(requests.Session):
     """
     Class that represents a session used to make repeated calls to an API.
-    Subclasses Request Session class.
+    Subclasses Request Session class. Every session for a target shares the process's
+    connection pool for it, so connections are kept alive between sessions, and reads are
+    retried.
     """
     auth = None
-    __attrs__ = requests.Session.__attrs__ + ['base_url']
+    __attrs__ = requests.Session.__attrs__ + ['base_url', 'target_name']
 
-    def __init__(self, base_url):
+    def __init__(self, base_url, target_name):
         """
         Handle HTTP session related work.
 
@@ -17,10 +27,22 @@ class PresQTSession(requests.Session):
         ----------
         base_url : str
             Base URL for the API
-
+        target_name : str
+            Name of the target the API belongs to
         """
         super(PresQTSession, self).__init__()
         self.base_url = base_url
+        self.target_name = target_name
+        adapter = get_http_adapter(target_name)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        """
+        Make a request, timing out if the target can't be reached or stops responding.
+        """
+        kwargs.setdefault('timeout', (CONNECT_TIMEOUT, READ_TIMEOUT))
+        return super(PresQTSession, self).request(method, url, *args, **kwargs)
 
     def token_auth(self, header_dict):
         """
@@ -44,3 +66,29 @@ class PresQTSession(requests.Session):
         parts.extend(args)
         # canonical URLs end with a slash
         return '/'.join(parts) + '/'
+
+
+def get_http_session(target_name):
+    """
+    Get the calling thread's session for one-off requests to a target, rather than making them
+    with requests.get and the like, which open a new connection for each. The session doesn't
+    keep the cookies it's sent, since its requests are made for different users.
+
+    Parameters
+    ----------
+    target_name : str
+        Name of the target the requests are made to
+
+    Returns
+    -------
+    The target's PresQTSession.
+    """
+    adapter = get_http_adapter(target_name)
+    sessions = _thread_state.__dict__.setdefault('sessions', {})
+    session = sessions.get(target_name)
+    # A forked process gets its own pools, and so its own sessions
+    if session is None or session.get_adapter('https://') is not adapter:
+        session = PresQTSession(None, target_name)
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        sessions[target_name] = session
+    return session
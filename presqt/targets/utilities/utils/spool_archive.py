@@ -0,0 +1,60 @@
+import tarfile
+
+from rest_framework import status
+
+from presqt.targets.utilities.utils.git_blob import GIT_BLOB_DIGEST, git_blob_hasher
+from presqt.targets.utilities.utils.spool_file import spool_stream
+from presqt.utilities import (PresQTResponseException, increment_process_info,
+                              report_downloaded_file)
+
+
+def spool_tar_archive(response, files, spool_directory, process_info_path, action):
+    """
+    Read a tar archive of a repository as it's streamed and spool the files that were asked for.
+    Only one member of the archive is read at a time, so nothing but the files themselves is
+    written to disk. The git blob SHA of each file is calculated as it's spooled.
+
+    Parameters
+    ----------
+    response: requests.Response
+        Response of the archive request, made with `stream=True`
+    files: dict
+        The file dictionaries to spool, keyed by the file's path in the repository. Each file's
+        'file' is replaced with the path to its spooled file.
+    spool_directory: str
+        Path to the directory the files will be spooled to
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    List of the paths of the files that weren't in the archive.
+    """
+    missing_files = dict(files)
+    response.raw.decode_content = True
+    try:
+        with tarfile.open(fileobj=response.raw, mode='r|*') as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                # Every member is inside of a directory named after the repository and commit
+                file = missing_files.pop(member.name.partition('/')[2], None)
+                if file is None:
+                    continue
+
+                file['file'] = spool_stream(
+                    archive.extractfile(member), spool_directory,
+                    {GIT_BLOB_DIGEST: git_blob_hasher(member.size)})
+                # Increment the number of files done in the process info file.
+                increment_process_info(process_info_path, action, 'download', member.size)
+                # Hand the file over before the rest have been downloaded
+                report_downloaded_file(process_info_path, file)
+    except tarfile.TarError:
+        raise PresQTResponseException('The archive of the repository could not be read.',
+                                      status.HTTP_400_BAD_REQUEST)
+    finally:
+        response.close()
+
+    return list(missing_files)
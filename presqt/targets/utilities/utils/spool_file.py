@@ -0,0 +1,202 @@
+import json
+import os
+from uuid import uuid4
+
+from presqt.utilities import MultiHasher, multi_hash_generator, file_multi_hash_generator
+
+# Number of bytes pulled from a response body and written to disk at a time. The peak memory of
+# a download is bounded by this value multiplied by the number of concurrent requests.
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+# Suffix of the file that holds the digests calculated while a file was being spooled.
+SPOOL_DIGESTS_SUFFIX = '.digests.json'
+
+
+def get_spool_file_path(spool_directory):
+    """
+    Build a unique path inside of the job's spool directory for a file to be written to.
+
+    Parameters
+    ----------
+    spool_directory: str
+        Path to the job's spool directory
+
+    Returns
+    -------
+    The path the spooled file should be written to.
+    """
+    os.makedirs(spool_directory, exist_ok=True)
+    return os.path.join(spool_directory, str(uuid4()))
+
+
+async def async_spool_response(response, spool_directory, hashers=None):
+    """
+    Coroutine that streams the body of an aiohttp response to a spool file in chunks.
+
+    Parameters
+    ----------
+    response: aiohttp.ClientResponse
+        Response object whose body has not been read yet
+    spool_directory: str
+        Path to the job's spool directory
+    hashers: dict
+        Extra hash objects, keyed by the name of their digest, to feed the body to. Their digests
+        are stored with the file's BagIt digests.
+
+    Returns
+    -------
+    The path to the spooled file.
+    """
+    spool_file_path = get_spool_file_path(spool_directory)
+    hasher = MultiHasher()
+    hashers = hashers or {}
+    with open(spool_file_path, 'wb') as spool_file:
+        async for chunk in response.content.iter_chunked(SPOOL_CHUNK_SIZE):
+            spool_file.write(chunk)
+            hasher.update(chunk)
+            for extra_hasher in hashers.values():
+                extra_hasher.update(chunk)
+    digests = hasher.hexdigests()
+    digests.update({name: extra_hasher.hexdigest() for name, extra_hasher in hashers.items()})
+    _write_spool_digests(spool_file_path, digests)
+    return spool_file_path
+
+
+def spool_response(response, spool_directory):
+    """
+    Stream the body of a requests response to a spool file in chunks.
+    The request must have been made with `stream=True`.
+
+    Parameters
+    ----------
+    response: requests.Response
+        Response object whose body has not been read yet
+    spool_directory: str
+        Path to the job's spool directory
+
+    Returns
+    -------
+    The path to the spooled file.
+    """
+    spool_file_path = get_spool_file_path(spool_directory)
+    hasher = MultiHasher()
+    with open(spool_file_path, 'wb') as spool_file:
+        for chunk in response.iter_content(SPOOL_CHUNK_SIZE):
+            spool_file.write(chunk)
+            hasher.update(chunk)
+    response.close()
+    _write_spool_digests(spool_file_path, hasher.hexdigests())
+    return spool_file_path
+
+
+def spool_stream(stream, spool_directory, hashers=None):
+    """
+    Copy a readable file-like object, such as a member of an archive being streamed, to a spool
+    file in chunks.
+
+    Parameters
+    ----------
+    stream: file-like object
+        Object whose read method returns the contents
+    spool_directory: str
+        Path to the job's spool directory
+    hashers: dict
+        Extra hash objects, keyed by the name of their digest, to feed the contents to. Their
+        digests are stored with the file's BagIt digests.
+
+    Returns
+    -------
+    The path to the spooled file.
+    """
+    spool_file_path = get_spool_file_path(spool_directory)
+    hasher = MultiHasher()
+    hashers = hashers or {}
+    with open(spool_file_path, 'wb') as spool_file:
+        for chunk in iter(lambda: stream.read(SPOOL_CHUNK_SIZE), b''):
+            spool_file.write(chunk)
+            hasher.update(chunk)
+            for extra_hasher in hashers.values():
+                extra_hasher.update(chunk)
+    digests = hasher.hexdigests()
+    digests.update({name: extra_hasher.hexdigest() for name, extra_hasher in hashers.items()})
+    _write_spool_digests(spool_file_path, digests)
+    return spool_file_path
+
+
+def spool_bytes(contents, spool_directory):
+    """
+    Write file contents that a target API returned inline (e.g. base64 encoded JSON) to a spool file
+    so they can be released from memory.
+
+    Parameters
+    ----------
+    contents: bytes
+        The file contents
+    spool_directory: str
+        Path to the job's spool directory
+
+    Returns
+    -------
+    The path to the spooled file.
+    """
+    spool_file_path = get_spool_file_path(spool_directory)
+    with open(spool_file_path, 'wb') as spool_file:
+        spool_file.write(contents)
+    _write_spool_digests(spool_file_path, multi_hash_generator(contents))
+    return spool_file_path
+
+
+def respool_file(file_path, spool_directory, digests):
+    """
+    Move a file that was downloaded earlier back into a spool file, along with the digests
+    calculated when it was first spooled.
+
+    Parameters
+    ----------
+    file_path: str
+        Path to the downloaded file
+    spool_directory: str
+        Path to the job's spool directory
+    digests: dict
+        Dictionary of hash algorithms (key) and the file hash they generated (value)
+
+    Returns
+    -------
+    The path to the spooled file.
+    """
+    spool_file_path = get_spool_file_path(spool_directory)
+    os.replace(file_path, spool_file_path)
+    _write_spool_digests(spool_file_path, digests)
+    return spool_file_path
+
+
+def get_spool_file_digests(file):
+    """
+    Get the BagIt digests of a downloaded file. Digests calculated while the file was being
+    spooled are reused, so the file is only read again if they are missing.
+
+    Parameters
+    ----------
+    file: bytes or str
+        The file contents or the path to the spooled file
+
+    Returns
+    -------
+    Dictionary of hash algorithms (key) and the file hash they generated (value).
+    """
+    if isinstance(file, bytes):
+        return multi_hash_generator(file)
+
+    try:
+        with open('{}{}'.format(file, SPOOL_DIGESTS_SUFFIX), 'r') as digests_file:
+            return json.load(digests_file)
+    except (FileNotFoundError, ValueError):
+        return file_multi_hash_generator(file, chunk_size=SPOOL_CHUNK_SIZE)
+
+
+def _write_spool_digests(spool_file_path, digests):
+    """
+    Store the digests of a spooled file next to it so they don't have to be calculated again.
+    """
+    with open('{}{}'.format(spool_file_path, SPOOL_DIGESTS_SUFFIX), 'w') as digests_file:
+        json.dump(digests, digests_file)
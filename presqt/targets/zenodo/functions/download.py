@@ -1,25 +1,28 @@
 import asyncio
-import aiohttp
-import requests
+import os
 
 from rest_framework import status
 
+from presqt.targets.utilities import get_http_session
 from presqt.targets.zenodo.utilities import (
-    zenodo_download_helper, zenodo_validation_check, extra_metadata_helper)
-from presqt.utilities import (PresQTResponseException, get_dictionary_from_list,
-                              update_process_info,
-                              increment_process_info, update_process_info_message)
+    zenodo_download_helper, zenodo_validation_check, extra_metadata_helper,
+    zenodo_file_deposition)
+from presqt.targets.utilities import async_spool_response, get_async_session, run_async
+from presqt.utilities import (PresQTResponseException, update_process_info,
+                              increment_process_info, update_process_info_message,
+                              report_downloaded_file, get_resumed_file)
 
 
-async def async_get(url, session, params, process_info_path, action):
+async def async_get(file, session, params, process_info_path, action, spool_directory):
     """
-    Coroutine that uses aiohttp to make a GET request. This is the method that will be called
-    asynchronously with other GETs.
+    Coroutine that uses aiohttp to make a GET request and stream the file to the job's spool
+    directory. This is the method that will be called asynchronously with other GETs.
 
     Parameters
     ----------
-    url: str
-        URL to call
+    file: dict
+        The file's dictionary. Its 'file' is the URL to call, which is replaced with the path to
+        the spooled file.
     session: ClientSession object
         aiohttp ClientSession Object
     params: str
@@ -28,44 +31,56 @@ async def async_get(url, session, params, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory the downloaded file will be spooled to
 
     Returns
     -------
-    Response JSON
+    The file's dictionary
     """
-    async with session.get(url, params=params) as response:
-        assert response.status == 200
-        content = await response.read()
-        # Increment the number of files done in the process info file.
-        increment_process_info(process_info_path, action, 'download')
-        return {'url': url, 'binary_content': content}
+    # A resumed transfer hands back the files the stopped one had already downloaded
+    resumed_file = get_resumed_file(process_info_path, file)
+    if resumed_file:
+        file['file'] = resumed_file
+    else:
+        async with session.get(file['file'], params=params) as response:
+            assert response.status == 200
+            file['file'] = await async_spool_response(response, spool_directory)
+    # Increment the number of files done in the process info file.
+    increment_process_info(process_info_path, action, 'download', os.path.getsize(file['file']))
+    # Hand the file over before the rest have been downloaded
+    report_downloaded_file(process_info_path, file)
+    return file
 
 
-async def async_main(url_list, params, process_info_path, action):
+async def async_main(files, params, process_info_path, action, spool_directory):
     """
     Main coroutine method that will gather the url calls to be made and will make them
     asynchronously.
 
     Parameters
     ----------
-    url_list: list
-        List of urls to call
+    files: list
+        List of file dictionaries whose 'file' is the URL to call
     params: str
         params
     process_info_path: str
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory the downloaded files will be spooled to
 
     Returns
     -------
     List of data brought back from each coroutine called.
     """
-    async with aiohttp.ClientSession() as session:
-        return await asyncio.gather(*[async_get(url, session, params, process_info_path, action) for url in url_list])
+    session = get_async_session('zenodo')
+    return await asyncio.gather(*[async_get(file, session, params, process_info_path, action, spool_directory)
+                                  for file in files])
 
 
-def zenodo_download_resource(token, resource_id, process_info_path, action):
+def zenodo_download_resource(token, resource_id, process_info_path, action, spool_directory):
     """
     Fetch the requested resource from Zenodo along with its hash information.
 
@@ -79,6 +94,8 @@ def zenodo_download_resource(token, resource_id, process_info_path, action):
         Path to the process info file that keeps track of the action's progress
     action: str
         The action being performed
+    spool_directory: str
+        Path to the directory in the job's ticket path that files should be streamed to
 
     Returns
     -------
@@ -86,7 +103,7 @@ def zenodo_download_resource(token, resource_id, process_info_path, action):
         'resources': List of dictionary objects that each hold a file and its information.
                      Dictionary must be in the following format:
                          {
-                            'file': binary_file,
+                            'file': '/path/to/spooled/file',
                             'hashes': {'hash_algorithm': 'the_hash'},
                             'title': 'file.jpg',
                             'path': '/path/to/file',
@@ -117,24 +134,15 @@ def zenodo_download_resource(token, resource_id, process_info_path, action):
     # If the resource_id is longer than 7 characters, the resource is an individual file
     if len(resource_id) > 7:
         # First we need to check if the file id given belongs to a public published record.
-        zenodo_file = requests.get(
+        zenodo_file = get_http_session('zenodo').get(
             'https://zenodo.org/api/files/{}'.format(resource_id), params=auth_parameter)
         if zenodo_file.status_code != 200:
-            # If not, we need to loop through their depositions to look for the file.
-            zenodo_projects = requests.get('https://zenodo.org/api/deposit/depositions',
-                                           params=auth_parameter).json()
-            for entry in zenodo_projects:
-                project_files = requests.get(entry['links']['self'], params=auth_parameter).json()
-                for file in project_files['files']:
-                    if file['id'] == resource_id:
-                        base_url = entry['links']['self']
-                        file_url = file['links']['self']
-                        is_record = False
-                        break
-                else:
-                    # If the file wasn't found we want to continue the loop.
-                    continue
-                break
+            # If not, we need to look for the file in their depositions.
+            deposition, file = zenodo_file_deposition(auth_parameter, resource_id)
+            if deposition is not None:
+                base_url = deposition['links']['self']
+                file_url = file['links']['self']
+                is_record = False
         else:
             is_record = True
             base_url = 'https://zenodo.org/api/files/{}'.format(resource_id)
@@ -151,44 +159,37 @@ def zenodo_download_resource(token, resource_id, process_info_path, action):
         update_process_info(process_info_path, 1, action, 'download')
 
         files, action_metadata = zenodo_download_helper(is_record, base_url, auth_parameter, files,
-                                                        file_url)
+                                                        spool_directory, file_url)
 
         # Increment the number of files done in the process info file.
-        increment_process_info(process_info_path, action, 'download')
+        increment_process_info(process_info_path, action, 'download',
+                               os.path.getsize(files[0]['file']))
 
     # Otherwise, it's a full project
     else:
         base_url = 'https://zenodo.org/api/records/{}'.format(resource_id)
-        zenodo_record = requests.get(base_url, params=auth_parameter)
+        zenodo_record = get_http_session('zenodo').get(base_url, params=auth_parameter)
         is_record = True
         if zenodo_record.status_code != 200:
             base_url = 'https://zenodo.org/api/deposit/depositions/{}'.format(resource_id)
             is_record = False
         try:
             files, action_metadata = zenodo_download_helper(is_record, base_url, auth_parameter,
-                                                            files)
+                                                            files, spool_directory)
         except PresQTResponseException:
             raise PresQTResponseException(
                 "The resource with id, {}, does not exist for this user.".format(resource_id),
                 status.HTTP_404_NOT_FOUND)
 
         extra_metadata = extra_metadata_helper(base_url, is_record, auth_parameter)
-        file_urls = [file['file'] for file in files]
 
         update_process_info_message(process_info_path, action, 'Downloading files from Zenodo...')
         # Add the total number of projects to the process info file.
         # This is necessary to keep track of the progress of the request.
-        update_process_info(process_info_path, len(file_urls), action, 'download')
-
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        download_data = loop.run_until_complete(async_main(
-            file_urls, auth_parameter, process_info_path, action))
+        update_process_info(process_info_path, len(files), action, 'download')
 
-        # Go through the file dictionaries and replace the file path with the binary_content
-        for file in files:
-            file['file'] = get_dictionary_from_list(
-                download_data, 'url', file['file'])['binary_content']
+        # Each file's url is replaced with the path to its spooled file
+        run_async(async_main(files, auth_parameter, process_info_path, action, spool_directory))
 
     return {
         'resources': files,
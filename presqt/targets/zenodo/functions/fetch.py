@@ -1,9 +1,9 @@
-import requests
-
 from rest_framework import status
 
+from presqt.targets.utilities import get_http_session
 from presqt.targets.zenodo.utilities import (
-    zenodo_validation_check, zenodo_fetch_resources_helper, zenodo_fetch_resource_helper)
+    zenodo_validation_check, zenodo_fetch_resources_helper, zenodo_fetch_resource_helper,
+    zenodo_file_deposition)
 from presqt.utilities import PresQTValidationError, PresQTResponseException
 
 
@@ -74,7 +74,8 @@ def zenodo_fetch_resources(token, query_parameter):
             search_parameters = query_parameter['keywords'].replace(' ', '+')
             base_url = 'https://zenodo.org/api/records?q=keywords:{}'.format(search_parameters)
 
-        zenodo_projects = requests.get(base_url, params=auth_parameter).json()['hits']['hits']
+        zenodo_projects = get_http_session('zenodo').get(
+            base_url, params=auth_parameter).json()['hits']['hits']
         is_record = True
 
     else:
@@ -84,7 +85,7 @@ def zenodo_fetch_resources(token, query_parameter):
         else:
             base_url = "https://zenodo.org/api/deposit/depositions?page=1"
         
-        zenodo_projects = requests.get(base_url, params=auth_parameter).json()
+        zenodo_projects = get_http_session('zenodo').get(base_url, params=auth_parameter).json()
         is_record = False
 
     resources = zenodo_fetch_resources_helper(zenodo_projects, auth_parameter, is_record)
@@ -133,14 +134,14 @@ def zenodo_fetch_resource(token, resource_id):
     # Let's first try to get the record with this id.
     if len(str(resource_id)) <= 7:
         base_url = "https://zenodo.org/api/records/{}".format(resource_id)
-        zenodo_project = requests.get(base_url, params=auth_parameter)
+        zenodo_project = get_http_session('zenodo').get(base_url, params=auth_parameter)
         if zenodo_project.status_code == 200:
             # We found the record, pass the project to our function.
             resource = zenodo_fetch_resource_helper(zenodo_project.json(), resource_id, True)
         else:
             # We need to get the resource from the depositions
             base_url = "https://zenodo.org/api/deposit/depositions/{}".format(resource_id)
-            zenodo_project = requests.get(base_url, params=auth_parameter)
+            zenodo_project = get_http_session('zenodo').get(base_url, params=auth_parameter)
             if zenodo_project.status_code != 200:
                 raise PresQTResponseException("The resource could not be found by the requesting user.",
                                               status.HTTP_404_NOT_FOUND)
@@ -151,44 +152,30 @@ def zenodo_fetch_resource(token, resource_id):
     else:
         # We got ourselves a file.
         base_url = "https://zenodo.org/api/files/{}".format(resource_id)
-        zenodo_project = requests.get(base_url, params=auth_parameter)
+        zenodo_project = get_http_session('zenodo').get(base_url, params=auth_parameter)
         if zenodo_project.status_code == 200:
             # Contents returns a list of the single file
             resource = zenodo_fetch_resource_helper(
                 zenodo_project.json()['contents'][0], resource_id, True, True)
         else:
-            # We need to loop through the users depositions and see if the file is there.
-            base_url = 'https://zenodo.org/api/deposit/depositions'
-            zenodo_projects = requests.get(base_url, params=auth_parameter).json()
-            for entry in zenodo_projects:
-                project_files = requests.get(entry['links']['self'], params=auth_parameter).json()
-                for file in project_files['files']:
-                    if file['id'] == resource_id:
-                        resource = {
-                            "container": entry['id'],
-                            "kind": "item",
-                            "kind_name": "file",
-                            "id": resource_id,
-                            "identifier": None,
-                            "title": file['filename'],
-                            "date_created": None,
-                            "date_modified": None,
-                            "hashes": {
-                                "md5": file['checksum']
-                            },
-                            "extra": {},
-                            "children": []}
-                        # We found the file, break out of file loop
-                        break
-                # If the file wasn't found, we want to continue looping through the other projects.
-                else:
-                    continue
-                # File has been found, break out of project loop
-                break
-
-            # File not found, raise exception
-            else:
+            # We need to look for the file in the users depositions.
+            deposition, file = zenodo_file_deposition(auth_parameter, resource_id)
+            if deposition is None:
                 raise PresQTResponseException("The resource could not be found by the requesting user.",
                                               status.HTTP_404_NOT_FOUND)
+            resource = {
+                "container": deposition['id'],
+                "kind": "item",
+                "kind_name": "file",
+                "id": resource_id,
+                "identifier": None,
+                "title": file['filename'],
+                "date_created": None,
+                "date_modified": None,
+                "hashes": {
+                    "md5": file['checksum']
+                },
+                "extra": {},
+                "children": []}
 
     return resource
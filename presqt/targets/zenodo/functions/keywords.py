@@ -1,8 +1,8 @@
 import json
-import requests
 
 from rest_framework import status
 
+from presqt.targets.utilities import get_http_session
 from presqt.targets.zenodo.utilities import zenodo_validation_check
 from presqt.utilities import PresQTResponseException
 
@@ -44,13 +44,13 @@ def zenodo_fetch_keywords(token, resource_id):
     metadata = None
     if resource['kind'] == 'container':
         file_url = "https://zenodo.org/api/deposit/depositions/{}/files".format(resource_id)
-        project_files_response = requests.get(file_url, params=auth_parameter)
+        project_files_response = get_http_session('zenodo').get(file_url, params=auth_parameter)
 
         if project_files_response.status_code == 200:
             for file in project_files_response.json():
                 if file['filename'] == 'PRESQT_FTS_METADATA.json':
                     # Download the metadata
-                    metadata_file = requests.get(
+                    metadata_file = get_http_session('zenodo').get(
                         file['links']['download'], params=auth_parameter).content
                     metadata = json.loads(metadata_file)
 
@@ -123,8 +123,8 @@ def zenodo_upload_keywords(token, resource_id, keywords):
         "keywords": list(set(keywords))
     }}
 
-    response = requests.put(put_url, params=headers, data=json.dumps(data),
-                            headers={'Content-Type': 'application/json'})
+    response = get_http_session('zenodo').put(put_url, params=headers, data=json.dumps(data),
+                                              headers={'Content-Type': 'application/json'})
 
     if response.status_code != 200:
         raise PresQTResponseException("Zenodo returned a {} error trying to update keywords.".format(
@@ -1,13 +1,14 @@
 import os
 import json
-import requests
 
 from rest_framework import status
 
-from presqt.targets.utilities import get_duplicate_title, upload_total_files
-from presqt.targets.zenodo.utilities import zenodo_validation_check, zenodo_upload_helper
+from presqt.targets.utilities import get_duplicate_title, upload_total_files, get_http_session
+from presqt.targets.zenodo.utilities import (zenodo_validation_check, zenodo_upload_helper,
+                                             zenodo_bucket_upload)
 from presqt.utilities import (PresQTValidationError, PresQTResponseException,
-                              update_process_info, increment_process_info, update_process_info_message)
+                              update_process_info, update_process_info_message,
+                              record_upload_destination)
 
 
 def zenodo_upload_resource(token, resource_id, resource_main_dir, hash_algorithm,
@@ -73,8 +74,9 @@ def zenodo_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
 
     # Since Zenodo is a finite depth target, the checks for path validity have already been done.
     if resource_id:
-        name_helper = requests.get("https://zenodo.org/api/deposit/depositions/{}".format(
-            resource_id), params=auth_parameter).json()
+        name_helper = get_http_session('zenodo').get(
+            "https://zenodo.org/api/deposit/depositions/{}".format(resource_id),
+            params=auth_parameter).json()
 
         try:
             final_title = name_helper['title']
@@ -87,24 +89,25 @@ def zenodo_upload_resource(token, resource_id, resource_main_dir, hash_algorithm
     else:
         action_metadata = {"destinationUsername": None}
         project_title = os_path[1][0]
-        name_helper = requests.get("https://zenodo.org/api/deposit/depositions",
-                                   params=auth_parameter).json()
+        name_helper = get_http_session('zenodo').get("https://zenodo.org/api/deposit/depositions",
+                                                     params=auth_parameter).json()
         titles = [project['title'] for project in name_helper]
         final_title = get_duplicate_title(project_title, titles, ' (PresQT*)')
         resource_id = zenodo_upload_helper(auth_parameter, final_title)
+        record_upload_destination(process_info_path, resource_id)
 
-    post_url = "https://zenodo.org/api/deposit/depositions/{}/files".format(resource_id)
     upload_dict = zenodo_upload_loop(action_metadata, resource_id, resource_main_dir,
-                                     post_url, auth_parameter, final_title, file_duplicate_action,
+                                     auth_parameter, final_title, file_duplicate_action,
                                      process_info_path, action)
 
     return upload_dict
 
 
-def zenodo_upload_loop(action_metadata, resource_id, resource_main_dir, post_url, auth_parameter,
-                       title, file_duplicate_action, process_info_path, action):
+def zenodo_upload_loop(action_metadata, resource_id, resource_main_dir, auth_parameter, title,
+                       file_duplicate_action, process_info_path, action):
     """
-    Loop through the files to be uploaded and return the dictionary.
+    Loop through the files to be uploaded, stream them into the deposition's bucket and return
+    the dictionary.
 
     Parameters
     ----------
@@ -112,8 +115,6 @@ def zenodo_upload_loop(action_metadata, resource_id, resource_main_dir, post_url
         The metadata for this PresQT action
     resource_id : str
         The id of the resource the upload is happening on
-    post_url : str
-        The url to upload files to
     auth_parameter : dict
         Zenodo's authorization paramater
     title : str
@@ -156,51 +157,37 @@ def zenodo_upload_loop(action_metadata, resource_id, resource_main_dir, post_url
     file_metadata_list = []
     action_metadata = {'destinationUsername': None}
 
-    # Get current files associated with the resource.
+    # Get current files associated with the resource, and the bucket files are uploaded to.
     project_url = "https://zenodo.org/api/deposit/depositions/{}".format(resource_id)
-    current_file_list = requests.get(project_url, params=auth_parameter).json()['files']
-    file_title_list = [entry['filename'] for entry in current_file_list]
+    project_data = get_http_session('zenodo').get(project_url, params=auth_parameter).json()
+    file_title_list = [entry['filename'] for entry in project_data['files']]
 
+    upload_list = []
     for path, subdirs, files in os.walk(resource_main_dir):
         if not subdirs and not files:
             resources_ignored.append(path)
 
         for name in files:
             formatted_name = name.replace(' ', '_')
-            if formatted_name in file_title_list and file_duplicate_action == 'ignore':
-                resources_ignored.append(os.path.join(path, name))
-                continue
-
-            data = {'name': formatted_name}
-            files = {'file': open(os.path.join(path, name), "rb")}
-
-            if formatted_name in file_title_list and file_duplicate_action == 'update':
-                # First we need to delete the old file
-                for entry in current_file_list:
-                    if formatted_name == entry['filename']:
-                        delete_response = requests.delete(
-                            entry['links']['self'], params=auth_parameter)
-                        if delete_response.status_code != 204:
-                            raise PresQTResponseException(
-                                "Zenodo returned an error trying to update {}".format(name),
-                                status.HTTP_400_BAD_REQUEST)
-                        # Add this resource to the updated list
-                        resources_updated.append(os.path.join(path, name))
-            # Make the upload request....
-            response = requests.post(post_url, params=auth_parameter,
-                                     data=data, files=files)
-            if response.status_code != 201:
-                raise PresQTResponseException(
-                    "Zenodo returned an error trying to upload {}".format(name),
-                    status.HTTP_400_BAD_REQUEST)
-            # Increment process info file
-            increment_process_info(process_info_path, action, 'upload')
-
-            file_metadata_list.append({
-                'actionRootPath': os.path.join(path, name),
-                'destinationPath': '/{}/{}'.format(title, formatted_name),
-                'title': formatted_name,
-                'destinationHash': response.json()['checksum']})
+            if formatted_name in file_title_list:
+                if file_duplicate_action == 'ignore':
+                    resources_ignored.append(os.path.join(path, name))
+                    continue
+                # Putting the file into the bucket replaces the old one
+                resources_updated.append(os.path.join(path, name))
+
+            upload_list.append({'file_path': os.path.join(path, name), 'name': formatted_name})
+
+    responses = zenodo_bucket_upload(project_data['links']['bucket'], auth_parameter,
+                                     upload_list, process_info_path, action)
+
+    for upload, response_data in zip(upload_list, responses):
+        file_metadata_list.append({
+            'actionRootPath': upload['file_path'],
+            'destinationPath': '/{}/{}'.format(title, upload['name']),
+            'title': upload['name'],
+            # The bucket gives the checksum as 'md5:<hash>'
+            'destinationHash': response_data['checksum'].partition(':')[2]})
 
     return {
         "resources_ignored": resources_ignored,
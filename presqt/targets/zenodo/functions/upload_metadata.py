@@ -1,8 +1,8 @@
 import itertools
 import json
-import requests
 
 from presqt.json_schemas.schema_handlers import schema_validator
+from presqt.targets.utilities import get_http_session
 from presqt.targets.zenodo.utilities import zenodo_validation_check
 from presqt.targets.zenodo.utilities.upload_extra_metadata import upload_extra_metadata
 from presqt.utilities import PresQTError
@@ -25,13 +25,13 @@ def zenodo_upload_metadata(token, project_id, metadata_dict):
     post_url = "https://zenodo.org/api/deposit/depositions/{}/files".format(project_id)
     file_name = 'PRESQT_FTS_METADATA.json'
 
-    project_files = requests.get(post_url, params=auth_parameter).json()
+    project_files = get_http_session('zenodo').get(post_url, params=auth_parameter).json()
 
     for file in project_files:
         if file['filename'] == file_name:
             # Download the metadata
-            old_metadata_file = requests.get(file['links']['download'],
-                                             params=auth_parameter).content
+            old_metadata_file = get_http_session('zenodo').get(file['links']['download'],
+                                                               params=auth_parameter).content
             # Load the existing metadata to be updated.
             updated_metadata = json.loads(old_metadata_file)
 
@@ -39,7 +39,7 @@ def zenodo_upload_metadata(token, project_id, metadata_dict):
                 # We need to change the file name, this metadata is improperly formatted and
                 # therefore invalid. Zenodo is having issues with their put method atm.......
                 # Need to delete the old metadata file.
-                requests.delete(file['links']['self'], params=auth_parameter)
+                get_http_session('zenodo').delete(file['links']['self'], params=auth_parameter)
                 response_status = metadata_post_request('INVALID_PRESQT_FTS_METADATA.json',
                                                         updated_metadata, auth_parameter, post_url)
                 if response_status != 201:
@@ -49,7 +49,7 @@ def zenodo_upload_metadata(token, project_id, metadata_dict):
                 break
 
             # Need to delete the old metadata file.
-            requests.delete(file['links']['self'], params=auth_parameter)
+            get_http_session('zenodo').delete(file['links']['self'], params=auth_parameter)
 
             # Loop through each 'action' in both metadata files and make a new list of them.
             joined_actions = [entry for entry in itertools.chain(metadata_dict['actions'],
@@ -105,6 +105,6 @@ def metadata_post_request(file_name, metadata, auth_parameter, url):
     files = {'file': metadata_bytes}
 
     # Make the request
-    response = requests.post(url, params=auth_parameter, data=data, files=files)
+    response = get_http_session('zenodo').post(url, params=auth_parameter, data=data, files=files)
 
     return response.status_code
@@ -0,0 +1,113 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+
+from aiohttp import web
+from django.test import SimpleTestCase
+
+from presqt.targets.utilities.tests.shared_fake_server import FakeServer
+from presqt.targets.zenodo.utilities import zenodo_bucket_upload
+from presqt.utilities import PresQTResponseException, get_job_store, get_process_info_path
+
+
+class TestBucketUpload(SimpleTestCase):
+    def setUp(self):
+        self.ticket_number = 'test_zenodo_bucket_upload'
+        self.directory = tempfile.mkdtemp()
+        self.uploads_running = 0
+        self.most_uploads_running = 0
+        self.received = {}
+
+        # Serve a fake bucket from its own loop in the background
+        self.server = FakeServer([web.put('/bucket/{name}', self.handle_put)])
+        self.bucket_url = '{}/bucket'.format(self.server.url)
+
+        get_job_store().set_action(self.ticket_number, 'resource_upload', {
+            'status': 'in_progress', 'upload_files_finished': 0})
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.directory)
+        shutil.rmtree(os.path.dirname(get_process_info_path(self.ticket_number)),
+                      ignore_errors=True)
+
+    async def handle_put(self, request):
+        self.uploads_running += 1
+        self.most_uploads_running = max(self.most_uploads_running, self.uploads_running)
+        contents = await request.read()
+        # Earlier uploads to a key are slower, so they'd land last if they weren't kept in order
+        await asyncio.sleep(0.15 if contents.startswith(b'first') else 0.05)
+        self.uploads_running -= 1
+        if request.query['access_token'] != 'eggs' or request.match_info['name'] == 'bad.txt':
+            return web.json_response({'message': 'Nope'}, status=400)
+        self.received[request.match_info['name']] = contents
+        return web.json_response(
+            {'key': request.match_info['name'],
+             'checksum': 'md5:{}'.format(hashlib.md5(contents).hexdigest())}, status=201)
+
+    def write_uploads(self, names):
+        upload_list = []
+        for name in names:
+            file_path = os.path.join(self.directory, name)
+            with open(file_path, 'wb') as file:
+                file.write(name.encode() * 100)
+            upload_list.append({'file_path': file_path, 'name': name})
+        return upload_list
+
+    def test_bucket_upload(self):
+        """
+        Every file should be streamed into the bucket, no more than four at a time, and Zenodo's
+        response for each returned in order.
+        """
+        upload_list = self.write_uploads(['file_{}.txt'.format(index) for index in range(10)])
+
+        responses = zenodo_bucket_upload(self.bucket_url, {'access_token': 'eggs'}, upload_list,
+                                         get_process_info_path(self.ticket_number),
+                                         'resource_upload')
+
+        self.assertEqual([response['key'] for response in responses],
+                         [upload['name'] for upload in upload_list])
+        self.assertEqual(responses[3]['checksum'],
+                         'md5:{}'.format(hashlib.md5(b'file_3.txt' * 100).hexdigest()))
+        self.assertEqual(self.received['file_3.txt'], b'file_3.txt' * 100)
+        self.assertEqual(self.most_uploads_running, 4)
+        self.assertEqual(
+            get_job_store().get_job(self.ticket_number)['resource_upload']['upload_files_finished'],
+            10)
+
+    def test_bucket_upload_names(self):
+        """
+        Names should be quoted in the bucket URL, and of the files given the same name the last
+        one should be left in the bucket.
+        """
+        upload_list = self.write_uploads(['what?.txt', 'hash#tag.txt', '100%.txt'])
+        for index, contents in enumerate([b'first file', b'second file']):
+            file_path = os.path.join(self.directory, str(index), 'same.txt')
+            os.makedirs(os.path.dirname(file_path))
+            with open(file_path, 'wb') as file:
+                file.write(contents)
+            upload_list.append({'file_path': file_path, 'name': 'same.txt'})
+
+        responses = zenodo_bucket_upload(self.bucket_url, {'access_token': 'eggs'}, upload_list,
+                                         get_process_info_path(self.ticket_number),
+                                         'resource_upload')
+
+        self.assertEqual([response['key'] for response in responses],
+                         ['what?.txt', 'hash#tag.txt', '100%.txt', 'same.txt', 'same.txt'])
+        self.assertEqual(self.received['100%.txt'], b'100%.txt' * 100)
+        self.assertEqual(self.received['same.txt'], b'second file')
+        self.assertEqual(responses[3]['checksum'],
+                         'md5:{}'.format(hashlib.md5(b'first file').hexdigest()))
+
+    def test_bucket_upload_error(self):
+        """
+        An upload Zenodo refuses should raise an error.
+        """
+        upload_list = self.write_uploads(['good.txt', 'bad.txt'])
+
+        with self.assertRaises(PresQTResponseException) as error:
+            zenodo_bucket_upload(self.bucket_url, {'access_token': 'eggs'}, upload_list,
+                                 get_process_info_path(self.ticket_number), 'resource_upload')
+        self.assertEqual(error.exception.data, 'Zenodo returned an error trying to upload bad.txt')
@@ -0,0 +1,76 @@
+import shutil
+import tempfile
+from importlib import import_module
+from unittest.mock import patch
+
+from aiohttp import web
+from django.test import SimpleTestCase
+
+from presqt.targets.utilities.tests.shared_fake_server import FakeServer
+from presqt.targets.zenodo.utilities import zenodo_file_deposition
+
+file_index = import_module('presqt.targets.zenodo.utilities.helpers.file_index')
+
+
+class TestFileIndex(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.deposition_requests = []
+        self.depositions = {
+            str(deposition_id): {
+                'modified': '2020-01-01T00:00:00',
+                'files': [{'id': 'file-{}'.format(deposition_id), 'filename': 'file.txt',
+                           'checksum': 'abc'}]}
+            for deposition_id in range(20)}
+
+        # Serve fake depositions from their own loop in the background
+        self.server = FakeServer([
+            web.get('/depositions', self.handle_list),
+            web.get('/depositions/{id}', self.handle_deposition)])
+        self.url = '{}/depositions'.format(self.server.url)
+
+        self.patches = [patch.object(file_index, 'DEPOSITIONS_URL', self.url),
+                        patch.object(file_index, 'FILE_INDEX_DIRECTORY', self.directory)]
+        for patcher in self.patches:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patches:
+            patcher.stop()
+        self.server.stop()
+        shutil.rmtree(self.directory)
+
+    async def handle_list(self, request):
+        return web.json_response([
+            {'id': int(deposition_id), 'modified': deposition['modified'],
+             'links': {'self': '{}/{}'.format(self.url, deposition_id)}}
+            for deposition_id, deposition in self.depositions.items()])
+
+    async def handle_deposition(self, request):
+        self.deposition_requests.append(request.match_info['id'])
+        return web.json_response(
+            {'files': self.depositions[request.match_info['id']]['files']})
+
+    def test_index_is_refreshed_incrementally(self):
+        """
+        The first lookup should fetch every deposition, later ones only the depositions that
+        were modified since, and deleted depositions should drop out of the index.
+        """
+        auth_parameter = {'access_token': 'eggs'}
+        deposition, file = zenodo_file_deposition(auth_parameter, 'file-12')
+        self.assertEqual(deposition['id'], 12)
+        self.assertEqual(file['filename'], 'file.txt')
+        self.assertEqual(len(self.deposition_requests), 20)
+
+        # Nothing changed so the index answers on its own
+        self.deposition_requests = []
+        self.assertEqual(zenodo_file_deposition(auth_parameter, 'file-3')[0]['id'], 3)
+        self.assertEqual(self.deposition_requests, [])
+
+        self.depositions['5']['modified'] = '2020-02-01T00:00:00'
+        self.depositions['5']['files'].append({'id': 'new-file', 'filename': 'new.txt',
+                                               'checksum': 'def'})
+        del self.depositions['7']
+        self.assertEqual(zenodo_file_deposition(auth_parameter, 'new-file')[0]['id'], 5)
+        self.assertEqual(self.deposition_requests, ['5'])
+        self.assertEqual(zenodo_file_deposition(auth_parameter, 'file-7'), (None, None))
@@ -144,7 +144,7 @@ class TestResourceKeywordsPOST(SimpleTestCase):
                 self.status_code = status_code
         mock_req = MockResponse({'error': 'The server is down.'}, 500)
 
-        with patch('requests.post') as mock_request:
+        with patch('requests.Session.post') as mock_request:
             mock_request.return_value = mock_req
 
             resource_id = '3525310'
@@ -205,7 +205,7 @@ class TestResourceKeywordsPOST(SimpleTestCase):
                 self.json_data = json_data
                 self.status_code = status_code
         mock_req = MockResponse({'error': 'The server is down.'}, 500)
-        with patch('requests.put') as mock_request:
+        with patch('requests.Session.put') as mock_request:
             mock_request.return_value = mock_req
             # Upload new keywords
             resource_id = '3525310'
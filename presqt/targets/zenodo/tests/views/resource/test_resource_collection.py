@@ -292,10 +292,14 @@ class TestResourceCollectionPOST(SimpleTestCase):
 
         # *Error* when uploading to an existing project.
         class MockResponse:
-            def __init__(self, json_data, status_code):
-                self.json_data = json_data
-                self.status_code = status_code
-        mock_req = MockResponse({'error': 'The server is down.'}, 500)
+            status = 500
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                pass
+        mock_req = MockResponse()
 
         self.resource_id = [resource['id']
                             for resource in response_json if resource['title'] == self.project_title][0]
@@ -304,8 +308,8 @@ class TestResourceCollectionPOST(SimpleTestCase):
                            'target_name': 'zenodo', 'resource_id': self.resource_id})
         self.file = 'presqt/api_v1/tests/resources/upload/ProjectSingleFileToUpload.zip'
 
-        with patch('requests.post') as fake_post:
-            fake_post.return_value = mock_req
+        with patch('aiohttp.ClientSession.put') as fake_put:
+            fake_put.return_value = mock_req
 
             self.headers['HTTP_PRESQT_FILE_DUPLICATE_ACTION'] = 'update'
             response = self.client.post(self.url, {'presqt-file': open(self.file, 'rb')},
@@ -331,10 +335,10 @@ class TestResourceCollectionPOST(SimpleTestCase):
             # Delete the upload folder
             shutil.rmtree(ticket_path)
 
-    def test_error_uploading_to_exisitng_container_update(self):
+    def test_update_on_exisitng_container_replaces_file(self):
         """
-        If there is an error response from Zenodo when updating a file on an existing container, we 
-        want to make the user aware.
+        Updating a file on an existing container replaces it in the deposition's bucket, so the
+        update doesn't depend on deleting the old file first.
         """
         # 202 when uploading a new top level repo
         shared_upload_function_osf(self)
@@ -364,8 +368,8 @@ class TestResourceCollectionPOST(SimpleTestCase):
                            'target_name': 'zenodo', 'resource_id': self.resource_id})
         self.file = 'presqt/api_v1/tests/resources/upload/ProjectSingleFileToUpload.zip'
 
-        with patch('requests.delete') as fake_post:
-            fake_post.return_value = mock_req
+        with patch('requests.Session.delete') as fake_delete:
+            fake_delete.return_value = mock_req
 
             self.headers['HTTP_PRESQT_FILE_DUPLICATE_ACTION'] = 'update'
             response = self.client.post(self.url, {'presqt-file': open(self.file, 'rb')},
@@ -383,10 +387,8 @@ class TestResourceCollectionPOST(SimpleTestCase):
                     # Pass while the process_info file is being written to
                     pass
 
-            upload_job_response = self.client.get(response.data['upload_job'], **self.headers)
-            self.assertEqual(upload_job_response.data['status_code'], 400)
-            self.assertEqual(upload_job_response.data['message'],
-                             'Zenodo returned an error trying to update NewProject.presqt.zip')
+            self.assertEqual(process_info['resource_upload']['status_code'], '200')
+            self.assertEqual(len(process_info['resource_upload']['resources_updated']), 1)
 
             # Delete the upload folder
             shutil.rmtree(ticket_path)
@@ -486,7 +488,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
                 self.status_code = status_code
         mock_req = MockResponse({'error': 'The server is down.'}, 500)
 
-        with patch('requests.post') as fake_post:
+        with patch('requests.Session.post') as fake_post:
             fake_post.return_value = mock_req
             self.assertRaises(PresQTError, zenodo_upload_metadata, self.token, project_id,
                               self.metadata_dict)
@@ -500,13 +502,13 @@ class TestResourceCollectionPOST(SimpleTestCase):
                       params=self.auth_params,
                       data={'name': 'PRESQT_FTS_METADATA.json'},
                       files={'file': json.dumps(bad_metadata, indent=4).encode('utf-8')})
-        with patch('requests.post') as fake_post:
+        with patch('requests.Session.post') as fake_post:
             fake_post.return_value = mock_req
             self.assertRaises(PresQTError, zenodo_upload_metadata, self.token, project_id,
                               self.metadata_dict)
 
         ### EXPLICIT TEST UPLOADING METADATA BUT THERE'S AN ERROR ###
-        with patch('requests.post') as fake_post:
+        with patch('requests.Session.post') as fake_post:
             fake_post.return_value = mock_req
             self.assertRaises(PresQTError, zenodo_upload_metadata, self.token, project_id,
                               self.metadata_dict)
@@ -696,7 +698,7 @@ class TestResourceCollectionPOST(SimpleTestCase):
                 self.status_code = status_code
         mock_req = MockResponse({'error': 'The server is down.'}, 500)
 
-        with patch('requests.post') as fake_post:
+        with patch('requests.Session.post') as fake_post:
             fake_post.return_value = mock_req
 
             self.headers['HTTP_PRESQT_FILE_DUPLICATE_ACTION'] = self.duplicate_action
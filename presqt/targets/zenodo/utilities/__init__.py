@@ -1,6 +1,8 @@
 from presqt.targets.zenodo.utilities.helpers.validation_check import zenodo_validation_check
 from presqt.targets.zenodo.utilities.helpers.download_helper import zenodo_download_helper
 from presqt.targets.zenodo.utilities.helpers.upload_helper import zenodo_upload_helper
+from presqt.targets.zenodo.utilities.helpers.bucket_upload import zenodo_bucket_upload
+from presqt.targets.zenodo.utilities.helpers.file_index import zenodo_file_deposition
 from presqt.targets.zenodo.utilities.helpers.fetch_helpers import (
     zenodo_fetch_resources_helper, zenodo_fetch_resource_helper)
 from presqt.targets.zenodo.utilities.helpers.extra_metadata_helper import extra_metadata_helper
@@ -0,0 +1,133 @@
+import asyncio
+import collections
+import os
+from urllib.parse import quote
+
+from rest_framework import status
+
+from presqt.targets.utilities import get_async_session, run_async
+from presqt.utilities import PresQTResponseException, increment_process_info
+
+# Largest number of files uploaded to a bucket at the same time
+BUCKET_UPLOAD_CONCURRENCY = 4
+
+
+def zenodo_bucket_upload(bucket_url, auth_parameter, upload_list, process_info_path, action):
+    """
+    Open an async loop and stream files into a deposition's bucket, at most
+    BUCKET_UPLOAD_CONCURRENCY at a time. A file already in the bucket under the same name is
+    replaced. Files given the same name are uploaded one after another in the order of
+    upload_list, so the last of them is the one left in the bucket.
+
+    Parameters
+    ----------
+    bucket_url : str
+        The deposition's bucket link
+    auth_parameter : dict
+        Zenodo's authorization parameter
+    upload_list : list
+        List of dictionaries holding the 'file_path' of each file on disk and the 'name' to
+        give it in the bucket
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    List of the JSON Zenodo returned for each file, in the order of upload_list.
+    """
+    return run_async(
+        async_main(bucket_url, auth_parameter, upload_list, process_info_path, action))
+
+
+async def async_put(bucket_url, session, semaphore, auth_parameter, upload, process_info_path,
+                    action):
+    """
+    Coroutine that uses aiohttp to stream a file from disk into the bucket.
+
+    Parameters
+    ----------
+    bucket_url : str
+        The deposition's bucket link
+    session: ClientSession object
+        aiohttp ClientSession Object
+    semaphore: asyncio.Semaphore
+        Bounds the number of uploads running at the same time
+    auth_parameter : dict
+        Zenodo's authorization parameter
+    upload : dict
+        The upload to make
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    The JSON of the response.
+    """
+    async with semaphore:
+        with open(upload['file_path'], 'rb') as file:
+            async with session.put('{}/{}'.format(bucket_url, quote(upload['name'])),
+                                   params=auth_parameter, data=file,
+                                   headers={'Content-Type': 'application/octet-stream'}
+                                   ) as response:
+                if response.status not in [200, 201]:
+                    raise PresQTResponseException(
+                        "Zenodo returned an error trying to upload {}".format(upload['name']),
+                        status.HTTP_400_BAD_REQUEST)
+                response_data = await response.json()
+
+    # Increment process info file
+    increment_process_info(process_info_path, action, 'upload',
+                           os.path.getsize(upload['file_path']), upload['file_path'])
+    return response_data
+
+
+async def async_main(bucket_url, auth_parameter, upload_list, process_info_path, action):
+    """
+    Main coroutine method that will gather the uploads to be made and will make them
+    asynchronously. If an upload fails the rest are cancelled.
+
+    Parameters
+    ----------
+    bucket_url : str
+        The deposition's bucket link
+    auth_parameter : dict
+        Zenodo's authorization parameter
+    upload_list : list
+        List of the uploads to make
+    process_info_path: str
+        Path to the process info file that keeps track of the action's progress
+    action: str
+        The action being performed
+
+    Returns
+    -------
+    List of the JSON of each response.
+    """
+    semaphore = asyncio.Semaphore(BUCKET_UPLOAD_CONCURRENCY)
+    session = get_async_session('zenodo')
+    responses = [None] * len(upload_list)
+
+    # Uploads to the same key would race each other, so they're made one at a time
+    indexes_by_name = collections.OrderedDict()
+    for index, upload in enumerate(upload_list):
+        indexes_by_name.setdefault(upload['name'], []).append(index)
+
+    async def put_in_order(indexes):
+        for index in indexes:
+            responses[index] = await async_put(bucket_url, session, semaphore, auth_parameter,
+                                               upload_list[index], process_info_path, action)
+
+    tasks = [asyncio.ensure_future(put_in_order(indexes))
+             for indexes in indexes_by_name.values()]
+    try:
+        await asyncio.gather(*tasks)
+        return responses
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
@@ -1,11 +1,11 @@
-import requests
-
 from rest_framework import status
 
+from presqt.targets.utilities import spool_response, get_http_session
 from presqt.utilities import PresQTResponseException
 
 
-def zenodo_download_helper(is_record, base_url, auth_parameter, files, file_url=None):
+def zenodo_download_helper(is_record, base_url, auth_parameter, files, spool_directory,
+                           file_url=None):
     """
     This is used in Zenodo's download function.
 
@@ -19,6 +19,8 @@ def zenodo_download_helper(is_record, base_url, auth_parameter, files, file_url=
         The Authentication parameter expected by Zenodo.
     files : list
         The list of files to append to.
+    spool_directory : str
+        Path to the directory a single file download will be spooled to.
     file_url : str
         If the download is a single file, we also pass the link to the file.
 
@@ -26,7 +28,7 @@ def zenodo_download_helper(is_record, base_url, auth_parameter, files, file_url=
     -------
     The list of file dictionaries and action_metadata.
     """
-    project_info = requests.get(base_url, auth_parameter)
+    project_info = get_http_session('zenodo').get(base_url, auth_parameter)
     if project_info.status_code != 200:
         raise PresQTResponseException('The response returned a 404 not found status code.',
                                       status.HTTP_404_NOT_FOUND)
@@ -50,9 +52,9 @@ def zenodo_download_helper(is_record, base_url, auth_parameter, files, file_url=
     action_metadata = {"sourceUsername": username}
 
     if file_url:
-        metadata_helper = requests.get(file_url, params=auth_parameter).json()
+        metadata_helper = get_http_session('zenodo').get(file_url, params=auth_parameter).json()
         files = zenodo_file_download_helper(
-            auth_parameter, is_record, project_name, metadata_helper, files)
+            auth_parameter, is_record, project_name, metadata_helper, files, spool_directory)
 
     else:
         files = zenodo_project_download_helper(is_record, project_name, project_helper, files)
@@ -60,7 +62,8 @@ def zenodo_download_helper(is_record, base_url, auth_parameter, files, file_url=
     return files, action_metadata
 
 
-def zenodo_file_download_helper(auth_parameter, is_record, project_name, metadata_helper, files):
+def zenodo_file_download_helper(auth_parameter, is_record, project_name, metadata_helper, files,
+                                spool_directory):
     """
     Downloads a single file from Zenodo and returns the expected dictionary.
 
@@ -76,29 +79,33 @@ def zenodo_file_download_helper(auth_parameter, is_record, project_name, metadat
         JSON payload from Zenodo API
     files: list
         The list to append the file to.
+    spool_directory: str
+        Path to the directory the file will be spooled to.
 
     Returns
     -------
         The list of files.
     """
     if is_record is True:
-        file_contents = requests.get(
-            metadata_helper['contents'][0]['links']['self'], params=auth_parameter).content
+        file_path = spool_response(get_http_session('zenodo').get(
+            metadata_helper['contents'][0]['links']['self'], params=auth_parameter, stream=True),
+            spool_directory)
         hashes = {'md5': metadata_helper['contents'][0]['checksum'].partition(':')[2]}
         title = metadata_helper['contents'][0]['key']
         path = '/{}'.format(title)
         # No way of getting project title if passed a file id.
         source_path = '/{}'.format(title)
     else:
-        file_contents = requests.get(
-            metadata_helper['links']['download'], params=auth_parameter).content
+        file_path = spool_response(get_http_session('zenodo').get(
+            metadata_helper['links']['download'], params=auth_parameter, stream=True),
+            spool_directory)
         hashes = {'md5': metadata_helper['checksum']}
         title = metadata_helper['filename']
         path = '/{}'.format(metadata_helper['filename'])
         source_path = "/{}/{}".format(project_name, metadata_helper['filename'])
 
     files.append({
-        'file': file_contents,
+        'file': file_path,
         'hashes': hashes,
         'title': title,
         # If the file is the only resource we are downloading then we don't need it's full path.
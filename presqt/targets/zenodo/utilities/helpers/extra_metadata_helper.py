@@ -1,4 +1,5 @@
-import requests
+from presqt.targets.utilities import get_http_session
+
 
 
 def extra_metadata_helper(base_url, is_record, auth_parameter):
@@ -18,7 +19,7 @@ def extra_metadata_helper(base_url, is_record, auth_parameter):
     -------
         Extra metadata dictionary
     """
-    project_helper = requests.get(base_url, auth_parameter).json()
+    project_helper = get_http_session('zenodo').get(base_url, auth_parameter).json()
     keywords = []
 
     if is_record:
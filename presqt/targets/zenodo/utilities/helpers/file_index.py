@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+import json
+import os
+
+from rest_framework import status
+
+from presqt.targets.utilities import get_async_session, run_async, get_http_session
+from presqt.utilities import PresQTResponseException
+
+DEPOSITIONS_URL = 'https://zenodo.org/api/deposit/depositions'
+# Every user gets a file in here, named after their hashed token, mapping their files to the
+# depositions holding them.
+FILE_INDEX_DIRECTORY = os.path.join('mediafiles', 'zenodo_file_index')
+# Largest number of depositions fetched at the same time while the index is refreshed
+DEPOSITION_CONCURRENCY = 8
+
+
+def zenodo_file_deposition(auth_parameter, file_id):
+    """
+    Find the deposition a user's file belongs to. The user's depositions are listed and only
+    the ones modified since the index was last refreshed are fetched again, all at the same
+    time, so once the index has been built a lookup takes a single request.
+
+    Parameters
+    ----------
+    auth_parameter : dict
+        Zenodo's authorization parameter
+    file_id : str
+        ID of the file to look for
+
+    Returns
+    -------
+    Tuple of the deposition, as it's listed, and the file's dictionary. Both are None if none of
+    the user's depositions hold the file.
+    """
+    response = get_http_session('zenodo').get(DEPOSITIONS_URL, params=auth_parameter)
+    if response.status_code != 200:
+        raise PresQTResponseException(
+            "Zenodo returned a {} error trying to list the depositions.".format(
+                response.status_code), status.HTTP_400_BAD_REQUEST)
+    depositions = response.json()
+
+    index_path = os.path.join(FILE_INDEX_DIRECTORY, '{}.json'.format(
+        hashlib.sha256(auth_parameter['access_token'].encode()).hexdigest()))
+    try:
+        with open(index_path, 'r') as index_file:
+            index = json.load(index_file)
+    except (FileNotFoundError, ValueError):
+        index = {}
+
+    stale_depositions = [
+        deposition for deposition in depositions
+        if index.get(str(deposition['id']), {}).get('modified') != deposition['modified']]
+    if stale_depositions:
+        refreshed = run_async(async_main(stale_depositions, auth_parameter))
+        for deposition, deposition_files in zip(stale_depositions, refreshed):
+            index[str(deposition['id'])] = {
+                'modified': deposition['modified'],
+                'files': {file['id']: file for file in deposition_files}}
+
+    # Depositions that were deleted drop out of the index
+    listed_ids = [str(deposition['id']) for deposition in depositions]
+    index = {deposition_id: entry for deposition_id, entry in index.items()
+             if deposition_id in listed_ids}
+    if stale_depositions or len(index) != len(listed_ids):
+        _save_index(index_path, index)
+
+    for deposition in depositions:
+        file = index[str(deposition['id'])]['files'].get(file_id)
+        if file is not None:
+            return deposition, file
+    return None, None
+
+
+def _save_index(index_path, index):
+    """
+    Write a user's index. The file is replaced atomically so a lookup running at the same time
+    never reads a partially written index.
+    """
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    temporary_path = '{}.{}.tmp'.format(index_path, os.getpid())
+    with open(temporary_path, 'w') as index_file:
+        json.dump(index, index_file)
+    os.replace(temporary_path, index_path)
+
+
+async def async_get_files(session, semaphore, auth_parameter, deposition):
+    """
+    Coroutine that uses aiohttp to get the files of a deposition.
+
+    Parameters
+    ----------
+    session: ClientSession object
+        aiohttp ClientSession Object
+    semaphore: asyncio.Semaphore
+        Bounds the number of depositions fetched at the same time
+    auth_parameter : dict
+        Zenodo's authorization parameter
+    deposition : dict
+        The deposition, as it's listed
+
+    Returns
+    -------
+    List of the deposition's file dictionaries.
+    """
+    async with semaphore:
+        async with session.get(deposition['links']['self'], params=auth_parameter) as response:
+            if response.status != 200:
+                raise PresQTResponseException(
+                    "Zenodo returned a {} error trying to get deposition {}.".format(
+                        response.status, deposition['id']), status.HTTP_400_BAD_REQUEST)
+            return (await response.json())['files']
+
+
+async def async_main(depositions, auth_parameter):
+    """
+    Main coroutine method that will gather the depositions to fetch and will fetch them
+    asynchronously. If a deposition can't be fetched the rest are cancelled.
+
+    Parameters
+    ----------
+    depositions : list
+        The depositions to fetch
+    auth_parameter : dict
+        Zenodo's authorization parameter
+
+    Returns
+    -------
+    List of the files of each deposition, in the order of depositions.
+    """
+    semaphore = asyncio.Semaphore(DEPOSITION_CONCURRENCY)
+    session = get_async_session('zenodo')
+    tasks = [asyncio.ensure_future(async_get_files(session, semaphore, auth_parameter,
+                                                   deposition))
+             for deposition in depositions]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
@@ -1,8 +1,8 @@
 import json
-import requests
 
 from rest_framework import status
 
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTResponseException
 
 
@@ -22,8 +22,8 @@ def zenodo_upload_helper(auth_parameter, project_title=None):
 
     headers = {"Content-Type": "application/json"}
 
-    project_info = requests.post('https://zenodo.org/api/deposit/depositions', params=auth_parameter,
-                                 json={}, headers=headers)
+    project_info = get_http_session('zenodo').post('https://zenodo.org/api/deposit/depositions', params=auth_parameter,
+                                                   json={}, headers=headers)
 
     if project_info.status_code != 201:
         raise PresQTResponseException(
@@ -42,7 +42,8 @@ def zenodo_upload_helper(auth_parameter, project_title=None):
             'description': 'PresQT Upload',
             'creators': [{'name': str(project_owner)}]}}
 
-    requests.put('https://zenodo.org/api/deposit/depositions/{}'.format(project_id),
-                 params=auth_parameter, data=json.dumps(data), headers=headers)
+    get_http_session('zenodo').put(
+        'https://zenodo.org/api/deposit/depositions/{}'.format(project_id), params=auth_parameter,
+        data=json.dumps(data), headers=headers)
 
     return project_id
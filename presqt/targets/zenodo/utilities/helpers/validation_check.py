@@ -1,7 +1,6 @@
-import requests
-
 from rest_framework import status
 
+from presqt.targets.utilities import get_http_session
 from presqt.utilities import PresQTValidationError
 
 
@@ -22,8 +21,8 @@ def zenodo_validation_check(token):
     auth_parameter = {'access_token': token}
 
     # Gonna use the test server for now
-    validator = requests.get("https://zenodo.org/api/deposit/depositions",
-                             params=auth_parameter).status_code
+    validator = get_http_session('zenodo').get("https://zenodo.org/api/deposit/depositions",
+                                               params=auth_parameter).status_code
 
     if validator != 200:
         raise PresQTValidationError("Token is invalid. Response returned a 401 status code.",
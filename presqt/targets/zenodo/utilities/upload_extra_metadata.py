@@ -1,5 +1,6 @@
 import json
-import requests
+
+from presqt.targets.utilities import get_http_session
 
 
 def upload_extra_metadata(extra_metadata, auth_parameter, attribute_url):
@@ -41,7 +42,7 @@ def upload_extra_metadata(extra_metadata, auth_parameter, attribute_url):
             data["metadata"]['creators'].append(creator_dict)
 
     if extra_metadata['license']:
-        license_response = requests.get("https://zenodo.org/api/licenses/?q={}".format(extra_metadata['license']))
+        license_response = get_http_session('zenodo').get("https://zenodo.org/api/licenses/?q={}".format(extra_metadata['license']))
         if license_response.status_code == 200:
             for license_dict in license_response.json()['hits']['hits']:
                 if license_dict['metadata']['title'] == extra_metadata['license']:
@@ -65,7 +66,7 @@ def upload_extra_metadata(extra_metadata, auth_parameter, attribute_url):
     if extra_metadata['notes']:
         data["metadata"]["notes"] = extra_metadata['notes']
 
-    requests.put(attribute_url,
-                 params=auth_parameter,
-                 data=json.dumps(data),
-                 headers={"Content-Type": "application/json"})
\ No newline at end of file
+    get_http_session('zenodo').put(attribute_url,
+                                   params=auth_parameter,
+                                   data=json.dumps(data),
+                                   headers={"Content-Type": "application/json"})
\ No newline at end of file
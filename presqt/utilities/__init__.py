@@ -1,12 +1,26 @@
 
 from presqt.utilities.exceptions.exceptions import (
     PresQTError, PresQTInvalidTokenError, PresQTResponseException, PresQTValidationError)
+from presqt.utilities.io.extract_zip import extract_zip
+from presqt.utilities.io.move_file import move_file
 from presqt.utilities.io.read_file import read_file
 from presqt.utilities.io.remove_path_contents import remove_path_contents
+from presqt.utilities.io.save_uploaded_file import save_uploaded_file
+from presqt.utilities.io.write_chunk import write_chunk, chunk_lock
 from presqt.utilities.io.write_file import write_file
+from presqt.utilities.io.zip_compression import CompressionPolicy
 from presqt.utilities.io.zip_file import zip_directory
+from presqt.utilities.io.zip_stream import ZipStream, iter_zip_directory
+from presqt.utilities.job_store.base_job_store import get_process_info_path, get_ticket_number
+from presqt.utilities.job_store.get_job_queue import get_job_queue
+from presqt.utilities.job_store.get_job_store import get_job_store
+from presqt.utilities.job_store.progress_reporter import ProgressReporter
+from presqt.utilities.job_store.transfer_checkpoint import TransferCheckpoint
 from presqt.utilities.utils.get_dictionary_from_list import get_dictionary_from_list
 from presqt.utilities.utils.list_differences import list_differences
 from presqt.utilities.utils.list_intersection import list_intersection
+from presqt.utilities.utils.multi_hash_generator import (
+    BAG_CHECKSUMS, MultiHasher, multi_hash_generator, file_multi_hash_generator)
 from presqt.utilities.utils.update_process_info import (
-    update_process_info_message, update_process_info, increment_process_info)
+    update_process_info_message, update_process_info, increment_process_info,
+    record_upload_destination, report_downloaded_file, get_resumed_file)
@@ -0,0 +1,94 @@
+import os
+import shutil
+import zipfile
+import zlib
+
+from rest_framework import status
+
+from presqt.utilities.exceptions.exceptions import PresQTValidationError
+
+# Bytes read from a zip file member at a time while it's extracted
+EXTRACT_BLOCK_SIZE = 1024 * 1024
+
+
+def extract_zip(zip_path, destination, max_bytes=None, max_files=None, max_ratio=None):
+    """
+    Extract a zip file once, checking it can be extracted safely before anything is written.
+
+    The sizes, number of members and compression ratio the zip file declares are checked against
+    the limits first, along with the free disk space, so zip bombs and oversized uploads are
+    refused without being extracted. zipfile never returns more than a member's declared size
+    and checks each member's CRC-32 as the member is read to the end, so corrupt members fail
+    here instead of being found later by bag validation.
+
+    Parameters
+    ----------
+    zip_path: str
+        Path to the zip file
+    destination: str
+        Directory to extract the zip file into
+    max_bytes: int
+        Largest total size of the extracted files
+    max_files: int
+        Largest number of members
+    max_ratio: int
+        Largest ratio of the total size of the extracted files to the size of the zip file
+
+    Returns
+    -------
+    List of the paths of the extracted files.
+    """
+    with zipfile.ZipFile(zip_path) as zip_file:
+        members = zip_file.infolist()
+        total_bytes = sum(member.file_size for member in members)
+
+        if max_files is not None and len(members) > max_files:
+            raise PresQTValidationError(
+                "PresQT Error: The zip file has {} files, more than the {} allowed.".format(
+                    len(members), max_files), status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        if max_bytes is not None and total_bytes > max_bytes:
+            raise PresQTValidationError(
+                "PresQT Error: The zip file extracts to {} bytes, more than the {} allowed.".format(
+                    total_bytes, max_bytes), status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        if max_ratio is not None and total_bytes > max_ratio * max(os.path.getsize(zip_path), 1):
+            raise PresQTValidationError(
+                "PresQT Error: The zip file is compressed too much to be extracted safely.",
+                status.HTTP_400_BAD_REQUEST)
+
+        os.makedirs(destination, exist_ok=True)
+        if total_bytes > shutil.disk_usage(destination).free:
+            raise PresQTValidationError(
+                "PresQT Error: There is not enough space on the server to extract the zip file.",
+                status.HTTP_507_INSUFFICIENT_STORAGE)
+
+        # Refuse encrypted members and members that would be written outside of the destination
+        destination_root = os.path.abspath(destination)
+        member_paths = []
+        for member in members:
+            if member.flag_bits & 0x1:
+                raise PresQTValidationError(
+                    "PresQT Error: '{}' is encrypted.".format(member.filename),
+                    status.HTTP_400_BAD_REQUEST)
+            member_path = os.path.abspath(os.path.join(destination_root, member.filename))
+            if os.path.commonpath([destination_root, member_path]) != destination_root:
+                raise PresQTValidationError(
+                    "PresQT Error: '{}' is not a valid path.".format(member.filename),
+                    status.HTTP_400_BAD_REQUEST)
+            member_paths.append(member_path)
+
+        extracted_files = []
+        for member, member_path in zip(members, member_paths):
+            if member.is_dir():
+                os.makedirs(member_path, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(member_path), exist_ok=True)
+            try:
+                with zip_file.open(member) as source, open(member_path, 'wb') as target:
+                    shutil.copyfileobj(source, target, EXTRACT_BLOCK_SIZE)
+            except (zipfile.BadZipFile, zipfile.LargeZipFile, zlib.error, EOFError,
+                    NotImplementedError) as e:
+                raise PresQTValidationError(
+                    "PresQT Error: '{}' could not be extracted: {}".format(member.filename, e),
+                    status.HTTP_400_BAD_REQUEST)
+            extracted_files.append(member_path)
+    return extracted_files
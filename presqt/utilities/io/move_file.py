@@ -0,0 +1,18 @@
+import os
+import shutil
+
+
+def move_file(source_path, destination_path):
+    """
+    Move a file that has already been written to disk (e.g. a spooled download) to a specified
+    path. The file is renamed rather than copied when both paths are on the same filesystem.
+
+    Parameters
+    ----------
+    source_path : str
+        Path of the file to move.
+    destination_path : str
+        Path that the file should be moved to.
+    """
+    os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+    shutil.move(source_path, destination_path)
@@ -0,0 +1,24 @@
+import os
+
+from django.core.files.move import file_move_safe
+
+
+def save_uploaded_file(uploaded_file, file_path):
+    """
+    Save a file uploaded in a request to disk. Files Django has already written to a temporary
+    file are moved instead of being copied.
+
+    Parameters
+    ----------
+    uploaded_file : UploadedFile
+        The file from request.FILES
+    file_path : str
+        Path to save the file to
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        file_move_safe(uploaded_file.temporary_file_path(), file_path, allow_overwrite=True)
+    else:
+        with open(file_path, 'wb') as destination:
+            for chunk in uploaded_file.chunks():
+                destination.write(chunk)
@@ -0,0 +1,98 @@
+import base64
+import fcntl
+import hashlib
+import os
+from contextlib import contextmanager
+
+from rest_framework import status
+
+from presqt.utilities.exceptions.exceptions import PresQTValidationError
+
+# Bytes read from the request at a time while a chunk is written
+CHUNK_BLOCK_SIZE = 1024 * 1024
+# Status code of a chunk that doesn't match its checksum, as used by the tus protocol
+HTTP_460_CHECKSUM_MISMATCH = 460
+
+
+def write_chunk(file_path, offset, stream, length, algorithm, expected_digest):
+    """
+    Write a chunk of a file at an offset, straight from the request body, checking it against the
+    checksum sent with it. A chunk that doesn't arrive whole or doesn't match its checksum is
+    removed again so the file ends at the offset it was written at. Only one chunk of a file
+    can be written at a time.
+
+    Parameters
+    ----------
+    file_path: str
+        Path to the file being uploaded
+    offset: int
+        Byte of the file the chunk starts at
+    stream: file-like
+        The request body
+    length: int
+        Size of the chunk
+    algorithm: str
+        hashlib algorithm of the checksum
+    expected_digest: str
+        Base64 encoded digest of the chunk
+
+    Returns
+    -------
+    The offset after the chunk.
+    """
+    hasher = hashlib.new(algorithm)
+    received = 0
+    with chunk_lock(file_path) as file:
+        received_size = file.seek(0, os.SEEK_END)
+        if received_size < offset:
+            raise PresQTValidationError(
+                "PresQT Error: Only {} bytes of the file have been received.".format(
+                    received_size), status.HTTP_409_CONFLICT)
+
+        # Anything past the offset is left over from a chunk that didn't finish
+        file.truncate(offset)
+        while received < length:
+            block = stream.read(min(CHUNK_BLOCK_SIZE, length - received))
+            if not block:
+                break
+            hasher.update(block)
+            file.write(block)
+            received += len(block)
+
+        if received < length:
+            file.truncate(offset)
+            raise PresQTValidationError(
+                "PresQT Error: The chunk ended after {} of its {} bytes.".format(received, length),
+                status.HTTP_400_BAD_REQUEST)
+        if base64.b64encode(hasher.digest()).decode() != expected_digest:
+            file.truncate(offset)
+            raise PresQTValidationError(
+                "PresQT Error: The chunk doesn't match its Upload-Checksum.",
+                HTTP_460_CHECKSUM_MISMATCH)
+    return offset + length
+
+
+@contextmanager
+def chunk_lock(file_path):
+    """
+    Hold the lock that lets only one chunk of a file be written at a time. Anything that removes
+    the file holds it too so a chunk can't be written to a file that is being removed.
+
+    Parameters
+    ----------
+    file_path: str
+        Path to the file being uploaded
+
+    Yields
+    ------
+    The file, opened for reading and appending.
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'ab+') as file:
+        try:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise PresQTValidationError(
+                "PresQT Error: Another chunk of the file is being written.",
+                status.HTTP_409_CONFLICT)
+        yield file
@@ -0,0 +1,94 @@
+import mimetypes
+import os
+import zipfile
+
+from django.conf import settings
+
+
+class CompressionPolicy(object):
+    """
+    Decides whether each file written to a zip file is stored as it is or deflated.
+
+    The 'store' policy stores every file and 'deflate' deflates every file. The 'auto' policy
+    deflates files unless their extension or MIME type shows they are already compressed, like
+    images, video and other archives, where deflating costs time and saves next to nothing.
+    """
+
+    def __init__(self, mode='store', level=None, workers=1):
+        """
+        Parameters
+        ----------
+        mode: str
+            'store', 'deflate' or 'auto'
+        level: int
+            zlib compression level of deflated files, from 1 to 9
+        workers: int
+            Number of files zip_directory can deflate at the same time
+        """
+        if mode not in ['store', 'deflate', 'auto']:
+            raise ValueError("Unknown zip compression policy '{}'".format(mode))
+        self.mode = mode
+        self.level = level
+        self.workers = workers
+
+    @classmethod
+    def for_endpoint(cls, endpoint):
+        """
+        Get the compression policy of an endpoint from the ZIP_COMPRESSION setting.
+
+        Parameters
+        ----------
+        endpoint: str
+            Key of the endpoint in ZIP_COMPRESSION, e.g. 'resource_download'
+
+        Returns
+        -------
+        CompressionPolicy
+        """
+        policies = settings.ZIP_COMPRESSION
+        return cls(policies.get(endpoint, policies['default']), settings.ZIP_COMPRESSION_LEVEL,
+                   settings.ZIP_COMPRESSION_WORKERS)
+
+    def compress_type(self, file_name):
+        """
+        Get the zipfile compression method a file should be written with.
+
+        Parameters
+        ----------
+        file_name: str
+            Name or path of the file
+
+        Returns
+        -------
+        zipfile.ZIP_STORED or zipfile.ZIP_DEFLATED
+        """
+        if self.mode == 'store':
+            return zipfile.ZIP_STORED
+        if self.mode == 'deflate' or not is_compressed_format(file_name):
+            return zipfile.ZIP_DEFLATED
+        return zipfile.ZIP_STORED
+
+
+def is_compressed_format(file_name):
+    """
+    Check if a file is in a format that is already compressed, going by its extension and the
+    MIME type guessed from it.
+
+    Parameters
+    ----------
+    file_name: str
+        Name or path of the file
+
+    Returns
+    -------
+    True if the file isn't worth compressing again.
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension in settings.ZIP_STORED_EXTENSIONS:
+        return True
+    mime_type, encoding = mimetypes.guess_type(file_name)
+    # The encoding is set for files compressed with gzip, bzip2, xz and the like
+    if encoding:
+        return True
+    return bool(mime_type) and any(mime_type.startswith(stored_type)
+                                   for stored_type in settings.ZIP_STORED_MIME_TYPES)
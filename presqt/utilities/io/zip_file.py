@@ -1,11 +1,31 @@
+import collections
+import multiprocessing
 import os
+import shutil
+import struct
+import tempfile
+import time
 import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
+from presqt.utilities.io.zip_compression import CompressionPolicy
 
-def zip_directory(source_path, destination_path, to_strip=''):
+# Bytes read from a file at a time while it's deflated or copied into the zip file
+DEFLATE_BLOCK_SIZE = 1024 * 1024
+# Sizes, offsets and entry counts above these need the ZIP64 extensions of the zip format
+ZIP64_LIMIT = (1 << 31) - 1
+ZIP64_ENTRY_LIMIT = (1 << 16) - 1
+
+
+def zip_directory(source_path, destination_path, to_strip='', policy=None):
     """
     Zip a directory to a specified path.
 
+    Files the compression policy deflates are compressed by a pool of worker processes at the
+    same time, then added to the zip file in the order they were found. zipfile can't add data
+    that's already deflated, so the zip file is written by _ZipWriter instead.
+
     Parameters
     ----------
     destination_path : str
@@ -14,15 +34,304 @@ def zip_directory(source_path, destination_path, to_strip=''):
         Path of the directory to be zipped.
     to_strip : str
         String of the root directory we want to strip from the final root that's zipped up.
+    policy : CompressionPolicy
+        Decides which files are deflated, and how many at a time. Every file is stored as it is
+        if not given.
     """
-    my_zip_file = zipfile.ZipFile(destination_path, "w")
+    policy = policy or CompressionPolicy()
+    entries = []
     for root, dirs, files in os.walk(source_path):
         if not files:
-            # writestr takes the path and data as arguments, if data is empty it will create the
-            # empty directory we expect.
-            my_zip_file.writestr((root[len(to_strip)+1:] + "/"), "")
+            # The directory is written as an empty entry so it isn't lost
+            entries.append((None, root[len(to_strip)+1:] + "/", False))
         for file in files:
             # Change file path to write to.
-            new_path = os.path.join(root, file)[len(to_strip)+1:]
-            my_zip_file.write(os.path.join(root, file), new_path)
-    my_zip_file.close()
+            file_path = os.path.join(root, file)
+            entries.append((file_path, file_path[len(to_strip)+1:],
+                            policy.compress_type(file_path) == zipfile.ZIP_DEFLATED))
+
+    deflated_count = len([entry for entry in entries if entry[2]])
+    with _ZipWriter(destination_path) as my_zip_file, \
+            tempfile.TemporaryDirectory(dir=os.path.dirname(destination_path) or None) \
+            as temp_directory, _get_executor(min(policy.workers, deflated_count)) as executor:
+        # Files are deflated a few at a time ahead of being written, so only that many
+        # deflated copies are ever on disk at once.
+        pending = collections.deque()
+        window = max(policy.workers, 1) * 2
+        next_entry = 0
+
+        while pending or next_entry < len(entries):
+            while next_entry < len(entries) and len(pending) < window:
+                file_path, arcname, deflate = entries[next_entry]
+                future = None
+                if deflate:
+                    future = executor.submit(
+                        _deflate_file, file_path,
+                        os.path.join(temp_directory, str(next_entry)), policy.level)
+                pending.append((file_path, arcname, future))
+                next_entry += 1
+
+            file_path, arcname, future = pending.popleft()
+            if file_path is None:
+                my_zip_file.write_directory(arcname)
+            elif future is None:
+                my_zip_file.write_file(file_path, arcname)
+            else:
+                deflated_path, crc, compress_size = future.result()
+                if compress_size < os.path.getsize(file_path):
+                    my_zip_file.write_deflated(file_path, arcname, deflated_path, crc,
+                                               compress_size)
+                else:
+                    # Deflating made the file bigger, so store it instead
+                    my_zip_file.write_file(file_path, arcname)
+                os.remove(deflated_path)
+
+
+def _get_executor(workers):
+    """
+    Get the pool files are deflated in. Daemon processes can't start processes of their own, so
+    threads are used there; zlib releases the GIL while it compresses.
+    """
+    if workers > 1 and not multiprocessing.current_process().daemon:
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=max(workers, 1))
+
+
+def _deflate_file(file_path, deflated_path, level):
+    """
+    Deflate a file into a raw deflate stream, the way zip entries hold them.
+
+    Returns
+    -------
+    The path of the deflated file, and the CRC32 and size of the deflated data.
+    """
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION if level is None else level,
+                                  zlib.DEFLATED, -zlib.MAX_WBITS)
+    crc = 0
+    with open(file_path, 'rb') as source, open(deflated_path, 'wb') as destination:
+        while True:
+            block = source.read(DEFLATE_BLOCK_SIZE)
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            destination.write(compressor.compress(block))
+        destination.write(compressor.flush())
+        compress_size = destination.tell()
+    return deflated_path, crc, compress_size
+
+
+class _ZipWriter(object):
+    """
+    Write a zip file whose deflated entries have been compressed ahead of time.
+
+    Each entry's local header, data and central directory record are laid out as the zip file
+    format (PKWARE's APPNOTE.TXT) describes them. Entries and archives too large for the original
+    format get ZIP64 extensions. Entries are described with zipfile.ZipInfo so they have the same
+    names, timestamps and permissions as the ones zipfile writes without strict timestamps.
+    """
+
+    def __init__(self, destination_path):
+        """
+        Parameters
+        ----------
+        destination_path: str
+            Path to write the zip file to
+        """
+        self.file = open(destination_path, 'wb')
+        # ZipInfo and ZIP64 flag of every entry written, for the central directory
+        self.entries = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+
+    def write_directory(self, arcname):
+        """
+        Add an empty directory.
+
+        Parameters
+        ----------
+        arcname: str
+            Path of the directory in the zip file, ending with '/'
+        """
+        zip_info = zipfile.ZipInfo(arcname, time.localtime(time.time())[:6])
+        # drwxrwxr-x, and the MS-DOS directory flag
+        zip_info.external_attr = 0o40775 << 16 | 0x10
+        zip_info.CRC = 0
+        self._write_entry(zip_info, False)
+
+    def write_file(self, file_path, arcname):
+        """
+        Add a file as it is.
+
+        Parameters
+        ----------
+        file_path: str
+            Path to the file
+        arcname: str
+            Path of the file in the zip file
+        """
+        zip_info = _file_zip_info(file_path, arcname)
+        zip_info.compress_type = zipfile.ZIP_STORED
+        zip_info.compress_size = zip_info.file_size
+        zip_info.CRC = 0
+        zip64 = zip_info.file_size > ZIP64_LIMIT
+        header_offset = self._write_entry(zip_info, zip64)
+
+        crc = 0
+        with open(file_path, 'rb') as source:
+            while True:
+                block = source.read(DEFLATE_BLOCK_SIZE)
+                if not block:
+                    break
+                crc = zlib.crc32(block, crc)
+                self.file.write(block)
+        # The CRC is only known once the file has been read, so the header is written again
+        zip_info.CRC = crc
+        end = self.file.tell()
+        self.file.seek(header_offset)
+        self.file.write(self._local_header(zip_info, zip64))
+        self.file.seek(end)
+
+    def write_deflated(self, file_path, arcname, deflated_path, crc, compress_size):
+        """
+        Add a file that has already been deflated.
+
+        Parameters
+        ----------
+        file_path: str
+            Path to the original file
+        arcname: str
+            Path of the file in the zip file
+        deflated_path: str
+            Path to the file's raw deflate stream
+        crc: int
+            CRC-32 of the original file
+        compress_size: int
+            Size of the deflate stream
+        """
+        zip_info = _file_zip_info(file_path, arcname)
+        zip_info.compress_type = zipfile.ZIP_DEFLATED
+        zip_info.CRC = crc
+        zip_info.compress_size = compress_size
+        self._write_entry(zip_info, zip_info.file_size > ZIP64_LIMIT or
+                          compress_size > ZIP64_LIMIT)
+        with open(deflated_path, 'rb') as deflated_file:
+            shutil.copyfileobj(deflated_file, self.file, DEFLATE_BLOCK_SIZE)
+
+    def close(self):
+        """
+        Write the central directory and close the zip file.
+        """
+        directory_offset = self.file.tell()
+        for zip_info, zip64 in self.entries:
+            self.file.write(self._central_directory_record(zip_info, zip64))
+        directory_size = self.file.tell() - directory_offset
+        count = len(self.entries)
+
+        if (count > ZIP64_ENTRY_LIMIT or directory_offset > ZIP64_LIMIT or
+                directory_size > ZIP64_LIMIT):
+            zip64_end_offset = self.file.tell()
+            # ZIP64 end of central directory record, then its locator
+            self.file.write(struct.pack('<LQHHLLQQQQ', 0x06064b50, 44, 45, 45, 0, 0, count,
+                                        count, directory_size, directory_offset))
+            self.file.write(struct.pack('<LLQL', 0x07064b50, 0, zip64_end_offset, 1))
+            count = min(count, 0xFFFF)
+            directory_size = min(directory_size, 0xFFFFFFFF)
+            directory_offset = min(directory_offset, 0xFFFFFFFF)
+        self.file.write(struct.pack('<LHHHHLLH', 0x06054b50, 0, 0, count, count, directory_size,
+                                    directory_offset, 0))
+        self.file.close()
+
+    def _write_entry(self, zip_info, zip64):
+        """
+        Write an entry's local header. Returns where the header starts.
+        """
+        zip_info.header_offset = self.file.tell()
+        self.file.write(self._local_header(zip_info, zip64))
+        self.entries.append((zip_info, zip64))
+        return zip_info.header_offset
+
+    def _local_header(self, zip_info, zip64):
+        file_name, flags = _encode_file_name(zip_info.filename)
+        dos_time, dos_date = _dos_date_time(zip_info.date_time)
+        file_size, compress_size, extra = zip_info.file_size, zip_info.compress_size, b''
+        if zip64:
+            extra = struct.pack('<HHQQ', 1, 16, file_size, compress_size)
+            file_size = compress_size = 0xFFFFFFFF
+        return struct.pack('<LHHHHHLLLHH', 0x04034b50, 45 if zip64 else 20, flags,
+                           zip_info.compress_type, dos_time, dos_date, zip_info.CRC,
+                           compress_size, file_size, len(file_name), len(extra)) + \
+            file_name + extra
+
+    def _central_directory_record(self, zip_info, zip64):
+        file_name, flags = _encode_file_name(zip_info.filename)
+        dos_time, dos_date = _dos_date_time(zip_info.date_time)
+        file_size, compress_size = zip_info.file_size, zip_info.compress_size
+        header_offset = zip_info.header_offset
+        zip64_fields = []
+        if zip64:
+            zip64_fields = [file_size, compress_size]
+            file_size = compress_size = 0xFFFFFFFF
+        if header_offset > ZIP64_LIMIT:
+            zip64_fields.append(header_offset)
+            header_offset = 0xFFFFFFFF
+        extra = b''
+        if zip64_fields:
+            extra = struct.pack('<HH{}Q'.format(len(zip64_fields)), 1, 8 * len(zip64_fields),
+                                *zip64_fields)
+        version = 45 if extra else 20
+        return struct.pack('<LHHHHHHLLLHHHHHLL', 0x02014b50, zip_info.create_system << 8 | version,
+                           version, flags, zip_info.compress_type, dos_time, dos_date,
+                           zip_info.CRC, compress_size, file_size, len(file_name), len(extra), 0,
+                           0, 0, zip_info.external_attr, header_offset) + file_name + extra
+
+
+def _file_zip_info(file_path, arcname):
+    """
+    Describe a file the way zipfile.ZipInfo.from_file does, with modification times the zip
+    format can't hold clamped to the ones it can, as zipfile does without strict timestamps.
+
+    Returns
+    -------
+    The file's ZipInfo.
+    """
+    file_stat = os.stat(file_path)
+    date_time = time.localtime(file_stat.st_mtime)[:6]
+    if date_time[0] < 1980:
+        date_time = (1980, 1, 1, 0, 0, 0)
+    elif date_time[0] > 2107:
+        date_time = (2107, 12, 31, 23, 59, 59)
+    zip_info = zipfile.ZipInfo(arcname, date_time)
+    zip_info.external_attr = (file_stat.st_mode & 0xFFFF) << 16
+    zip_info.file_size = file_stat.st_size
+    return zip_info
+
+
+def _encode_file_name(file_name):
+    """
+    Returns
+    -------
+    The file name as it's written to the zip file, and the flag bits it needs.
+    """
+    try:
+        return file_name.encode('ascii'), 0
+    except UnicodeEncodeError:
+        # Bit 11 marks a UTF-8 file name
+        return file_name.encode('utf-8'), 0x800
+
+
+def _dos_date_time(date_time):
+    """
+    Returns
+    -------
+    The MS-DOS time and date of a ZipInfo.date_time tuple.
+    """
+    year, month, day, hour, minute, second = date_time
+    return (hour << 11 | minute << 5 | second // 2,
+            (year - 1980) << 9 | month << 5 | day)
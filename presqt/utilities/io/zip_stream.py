@@ -0,0 +1,198 @@
+import os
+import queue
+import threading
+import zipfile
+
+from presqt.utilities.io.zip_compression import CompressionPolicy
+
+# Bytes of a streamed zip file sent at a time, and how many of them can wait to be sent
+ZIP_STREAM_BLOCK_SIZE = 1024 * 1024
+ZIP_STREAM_QUEUE_SIZE = 8
+
+
+class ZipStream(object):
+    """
+    Write a zip file one entry at a time as its contents are produced, instead of zipping a
+    finished directory.
+
+    The zip file can be written to anything with a write() method, including sinks that can't
+    seek like an HTTP response. Entries are then followed by data descriptors. ZIP64 extensions
+    are used for entries, and archives, too large for the original zip format.
+    """
+
+    def __init__(self, sink, policy=None):
+        """
+        Parameters
+        ----------
+        sink: str or file-like
+            Path to write the zip file to, or where the zip file is written to
+        policy: CompressionPolicy
+            Decides which entries are deflated. Every entry is stored as it is if not given.
+        """
+        self.policy = policy or CompressionPolicy()
+        self.zip_file = zipfile.ZipFile(sink, 'w', allowZip64=True,
+                                        compresslevel=self.policy.level)
+        # Directories the entries are in, and the ones that directly hold a file or have an entry
+        self._directories = set()
+        self._filled_directories = set()
+
+    def write_file(self, file_path, arcname):
+        """
+        Add a file on disk to the zip file.
+
+        Parameters
+        ----------
+        file_path: str
+            Path to the file
+        arcname: str
+            Path of the file in the zip file
+        """
+        self._add_directories(arcname)
+        self.zip_file.write(file_path, arcname, compress_type=self.policy.compress_type(arcname))
+
+    def write_bytes(self, contents, arcname):
+        """
+        Add a file held in memory to the zip file.
+
+        Parameters
+        ----------
+        contents: bytes or str
+            The file contents
+        arcname: str
+            Path of the file in the zip file
+        """
+        self._add_directories(arcname)
+        self.zip_file.writestr(arcname, contents, compress_type=self.policy.compress_type(arcname))
+
+    def write_directory(self, arcname):
+        """
+        Add an empty directory to the zip file.
+
+        Parameters
+        ----------
+        arcname: str
+            Path of the directory in the zip file
+        """
+        arcname = arcname.rstrip('/')
+        self._add_directories(arcname)
+        self._filled_directories.add(arcname)
+        self.zip_file.writestr('{}/'.format(arcname), '')
+
+    def write_empty_directories(self):
+        """
+        Add an entry for every directory that holds no files directly, the same way
+        zip_directory does, so folders without files aren't lost when the zip file is extracted.
+        """
+        for directory in sorted(self._directories - self._filled_directories):
+            self.write_directory(directory)
+
+    def _add_directories(self, arcname):
+        parent = os.path.dirname(arcname)
+        self._filled_directories.add(parent)
+        while parent:
+            self._directories.add(parent)
+            parent = os.path.dirname(parent)
+
+    def close(self):
+        """
+        Write the zip file's central directory.
+        """
+        self.zip_file.close()
+
+
+class ZipStreamPipe(object):
+    """
+    Sink for a ZipStream written in another thread, so a zip file can be sent in blocks while
+    it's being written. Up to ZIP_STREAM_QUEUE_SIZE blocks wait to be sent before the writing
+    thread is held back.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=ZIP_STREAM_QUEUE_SIZE)
+        self._block = bytearray()
+        # The error raised while writing, raised again to whoever is reading the zip file
+        self._error = None
+        self._closed = threading.Event()
+
+    def write(self, data):
+        self._block += data
+        if len(self._block) >= ZIP_STREAM_BLOCK_SIZE:
+            self._put(bytes(self._block))
+            self._block = bytearray()
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def iter_written(self, write_zip):
+        """
+        Run a function that writes a zip file to this pipe in another thread, yielding the zip
+        file in blocks as it's written. The writing stops if the generator is closed early.
+
+        Parameters
+        ----------
+        write_zip: function
+            Takes the pipe to write the zip file to
+        """
+        thread = threading.Thread(target=self._write, args=(write_zip,), daemon=True)
+        thread.start()
+        try:
+            while True:
+                block = self.queue.get()
+                if block is None:
+                    break
+                yield block
+            thread.join()
+            if self._error:
+                raise self._error
+        finally:
+            self._closed.set()
+
+    def _write(self, write_zip):
+        try:
+            write_zip(self)
+            if self._block:
+                self._put(bytes(self._block))
+        except Exception as e:
+            self._error = e
+        try:
+            self._put(None)
+        except BrokenPipeError:
+            pass
+
+    def _put(self, block):
+        # Give up once nothing is reading the zip file anymore, like when the client hangs up
+        while not self._closed.is_set():
+            try:
+                self.queue.put(block, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise BrokenPipeError('The zip file is no longer being read.')
+
+
+def iter_zip_directory(source_path, to_strip='', policy=None):
+    """
+    Zip a directory without writing the zip file anywhere, yielding it in blocks as it's made so
+    it can be streamed straight to a response.
+
+    Parameters
+    ----------
+    source_path : str
+        Path of the directory to be zipped.
+    to_strip : str
+        String of the root directory we want to strip from the final root that's zipped up.
+    policy : CompressionPolicy
+        Decides which files are deflated. Every file is stored as it is if not given.
+    """
+    def write_zip(pipe):
+        zip_stream = ZipStream(pipe, policy)
+        for root, dirs, files in os.walk(source_path):
+            if not files:
+                zip_stream.write_directory(root[len(to_strip) + 1:])
+            for file in files:
+                zip_stream.write_file(os.path.join(root, file),
+                                      os.path.join(root, file)[len(to_strip) + 1:])
+        zip_stream.close()
+
+    return ZipStreamPipe().iter_written(write_zip)
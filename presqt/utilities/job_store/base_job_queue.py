@@ -0,0 +1,100 @@
+class BaseJobQueue(object):
+    """
+    Queue of the jobs the server has accepted, shared by every server process and job worker.
+    A job waits in the queue until starting it keeps the number of running jobs within the
+    configured limits overall, per target and per user.
+
+    Jobs are queued with a payload that lets any job supervisor rebuild and run them. Whoever
+    runs a job holds a lease on it that has to be renewed with heartbeat(). A job whose lease
+    runs out has lost its runner and is queued again for another supervisor, up to the number of
+    attempts allowed for its action.
+    """
+
+    def enqueue(self, ticket_number, action, targets, users, payload, priority=0):
+        """
+        Add a job to the end of the queue.
+
+        Parameters
+        ----------
+        ticket_number: str
+            Ticket number of the job
+        action: str
+            The action the job runs
+        targets: list
+            Names of the targets the job talks to
+        users: list
+            Hashed tokens of the users the job acts for
+        payload: dict
+            Everything a job supervisor needs to run the job
+        priority: int
+            Jobs with a higher priority are dispatched first
+
+        Returns
+        -------
+        The id of the queued job.
+        """
+        raise NotImplementedError
+
+    def claim(self, worker_id, max_jobs):
+        """
+        Mark up to max_jobs of the jobs that can start now as running for worker_id.
+
+        Returns
+        -------
+        A tuple of the claimed jobs as (id, payload) tuples and the (ticket_number, action) of
+        every job that lost its runner and won't be run again.
+        """
+        raise NotImplementedError
+
+    def heartbeat(self, worker_id, job_ids):
+        """
+        Renew worker_id's leases on its jobs.
+
+        Returns
+        -------
+        The ids of the jobs whose cancellation has been requested.
+        """
+        raise NotImplementedError
+
+    def started(self, job_id, process_id):
+        """
+        Record the id of the process running a claimed job.
+        """
+        raise NotImplementedError
+
+    def finish(self, job_id):
+        """
+        Mark a job as finished so its place is freed for the next one.
+        """
+        raise NotImplementedError
+
+    def cancel(self, ticket_number, action):
+        """
+        Remove a job from the queue if it hasn't started yet.
+
+        Returns
+        -------
+        True if a waiting job was removed, False otherwise.
+        """
+        raise NotImplementedError
+
+    def request_cancel(self, ticket_number, action):
+        """
+        Ask whoever runs a job to stop it. The request is picked up on their next heartbeat.
+
+        Returns
+        -------
+        True if a running job was found, False otherwise.
+        """
+        raise NotImplementedError
+
+    def get_position(self, ticket_number, action):
+        """
+        Get where a waiting job is in the queue and when it's expected to start.
+
+        Returns
+        -------
+        A dictionary with the job's 'queue_position' (1 is next) and 'estimated_start_time'
+        (Unix time, or None if it can't be estimated), or None if the job isn't waiting.
+        """
+        raise NotImplementedError
@@ -0,0 +1,114 @@
+import json
+import os
+
+# Every job gets a directory named after its ticket number in here.
+JOBS_DIRECTORY = os.path.join('mediafiles', 'jobs')
+
+
+def get_process_info_path(ticket_number):
+    """
+    Build the path to the process_info.json export of a job.
+
+    Parameters
+    ----------
+    ticket_number: str
+        Ticket number of the job
+
+    Returns
+    -------
+    The path to the job's process_info.json file.
+    """
+    return os.path.join(JOBS_DIRECTORY, str(ticket_number), 'process_info.json')
+
+
+def get_ticket_number(process_info_path):
+    """
+    Get the ticket number of a job from the path to its process_info.json file.
+
+    Parameters
+    ----------
+    process_info_path: str
+        Path to the job's process_info.json file
+
+    Returns
+    -------
+    The ticket number of the job.
+    """
+    return os.path.basename(os.path.dirname(os.path.normpath(process_info_path)))
+
+
+class BaseJobStore(object):
+    """
+    Storage for the state of the jobs the server runs. A job is a dictionary of actions
+    (e.g. 'resource_download') to the process info of that action.
+
+    Every store keeps process_info.json in the job's directory up to date whenever a whole action
+    or one of its fields is written, so anything reading that file keeps working. Progress
+    counters are not exported as they change once per file.
+    """
+
+    def get_job(self, ticket_number):
+        """
+        Returns
+        -------
+        Dictionary of actions (key) and their process info (value), or None if the job doesn't
+        exist.
+        """
+        raise NotImplementedError
+
+    def set_action(self, ticket_number, action, process_obj):
+        """
+        Create or replace the process info of an action.
+        """
+        raise NotImplementedError
+
+    def update_action(self, ticket_number, action, fields):
+        """
+        Update some fields of an action's process info without touching the others.
+        """
+        raise NotImplementedError
+
+    def update_in_progress_action(self, ticket_number, action, fields):
+        """
+        Update some fields of an action's process info, but only if its status is still
+        'in_progress'. The check and the update happen atomically so a job that finishes at the
+        same moment it is failed keeps whichever status was written first.
+
+        Returns
+        -------
+        True if the action was updated, False otherwise.
+        """
+        raise NotImplementedError
+
+    def increment_action(self, ticket_number, action, key, amount=1):
+        """
+        Atomically add amount to a counter in an action's process info.
+        """
+        self.record_progress(ticket_number, action, {key: amount})
+
+    def record_progress(self, ticket_number, action, increments, fields=None):
+        """
+        Atomically add to several counters of an action's process info and set some progress
+        fields alongside them. Counters that don't exist yet start at 0. Like increment_action
+        this isn't exported to process_info.json.
+        """
+        raise NotImplementedError
+
+    def delete_job(self, ticket_number):
+        """
+        Remove every action of a job from the store.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def export_job(ticket_number, job):
+        """
+        Write a job to its process_info.json file. The file is replaced atomically so readers
+        never see a partially written file.
+        """
+        process_info_path = get_process_info_path(ticket_number)
+        os.makedirs(os.path.dirname(process_info_path), exist_ok=True)
+        temporary_path = '{}.{}.tmp'.format(process_info_path, os.getpid())
+        with open(temporary_path, 'w') as export_file:
+            json.dump(job, export_file, indent=4)
+        os.replace(temporary_path, process_info_path)
@@ -0,0 +1,37 @@
+import os
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+_job_queue = None
+
+
+def get_job_queue():
+    """
+    Get the job queue configured by the JOB_QUEUE_* settings. JOB_QUEUE_BACKEND is the dotted
+    path of the BaseJobQueue class to use. The default SQLiteJobQueue keeps the queue in the
+    JOB_STATE_DATABASE SQLite database whichever JOB_STATE_BACKEND is in use.
+
+    Returns
+    -------
+    The job queue instance shared by this process.
+    """
+    global _job_queue
+    if _job_queue is None:
+        backend = import_string(getattr(
+            settings, 'JOB_QUEUE_BACKEND',
+            'presqt.utilities.job_store.sqlite_job_queue.SQLiteJobQueue'))
+        options = {
+            'database_path': getattr(settings, 'JOB_STATE_DATABASE',
+                                     os.path.join('jobstate', 'jobs.sqlite3')),
+            'max_running': getattr(settings, 'JOB_QUEUE_MAX_RUNNING', 8),
+            'max_waiting': getattr(settings, 'JOB_QUEUE_MAX_WAITING', 100),
+            'max_running_per_target': getattr(settings, 'JOB_QUEUE_MAX_RUNNING_PER_TARGET', None),
+            'max_running_per_user': getattr(settings, 'JOB_QUEUE_MAX_RUNNING_PER_USER', None),
+            'lease_seconds': getattr(settings, 'JOB_QUEUE_LEASE_SECONDS', 30),
+            'max_attempts': getattr(settings, 'JOB_QUEUE_MAX_ATTEMPTS', None)
+        }
+        # Backends other than the default may need other options than the database path
+        options.update(getattr(settings, 'JOB_QUEUE_OPTIONS', {}))
+        _job_queue = backend(**options)
+    return _job_queue
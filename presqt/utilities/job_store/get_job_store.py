@@ -0,0 +1,33 @@
+import os
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from presqt.utilities.job_store.json_job_store import JSONJobStore
+from presqt.utilities.job_store.sqlite_job_store import SQLiteJobStore
+
+_job_store = None
+
+
+def get_job_store():
+    """
+    Get the job store configured by the JOB_STATE_BACKEND setting. 'sqlite' (the default) keeps
+    job state in the JOB_STATE_DATABASE SQLite database and 'json' keeps it only in each job's
+    process_info.json file.
+
+    Returns
+    -------
+    The job store instance shared by this process.
+    """
+    global _job_store
+    if _job_store is None:
+        backend = getattr(settings, 'JOB_STATE_BACKEND', 'sqlite')
+        if backend == 'sqlite':
+            _job_store = SQLiteJobStore(getattr(settings, 'JOB_STATE_DATABASE',
+                                                os.path.join('jobstate', 'jobs.sqlite3')))
+        elif backend == 'json':
+            _job_store = JSONJobStore()
+        else:
+            raise ImproperlyConfigured(
+                "JOB_STATE_BACKEND must be 'sqlite' or 'json', not '{}'.".format(backend))
+    return _job_store
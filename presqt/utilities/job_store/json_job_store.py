@@ -0,0 +1,67 @@
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+
+from presqt.utilities.job_store.base_job_store import BaseJobStore, get_process_info_path
+
+
+class JSONJobStore(BaseJobStore):
+    """
+    Job store that keeps each job only in its process_info.json file. Writes are serialized with
+    a lock file next to process_info.json so concurrent increments aren't lost.
+    """
+
+    def get_job(self, ticket_number):
+        try:
+            with open(get_process_info_path(ticket_number), 'r') as process_info_file:
+                return json.load(process_info_file)
+        except FileNotFoundError:
+            return None
+
+    def set_action(self, ticket_number, action, process_obj):
+        with self._locked_job(ticket_number) as job:
+            job[action] = process_obj
+
+    def update_action(self, ticket_number, action, fields):
+        with self._locked_job(ticket_number) as job:
+            job[action].update(fields)
+
+    def update_in_progress_action(self, ticket_number, action, fields):
+        with self._locked_job(ticket_number) as job:
+            if job.get(action, {}).get('status') != 'in_progress':
+                return False
+            job[action].update(fields)
+        return True
+
+    def record_progress(self, ticket_number, action, increments, fields=None):
+        with self._locked_job(ticket_number) as job:
+            for key, amount in increments.items():
+                job[action][key] = job[action].get(key, 0) + amount
+            job[action].update(fields or {})
+
+    def delete_job(self, ticket_number):
+        process_info_path = get_process_info_path(ticket_number)
+        for path in [process_info_path, '{}.lock'.format(process_info_path)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @contextmanager
+    def _locked_job(self, ticket_number):
+        """
+        Hold the job's lock while the job is read, modified by the caller and written back.
+        """
+        lock_path = '{}.lock'.format(get_process_info_path(ticket_number))
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        with open(lock_path, 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                job = self.get_job(ticket_number) or {}
+                yield job
+                # Don't create process_info.json for a job that doesn't exist
+                if job:
+                    self.export_job(ticket_number, job)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,182 @@
+import threading
+import time
+
+from django.conf import settings
+
+from presqt.utilities.job_store.base_job_store import get_process_info_path
+from presqt.utilities.job_store.get_job_store import get_job_store
+
+
+class ProgressReporter(object):
+    """
+    Collects the progress of a job in memory and writes it to the job store at most once every
+    JOB_PROGRESS_FLUSH_INTERVAL milliseconds, or right away when the phase of the job changes.
+
+    Target functions are given a ProgressReporter in place of the process_info_path, so the
+    helpers in update_process_info.py report through it instead of writing for every file.
+
+    A transfer's reporter also marks the downloaded and uploaded files in the transfer's
+    checkpoint when it flushes, and hands each downloaded file to on_file_downloaded as soon as
+    the target reports it so a streaming transfer can upload it while the rest are downloaded.
+    Files a stopped transfer had already downloaded are handed back to the target through
+    resumed_files instead of being downloaded again.
+    """
+
+    def __init__(self, ticket_number, flush_interval=None, checkpoint=None,
+                 on_file_downloaded=None, resumed_files=None):
+        self.ticket_number = str(ticket_number)
+        self.process_info_path = get_process_info_path(self.ticket_number)
+        if flush_interval is None:
+            flush_interval = getattr(settings, 'JOB_PROGRESS_FLUSH_INTERVAL', 500)
+        self.flush_interval = flush_interval / 1000
+        self.job_store = get_job_store()
+        self.checkpoint = checkpoint
+        self.on_file_downloaded = on_file_downloaded
+        # Spooled copies of the files a stopped transfer downloaded, by their path in the bag
+        self.resumed_files = resumed_files or {}
+
+        # Counters that haven't been written yet, by action
+        self._pending = {}
+        # Bytes counted by this reporter and when the first of them arrived, by action and key
+        self._transfers = {}
+        # Downloaded and uploaded files that haven't been marked in the checkpoint yet
+        self._downloaded_files = []
+        self._uploaded_files = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return self.process_info_path
+
+    def increment(self, action, key, bytes_key=None, bytes_transferred=0, uploaded_file=None):
+        """
+        Count a finished file, and the bytes moved for it, towards the action's progress.
+
+        Parameters
+        ----------
+        action: str
+            The action to update
+        key: str
+            The files finished counter to increment
+        bytes_key: str
+            The bytes transferred counter to add bytes_transferred to
+        bytes_transferred: int
+            Number of bytes moved for the file
+        uploaded_file: str
+            Path on disk of the file, if it was uploaded
+        """
+        with self._lock:
+            pending = self._pending.setdefault(action, {})
+            pending[key] = pending.get(key, 0) + 1
+            if bytes_key and bytes_transferred:
+                pending[bytes_key] = pending.get(bytes_key, 0) + bytes_transferred
+                transfer = self._transfers.setdefault((action, bytes_key), [0, time.monotonic()])
+                transfer[0] += bytes_transferred
+            if uploaded_file and self.checkpoint:
+                self._uploaded_files.append(uploaded_file)
+
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def update(self, action, fields):
+        """
+        Write fields of the action's process info, e.g. a new message or total. This marks a
+        change of phase so everything counted so far is written first.
+
+        Parameters
+        ----------
+        action: str
+            The action to update
+        fields: dict
+            Fields to set in the action's process info
+        """
+        with self._lock:
+            self._flush()
+            self.job_store.update_action(self.ticket_number, action, fields)
+
+    def file_downloaded(self, resource):
+        """
+        Hand a downloaded file to the job before the rest of the download has finished.
+
+        Parameters
+        ----------
+        resource: dict
+            The file's resource dictionary, in the format download functions return them in
+        """
+        if self.on_file_downloaded:
+            self.on_file_downloaded(resource)
+
+    def resumed_file(self, path):
+        """
+        Get the spooled copy of a file a stopped transfer had already downloaded.
+
+        Parameters
+        ----------
+        path: str
+            The file's path in the resource
+
+        Returns
+        -------
+        The path to the spooled file, or None if the file has to be downloaded.
+        """
+        with self._lock:
+            return self.resumed_files.pop(path, None)
+
+    def record_downloaded(self, path, file_path, digests):
+        """
+        Mark a file as downloaded in the transfer's checkpoint on the next flush.
+
+        Parameters
+        ----------
+        path: str
+            The file's path in the bag's data directory
+        file_path: str
+            The file's path on disk
+        digests: dict
+            The file's digests
+        """
+        if not self.checkpoint:
+            return
+        with self._lock:
+            self._downloaded_files.append((path, file_path, digests))
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def record_destination(self, resource_id):
+        """
+        Record the destination resource an upload created in the transfer's checkpoint.
+
+        Parameters
+        ----------
+        resource_id: str
+            ID of the created resource on the destination target
+        """
+        if self.checkpoint:
+            self.checkpoint.record_destination(resource_id)
+
+    def flush(self):
+        """
+        Write everything counted so far to the job store.
+        """
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        now = time.monotonic()
+        for action, increments in self._pending.items():
+            fields = {}
+            for (transfer_action, bytes_key), (total_bytes, started) in self._transfers.items():
+                if transfer_action == action:
+                    fields[bytes_key.replace('_transferred', '_per_second')] = round(
+                        total_bytes / max(now - started, 0.001))
+            self.job_store.record_progress(self.ticket_number, action, increments, fields)
+        self._pending = {}
+        # The checkpoint is written after the progress so a file is never marked as uploaded
+        # before it's counted
+        if self._downloaded_files:
+            self.checkpoint.record_downloaded(self._downloaded_files)
+            self._downloaded_files = []
+        if self._uploaded_files:
+            self.checkpoint.record_uploaded(self._uploaded_files)
+            self._uploaded_files = []
+        self._last_flush = now
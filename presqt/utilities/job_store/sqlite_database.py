@@ -0,0 +1,56 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class SQLiteDatabase(object):
+    """
+    Connections to a SQLite database in WAL mode that can be shared by the threads and forked
+    processes of the server. Each thread of each process gets its own connection.
+    """
+
+    def __init__(self, database_path, schema):
+        """
+        Parameters
+        ----------
+        database_path: str
+            Path to the database file. Its directory is created if it doesn't exist.
+        schema: list
+            CREATE TABLE IF NOT EXISTS statements run on every new connection
+        """
+        self.database_path = database_path
+        self.schema = schema
+        self._local = threading.local()
+
+    def connection(self):
+        """
+        Get this thread's connection to the database. Connections can't be shared with forked
+        processes so a new one is opened whenever the process id changes.
+        """
+        if getattr(self._local, 'pid', None) != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.database_path)), exist_ok=True)
+            connection = sqlite3.connect(self.database_path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            for statement in self.schema:
+                connection.execute(statement)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run the block inside a write transaction. BEGIN IMMEDIATE takes the write lock up front
+        so a read-modify-write can't interleave with another process.
+        """
+        connection = self.connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        else:
+            connection.execute('COMMIT')
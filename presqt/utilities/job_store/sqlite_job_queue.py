@@ -0,0 +1,238 @@
+import json
+import math
+import time
+
+from rest_framework import status
+
+from presqt.utilities.exceptions.exceptions import PresQTValidationError
+from presqt.utilities.job_store.base_job_queue import BaseJobQueue
+from presqt.utilities.job_store.sqlite_database import SQLiteDatabase
+
+JOB_QUEUE_SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS job_queue ('
+    'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+    'ticket_number TEXT NOT NULL, '
+    'action TEXT NOT NULL, '
+    'targets TEXT NOT NULL, '
+    'users TEXT NOT NULL, '
+    'priority INTEGER NOT NULL, '
+    'state TEXT NOT NULL, '
+    'payload TEXT, '
+    'worker_id TEXT, '
+    'lease_expires REAL, '
+    'attempts INTEGER NOT NULL DEFAULT 0, '
+    'cancel_requested INTEGER NOT NULL DEFAULT 0, '
+    'process_id INTEGER, '
+    'enqueued_at REAL NOT NULL, '
+    'started_at REAL, '
+    'finished_at REAL)'
+]
+
+# Number of finished jobs kept to estimate how long jobs take
+FINISHED_JOBS_KEPT = 50
+
+
+class SQLiteJobQueue(BaseJobQueue):
+    """
+    Job queue kept in a SQLite database. Every server process and job worker using it must share
+    the database file, so it's meant for running everything on a single host.
+
+    Waiting jobs are dispatched by priority (highest first) and then in the order they were
+    queued. A waiting job that can't start because its target or user is at its limit doesn't
+    hold up the jobs behind it.
+    """
+
+    def __init__(self, database_path, max_running=8, max_waiting=100, max_running_per_target=None,
+                 max_running_per_user=None, lease_seconds=30, max_attempts=None):
+        """
+        Parameters
+        ----------
+        database_path: str
+            Path to the SQLite database holding the queue
+        max_running: int
+            Maximum number of jobs running at once
+        max_waiting: int
+            Maximum number of jobs waiting to run. New jobs are refused once it's reached.
+        max_running_per_target: dict
+            Maximum number of running jobs using each target, with a 'default' for targets that
+            aren't listed
+        max_running_per_user: int
+            Maximum number of running jobs using the same user token
+        lease_seconds: int
+            Seconds a lease lasts without a heartbeat
+        max_attempts: dict
+            Number of times a job is run before it's given up on by action, with a 'default'
+            for actions that aren't listed
+        """
+        self.max_running = max_running
+        self.max_waiting = max_waiting
+        self.max_running_per_target = max_running_per_target or {}
+        self.max_running_per_user = max_running_per_user
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts or {'default': 3}
+        self._database = SQLiteDatabase(database_path, JOB_QUEUE_SCHEMA)
+
+    def enqueue(self, ticket_number, action, targets, users, payload, priority=0):
+        now = time.time()
+        with self._database.transaction() as connection:
+            waiting = connection.execute(
+                "SELECT COUNT(*) FROM job_queue WHERE state = 'waiting'").fetchone()[0]
+            if waiting >= self.max_waiting:
+                raise PresQTValidationError(
+                    'PresQT Error: The server is too busy to accept this job. Try again later.',
+                    status.HTTP_503_SERVICE_UNAVAILABLE)
+
+            cursor = connection.execute(
+                'INSERT INTO job_queue (ticket_number, action, targets, users, priority, state, '
+                'payload, enqueued_at) '
+                "VALUES (?, ?, ?, ?, ?, 'waiting', ?, ?)",
+                (str(ticket_number), action, json.dumps(targets), json.dumps(users), priority,
+                 json.dumps(payload), now))
+            return cursor.lastrowid
+
+    def claim(self, worker_id, max_jobs):
+        now = time.time()
+        with self._database.transaction() as connection:
+            abandoned = self._release_expired(connection, now)
+
+            rows = connection.execute(
+                'SELECT id, targets, users, state, payload FROM job_queue '
+                "WHERE state IN ('waiting', 'running') ORDER BY priority DESC, id").fetchall()
+            running_targets = {}
+            running_users = {}
+            running = 0
+            for job_id, targets, users, state, payload in rows:
+                if state == 'running':
+                    running += 1
+                    self._count(running_targets, json.loads(targets))
+                    self._count(running_users, json.loads(users))
+
+            claimed = []
+            for job_id, targets, users, state, payload in rows:
+                if len(claimed) >= max_jobs or running >= self.max_running:
+                    break
+                if state != 'waiting':
+                    continue
+
+                targets = json.loads(targets)
+                users = json.loads(users)
+                if self._within_limits(targets, users, running_targets, running_users):
+                    running += 1
+                    self._count(running_targets, targets)
+                    self._count(running_users, users)
+                    connection.execute(
+                        "UPDATE job_queue SET state = 'running', worker_id = ?, "
+                        'lease_expires = ?, started_at = ?, attempts = attempts + 1 '
+                        'WHERE id = ?', (worker_id, now + self.lease_seconds, now, job_id))
+                    claimed.append((job_id, json.loads(payload)))
+
+        return claimed, abandoned
+
+    def heartbeat(self, worker_id, job_ids):
+        if not job_ids:
+            return []
+        placeholders = ', '.join('?' * len(job_ids))
+        with self._database.transaction() as connection:
+            connection.execute(
+                'UPDATE job_queue SET lease_expires = ? WHERE worker_id = ? '
+                'AND id IN ({})'.format(placeholders),
+                [time.time() + self.lease_seconds, worker_id] + list(job_ids))
+            rows = connection.execute(
+                'SELECT id FROM job_queue WHERE cancel_requested = 1 AND worker_id = ? '
+                'AND id IN ({})'.format(placeholders), [worker_id] + list(job_ids)).fetchall()
+        return [row[0] for row in rows]
+
+    def started(self, job_id, process_id):
+        with self._database.transaction() as connection:
+            connection.execute('UPDATE job_queue SET process_id = ? WHERE id = ?',
+                               (process_id, job_id))
+
+    def finish(self, job_id):
+        with self._database.transaction() as connection:
+            # The payload holds the user's encrypted tokens so it isn't kept any longer than needed
+            connection.execute(
+                "UPDATE job_queue SET state = 'finished', finished_at = ?, payload = NULL "
+                'WHERE id = ?', (time.time(), job_id))
+            connection.execute(
+                "DELETE FROM job_queue WHERE state = 'finished' AND id NOT IN ("
+                "SELECT id FROM job_queue WHERE state = 'finished' "
+                'ORDER BY finished_at DESC LIMIT ?)', (FINISHED_JOBS_KEPT,))
+
+    def cancel(self, ticket_number, action):
+        with self._database.transaction() as connection:
+            cursor = connection.execute(
+                'DELETE FROM job_queue WHERE ticket_number = ? AND action = ? '
+                "AND state = 'waiting'", (str(ticket_number), action))
+            return cursor.rowcount > 0
+
+    def request_cancel(self, ticket_number, action):
+        with self._database.transaction() as connection:
+            cursor = connection.execute(
+                'UPDATE job_queue SET cancel_requested = 1 WHERE ticket_number = ? '
+                "AND action = ? AND state = 'running'", (str(ticket_number), action))
+            return cursor.rowcount > 0
+
+    def get_position(self, ticket_number, action):
+        connection = self._database.connection()
+        job = connection.execute(
+            'SELECT id, priority FROM job_queue WHERE ticket_number = ? AND action = ? '
+            "AND state = 'waiting' ORDER BY id DESC LIMIT 1",
+            (str(ticket_number), action)).fetchone()
+        if job is None:
+            return None
+        job_id, priority = job
+
+        ahead = connection.execute(
+            "SELECT COUNT(*) FROM job_queue WHERE state = 'waiting' "
+            'AND (priority > ? OR (priority = ? AND id < ?))',
+            (priority, priority, job_id)).fetchone()[0]
+        # Assume the jobs ahead take as long as recently finished jobs did on average
+        average_duration = connection.execute(
+            'SELECT AVG(finished_at - started_at) FROM job_queue '
+            "WHERE state = 'finished' AND started_at IS NOT NULL").fetchone()[0]
+
+        estimated_start_time = None
+        if average_duration is not None:
+            estimated_start_time = round(
+                time.time() + math.ceil((ahead + 1) / self.max_running) * average_duration)
+        return {'queue_position': ahead + 1, 'estimated_start_time': estimated_start_time}
+
+    def _release_expired(self, connection, now):
+        """
+        Release the running jobs whose lease has run out. Jobs that haven't used up their
+        attempts are queued again for another supervisor. Returns the (ticket_number, action) of
+        the jobs that won't be run.
+        """
+        rows = connection.execute(
+            'SELECT id, ticket_number, action, attempts FROM job_queue '
+            "WHERE state = 'running' AND lease_expires < ?", (now,)).fetchall()
+
+        abandoned = []
+        for job_id, ticket_number, action, attempts in rows:
+            if attempts < self.max_attempts.get(action, self.max_attempts.get('default', 1)):
+                connection.execute(
+                    "UPDATE job_queue SET state = 'waiting', worker_id = NULL, "
+                    'lease_expires = NULL, process_id = NULL WHERE id = ?', (job_id,))
+                continue
+            connection.execute(
+                "UPDATE job_queue SET state = 'finished', finished_at = ?, payload = NULL "
+                'WHERE id = ?', (now, job_id))
+            abandoned.append((ticket_number, action))
+        return abandoned
+
+    def _within_limits(self, targets, users, running_targets, running_users):
+        for target in targets:
+            limit = self.max_running_per_target.get(
+                target, self.max_running_per_target.get('default'))
+            if limit is not None and running_targets.get(target, 0) >= limit:
+                return False
+        if self.max_running_per_user is not None:
+            for user in users:
+                if running_users.get(user, 0) >= self.max_running_per_user:
+                    return False
+        return True
+
+    @staticmethod
+    def _count(counts, keys):
+        for key in keys:
+            counts[key] = counts.get(key, 0) + 1
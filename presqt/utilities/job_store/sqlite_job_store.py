@@ -0,0 +1,111 @@
+import json
+import os
+
+from presqt.utilities.job_store.base_job_store import (BaseJobStore, JOBS_DIRECTORY,
+                                                       get_process_info_path)
+from presqt.utilities.job_store.sqlite_database import SQLiteDatabase
+
+JOBS_SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS jobs ('
+    'ticket_number TEXT NOT NULL, '
+    'action TEXT NOT NULL, '
+    'data TEXT NOT NULL, '
+    'PRIMARY KEY (ticket_number, action))'
+]
+
+
+class SQLiteJobStore(BaseJobStore):
+    """
+    Job store backed by a SQLite database in WAL mode. Each action of a job is a row keyed by
+    ticket number and action, so reads never block on writers and every write is a single
+    transaction instead of a re-serialization of the whole process_info.json file.
+    """
+
+    def __init__(self, database_path):
+        self.database_path = database_path
+        self._database = SQLiteDatabase(database_path, JOBS_SCHEMA)
+
+    def get_job(self, ticket_number):
+        # A job only lives as long as its directory. Once the directory is deleted (e.g. by
+        # delete_outdated_mediafiles) the job is gone too.
+        if not os.path.isdir(os.path.join(JOBS_DIRECTORY, str(ticket_number))):
+            self.delete_job(ticket_number)
+            return None
+
+        rows = self._database.connection().execute(
+            'SELECT action, data FROM jobs WHERE ticket_number = ?', (ticket_number,)).fetchall()
+        if rows:
+            return {action: json.loads(data) for action, data in rows}
+
+        # Jobs written before the store was in use only exist as process_info.json.
+        try:
+            with open(get_process_info_path(ticket_number), 'r') as process_info_file:
+                job = json.load(process_info_file)
+        except (FileNotFoundError, ValueError):
+            return None
+        with self._database.transaction() as connection:
+            for action, process_obj in job.items():
+                self._write_action(connection, ticket_number, action, process_obj)
+        return job
+
+    def set_action(self, ticket_number, action, process_obj):
+        with self._database.transaction() as connection:
+            # Drop anything left over from an earlier job whose directory has been deleted.
+            if not os.path.isdir(os.path.join(JOBS_DIRECTORY, str(ticket_number))):
+                connection.execute('DELETE FROM jobs WHERE ticket_number = ?', (ticket_number,))
+            self._write_action(connection, ticket_number, action, process_obj)
+            self._export(connection, ticket_number)
+
+    def update_action(self, ticket_number, action, fields):
+        with self._database.transaction() as connection:
+            process_obj = self._read_action(connection, ticket_number, action)
+            process_obj.update(fields)
+            self._write_action(connection, ticket_number, action, process_obj)
+            self._export(connection, ticket_number)
+
+    def update_in_progress_action(self, ticket_number, action, fields):
+        with self._database.transaction() as connection:
+            try:
+                process_obj = self._read_action(connection, ticket_number, action)
+            except KeyError:
+                return False
+            if process_obj.get('status') != 'in_progress':
+                return False
+            process_obj.update(fields)
+            self._write_action(connection, ticket_number, action, process_obj)
+            self._export(connection, ticket_number)
+        return True
+
+    def record_progress(self, ticket_number, action, increments, fields=None):
+        with self._database.transaction() as connection:
+            process_obj = self._read_action(connection, ticket_number, action)
+            for key, amount in increments.items():
+                process_obj[key] = process_obj.get(key, 0) + amount
+            process_obj.update(fields or {})
+            self._write_action(connection, ticket_number, action, process_obj)
+
+    def delete_job(self, ticket_number):
+        with self._database.transaction() as connection:
+            connection.execute('DELETE FROM jobs WHERE ticket_number = ?', (ticket_number,))
+
+    @staticmethod
+    def _read_action(connection, ticket_number, action):
+        row = connection.execute('SELECT data FROM jobs WHERE ticket_number = ? AND action = ?',
+                                 (ticket_number, action)).fetchone()
+        if row is None:
+            raise KeyError(action)
+        return json.loads(row[0])
+
+    @staticmethod
+    def _write_action(connection, ticket_number, action, process_obj):
+        connection.execute('INSERT OR REPLACE INTO jobs (ticket_number, action, data) '
+                           'VALUES (?, ?, ?)', (ticket_number, action, json.dumps(process_obj)))
+
+    def _export(self, connection, ticket_number):
+        """
+        Export the job to process_info.json while the write lock is still held so exports from
+        different processes can't be written out of order.
+        """
+        rows = connection.execute('SELECT action, data FROM jobs WHERE ticket_number = ?',
+                                  (ticket_number,)).fetchall()
+        self.export_job(ticket_number, {action: json.loads(data) for action, data in rows})
@@ -0,0 +1,252 @@
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+
+# Name of the checkpoint manifest in a transfer's job directory
+CHECKPOINT_FILE_NAME = 'checkpoint.json'
+# Directory in a transfer's job directory that already uploaded files are moved to while a
+# resumed upload sends the rest
+SET_ASIDE_DIRECTORY_NAME = 'uploaded'
+# Attributes of a transfer that are never written to its checkpoint. Tokens are sent again with
+# the request to resume and the process info is read from the job store.
+CHECKPOINT_EXCLUDED = ['source_token', 'destination_token', 'process_info_obj']
+
+
+class TransferCheckpoint(object):
+    """
+    Manifest of a transfer's progress kept in its job directory, so a transfer stopped by a
+    timeout, a crash or a restart can be resumed instead of started over.
+
+    The manifest moves through three stages:
+        'requested': The transfer was accepted. Holds the state needed to run it again, and
+                     each file as soon as it has been downloaded and hashed.
+        'downloaded': The source resource was downloaded, hashed and bagged. Holds the state
+                      after the download and the status of every file.
+        'uploading': Files are being uploaded. Each file is marked as it reaches the
+                     destination, along with the destination resource the upload created.
+                     Streaming transfers start uploading before the download has finished.
+
+    The manifest is replaced atomically on every save so a job killed while saving leaves the
+    previous one behind. User tokens are never written to it.
+    """
+
+    def __init__(self, ticket_path):
+        """
+        Parameters
+        ----------
+        ticket_path: str
+            The transfer's job directory
+        """
+        self.path = os.path.join(ticket_path, CHECKPOINT_FILE_NAME)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path) as checkpoint_file:
+                self.data = json.load(checkpoint_file)
+        except (FileNotFoundError, ValueError):
+            self.data = {}
+
+    @property
+    def stage(self):
+        return self.data.get('stage')
+
+    @property
+    def state(self):
+        return self.data.get('state', {})
+
+    @property
+    def download_finished(self):
+        return bool(self.data.get('download_finished'))
+
+    @property
+    def destination_resource_id(self):
+        return self.data.get('destination_resource_id')
+
+    def record_request(self, state):
+        """
+        Start a new manifest for an accepted transfer.
+
+        Parameters
+        ----------
+        state: dict
+            Attributes of the transfer needed to run it
+        """
+        with self._lock:
+            self.data = {'stage': 'requested', 'state': state, 'files': {},
+                         'data_directory': None, 'destination_resource_id': None}
+            self._save()
+
+    def record_downloaded(self, files):
+        """
+        Mark files as downloaded once they have been hashed and written to the transfer's
+        resource directory, so a resumed download doesn't download them again.
+
+        Parameters
+        ----------
+        files: list
+            (path, file_path, digests) tuples of each file's path in the bag's data directory,
+            its path on disk and its digests
+        """
+        with self._lock:
+            if not self.data.get('stage'):
+                return
+            for path, file_path, digests in files:
+                self.data['files'].setdefault(path, {}).update(
+                    {'downloaded': True, 'hashes': digests, 'file_path': file_path})
+            self._save()
+
+    def record_download(self, state, file_digests):
+        """
+        Record that every file was downloaded and hashed.
+
+        Parameters
+        ----------
+        state: dict
+            Attributes of the transfer after the download
+        file_digests: dict
+            Digests of each downloaded file, keyed by its path in the bag's data directory
+        """
+        with self._lock:
+            # Files a streaming transfer uploaded during the download stay marked
+            uploaded = {path for path, file in self.data.get('files', {}).items()
+                        if file.get('uploaded')}
+            if self.data.get('stage') != 'uploading':
+                self.data['stage'] = 'downloaded'
+            self.data['download_finished'] = True
+            self.data['state'] = state
+            self.data['files'] = {
+                path: {'downloaded': True, 'hashes': digests, 'uploaded': path in uploaded}
+                for path, digests in file_digests.items()}
+            self._save()
+
+    def start_upload(self, data_directory):
+        """
+        Record that the upload of the bag's data directory has started.
+
+        Parameters
+        ----------
+        data_directory: str
+            The bag's data directory on disk
+        """
+        with self._lock:
+            self.data['stage'] = 'uploading'
+            self.data['data_directory'] = data_directory
+            self._save()
+
+    def record_uploaded(self, file_paths):
+        """
+        Mark files as uploaded to the destination.
+
+        Parameters
+        ----------
+        file_paths: list
+            Paths on disk of the uploaded files. Files outside the bag's data directory, like
+            the zip made for finite depth targets, aren't tracked.
+        """
+        with self._lock:
+            data_directory = self.data.get('data_directory')
+            if not data_directory:
+                return
+            for file_path in file_paths:
+                if file_path.startswith(data_directory + '/'):
+                    self.data['files'].setdefault(
+                        file_path[len(data_directory):], {})['uploaded'] = True
+            self._save()
+
+    def record_destination(self, resource_id):
+        """
+        Record the destination resource the upload created, so a resumed transfer uploads into
+        it instead of creating another.
+
+        Parameters
+        ----------
+        resource_id: str
+            ID of the created resource on the destination target
+        """
+        with self._lock:
+            if self.data.get('stage') and not self.data.get('destination_resource_id'):
+                self.data['destination_resource_id'] = str(resource_id)
+                self._save()
+
+    def downloaded_files(self):
+        """
+        Returns
+        -------
+        A dictionary of the (file_path, digests) tuples of the files a download that hasn't
+        finished has already downloaded, keyed by their path in the bag's data directory.
+        """
+        return {path: (file['file_path'], file['hashes'])
+                for path, file in self.data.get('files', {}).items()
+                if file.get('downloaded') and file.get('file_path')}
+
+    def uploaded_files(self):
+        """
+        Returns
+        -------
+        The set of paths in the bag's data directory of the files already uploaded.
+        """
+        return {path for path, file in self.data.get('files', {}).items() if file.get('uploaded')}
+
+    @contextmanager
+    def set_aside_uploaded_files(self):
+        """
+        Move the files already uploaded out of the bag's data directory while the block runs, so
+        a resumed upload only sends the files that haven't reached the destination. The files are
+        moved back when the block ends. Files left set aside by a job that was killed inside the
+        block are moved back first.
+        """
+        data_directory = self.data.get('data_directory')
+        set_aside_directory = os.path.join(os.path.dirname(self.path), SET_ASIDE_DIRECTORY_NAME)
+        self._restore_set_aside_files(set_aside_directory, data_directory)
+        if data_directory:
+            for path in self.uploaded_files():
+                if os.path.isfile(data_directory + path):
+                    os.makedirs(os.path.dirname(set_aside_directory + path), exist_ok=True)
+                    os.replace(data_directory + path, set_aside_directory + path)
+        try:
+            yield
+        finally:
+            self._restore_set_aside_files(set_aside_directory, data_directory)
+
+    def first_incomplete_file(self):
+        """
+        Returns
+        -------
+        The path in the bag's data directory of the first file that hasn't been uploaded, or
+        None if no file has been downloaded yet or every file was uploaded.
+        """
+        for path, file in sorted(self.data.get('files', {}).items()):
+            if not file.get('uploaded'):
+                return path
+        return None
+
+    def clear(self):
+        """
+        Remove the manifest once the transfer has finished.
+        """
+        with self._lock:
+            self.data = {}
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _restore_set_aside_files(set_aside_directory, data_directory):
+        if not os.path.isdir(set_aside_directory):
+            return
+        for path, folders, files in os.walk(set_aside_directory):
+            for name in files:
+                file_path = os.path.join(path, name)
+                destination_path = data_directory + file_path[len(set_aside_directory):]
+                os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+                os.replace(file_path, destination_path)
+        shutil.rmtree(set_aside_directory)
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary_path = '{}.tmp'.format(self.path)
+        with open(temporary_path, 'w') as checkpoint_file:
+            json.dump(self.data, checkpoint_file)
+        os.replace(temporary_path, self.path)
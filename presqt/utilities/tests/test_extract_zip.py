@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import zipfile
+
+from django.test import SimpleTestCase
+
+from presqt.utilities import PresQTValidationError, extract_zip
+
+
+class TestExtractZip(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.zip_path = os.path.join(self.directory, 'upload.zip')
+        self.destination = os.path.join(self.directory, 'upload')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_zip(self, members, compression=zipfile.ZIP_STORED):
+        with zipfile.ZipFile(self.zip_path, 'w', compression=compression) as zip_file:
+            for name, contents in members.items():
+                zip_file.writestr(name, contents)
+
+    def test_extract(self):
+        """
+        Every member should be extracted once, keeping empty directories.
+        """
+        self.write_zip({'bag/data/a.txt': b'a' * 100, 'bag/data/empty/': b'',
+                        'bag/bagit.txt': b'x'})
+        extracted_files = extract_zip(self.zip_path, self.destination, 1000, 10, 100)
+
+        self.assertEqual(
+            sorted(os.path.relpath(path, self.destination) for path in extracted_files),
+            ['bag/bagit.txt', 'bag/data/a.txt'])
+        self.assertTrue(os.path.isdir(os.path.join(self.destination, 'bag/data/empty')))
+        with open(os.path.join(self.destination, 'bag/data/a.txt'), 'rb') as file:
+            self.assertEqual(file.read(), b'a' * 100)
+
+    def test_limits(self):
+        """
+        Zip files over the limits should be refused before anything is extracted.
+        """
+        self.write_zip({'bag/a.txt': b'a' * 100, 'bag/b.txt': b'b' * 100})
+        for limits, status_code in [((150, None, None), 413), ((None, 1, None), 413)]:
+            with self.assertRaises(PresQTValidationError) as e:
+                extract_zip(self.zip_path, self.destination, *limits)
+            self.assertEqual(e.exception.status_code, status_code)
+        self.assertFalse(os.path.exists(os.path.join(self.destination, 'bag')))
+
+        # A zip bomb expands to many times its own size
+        self.write_zip({'bag/zeros.bin': b'\0' * 1024 * 1024}, zipfile.ZIP_DEFLATED)
+        with self.assertRaises(PresQTValidationError) as e:
+            extract_zip(self.zip_path, self.destination, max_ratio=100)
+        self.assertEqual(
+            e.exception.data,
+            'PresQT Error: The zip file is compressed too much to be extracted safely.')
+
+    def test_unsafe_path(self):
+        """
+        Members that would be written outside of the destination should be refused.
+        """
+        self.write_zip({'bag/a.txt': b'a', '../outside.txt': b'b'})
+        with self.assertRaises(PresQTValidationError) as e:
+            extract_zip(self.zip_path, self.destination)
+        self.assertEqual(e.exception.data, "PresQT Error: '../outside.txt' is not a valid path.")
+        self.assertFalse(os.path.exists(os.path.join(self.destination, 'bag')))
+
+    def test_bad_crc(self):
+        """
+        A member whose contents don't match its CRC-32 should fail to extract.
+        """
+        self.write_zip({'bag/a.txt': b'abcdefghij' * 10})
+        with open(self.zip_path, 'r+b') as file:
+            contents = file.read()
+            file.seek(contents.index(b'abcdefghij'))
+            file.write(b'ABCDEFGHIJ')
+
+        with self.assertRaises(PresQTValidationError) as e:
+            extract_zip(self.zip_path, self.destination)
+        self.assertEqual(e.exception.status_code, 400)
+        self.assertIn('Bad CRC-32', e.exception.data)
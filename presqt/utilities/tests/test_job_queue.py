@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.test import SimpleTestCase
+
+from presqt.utilities import PresQTValidationError
+from presqt.utilities.job_store.sqlite_job_queue import SQLiteJobQueue
+
+
+class TestJobQueue(SimpleTestCase):
+    def setUp(self):
+        self.database_directory = tempfile.mkdtemp()
+        self.job_queue = SQLiteJobQueue(os.path.join(self.database_directory, 'jobs.sqlite3'),
+                                        max_running=3, max_waiting=5,
+                                        max_running_per_target={'github': 1, 'default': 2},
+                                        max_running_per_user=2)
+        self.worker_id = 'host:1'
+        self.payload = {'method': '_download_resource'}
+
+    def tearDown(self):
+        shutil.rmtree(self.database_directory)
+
+    def enqueue(self, ticket_number, targets, users, priority=0):
+        return self.job_queue.enqueue(ticket_number, 'resource_download', targets, users,
+                                      self.payload, priority)
+
+    def test_limits(self):
+        """
+        Jobs should only be claimed while the pool, target and user limits allow it, without a
+        blocked job holding up the ones behind it.
+        """
+        first = self.enqueue('1', ['github'], ['a'])
+        second = self.enqueue('2', ['github'], ['b'])
+        third = self.enqueue('3', ['osf'], ['a'])
+        fourth = self.enqueue('4', ['osf'], ['a'])
+        fifth = self.enqueue('5', ['zenodo'], ['c'])
+
+        claimed, abandoned = self.job_queue.claim(self.worker_id, 5)
+        self.assertEqual(claimed, [(first, self.payload), (third, self.payload),
+                                   (fifth, self.payload)])
+        self.assertEqual(abandoned, [])
+
+        self.job_queue.finish(first)
+        claimed, abandoned = self.job_queue.claim(self.worker_id, 5)
+        self.assertEqual(claimed, [(second, self.payload)])
+
+    def test_priority(self):
+        """
+        Jobs with a higher priority should be claimed first.
+        """
+        self.job_queue.max_running = 1
+        self.enqueue('1', ['osf'], ['a'])
+        urgent = self.enqueue('2', ['osf'], ['b'], priority=1)
+
+        claimed, abandoned = self.job_queue.claim(self.worker_id, 5)
+        self.assertEqual(claimed, [(urgent, self.payload)])
+
+    def test_position_and_cancel(self):
+        """
+        Waiting jobs should report their position and be removed from the queue when cancelled.
+        """
+        self.job_queue.max_running = 0
+        self.enqueue('1', ['osf'], ['a'])
+        self.enqueue('2', ['osf'], ['b'])
+
+        position = self.job_queue.get_position('2', 'resource_download')
+        self.assertEqual(position['queue_position'], 2)
+        self.assertIsNone(position['estimated_start_time'])
+
+        self.assertTrue(self.job_queue.cancel('1', 'resource_download'))
+        self.assertFalse(self.job_queue.cancel('1', 'resource_download'))
+        self.assertIsNone(self.job_queue.get_position('1', 'resource_download'))
+        self.assertEqual(
+            self.job_queue.get_position('2', 'resource_download')['queue_position'], 1)
+
+    def test_full_queue(self):
+        """
+        Jobs should be refused with a 503 once the queue is full.
+        """
+        for ticket_number in range(5):
+            self.enqueue(str(ticket_number), ['osf'], ['a'])
+
+        with self.assertRaises(PresQTValidationError) as error:
+            self.enqueue('6', ['osf'], ['a'])
+        self.assertEqual(error.exception.status_code, 503)
+
+    def test_claim_limit(self):
+        """
+        Jobs should be claimed by any worker, up to the number it has room for.
+        """
+        first = self.enqueue('1', ['osf'], ['a'])
+        second = self.enqueue('2', ['osf'], ['b'])
+
+        claimed, abandoned = self.job_queue.claim('worker:1', 1)
+        self.assertEqual(claimed, [(first, self.payload)])
+        claimed, abandoned = self.job_queue.claim('worker:2', 1)
+        self.assertEqual(claimed, [(second, self.payload)])
+
+    def test_expired_lease(self):
+        """
+        A job whose worker stopped renewing its lease should be queued again until it runs out of
+        the attempts allowed for its action.
+        """
+        self.job_queue.lease_seconds = 0.1
+        self.job_queue.max_attempts = {'resource_upload': 1, 'default': 2}
+        job_id = self.enqueue('1', ['osf'], ['a'])
+
+        self.assertEqual(len(self.job_queue.claim('worker:1', 1)[0]), 1)
+        self.assertEqual(self.job_queue.heartbeat('worker:1', [job_id]), [])
+        time.sleep(0.2)
+        claimed, abandoned = self.job_queue.claim('worker:2', 1)
+        self.assertEqual(claimed[0][0], job_id)
+
+        time.sleep(0.2)
+        claimed, abandoned = self.job_queue.claim('worker:3', 1)
+        self.assertEqual(claimed, [])
+        self.assertEqual(abandoned, [('1', 'resource_download')])
+
+        self.job_queue.enqueue('2', 'resource_upload', ['osf'], ['b'], self.payload)
+        self.assertEqual(len(self.job_queue.claim('worker:3', 1)[0]), 1)
+        time.sleep(0.2)
+        claimed, abandoned = self.job_queue.claim('worker:4', 1)
+        self.assertEqual(claimed, [])
+        self.assertEqual(abandoned, [('2', 'resource_upload')])
+
+    def test_request_cancel(self):
+        """
+        Cancelling a running job should be reported to its worker on the next heartbeat.
+        """
+        job_id = self.enqueue('1', ['osf'], ['a'])
+        self.job_queue.claim('worker:1', 1)
+
+        self.assertTrue(self.job_queue.request_cancel('1', 'resource_download'))
+        self.assertEqual(self.job_queue.heartbeat('worker:1', [job_id]), [job_id])
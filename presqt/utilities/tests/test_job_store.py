@@ -0,0 +1,121 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase
+
+from presqt.utilities import (read_file, increment_process_info, update_process_info_message,
+                              ProgressReporter)
+from presqt.utilities.job_store.base_job_store import get_process_info_path, get_ticket_number
+from presqt.utilities.job_store.json_job_store import JSONJobStore
+from presqt.utilities.job_store.sqlite_job_store import SQLiteJobStore
+
+
+def increment_job(job_store, ticket_number):
+    for _ in range(50):
+        job_store.increment_action(ticket_number, 'resource_download', 'download_files_finished')
+
+
+class TestJobStores(SimpleTestCase):
+    def setUp(self):
+        self.ticket_number = 'test_job_store'
+        self.database_directory = tempfile.mkdtemp()
+        self.job_stores = [
+            SQLiteJobStore(os.path.join(self.database_directory, 'jobs.sqlite3')),
+            JSONJobStore()]
+        self.process_obj = {'status': 'in_progress', 'message': 'Job is starting...',
+                            'download_files_finished': 0}
+
+    def tearDown(self):
+        shutil.rmtree(self.database_directory)
+        shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number), ignore_errors=True)
+
+    def test_get_ticket_number(self):
+        """
+        The ticket number should be the name of the directory process_info.json is in.
+        """
+        self.assertEqual(get_ticket_number(get_process_info_path('1234_5678')), '1234_5678')
+
+    def test_concurrent_increments(self):
+        """
+        Increments made from several processes at once should never be lost.
+        """
+        for job_store in self.job_stores:
+            job_store.set_action(self.ticket_number, 'resource_download', self.process_obj)
+
+            processes = [multiprocessing.Process(target=increment_job,
+                                                 args=(job_store, self.ticket_number))
+                         for _ in range(4)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+
+            job = job_store.get_job(self.ticket_number)
+            self.assertEqual(job['resource_download']['download_files_finished'], 200)
+            shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number))
+
+    def test_update_action_exports_json(self):
+        """
+        Field updates should only change the given fields and be exported to process_info.json.
+        """
+        for job_store in self.job_stores:
+            job_store.set_action(self.ticket_number, 'resource_download', self.process_obj)
+            job_store.update_action(self.ticket_number, 'resource_download',
+                                    {'status': 'finished'})
+
+            process_info = read_file(get_process_info_path(self.ticket_number), True)
+            self.assertEqual(process_info['resource_download']['status'], 'finished')
+            self.assertEqual(process_info['resource_download']['message'], 'Job is starting...')
+            shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number))
+
+    def test_job_deleted_with_directory(self):
+        """
+        A job should no longer exist once its directory has been deleted.
+        """
+        job_store = self.job_stores[0]
+        job_store.set_action(self.ticket_number, 'resource_download', self.process_obj)
+        self.assertIsNotNone(job_store.get_job(self.ticket_number))
+
+        shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number))
+        self.assertIsNone(job_store.get_job(self.ticket_number))
+
+
+class TestProgressReporter(SimpleTestCase):
+    def setUp(self):
+        self.ticket_number = 'test_progress_reporter'
+        self.database_directory = tempfile.mkdtemp()
+        self.job_store = SQLiteJobStore(os.path.join(self.database_directory, 'jobs.sqlite3'))
+        self.job_store.set_action(self.ticket_number, 'resource_download',
+                                  {'status': 'in_progress', 'message': 'Job is starting...',
+                                   'download_files_finished': 0})
+
+        self.progress_reporter = ProgressReporter(self.ticket_number, flush_interval=60000)
+        self.progress_reporter.job_store = self.job_store
+
+    def tearDown(self):
+        shutil.rmtree(self.database_directory)
+        shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number), ignore_errors=True)
+
+    def test_increments_are_coalesced(self):
+        """
+        Finished files should only be written once the flush interval passes or the phase changes.
+        """
+        for _ in range(10):
+            increment_process_info(self.progress_reporter, 'resource_download', 'download', 100)
+        process_obj = self.job_store.get_job(self.ticket_number)['resource_download']
+        self.assertEqual(process_obj['download_files_finished'], 0)
+
+        update_process_info_message(self.progress_reporter, 'resource_download', 'Zipping...')
+        process_obj = self.job_store.get_job(self.ticket_number)['resource_download']
+        self.assertEqual(process_obj['download_files_finished'], 10)
+        self.assertEqual(process_obj['download_bytes_transferred'], 1000)
+        self.assertIn('download_bytes_per_second', process_obj)
+        self.assertEqual(process_obj['message'], 'Zipping...')
+
+    def test_path_of_reporter(self):
+        """
+        A progress reporter should stand in for the path of the job's process_info.json file.
+        """
+        self.assertEqual(str(self.progress_reporter), get_process_info_path(self.ticket_number))
@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase
+
+from presqt.utilities import (TransferCheckpoint, ProgressReporter, increment_process_info,
+                              record_upload_destination, get_job_store, get_resumed_file)
+
+
+class TestTransferCheckpoint(SimpleTestCase):
+    def setUp(self):
+        self.ticket_number = 'test_transfer_checkpoint'
+        self.ticket_path = tempfile.mkdtemp()
+        self.data_directory = os.path.join(self.ticket_path, 'bag', 'data')
+        self.checkpoint = TransferCheckpoint(self.ticket_path)
+        self.checkpoint.record_request({'source_resource_id': '1234'})
+        self.checkpoint.record_download({'source_resource_id': '1234'}, {
+            '/project/a.txt': {'md5': 'a'}, '/project/b.txt': {'md5': 'b'}})
+
+    def tearDown(self):
+        shutil.rmtree(self.ticket_path)
+        shutil.rmtree('mediafiles/jobs/{}'.format(self.ticket_number), ignore_errors=True)
+
+    def test_stages(self):
+        """
+        The checkpoint should be saved at every stage and read back by a new instance.
+        """
+        self.checkpoint.start_upload(self.data_directory)
+        self.checkpoint.record_uploaded([os.path.join(self.data_directory, 'project/a.txt'),
+                                         os.path.join(self.ticket_path, 'zip_format/a.zip')])
+        self.checkpoint.record_destination('5678')
+        self.checkpoint.record_destination('9999')
+
+        checkpoint = TransferCheckpoint(self.ticket_path)
+        self.assertEqual(checkpoint.stage, 'uploading')
+        self.assertEqual(checkpoint.state, {'source_resource_id': '1234'})
+        self.assertEqual(checkpoint.uploaded_files(), {'/project/a.txt'})
+        self.assertEqual(checkpoint.first_incomplete_file(), '/project/b.txt')
+        self.assertEqual(checkpoint.destination_resource_id, '5678')
+
+        checkpoint.clear()
+        self.assertIsNone(TransferCheckpoint(self.ticket_path).stage)
+
+    def test_progress_reporter(self):
+        """
+        Uploaded files and created destinations reported through a transfer's progress reporter
+        should be recorded in its checkpoint when it flushes.
+        """
+        get_job_store().set_action(self.ticket_number, 'resource_transfer_in', {
+            'status': 'in_progress', 'upload_files_finished': 0})
+        self.checkpoint.start_upload(self.data_directory)
+        progress_reporter = ProgressReporter(self.ticket_number, flush_interval=60000,
+                                             checkpoint=self.checkpoint)
+
+        record_upload_destination(progress_reporter, '5678')
+        for name in ['a.txt', 'b.txt']:
+            increment_process_info(progress_reporter, 'resource_transfer_in', 'upload', 10,
+                                   os.path.join(self.data_directory, 'project', name))
+        self.assertEqual(TransferCheckpoint(self.ticket_path).uploaded_files(), set())
+
+        progress_reporter.flush()
+        checkpoint = TransferCheckpoint(self.ticket_path)
+        self.assertEqual(checkpoint.uploaded_files(), {'/project/a.txt', '/project/b.txt'})
+        self.assertIsNone(checkpoint.first_incomplete_file())
+        self.assertEqual(checkpoint.destination_resource_id, '5678')
+
+    def test_set_aside_uploaded_files(self):
+        """
+        Uploaded files should be out of the data directory while a resumed upload runs, and put
+        back afterwards even if an earlier resume was killed while they were set aside.
+        """
+        for name in ['a.txt', 'b.txt']:
+            os.makedirs(os.path.join(self.data_directory, 'project'), exist_ok=True)
+            with open(os.path.join(self.data_directory, 'project', name), 'w') as file:
+                file.write(name)
+        self.checkpoint.start_upload(self.data_directory)
+        self.checkpoint.record_uploaded([os.path.join(self.data_directory, 'project/a.txt')])
+
+        project_directory = os.path.join(self.data_directory, 'project')
+        with self.checkpoint.set_aside_uploaded_files():
+            self.assertEqual(os.listdir(project_directory), ['b.txt'])
+        self.assertEqual(sorted(os.listdir(project_directory)), ['a.txt', 'b.txt'])
+
+        # A job killed inside the block leaves the files set aside
+        os.makedirs(os.path.join(self.ticket_path, 'uploaded', 'project'))
+        os.replace(os.path.join(project_directory, 'a.txt'),
+                   os.path.join(self.ticket_path, 'uploaded', 'project', 'a.txt'))
+        with TransferCheckpoint(self.ticket_path).set_aside_uploaded_files():
+            self.assertEqual(os.listdir(project_directory), ['b.txt'])
+        self.assertEqual(sorted(os.listdir(project_directory)), ['a.txt', 'b.txt'])
+        self.assertFalse(os.path.exists(os.path.join(self.ticket_path, 'uploaded')))
+
+    def test_downloaded_files(self):
+        """
+        Files should be recorded in the checkpoint as they are downloaded, and a resumed
+        download's reporter should hand each one back once instead of it being downloaded again.
+        """
+        get_job_store().set_action(self.ticket_number, 'resource_transfer_in', {
+            'status': 'in_progress', 'download_files_finished': 0})
+        checkpoint = TransferCheckpoint(self.ticket_path)
+        checkpoint.record_request({'source_resource_id': '1234'})
+        progress_reporter = ProgressReporter(self.ticket_number, flush_interval=60000,
+                                             checkpoint=checkpoint)
+
+        progress_reporter.record_downloaded('/project/a.txt', '/bag/project/a.txt', {'md5': 'a'})
+        self.assertEqual(TransferCheckpoint(self.ticket_path).downloaded_files(), {})
+        progress_reporter.flush()
+        checkpoint = TransferCheckpoint(self.ticket_path)
+        self.assertEqual(checkpoint.downloaded_files(),
+                         {'/project/a.txt': ('/bag/project/a.txt', {'md5': 'a'})})
+        self.assertEqual(checkpoint.first_incomplete_file(), '/project/a.txt')
+
+        progress_reporter = ProgressReporter(self.ticket_number,
+                                             resumed_files={'/project/a.txt': '/spool/1'})
+        self.assertEqual(get_resumed_file(progress_reporter, {'path': '/project/a.txt'}),
+                         '/spool/1')
+        self.assertIsNone(get_resumed_file(progress_reporter, {'path': '/project/a.txt'}))
+        self.assertIsNone(get_resumed_file('process_info.json', {'path': '/project/a.txt'}))
@@ -0,0 +1,155 @@
+import os
+import shutil
+import tempfile
+import zipfile
+from importlib import import_module
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from presqt.utilities import CompressionPolicy, zip_directory
+
+zip_file_module = import_module('presqt.utilities.io.zip_file')
+
+
+class TestZipCompression(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.directory, 'bag')
+        self.files = {
+            'data/table.csv': b'id,name,value\n' * 5000,
+            'data/notes.txt': b'Some notes\n' * 2000,
+            'data/photo.jpg': os.urandom(4096),
+            'data/nested/random.bin': os.urandom(4096),
+            'bagit.txt': b'BagIt-Version: 0.97\n'
+        }
+        for path, contents in self.files.items():
+            file_path = os.path.join(self.source_path, path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'wb') as file:
+                file.write(contents)
+        os.makedirs(os.path.join(self.source_path, 'data', 'empty'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_compress_type(self):
+        """
+        The 'auto' policy should only deflate files that aren't already compressed.
+        """
+        policy = CompressionPolicy('auto')
+        self.assertEqual(policy.compress_type('data/table.csv'), zipfile.ZIP_DEFLATED)
+        self.assertEqual(policy.compress_type('data/unknown'), zipfile.ZIP_DEFLATED)
+        for file_name in ['photo.JPG', 'archive.zip', 'table.csv.gz', 'movie.mp4', 'paper.docx']:
+            self.assertEqual(policy.compress_type(file_name), zipfile.ZIP_STORED)
+        self.assertEqual(CompressionPolicy('deflate').compress_type('photo.jpg'),
+                         zipfile.ZIP_DEFLATED)
+        self.assertEqual(CompressionPolicy().compress_type('table.csv'), zipfile.ZIP_STORED)
+
+        with override_settings(ZIP_COMPRESSION={'bag_and_zip': 'deflate', 'default': 'store'},
+                               ZIP_COMPRESSION_LEVEL=9, ZIP_COMPRESSION_WORKERS=2):
+            policy = CompressionPolicy.for_endpoint('bag_and_zip')
+            self.assertEqual((policy.mode, policy.level, policy.workers), ('deflate', 9, 2))
+            self.assertEqual(CompressionPolicy.for_endpoint('resource_download').mode, 'store')
+
+        with self.assertRaises(ValueError):
+            CompressionPolicy('bzip2')
+
+    def test_parallel_zip_directory(self):
+        """
+        Files deflated by the worker pool should be written into one valid zip file.
+        """
+        zip_path = os.path.join(self.directory, 'bag.zip')
+        zip_directory(self.source_path, zip_path, self.directory, CompressionPolicy('auto', 6, 2))
+
+        with zipfile.ZipFile(zip_path) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            self.assertIn('bag/data/empty/', zip_file.namelist())
+            for path, contents in self.files.items():
+                self.assertEqual(zip_file.read('bag/{}'.format(path)), contents)
+
+            compress_types = {zip_info.filename: zip_info.compress_type
+                              for zip_info in zip_file.infolist()}
+            self.assertEqual(compress_types['bag/data/table.csv'], zipfile.ZIP_DEFLATED)
+            self.assertEqual(compress_types['bag/data/photo.jpg'], zipfile.ZIP_STORED)
+            # Random data doesn't get any smaller, so it's stored
+            self.assertEqual(compress_types['bag/data/nested/random.bin'], zipfile.ZIP_STORED)
+            self.assertLess(zip_file.getinfo('bag/data/table.csv').compress_size,
+                            len(self.files['data/table.csv']))
+
+    def test_zip64(self):
+        """
+        Entries and archives past the ZIP64 limits should get ZIP64 extensions zipfile can read,
+        and keep the names, timestamps and permissions zipfile gives them.
+        """
+        with open(os.path.join(self.source_path, 'data', 'caf\u00e9.txt'), 'wb') as file:
+            file.write(b'Caf\xc3\xa9\n' * 100)
+        zip_path = os.path.join(self.directory, 'bag.zip')
+        with patch.object(zip_file_module, 'ZIP64_LIMIT', 100), \
+                patch.object(zip_file_module, 'ZIP64_ENTRY_LIMIT', 2):
+            zip_directory(self.source_path, zip_path, self.directory,
+                          CompressionPolicy('auto', 6, 2))
+
+        with zipfile.ZipFile(zip_path) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            self.assertEqual(zip_file.read('bag/data/caf\u00e9.txt'), b'Caf\xc3\xa9\n' * 100)
+            for path, contents in self.files.items():
+                self.assertEqual(zip_file.read('bag/{}'.format(path)), contents)
+
+            file_path = os.path.join(self.source_path, 'data', 'table.csv')
+            expected = zipfile.ZipInfo.from_file(file_path, 'bag/data/table.csv')
+            zip_info = zip_file.getinfo('bag/data/table.csv')
+            self.assertEqual(zip_info.date_time[:5], expected.date_time[:5])
+            self.assertEqual(zip_info.external_attr, expected.external_attr)
+
+    def test_zip64_entry_count(self):
+        """
+        Archives with more entries than the original format can count should get a ZIP64 end of
+        central directory record zipfile can read.
+        """
+        zip_path = os.path.join(self.directory, 'bag.zip')
+        with patch.object(zip_file_module, 'ZIP64_ENTRY_LIMIT', 2):
+            zip_directory(self.source_path, zip_path, self.directory,
+                          CompressionPolicy('auto', 6, 2))
+
+        with open(zip_path, 'rb') as zip_file:
+            self.assertIn(b'PK\x06\x06', zip_file.read())
+        with zipfile.ZipFile(zip_path) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            self.assertEqual(len(zip_file.infolist()), len(self.files) + 1)
+
+    def test_zip64_sizes(self):
+        """
+        Entries larger than the original format can hold should get ZIP64 extra fields zipfile
+        can read, whether they are stored or deflated.
+        """
+        zip_path = os.path.join(self.directory, 'bag.zip')
+        with patch.object(zip_file_module, 'ZIP64_LIMIT', 1000):
+            zip_directory(self.source_path, zip_path, self.directory,
+                          CompressionPolicy('auto', 6, 2))
+
+        with zipfile.ZipFile(zip_path) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            for path in ['data/table.csv', 'data/photo.jpg']:
+                zip_info = zip_file.getinfo('bag/{}'.format(path))
+                # The ZIP64 extra field's header id is 1
+                self.assertEqual(zip_info.extra[:2], b'\x01\x00')
+                self.assertEqual(zip_info.file_size, len(self.files[path]))
+            self.assertEqual(zip_file.getinfo('bag/data/table.csv').compress_type,
+                             zipfile.ZIP_DEFLATED)
+            self.assertEqual(zip_file.getinfo('bag/data/photo.jpg').compress_type,
+                             zipfile.ZIP_STORED)
+
+    def test_old_timestamps(self):
+        """
+        Files modified before 1980 should be zipped with the earliest time the format can hold.
+        """
+        os.utime(os.path.join(self.source_path, 'data', 'notes.txt'), (0, 0))
+        os.utime(os.path.join(self.source_path, 'data', 'photo.jpg'), (0, 0))
+        zip_path = os.path.join(self.directory, 'bag.zip')
+        zip_directory(self.source_path, zip_path, self.directory, CompressionPolicy('auto', 6, 2))
+
+        with zipfile.ZipFile(zip_path) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            for path in ['bag/data/notes.txt', 'bag/data/photo.jpg']:
+                self.assertEqual(zip_file.getinfo(path).date_time, (1980, 1, 1, 0, 0, 0))
@@ -0,0 +1,79 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from importlib import import_module
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from presqt.utilities import ZipStream, iter_zip_directory, zip_directory
+
+zip_stream_module = import_module('presqt.utilities.io.zip_stream')
+
+
+class TestZipStream(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.directory, 'bag')
+        os.makedirs(os.path.join(self.source_path, 'data', 'project', 'empty'))
+        with open(os.path.join(self.source_path, 'bagit.txt'), 'w') as file:
+            file.write('BagIt-Version: 0.97\n')
+        with open(os.path.join(self.source_path, 'data', 'project', 'file.txt'), 'wb') as file:
+            file.write(os.urandom(1024))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_iter_zip_directory(self):
+        """
+        Streaming a directory should give the same zip file entries as zip_directory.
+        """
+        zip_path = os.path.join(self.directory, 'bag.zip')
+        zip_directory(self.source_path, zip_path, self.directory)
+        streamed = b''.join(iter_zip_directory(self.source_path, self.directory))
+
+        with zipfile.ZipFile(zip_path) as zipped, \
+                zipfile.ZipFile(io.BytesIO(streamed)) as streamed_zip:
+            self.assertEqual(sorted(zipped.namelist()), sorted(streamed_zip.namelist()))
+            self.assertIsNone(streamed_zip.testzip())
+            self.assertEqual(streamed_zip.read('bag/data/project/file.txt'),
+                             zipped.read('bag/data/project/file.txt'))
+
+    def test_iter_zip_directory_closed(self):
+        """
+        Closing the stream early, like when the client hangs up, should stop the zip file being
+        written.
+        """
+        with patch.object(zip_stream_module, 'ZIP_STREAM_BLOCK_SIZE', 16), \
+                patch.object(zip_stream_module, 'ZIP_STREAM_QUEUE_SIZE', 1):
+            stream = iter_zip_directory(self.source_path, self.directory)
+            next(stream)
+            threads = threading.active_count()
+            stream.close()
+        for _ in range(50):
+            if threading.active_count() < threads:
+                break
+            time.sleep(0.1)
+        self.assertLess(threading.active_count(), threads)
+
+    def test_write_empty_directories(self):
+        """
+        Directories without files of their own should get an entry, like zip_directory gives them.
+        """
+        zip_path = os.path.join(self.directory, 'streamed.zip')
+        zip_stream = ZipStream(zip_path)
+        zip_stream.write_file(os.path.join(self.source_path, 'data', 'project', 'file.txt'),
+                              'bag/data/project/file.txt')
+        zip_stream.write_directory('bag/data/project/empty')
+        zip_stream.write_bytes('BagIt-Version: 0.97\n', 'bag/bagit.txt')
+        zip_stream.write_empty_directories()
+        zip_stream.close()
+
+        with zipfile.ZipFile(zip_path) as streamed_zip:
+            self.assertEqual(sorted(streamed_zip.namelist()),
+                             ['bag/bagit.txt', 'bag/data/', 'bag/data/project/empty/',
+                              'bag/data/project/file.txt'])
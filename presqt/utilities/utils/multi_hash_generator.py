@@ -0,0 +1,80 @@
+import hashlib
+
+# The checksums PresQT writes into every BagIt manifest it creates.
+BAG_CHECKSUMS = ['md5', 'sha1', 'sha256', 'sha512']
+
+
+class MultiHasher(object):
+    """
+    Feed bytes to several hash algorithms at once so every digest PresQT needs for a file can be
+    calculated in a single pass over its contents.
+    """
+
+    def __init__(self, algorithms=BAG_CHECKSUMS):
+        self.hashers = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+        self.byte_count = 0
+
+    def update(self, chunk):
+        """
+        Add a chunk of the file's contents to every digest.
+
+        Parameters
+        ----------
+        chunk : bytes
+            The next chunk of the file
+        """
+        for hasher in self.hashers.values():
+            hasher.update(chunk)
+        self.byte_count += len(chunk)
+
+    def hexdigests(self):
+        """
+        Returns
+        -------
+        Dictionary of hash algorithms (key) and the hex digest of everything fed so far (value).
+        """
+        return {algorithm: hasher.hexdigest() for algorithm, hasher in self.hashers.items()}
+
+
+def multi_hash_generator(file, algorithms=BAG_CHECKSUMS):
+    """
+    Generate hashes for a file with several hash algorithms at once.
+
+    Parameters
+    ----------
+    file : bytes
+        File to be ran through the hash algorithms
+    algorithms : list
+        Hash algorithms to use
+
+    Returns
+    -------
+    Dictionary of hash algorithms (key) and the file hash they generated (value).
+    """
+    hasher = MultiHasher(algorithms)
+    hasher.update(file)
+    return hasher.hexdigests()
+
+
+def file_multi_hash_generator(file_path, algorithms=BAG_CHECKSUMS, chunk_size=1024 * 1024):
+    """
+    Generate hashes for a file on disk with several hash algorithms while only reading it once.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file to be ran through the hash algorithms
+    algorithms : list
+        Hash algorithms to use
+    chunk_size : int
+        Number of bytes to read from the file at a time
+
+    Returns
+    -------
+    Dictionary of hash algorithms (key) and the file hash they generated (value).
+    """
+    hasher = MultiHasher(algorithms)
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher.hexdigests()
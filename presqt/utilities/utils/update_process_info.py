@@ -1,16 +1,16 @@
-# TODO: Refactor these funcs to keep things dry
-
-from presqt.utilities import write_file, read_file
+from presqt.utilities.job_store.base_job_store import get_ticket_number
+from presqt.utilities.job_store.get_job_store import get_job_store
+from presqt.utilities.job_store.progress_reporter import ProgressReporter
 
 
 def update_process_info(process_info_path, total_files, action, function):
     """
-    Update the process_info.json file with the number of total files involved in the action
+    Update the job's process info with the number of total files involved in the action
 
     Parameters
     ----------
-    process_info_path: str
-        Path to the process_info.json file to update
+    process_info_path: str or ProgressReporter
+        Path to the process_info.json file of the job to update, or the job's progress reporter
     total_files: int
         Total number of resources involved in the action
     action: str
@@ -18,8 +18,6 @@ def update_process_info(process_info_path, total_files, action, function):
     function: str
         The function being called
     """
-    process_info_data = read_file(process_info_path, True)
-
     # Get the proper dict key
     if function == 'upload':
         key = 'upload_total_files'
@@ -28,53 +26,130 @@ def update_process_info(process_info_path, total_files, action, function):
     else:
         key = 'total_files'
 
-    process_info_data[action][key] = total_files
-    write_file(process_info_path, process_info_data, True)
+    _update_process_info_fields(process_info_path, action, {key: total_files})
     return
 
 
-def increment_process_info(process_info_path, action, function):
+def increment_process_info(process_info_path, action, function, bytes_transferred=0,
+                           file_path=None):
     """
-    Increment the download_files_finished attribute in the process_info.json file
+    Increment the files finished attribute in the job's process info
 
     Parameters
     ----------
-    process_info_path: str
-        Path to the process_info.json file to update
+    process_info_path: str or ProgressReporter
+        Path to the process_info.json file of the job to update, or the job's progress reporter
     action: str
         The action to update in the process_info.json object
     function: str
         The function being called
+    bytes_transferred: int
+        Number of bytes moved for the finished file
+    file_path: str
+        Path on disk of the finished file. Uploaded files are marked in the transfer's
+        checkpoint so a resumed transfer doesn't send them again.
     """
-    process_info_data = read_file(process_info_path, True)
-
-    # Get the proper dict key
+    # Get the proper dict keys
     if function == 'upload':
         key = 'upload_files_finished'
+        bytes_key = 'upload_bytes_transferred'
     elif function == 'download':
         key = 'download_files_finished'
+        bytes_key = 'download_bytes_transferred'
     else:
         key = 'files_finished'
+        bytes_key = 'bytes_transferred'
+
+    if isinstance(process_info_path, ProgressReporter):
+        process_info_path.increment(action, key, bytes_key, bytes_transferred,
+                                    file_path if function == 'upload' else None)
+    else:
+        increments = {key: 1}
+        if bytes_transferred:
+            increments[bytes_key] = bytes_transferred
+        get_job_store().record_progress(get_ticket_number(process_info_path), action, increments)
+    return
+
+
+def report_downloaded_file(process_info_path, resource):
+    """
+    Report a file as soon as it has been downloaded, so a streaming transfer can upload it while
+    the rest are still being downloaded. Files that aren't reported are handled once the download
+    function returns.
+
+    Parameters
+    ----------
+    process_info_path: str or ProgressReporter
+        Path to the process_info.json file of the job to update, or the job's progress reporter
+    resource: dict
+        The file's resource dictionary, in the format download functions return them in
+    """
+    if isinstance(process_info_path, ProgressReporter):
+        process_info_path.file_downloaded(resource)
+    return
+
+
+def get_resumed_file(process_info_path, resource):
+    """
+    Get the spooled copy of a file that a stopped transfer had already downloaded, so a resumed
+    download can use it instead of downloading the file again.
+
+    Parameters
+    ----------
+    process_info_path: str or ProgressReporter
+        Path to the process_info.json file of the job to update, or the job's progress reporter
+    resource: dict
+        The file's resource dictionary, with its 'path' in the resource
+
+    Returns
+    -------
+    The path to the spooled file, or None if the file has to be downloaded.
+    """
+    if isinstance(process_info_path, ProgressReporter):
+        return process_info_path.resumed_file(resource['path'])
+    return None
+
+
+def record_upload_destination(process_info_path, resource_id):
+    """
+    Record the resource an upload created on the destination target, so a resumed transfer
+    uploads into it instead of creating another. Only transfers keep a checkpoint to record it
+    in.
 
-    process_info_data[action][key] = process_info_data[action][key] + 1
-    write_file(process_info_path, process_info_data, True)
+    Parameters
+    ----------
+    process_info_path: str or ProgressReporter
+        Path to the process_info.json file of the job to update, or the job's progress reporter
+    resource_id: str
+        ID of the created resource
+    """
+    if isinstance(process_info_path, ProgressReporter):
+        process_info_path.record_destination(resource_id)
     return
 
 
 def update_process_info_message(process_info_path, action, message):
     """
-    Update the process_info.json file with the number of total files involved in the action
+    Update the job's process info with a new message
 
     Parameters
     ----------
-    process_info_path: str
-        Path to the process_info.json file to update
+    process_info_path: str or ProgressReporter
+        Path to the process_info.json file of the job to update, or the job's progress reporter
     action: str
         The action to update in the process_info.json object
     message: str
         The message to add to the process_info file
     """
-    process_info_data = read_file(process_info_path, True)
-    process_info_data[action]['message'] = message
-    write_file(process_info_path, process_info_data, True)
+    _update_process_info_fields(process_info_path, action, {'message': message})
     return
+
+
+def _update_process_info_fields(process_info_path, action, fields):
+    """
+    Write fields of the action's process info through the progress reporter if there is one.
+    """
+    if isinstance(process_info_path, ProgressReporter):
+        process_info_path.update(action, fields)
+    else:
+        get_job_store().update_action(get_ticket_number(process_info_path), action, fields)